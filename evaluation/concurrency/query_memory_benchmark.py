@@ -0,0 +1,109 @@
+"""
+Benchmark of per-session search throughput
+as the number of concurrent queries on one session grows.
+
+Long-term memory search is simulated with a fixed latency,
+so that the benchmark measures the concurrency of EpisodicMemory.query_memory
+rather than the speed of the configured stores.
+"""
+
+import argparse
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+from memmachine.episodic_memory.data_types import MemoryContext
+from memmachine.episodic_memory.episodic_memory import EpisodicMemory
+
+
+class SimulatedLongTermMemory:
+    """
+    Long-term memory whose searches take a fixed time.
+    """
+
+    def __init__(self, search_latency_seconds: float):
+        self._search_latency_seconds = search_latency_seconds
+
+    async def search(self, query, num_episodes_limit, property_filter=None):
+        await asyncio.sleep(self._search_latency_seconds)
+        return []
+
+    async def forget_session(self):
+        pass
+
+
+def create_episodic_memory(search_latency_seconds: float) -> EpisodicMemory:
+    memory_context = MemoryContext(
+        group_id="benchmark_group",
+        agent_id={"benchmark_agent"},
+        user_id={"benchmark_user"},
+        session_id="benchmark_session",
+    )
+    config = {
+        "model": {
+            "benchmark_model": {
+                "model_vendor": "openai",
+                "model": "gpt-4o-mini",
+                "api_key": "unused",
+            }
+        },
+        "sessionmemory": {"model_name": "benchmark_model"},
+        "prompts": {},
+    }
+    episodic_memory = EpisodicMemory(MagicMock(), config, memory_context)
+    episodic_memory.long_term_memory = SimulatedLongTermMemory(search_latency_seconds)
+    return episodic_memory
+
+
+async def measure_throughput(
+    episodic_memory: EpisodicMemory, concurrency: int, num_queries: int
+) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def query():
+        async with semaphore:
+            await episodic_memory.query_memory("benchmark query")
+
+    start = time.perf_counter()
+    await asyncio.gather(*[query() for _ in range(num_queries)])
+    return num_queries / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--search-latency",
+        type=float,
+        default=0.02,
+        help="Simulated latency of a long-term memory search in seconds",
+    )
+    parser.add_argument(
+        "--num-queries",
+        type=int,
+        default=200,
+        help="Number of queries to run at each concurrency level",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8, 16, 32],
+        help="Numbers of concurrent queries to measure",
+    )
+    args = parser.parse_args()
+
+    episodic_memory = create_episodic_memory(args.search_latency)
+
+    print(f"{'concurrency':>12} {'queries/s':>12} {'speedup':>8}")
+    baseline = None
+    for concurrency in args.concurrency:
+        throughput = await measure_throughput(
+            episodic_memory, concurrency, args.num_queries
+        )
+        if baseline is None:
+            baseline = throughput
+        print(f"{concurrency:>12} {throughput:>12.1f} {throughput / baseline:>8.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
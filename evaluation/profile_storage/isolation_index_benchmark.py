@@ -0,0 +1,205 @@
+"""
+Benchmark of profile storage queries filtered by isolations
+on a profile table with millions of rows,
+without and with the isolation indexes of the profile schema.
+
+The profile table is created in a scratch schema of a PostgreSQL database
+with the pgvector extension, and is dropped afterwards.
+The connection parameters are read from the same environment variables
+as memmachine-sync-profile-schema.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import asyncpg
+import numpy as np
+from dotenv import load_dotenv
+
+from memmachine.profile_memory.storage.asyncpg_profile import AsyncPgProfileStorage
+from memmachine.profile_memory.storage.syncschema import get_base
+
+ISOLATION_INDEXES = ["prof_user_isolations_idx", "history_user_isolations_idx"]
+
+
+async def create_profile_table(
+    connection: asyncpg.Connection,
+    schema: str,
+    num_rows: int,
+    num_users: int,
+    num_sessions: int,
+    dimensions: int,
+):
+    await connection.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    await connection.execute(f"CREATE SCHEMA {schema}")
+    await connection.execute(f"SET search_path TO {schema}, public")
+    await connection.execute(get_base())
+
+    # Each user has features in every session of its group.
+    await connection.execute(
+        """
+        INSERT INTO prof (user_id, tag, feature, value, embedding, isolations)
+        SELECT
+            'user_' || (i % $2),
+            'tag_' || (i % 10),
+            'feature_' || i,
+            'value_' || i,
+            ARRAY(
+                SELECT random() FROM generate_series(1, $4) WHERE i IS NOT NULL
+            )::vector,
+            jsonb_build_object(
+                'group_id', 'group_' || (i % $2),
+                'session_id', 'session_' || ((i / $2) % $3)
+            )
+        FROM generate_series(1, $1) AS i
+        """,
+        num_rows,
+        num_users,
+        num_sessions,
+        dimensions,
+    )
+    await connection.execute("ANALYZE prof")
+
+
+async def measure_latencies(
+    storage: AsyncPgProfileStorage,
+    num_users: int,
+    num_sessions: int,
+    dimensions: int,
+    num_queries: int,
+) -> dict[str, float]:
+    rng = np.random.default_rng(0)
+    operations = {
+        "get_profile": lambda user, isolations: storage.get_profile(user, isolations),
+        "semantic_search": lambda user, isolations: storage.semantic_search(
+            user, rng.random(dimensions), 10, -1.0, isolations
+        ),
+        "get_large_profile_sections": (
+            lambda user, isolations: storage.get_large_profile_sections(
+                user, 5, isolations
+            )
+        ),
+    }
+
+    latencies = {}
+    for name, operation in operations.items():
+        start = time.perf_counter()
+        for index in range(num_queries):
+            user_index = index % num_users
+            await operation(
+                f"user_{user_index}",
+                {
+                    "group_id": f"group_{user_index}",
+                    "session_id": f"session_{index % num_sessions}",
+                },
+            )
+        latencies[name] = (time.perf_counter() - start) / num_queries * 1000
+    return latencies
+
+
+async def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--num-rows",
+        type=int,
+        default=2_000_000,
+        help="Number of profile features",
+    )
+    parser.add_argument(
+        "--num-users",
+        type=int,
+        default=100,
+        help="Number of users, each with its own group",
+    )
+    parser.add_argument(
+        "--num-sessions",
+        type=int,
+        default=1_000,
+        help="Number of sessions of each user",
+    )
+    parser.add_argument(
+        "--dimensions",
+        type=int,
+        default=8,
+        help="Dimensions of the feature embeddings",
+    )
+    parser.add_argument(
+        "--num-queries",
+        type=int,
+        default=100,
+        help="Number of queries to run of each kind",
+    )
+    parser.add_argument(
+        "--schema",
+        default="isolation_benchmark",
+        help="Scratch schema to create the profile table in",
+    )
+    args = parser.parse_args()
+
+    config = {
+        "host": os.getenv("POSTGRES_HOST"),
+        "port": os.getenv("POSTGRES_PORT"),
+        "user": os.getenv("POSTGRES_USER"),
+        "password": os.getenv("POSTGRES_PASSWORD"),
+        "database": os.getenv("POSTGRES_DB"),
+    }
+
+    connection = await asyncpg.connect(**config)
+    # The extensions are created outside of the scratch schema,
+    # and before the storage registers the vector type.
+    await connection.execute(
+        "CREATE EXTENSION IF NOT EXISTS vector;"
+        "CREATE EXTENSION IF NOT EXISTS btree_gin;"
+    )
+    storage = AsyncPgProfileStorage(config | {"schema": args.schema})
+    await storage.startup()
+    try:
+        print(f"Creating a profile table with {args.num_rows} features ...")
+        await create_profile_table(
+            connection,
+            args.schema,
+            args.num_rows,
+            args.num_users,
+            args.num_sessions,
+            args.dimensions,
+        )
+
+        for index_name in ISOLATION_INDEXES:
+            await connection.execute(f"DROP INDEX {index_name}")
+        without_indexes = await measure_latencies(
+            storage,
+            args.num_users,
+            args.num_sessions,
+            args.dimensions,
+            args.num_queries,
+        )
+
+        # Recreate the indexes as memmachine-sync-profile-schema does.
+        await connection.execute(get_base())
+        await connection.execute("ANALYZE prof")
+        with_indexes = await measure_latencies(
+            storage,
+            args.num_users,
+            args.num_sessions,
+            args.dimensions,
+            args.num_queries,
+        )
+
+        print(f"{'query':>28} {'unindexed ms':>13} {'indexed ms':>11} {'speedup':>8}")
+        for name, latency in without_indexes.items():
+            print(
+                f"{name:>28} {latency:>13.2f} {with_indexes[name]:>11.2f}"
+                f" {latency / with_indexes[name]:>8.2f}"
+            )
+    finally:
+        await storage.cleanup()
+        await connection.execute(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE")
+        await connection.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,9 +10,11 @@ from typing import Any
 from uuid import uuid4
 
 from langchain_aws import BedrockEmbeddings
+from langchain_aws.utils import parse_model_provider
 from pydantic import BaseModel, Field, InstanceOf
 
 from memmachine.common.data_types import ExternalServiceAPIError
+from memmachine.common.utils import async_with
 
 from .data_types import SimilarityMetric
 from .embedder import Embedder
@@ -36,6 +38,15 @@ class AmazonBedrockEmbedderParams(BaseModel):
         max_retry_interval_seconds (int):
             Maximal retry interval in seconds
             (default: 120).
+        max_inputs_per_request (int):
+            Maximum number of inputs to embed
+            in a single attempt
+            (default: 96).
+            Only Cohere models embed several inputs in one request,
+            other models are sent one request per input.
+        max_concurrent_requests (int):
+            Maximum number of concurrent requests to Amazon Bedrock
+            (default: 8).
     """
 
     client: InstanceOf[BedrockEmbeddings] = Field(
@@ -58,6 +69,16 @@ class AmazonBedrockEmbedderParams(BaseModel):
         description="Maximal retry interval in seconds (defualt: 120).",
         gt=0,
     )
+    max_inputs_per_request: int = Field(
+        96,
+        description="Maximum number of inputs to embed in a single attempt.",
+        gt=0,
+    )
+    max_concurrent_requests: int = Field(
+        8,
+        description="Maximum number of concurrent requests to Amazon Bedrock.",
+        gt=0,
+    )
 
 
 class AmazonBedrockEmbedder(Embedder):
@@ -83,6 +104,14 @@ class AmazonBedrockEmbedder(Embedder):
         self._similarity_metric = params.similarity_metric
         self._max_retry_interval_seconds = params.max_retry_interval_seconds
 
+        self._max_inputs_per_request = params.max_inputs_per_request
+        self._semaphore = asyncio.Semaphore(params.max_concurrent_requests)
+
+        # Only Cohere models embed several documents in one request.
+        self._embeds_documents_in_one_request = (
+            self._client.provider or parse_model_provider(self._client.model_id)
+        ) == "cohere"
+
         # Get dimensions by embedding a dummy string.
         response = self._client.embed_documents(["."])
         self._dimensions = len(response[0])
@@ -102,7 +131,12 @@ class AmazonBedrockEmbedder(Embedder):
         self,
         inputs: list[Any],
     ) -> list[list[float]]:
-        return await self._client.aembed_documents(inputs)
+        if self._embeds_documents_in_one_request:
+            async with self._semaphore:
+                return await self._client.aembed_documents(inputs)
+
+        # Other models embed documents like queries, one request per input.
+        return await self._search_embed_func(inputs)
 
     async def search_embed(
         self,
@@ -119,7 +153,10 @@ class AmazonBedrockEmbedder(Embedder):
         self,
         queries: list[Any],
     ) -> list[list[float]]:
-        embed_queries_tasks = [self._client.aembed_query(query) for query in queries]
+        embed_queries_tasks = [
+            async_with(self._semaphore, self._client.aembed_query(query))
+            for query in queries
+        ]
         return await asyncio.gather(*embed_queries_tasks)
 
     async def _embed(
@@ -128,9 +165,35 @@ class AmazonBedrockEmbedder(Embedder):
         async_embed_func: Callable[[list[Any]], Coroutine[Any, Any, list[list[float]]]],
         max_attempts: int = 1,
     ) -> list[list[float]]:
+        if not inputs:
+            return []
         if max_attempts <= 0:
             raise ValueError("max_attempts must be a positive integer")
 
+        # Split inputs into chunks and embed the chunks concurrently,
+        # retrying each chunk independently.
+        # Requests to Amazon Bedrock are bounded by the embed functions.
+        embed_chunk_tasks = [
+            self._embed_chunk(
+                inputs[start : start + self._max_inputs_per_request],
+                async_embed_func,
+                max_attempts,
+            )
+            for start in range(0, len(inputs), self._max_inputs_per_request)
+        ]
+
+        return [
+            embedding
+            for chunk_embeddings in await asyncio.gather(*embed_chunk_tasks)
+            for embedding in chunk_embeddings
+        ]
+
+    async def _embed_chunk(
+        self,
+        inputs: list[Any],
+        async_embed_func: Callable[[list[Any]], Coroutine[Any, Any, list[list[float]]]],
+        max_attempts: int,
+    ) -> list[list[float]]:
         embed_call_uuid = uuid4()
 
         start_time = time.monotonic()
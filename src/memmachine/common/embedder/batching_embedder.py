@@ -0,0 +1,208 @@
+"""
+Embedder that coalesces concurrent calls to another embedder into batches.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import BaseModel, Field, InstanceOf
+
+from memmachine.common.data_types import ExternalServiceAPIError
+
+from .data_types import SimilarityMetric
+from .embedder import Embedder
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingEmbedderParams(BaseModel):
+    """
+    Parameters for BatchingEmbedder.
+
+    Attributes:
+        embedder (Embedder):
+            Embedder to generate embeddings for batches of inputs.
+        max_batch_size (int):
+            Number of inputs at which a batch is embedded
+            without waiting any longer
+            (default: 128).
+        max_wait_seconds (float):
+            Maximum time in seconds to wait for more inputs
+            before embedding a batch
+            (default: 0.005).
+    """
+
+    embedder: InstanceOf[Embedder] = Field(
+        ..., description="Embedder to generate embeddings for batches of inputs"
+    )
+    max_batch_size: int = Field(
+        128,
+        description="Number of inputs at which a batch is embedded without waiting",
+        gt=0,
+    )
+    max_wait_seconds: float = Field(
+        0.005,
+        description="Maximum time in seconds to wait for more inputs",
+        ge=0,
+    )
+
+
+@dataclass
+class _PendingBatch:
+    # Inputs of each call in the batch,
+    # with the future to resolve with their embeddings.
+    calls: list[tuple[list[Any], asyncio.Future[list[list[float]]]]] = field(
+        default_factory=list
+    )
+    size: int = 0
+    flush_handle: asyncio.TimerHandle | None = None
+
+
+class BatchingEmbedder(Embedder):
+    """
+    Embedder that collects the inputs of concurrent calls
+    for up to a maximum wait time or batch size,
+    embeds them in a single call to another embedder,
+    and fans the embeddings back out to the callers.
+    """
+
+    def __init__(self, params: BatchingEmbedderParams):
+        """
+        Initialize a BatchingEmbedder with the provided parameters.
+
+        Args:
+            params (BatchingEmbedderParams):
+                Parameters for the BatchingEmbedder.
+        """
+        super().__init__()
+
+        self._embedder = params.embedder
+        self._max_batch_size = params.max_batch_size
+        self._max_wait_seconds = params.max_wait_seconds
+
+        # Calls are only batched with calls
+        # of the same purpose and max attempts.
+        self._pending_batches: dict[tuple[str, int], _PendingBatch] = {}
+
+        # Keep references to running batches
+        # so that they are not garbage collected.
+        self._batch_tasks: set[asyncio.Task] = set()
+
+    async def ingest_embed(
+        self,
+        inputs: list[Any],
+        max_attempts: int = 1,
+    ) -> list[list[float]]:
+        return await self._batched_embed("ingest", inputs, max_attempts)
+
+    async def search_embed(
+        self,
+        queries: list[Any],
+        max_attempts: int = 1,
+    ) -> list[list[float]]:
+        return await self._batched_embed("search", queries, max_attempts)
+
+    async def _batched_embed(
+        self,
+        purpose: str,
+        inputs: list[Any],
+        max_attempts: int,
+    ) -> list[list[float]]:
+        if not inputs:
+            return []
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be a positive integer")
+
+        batch_key = (purpose, max_attempts)
+        pending_batch = self._pending_batches.setdefault(batch_key, _PendingBatch())
+
+        future: asyncio.Future[list[list[float]]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        pending_batch.calls.append((inputs, future))
+        pending_batch.size += len(inputs)
+
+        if pending_batch.size >= self._max_batch_size:
+            self._flush(batch_key)
+        elif pending_batch.flush_handle is None:
+            pending_batch.flush_handle = asyncio.get_running_loop().call_later(
+                self._max_wait_seconds, self._flush, batch_key
+            )
+
+        return await future
+
+    def _flush(self, batch_key: tuple[str, int]):
+        """
+        Start embedding the pending batch for the key.
+        """
+        pending_batch = self._pending_batches.pop(batch_key, None)
+        if pending_batch is None:
+            return
+
+        if pending_batch.flush_handle is not None:
+            pending_batch.flush_handle.cancel()
+
+        batch_task = asyncio.create_task(self._embed_batch(batch_key, pending_batch))
+        self._batch_tasks.add(batch_task)
+        batch_task.add_done_callback(self._batch_tasks.discard)
+
+    async def _embed_batch(
+        self,
+        batch_key: tuple[str, int],
+        pending_batch: _PendingBatch,
+    ):
+        purpose, max_attempts = batch_key
+        embed = (
+            self._embedder.ingest_embed
+            if purpose == "ingest"
+            else self._embedder.search_embed
+        )
+
+        logger.debug(
+            "Embedding batch of %d inputs from %d calls",
+            pending_batch.size,
+            len(pending_batch.calls),
+        )
+
+        try:
+            embeddings = await embed(
+                [input for inputs, _ in pending_batch.calls for input in inputs],
+                max_attempts,
+            )
+            if len(embeddings) != pending_batch.size:
+                raise ExternalServiceAPIError(
+                    f"Received {len(embeddings)} embeddings "
+                    f"for a batch of {pending_batch.size} inputs"
+                )
+        except asyncio.CancelledError:
+            for _, future in pending_batch.calls:
+                future.cancel()
+            raise
+        except BaseException as e:
+            for _, future in pending_batch.calls:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        start = 0
+        for inputs, future in pending_batch.calls:
+            end = start + len(inputs)
+            if not future.done():
+                future.set_result(embeddings[start:end])
+            start = end
+
+    @property
+    def model_id(self) -> str:
+        return self._embedder.model_id
+
+    @property
+    def dimensions(self) -> int:
+        return self._embedder.dimensions
+
+    @property
+    def similarity_metric(self) -> SimilarityMetric:
+        return self._embedder.similarity_metric
@@ -0,0 +1,384 @@
+"""
+Embedder that caches embeddings generated by another embedder.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from pydantic import BaseModel, Field, InstanceOf
+
+from memmachine.common.metrics_factory.metrics_factory import MetricsFactory
+
+from .data_types import SimilarityMetric
+from .embedder import Embedder
+
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbedderParams(BaseModel):
+    """
+    Parameters for CachedEmbedder.
+
+    Attributes:
+        embedder (Embedder):
+            Embedder to generate embeddings that are not cached.
+        max_size (int):
+            Maximum number of embeddings to cache in process
+            (default: 10000).
+        ttl_seconds (float | None):
+            Time in seconds after which cached embeddings expire.
+            If None, cached embeddings do not expire
+            (default: None).
+        sqlite_path (str | None):
+            Path of a SQLite database to share cached embeddings
+            between processes and restarts, behind the in-process cache.
+            If None, embeddings are only cached in process
+            (default: None).
+        metrics_factory (MetricsFactory | None):
+            An instance of MetricsFactory
+            for collecting cache hit and miss metrics
+            (default: None).
+        user_metrics_labels (dict[str, str]):
+            Labels to attach to the collected metrics
+            (default: {}).
+    """
+
+    embedder: InstanceOf[Embedder] = Field(
+        ..., description="Embedder to generate embeddings that are not cached"
+    )
+    max_size: int = Field(
+        10000,
+        description="Maximum number of embeddings to cache in process",
+        gt=0,
+    )
+    ttl_seconds: float | None = Field(
+        None,
+        description="Time in seconds after which cached embeddings expire",
+        gt=0,
+    )
+    sqlite_path: str | None = Field(
+        None,
+        description="Path of a SQLite database to share cached embeddings",
+    )
+    metrics_factory: InstanceOf[MetricsFactory] | None = Field(
+        None,
+        description="An instance of MetricsFactory for collecting cache metrics",
+    )
+    user_metrics_labels: dict[str, str] = Field(
+        default_factory=dict,
+        description="Labels to attach to the collected metrics",
+    )
+
+
+class CachedEmbedder(Embedder):
+    """
+    Embedder that caches embeddings generated by another embedder,
+    keyed by a hash of the model identifier, dimensionality,
+    embedding purpose (ingest or search), and input.
+    """
+
+    def __init__(self, params: CachedEmbedderParams):
+        """
+        Initialize a CachedEmbedder with the provided parameters.
+
+        Args:
+            params (CachedEmbedderParams):
+                Parameters for the CachedEmbedder.
+        """
+        super().__init__()
+
+        self._embedder = params.embedder
+        self._max_size = params.max_size
+        self._ttl_seconds = params.ttl_seconds
+
+        # Least recently used entries first.
+        # Each entry maps a key to its expiry time and embedding.
+        self._cache: OrderedDict[str, tuple[float | None, list[float]]] = OrderedDict()
+
+        # Futures of embeddings being generated, by key,
+        # so that concurrent misses wait for a single call to the embedder.
+        self._in_flight: dict[str, asyncio.Future[list[float]]] = {}
+
+        self._sqlite_lock = threading.Lock()
+        self._sqlite_connection: sqlite3.Connection | None = None
+        if params.sqlite_path is not None:
+            sqlite_directory = os.path.dirname(params.sqlite_path)
+            if sqlite_directory:
+                os.makedirs(sqlite_directory, exist_ok=True)
+
+            self._sqlite_connection = sqlite3.connect(
+                params.sqlite_path,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self._sqlite_connection.execute("PRAGMA journal_mode=WAL")
+            self._sqlite_connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (\n"
+                "    key TEXT PRIMARY KEY,\n"
+                "    embedding BLOB NOT NULL,\n"
+                "    expires_at REAL\n"
+                ")"
+            )
+            self._sqlite_connection.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_expires_at\n"
+                "ON embeddings (expires_at)"
+            )
+
+        metrics_factory = params.metrics_factory
+
+        self._collect_metrics = False
+        if metrics_factory is not None:
+            self._collect_metrics = True
+            self._user_metrics_labels = params.user_metrics_labels
+            label_names = self._user_metrics_labels.keys()
+
+            self._hits_counter = metrics_factory.get_counter(
+                "embedder_cache_hits",
+                "Number of inputs with embeddings found in the embedder cache",
+                label_names=label_names,
+            )
+            self._misses_counter = metrics_factory.get_counter(
+                "embedder_cache_misses",
+                "Number of inputs with embeddings not found in the embedder cache",
+                label_names=label_names,
+            )
+
+    async def ingest_embed(
+        self,
+        inputs: list[Any],
+        max_attempts: int = 1,
+    ) -> list[list[float]]:
+        return await self._cached_embed(
+            "ingest", inputs, self._embedder.ingest_embed, max_attempts
+        )
+
+    async def search_embed(
+        self,
+        queries: list[Any],
+        max_attempts: int = 1,
+    ) -> list[list[float]]:
+        return await self._cached_embed(
+            "search", queries, self._embedder.search_embed, max_attempts
+        )
+
+    async def _cached_embed(
+        self,
+        purpose: str,
+        inputs: list[Any],
+        embed: Callable[[list[Any], int], Awaitable[list[list[float]]]],
+        max_attempts: int,
+    ) -> list[list[float]]:
+        if not inputs:
+            return []
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be a positive integer")
+
+        keys = [self._cache_key(purpose, input) for input in inputs]
+
+        # Identical inputs are looked up and embedded once.
+        key_inputs = dict(zip(keys, inputs))
+
+        embeddings: dict[str, list[float]] = {}
+        for key in key_inputs:
+            embedding = self._get_cached(key)
+            if embedding is not None:
+                embeddings[key] = embedding
+
+        missing_keys = [key for key in key_inputs if key not in embeddings]
+
+        # Inputs already being embedded by concurrent calls are awaited.
+        in_flight_futures = {
+            key: self._in_flight[key] for key in missing_keys if key in self._in_flight
+        }
+        missing_keys = [key for key in missing_keys if key not in in_flight_futures]
+
+        loop = asyncio.get_running_loop()
+        futures = {key: loop.create_future() for key in missing_keys}
+        self._in_flight.update(futures)
+        try:
+            await self._embed_missing(
+                keys, key_inputs, missing_keys, embeddings, embed, max_attempts
+            )
+        except asyncio.CancelledError:
+            for future in futures.values():
+                future.cancel()
+            raise
+        except BaseException as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark the exception as retrieved if no call awaits it.
+                    future.exception()
+            raise
+        finally:
+            for key in missing_keys:
+                del self._in_flight[key]
+
+        for key in missing_keys:
+            futures[key].set_result(embeddings[key])
+
+        retry_keys = []
+        for key, future in in_flight_futures.items():
+            try:
+                # Shield the future so that cancelling this call
+                # does not cancel the call generating the embedding.
+                embeddings[key] = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The call generating the embedding was cancelled.
+                retry_keys.append(key)
+
+        if len(retry_keys) > 0:
+            retry_embeddings = await self._cached_embed(
+                purpose,
+                [key_inputs[key] for key in retry_keys],
+                embed,
+                max_attempts,
+            )
+            embeddings.update(zip(retry_keys, retry_embeddings))
+
+        # Copy so that callers cannot modify cached embeddings.
+        return [list(embeddings[key]) for key in keys]
+
+    async def _embed_missing(
+        self,
+        keys: list[str],
+        key_inputs: dict[str, Any],
+        missing_keys: list[str],
+        embeddings: dict[str, list[float]],
+        embed: Callable[[list[Any], int], Awaitable[list[list[float]]]],
+        max_attempts: int,
+    ):
+        if self._sqlite_connection is not None and len(missing_keys) > 0:
+            shared_embeddings = await asyncio.to_thread(self._get_shared, missing_keys)
+            for key, (expires_at, embedding) in shared_embeddings.items():
+                self._put_cached(key, expires_at, embedding)
+                embeddings[key] = embedding
+
+        missing_keys = [key for key in missing_keys if key not in embeddings]
+
+        if self._collect_metrics:
+            missing_key_set = set(missing_keys)
+            miss_count = sum(1 for key in keys if key in missing_key_set)
+            self._hits_counter.increment(
+                value=len(keys) - miss_count,
+                labels=self._user_metrics_labels,
+            )
+            self._misses_counter.increment(
+                value=miss_count,
+                labels=self._user_metrics_labels,
+            )
+
+        if len(missing_keys) > 0:
+            missing_embeddings = await embed(
+                [key_inputs[key] for key in missing_keys], max_attempts
+            )
+
+            expires_at = (
+                time.time() + self._ttl_seconds
+                if self._ttl_seconds is not None
+                else None
+            )
+            for key, embedding in zip(missing_keys, missing_embeddings, strict=True):
+                self._put_cached(key, expires_at, embedding)
+                embeddings[key] = embedding
+
+            if self._sqlite_connection is not None:
+                await asyncio.to_thread(
+                    self._put_shared,
+                    {key: embeddings[key] for key in missing_keys},
+                    expires_at,
+                )
+
+    def _cache_key(self, purpose: str, input: Any) -> str:
+        return hashlib.sha256(
+            repr(
+                (self._embedder.model_id, self._embedder.dimensions, purpose, input)
+            ).encode()
+        ).hexdigest()
+
+    def _get_cached(self, key: str) -> list[float] | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, embedding = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        return embedding
+
+    def _put_cached(self, key: str, expires_at: float | None, embedding: list[float]):
+        self._cache[key] = (expires_at, embedding)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
+    def _get_shared(
+        self, keys: list[str]
+    ) -> dict[str, tuple[float | None, list[float]]]:
+        assert self._sqlite_connection is not None
+
+        shared_embeddings: dict[str, tuple[float | None, list[float]]] = {}
+        with self._sqlite_lock:
+            # Stay well below the SQLite limit on the number of query parameters.
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                for key, embedding, expires_at in self._sqlite_connection.execute(
+                    "SELECT key, embedding, expires_at FROM embeddings\n"
+                    f"WHERE key IN ({', '.join('?' * len(chunk))})\n"
+                    "AND (expires_at IS NULL OR expires_at > ?)",
+                    [*chunk, time.time()],
+                ):
+                    shared_embeddings[key] = (
+                        expires_at,
+                        array("d", embedding).tolist(),
+                    )
+
+        return shared_embeddings
+
+    def _put_shared(self, embeddings: dict[str, list[float]], expires_at: float | None):
+        assert self._sqlite_connection is not None
+
+        with self._sqlite_lock:
+            self._sqlite_connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._sqlite_connection.execute(
+                    "DELETE FROM embeddings WHERE expires_at <= ?", (time.time(),)
+                )
+                self._sqlite_connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, embedding, expires_at)\n"
+                    "VALUES (?, ?, ?)",
+                    [
+                        (key, array("d", embedding).tobytes(), expires_at)
+                        for key, embedding in embeddings.items()
+                    ],
+                )
+                self._sqlite_connection.execute("COMMIT")
+            except BaseException:
+                self._sqlite_connection.execute("ROLLBACK")
+                raise
+
+    @property
+    def model_id(self) -> str:
+        return self._embedder.model_id
+
+    @property
+    def dimensions(self) -> int:
+        return self._embedder.dimensions
+
+    @property
+    def similarity_metric(self) -> SimilarityMetric:
+        return self._embedder.similarity_metric
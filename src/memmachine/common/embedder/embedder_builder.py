@@ -6,6 +6,7 @@ from typing import Any
 
 from memmachine.common.builder import Builder
 from memmachine.common.metrics_factory.metrics_factory import MetricsFactory
+from memmachine.common.utils import get_openai_http_client
 
 from .data_types import SimilarityMetric
 from .embedder import Embedder
@@ -28,6 +29,12 @@ class EmbedderBuilder(Builder):
             case "openai":
                 if "metrics_factory_id" in config:
                     dependency_ids.add(config["metrics_factory_id"])
+            case "batching":
+                dependency_ids.add(config["embedder_id"])
+            case "cached":
+                dependency_ids.add(config["embedder_id"])
+                if "metrics_factory_id" in config:
+                    dependency_ids.add(config["metrics_factory_id"])
 
         return dependency_ids
 
@@ -61,7 +68,8 @@ class EmbedderBuilder(Builder):
                         retries={
                             "total_max_attempts": 1,
                             "mode": "standard",
-                        }
+                        },
+                        max_pool_connections=config.get("max_connections", 10),
                     ),
                 )
 
@@ -75,6 +83,38 @@ class EmbedderBuilder(Builder):
                         max_retry_interval_seconds=config.get(
                             "max_retry_interval_seconds", 120
                         ),
+                        max_inputs_per_request=config.get("max_inputs_per_request", 96),
+                        max_concurrent_requests=config.get(
+                            "max_concurrent_requests", 8
+                        ),
+                    )
+                )
+            case "batching":
+                from .batching_embedder import (
+                    BatchingEmbedder,
+                    BatchingEmbedderParams,
+                )
+
+                return BatchingEmbedder(
+                    BatchingEmbedderParams(
+                        embedder=EmbedderBuilder._get_embedder(config, injections),
+                        max_batch_size=config.get("max_batch_size", 128),
+                        max_wait_seconds=config.get("max_wait_seconds", 0.005),
+                    )
+                )
+            case "cached":
+                from .cached_embedder import CachedEmbedder, CachedEmbedderParams
+
+                return CachedEmbedder(
+                    CachedEmbedderParams(
+                        embedder=EmbedderBuilder._get_embedder(config, injections),
+                        max_size=config.get("max_size", 10000),
+                        ttl_seconds=config.get("ttl_seconds"),
+                        sqlite_path=config.get("sqlite_path"),
+                        metrics_factory=EmbedderBuilder._get_metrics_factory(
+                            config, injections
+                        ),
+                        user_metrics_labels=config.get("user_metrics_labels", {}),
                     )
                 )
             case "openai":
@@ -82,39 +122,31 @@ class EmbedderBuilder(Builder):
 
                 from .openai_embedder import OpenAIEmbedder, OpenAIEmbedderParams
 
-                injected_metrics_factory_id = config.get("metrics_factory_id")
-                if injected_metrics_factory_id is None:
-                    injected_metrics_factory = None
-                elif not isinstance(injected_metrics_factory_id, str):
-                    raise TypeError("metrics_factory_id must be a string if provided")
-                else:
-                    injected_metrics_factory = injections.get(
-                        injected_metrics_factory_id
-                    )
-                    if injected_metrics_factory is None:
-                        raise ValueError(
-                            "MetricsFactory with id "
-                            f"{injected_metrics_factory_id} "
-                            "not found in injections"
-                        )
-                    elif not isinstance(injected_metrics_factory, MetricsFactory):
-                        raise TypeError(
-                            "Injected dependency with id "
-                            f"{injected_metrics_factory_id} "
-                            "is not a MetricsFactory"
-                        )
+                injected_metrics_factory = EmbedderBuilder._get_metrics_factory(
+                    config, injections
+                )
 
                 return OpenAIEmbedder(
                     OpenAIEmbedderParams(
                         client=openai.AsyncOpenAI(
                             api_key=config["api_key"],
                             base_url=config.get("base_url"),
+                            http_client=get_openai_http_client(config),
                         ),
                         model=config.get("model", "text-embedding-3-small"),
                         dimensions=config.get("dimensions", 1536),
                         max_retry_interval_seconds=config.get(
                             "max_retry_interval_seconds", 120
                         ),
+                        max_inputs_per_request=config.get(
+                            "max_inputs_per_request", 2048
+                        ),
+                        max_tokens_per_request=config.get(
+                            "max_tokens_per_request", 300000
+                        ),
+                        max_concurrent_requests=config.get(
+                            "max_concurrent_requests", 8
+                        ),
                         metrics_factory=injected_metrics_factory,
                         user_metrics_labels=config.get("user_metrics_labels", {}),
                     )
@@ -149,3 +181,50 @@ class EmbedderBuilder(Builder):
                 )
             case _:
                 raise ValueError(f"Unknown Embedder name: {name}")
+
+    @staticmethod
+    def _get_embedder(config: dict[str, Any], injections: dict[str, Any]) -> Embedder:
+        """
+        Get the Embedder injected for the configured embedder_id.
+        """
+        embedder = injections.get(config["embedder_id"])
+        if embedder is None:
+            raise ValueError(
+                f"Embedder with id {config['embedder_id']} not found in injections"
+            )
+        elif not isinstance(embedder, Embedder):
+            raise TypeError(
+                f"Injected dependency with id {config['embedder_id']} "
+                "is not an Embedder"
+            )
+
+        return embedder
+
+    @staticmethod
+    def _get_metrics_factory(
+        config: dict[str, Any], injections: dict[str, Any]
+    ) -> MetricsFactory | None:
+        """
+        Get the MetricsFactory injected for the configured metrics_factory_id.
+        """
+        injected_metrics_factory_id = config.get("metrics_factory_id")
+        if injected_metrics_factory_id is None:
+            injected_metrics_factory = None
+        elif not isinstance(injected_metrics_factory_id, str):
+            raise TypeError("metrics_factory_id must be a string if provided")
+        else:
+            injected_metrics_factory = injections.get(injected_metrics_factory_id)
+            if injected_metrics_factory is None:
+                raise ValueError(
+                    "MetricsFactory with id "
+                    f"{injected_metrics_factory_id} "
+                    "not found in injections"
+                )
+            elif not isinstance(injected_metrics_factory, MetricsFactory):
+                raise TypeError(
+                    "Injected dependency with id "
+                    f"{injected_metrics_factory_id} "
+                    "is not a MetricsFactory"
+                )
+
+        return injected_metrics_factory
@@ -13,6 +13,7 @@ from pydantic import BaseModel, Field, InstanceOf
 
 from memmachine.common.data_types import ExternalServiceAPIError
 from memmachine.common.metrics_factory.metrics_factory import MetricsFactory
+from memmachine.common.utils import async_with
 
 from .data_types import SimilarityMetric
 from .embedder import Embedder
@@ -36,6 +37,16 @@ class OpenAIEmbedderParams(BaseModel):
         max_retry_interval_seconds (int):
             Maximal retry interval in seconds when retrying API calls
             (default: 120).
+        max_inputs_per_request (int):
+            Maximum number of inputs to embed in a single API call
+            (default: 2048).
+        max_tokens_per_request (int):
+            Maximum estimated number of tokens
+            to embed in a single API call
+            (default: 300000).
+        max_concurrent_requests (int):
+            Maximum number of concurrent API calls
+            (default: 8).
         metrics_factory (MetricsFactory | None):
             An instance of MetricsFactory
             for collecting usage metrics
@@ -68,6 +79,21 @@ class OpenAIEmbedderParams(BaseModel):
         description="Maximal retry interval in seconds when retrying API calls",
         gt=0,
     )
+    max_inputs_per_request: int = Field(
+        2048,
+        description="Maximum number of inputs to embed in a single API call",
+        gt=0,
+    )
+    max_tokens_per_request: int = Field(
+        300000,
+        description="Maximum estimated number of tokens to embed in a single API call",
+        gt=0,
+    )
+    max_concurrent_requests: int = Field(
+        8,
+        description="Maximum number of concurrent API calls",
+        gt=0,
+    )
     metrics_factory: InstanceOf[MetricsFactory] | None = Field(
         None,
         description="An instance of MetricsFactory for collecting usage metrics",
@@ -104,6 +130,10 @@ class OpenAIEmbedder(Embedder):
 
         self._max_retry_interval_seconds = params.max_retry_interval_seconds
 
+        self._max_inputs_per_request = params.max_inputs_per_request
+        self._max_tokens_per_request = params.max_tokens_per_request
+        self._semaphore = asyncio.Semaphore(params.max_concurrent_requests)
+
         metrics_factory = params.metrics_factory
 
         self._collect_metrics = False
@@ -154,6 +184,55 @@ class OpenAIEmbedder(Embedder):
 
         inputs = [input.replace("\n", " ") if input else "\n" for input in inputs]
 
+        # Split inputs into chunks within the API limits
+        # and embed the chunks concurrently.
+        embed_chunk_tasks = [
+            async_with(self._semaphore, self._embed_chunk(chunk, max_attempts))
+            for chunk in self._chunk_inputs(inputs)
+        ]
+
+        return [
+            embedding
+            for chunk_embeddings in await asyncio.gather(*embed_chunk_tasks)
+            for embedding in chunk_embeddings
+        ]
+
+    def _chunk_inputs(self, inputs: list[str]) -> list[list[str]]:
+        """
+        Split inputs into chunks
+        within the limits on inputs and estimated tokens per API call.
+        """
+        chunks: list[list[str]] = []
+        chunk: list[str] = []
+        chunk_tokens = 0
+        for input in inputs:
+            input_tokens = OpenAIEmbedder._estimate_tokens(input)
+            if chunk and (
+                len(chunk) >= self._max_inputs_per_request
+                or chunk_tokens + input_tokens > self._max_tokens_per_request
+            ):
+                chunks.append(chunk)
+                chunk = []
+                chunk_tokens = 0
+
+            chunk.append(input)
+            chunk_tokens += input_tokens
+
+        if chunk:
+            chunks.append(chunk)
+
+        return chunks
+
+    @staticmethod
+    def _estimate_tokens(input: str) -> int:
+        # Typical English text averages about 4 characters per token.
+        return len(input) // 4 + 1
+
+    async def _embed_chunk(
+        self,
+        inputs: list[str],
+        max_attempts: int,
+    ) -> list[list[float]]:
         embed_call_uuid = uuid4()
 
         start_time = time.monotonic()
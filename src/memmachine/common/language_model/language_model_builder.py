@@ -6,6 +6,7 @@ from typing import Any
 
 from memmachine.common.builder import Builder
 from memmachine.common.metrics_factory.metrics_factory import MetricsFactory
+from memmachine.common.utils import get_openai_http_client
 
 from .language_model import LanguageModel
 
@@ -20,7 +21,7 @@ class LanguageModelBuilder(Builder):
         dependency_ids = set()
 
         match name:
-            case "openai":
+            case "openai" | "vllm" | "sglang" | "openai-compatible" | "amazon-bedrock":
                 if "metrics_factory_id" in config:
                     dependency_ids.add(config["metrics_factory_id"])
 
@@ -67,6 +68,7 @@ class LanguageModelBuilder(Builder):
                             api_key=config["api_key"],
                             base_url=config.get("base_url"),
                             max_retries=0,
+                            http_client=get_openai_http_client(config),
                         ),
                         model=config["model"],
                         max_retry_interval_seconds=config.get(
@@ -91,6 +93,7 @@ class LanguageModelBuilder(Builder):
                             api_key=config["api_key"],
                             base_url=config.get("base_url"),
                             max_retries=0,
+                            http_client=get_openai_http_client(config),
                         ),
                         model=config["model"],
                         max_retry_interval_seconds=config.get(
@@ -123,7 +126,8 @@ class LanguageModelBuilder(Builder):
                         retries={
                             "total_max_attempts": 1,
                             "mode": "standard",
-                        }
+                        },
+                        max_pool_connections=config.get("max_connections", 10),
                     ),
                 )
 
@@ -4,8 +4,8 @@ Common utility functions.
 
 import asyncio
 import functools
-from collections.abc import Awaitable
-from contextlib import AbstractAsyncContextManager
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from typing import Any
 
 
@@ -30,6 +30,42 @@ async def async_with(
         return await awaitable
 
 
+def get_openai_http_client(config: dict[str, Any]):
+    """
+    Get an HTTP client for an OpenAI client
+    with the connection pool limits in a configuration.
+
+    Args:
+        config (dict[str, Any]):
+            Configuration optionally containing
+            the maximum number of connections ("max_connections")
+            and of idle connections kept alive ("max_keepalive_connections").
+
+    Returns:
+        openai.DefaultAsyncHttpxClient | None:
+            The HTTP client, or None if no limits are configured,
+            so that the OpenAI client uses its default connection pool.
+    """
+    if "max_connections" not in config and "max_keepalive_connections" not in config:
+        return None
+
+    import httpx
+    import openai
+
+    return openai.DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=config.get(
+                "max_connections",
+                openai.DEFAULT_CONNECTION_LIMITS.max_connections,
+            ),
+            max_keepalive_connections=config.get(
+                "max_keepalive_connections",
+                openai.DEFAULT_CONNECTION_LIMITS.max_keepalive_connections,
+            ),
+        )
+    )
+
+
 def async_locked(func):
     """
     Decorator to ensure that a coroutine function is executed with a lock.
@@ -43,3 +79,59 @@ def async_locked(func):
             return await func(*args, **kwargs)
 
     return wrapper
+
+
+class AsyncReaderWriterLock:
+    """
+    Lock that can be held by any number of readers at once,
+    or by a single writer exclusively.
+    Waiting writers keep new readers from acquiring the lock,
+    so that writers are not starved by a stream of readers.
+    """
+
+    def __init__(self):
+        self._condition = asyncio.Condition()
+        self._reader_count = 0
+        self._waiting_writer_count = 0
+        self._writer_active = False
+
+    @asynccontextmanager
+    async def read_locked(self) -> AsyncIterator[None]:
+        """
+        Hold the lock shared with other readers.
+        """
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: not self._writer_active and self._waiting_writer_count == 0
+            )
+            self._reader_count += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._reader_count -= 1
+                if self._reader_count == 0:
+                    self._condition.notify_all()
+
+    @asynccontextmanager
+    async def write_locked(self) -> AsyncIterator[None]:
+        """
+        Hold the lock exclusively.
+        """
+        async with self._condition:
+            self._waiting_writer_count += 1
+            try:
+                await self._condition.wait_for(
+                    lambda: not self._writer_active and self._reader_count == 0
+                )
+            finally:
+                self._waiting_writer_count -= 1
+                # Readers blocked by a writer that gave up waiting may proceed.
+                self._condition.notify_all()
+            self._writer_active = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writer_active = False
+                self._condition.notify_all()
@@ -1,4 +1,4 @@
-from .data_types import Edge, Node, Property
+from .data_types import Edge, Node, Property, TraversalStep
 from .vector_graph_store import VectorGraphStore
 from .vector_graph_store_builder import VectorGraphStoreBuilder
 
@@ -8,4 +8,5 @@ __all__ = [
     "Edge",
     "Node",
     "Property",
+    "TraversalStep",
 ]
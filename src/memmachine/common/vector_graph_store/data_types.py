@@ -2,6 +2,7 @@
 Data types for nodes and edges in a vector graph store.
 """
 
+from collections.abc import Collection, Mapping
 from dataclasses import dataclass, field
 from datetime import datetime
 from uuid import UUID
@@ -44,6 +45,10 @@ class Edge:
     target_uuid: UUID
     relation: str = "RELATED_TO"
     properties: dict[str, Property] = field(default_factory=dict)
+    # Labels known to be on the source and target nodes.
+    # Not stored, but used by stores to look up the nodes efficiently.
+    source_labels: set[str] = field(default_factory=set)
+    target_labels: set[str] = field(default_factory=set)
 
     def __eq__(self, other):
         if not isinstance(other, Edge):
@@ -52,3 +57,20 @@ class Edge:
 
     def __hash__(self):
         return hash(self.uuid)
+
+
+@dataclass(kw_only=True)
+class TraversalStep:
+    """
+    A single hop from a set of nodes to their related nodes.
+
+    Attributes mirror the arguments of
+    VectorGraphStore.search_related_nodes.
+    """
+
+    allowed_relations: Collection[str] | None = None
+    find_sources: bool = True
+    find_targets: bool = True
+    required_labels: Collection[str] | None = None
+    required_properties: Mapping[str, Property] = field(default_factory=dict)
+    include_missing_properties: bool = False
@@ -0,0 +1,788 @@
+"""
+In-memory vector graph store implementation.
+
+This module provides an in-process implementation
+of a vector graph store using NumPy for similarity search,
+suitable for tests, benchmarks, and small single-node deployments.
+"""
+
+import asyncio
+import logging
+import os
+import pickle
+from collections.abc import Collection, Iterable, Mapping
+from typing import Any, TypeGuard
+from uuid import UUID
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from memmachine.common.embedder import SimilarityMetric
+
+from .data_types import Edge, Node, Property
+from .vector_graph_store import VectorGraphStore
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_VERSION = 1
+
+
+class InMemoryVectorGraphStoreParams(BaseModel):
+    """
+    Parameters for InMemoryVectorGraphStore.
+
+    Attributes:
+        snapshot_path (str | None):
+            Path of the file to load data from on initialization
+            and to save data to on snapshot and on close.
+            Snapshots are pickled,
+            so they must only be loaded from trusted locations.
+            If None, data is not persisted (default: None).
+    """
+
+    snapshot_path: str | None = Field(
+        None, description="Path of the file to persist data to"
+    )
+
+
+class _EmbeddingColumn:
+    """
+    Growable float32 matrix of embeddings,
+    one row per node,
+    for a single label and embedding property.
+    """
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self.uuids: list[UUID] = []
+
+        self._rows: dict[UUID, int] = {}
+        self._matrix = np.empty((16, dimensions), dtype=np.float32)
+        self._norms = np.empty(16, dtype=np.float32)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._matrix[: len(self.uuids)]
+
+    @property
+    def norms(self) -> np.ndarray:
+        return self._norms[: len(self.uuids)]
+
+    def add(self, uuid: UUID, embedding: np.ndarray):
+        row = len(self.uuids)
+        if row == self._matrix.shape[0]:
+            capacity = 2 * row
+            self._matrix = np.resize(self._matrix, (capacity, self.dimensions))
+            self._norms = np.resize(self._norms, capacity)
+
+        self.uuids.append(uuid)
+        self._rows[uuid] = row
+        self._matrix[row] = embedding
+        self._norms[row] = np.linalg.norm(embedding)
+
+    def remove(self, uuid: UUID):
+        row = self._rows.pop(uuid, None)
+        if row is None:
+            return
+
+        # Move the last row into the freed row to keep the matrix dense.
+        last_row = len(self.uuids) - 1
+        if row != last_row:
+            moved_uuid = self.uuids[last_row]
+            self._matrix[row] = self._matrix[last_row]
+            self._norms[row] = self._norms[last_row]
+            self.uuids[row] = moved_uuid
+            self._rows[moved_uuid] = row
+
+        self.uuids.pop()
+
+    def get(self, uuid: UUID) -> np.ndarray:
+        return self._matrix[self._rows[uuid]]
+
+
+class InMemoryVectorGraphStore(VectorGraphStore):
+    """
+    In-process implementation of VectorGraphStore.
+
+    Embedding properties (non-empty lists of floats)
+    are stored in a float32 matrix per label and property name
+    and searched by brute force,
+    so they are returned with float32 precision.
+    Edges are stored in adjacency lists per relation.
+
+    Similarity scores follow Neo4j vector similarity functions:
+    cosine similarity is scaled to [0, 1] as (1 + cos) / 2,
+    and euclidean similarity is 1 / (1 + squared distance).
+    Other similarity metrics fall back to cosine similarity.
+    """
+
+    def __init__(self, params: InMemoryVectorGraphStoreParams):
+        """
+        Initialize an InMemoryVectorGraphStore
+        with the provided parameters.
+
+        Args:
+            params (InMemoryVectorGraphStoreParams):
+                Parameters for the InMemoryVectorGraphStore.
+        """
+        super().__init__()
+
+        self._snapshot_path = params.snapshot_path
+
+        self._reset()
+
+        if self._snapshot_path is not None and os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, "rb") as snapshot_file:
+                self._load_snapshot_state(pickle.load(snapshot_file))
+
+    def _reset(self):
+        # Node properties exclude embedding properties,
+        # which are stored in the embedding columns.
+        self._nodes: dict[UUID, Node] = {}
+        self._node_embedding_property_names: dict[UUID, set[str]] = {}
+        self._label_node_uuids: dict[str, set[UUID]] = {}
+        self._embedding_columns: dict[tuple[str | None, str], _EmbeddingColumn] = {}
+
+        self._edges: dict[UUID, Edge] = {}
+        self._outgoing_edge_uuids: dict[UUID, dict[str, set[UUID]]] = {}
+        self._incoming_edge_uuids: dict[UUID, dict[str, set[UUID]]] = {}
+
+    async def add_nodes(self, nodes: Collection[Node]):
+        self._validate_nodes(nodes)
+
+        for node in nodes:
+            self._add_node(node)
+
+    async def add_edges(self, edges: Collection[Edge]):
+        for edge in edges:
+            self._add_edge(edge)
+
+    async def write_batch(
+        self,
+        nodes: Collection[Node],
+        edges: Collection[Edge],
+    ):
+        # Validate before mutating so that a failed batch writes nothing.
+        self._validate_nodes(nodes)
+
+        for node in nodes:
+            self._add_node(node)
+
+        for edge in edges:
+            self._add_edge(edge)
+
+    async def search_similar_nodes(
+        self,
+        query_embedding: list[float],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric = SimilarityMetric.COSINE,
+        limit: int | None = 100,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        min_score: float | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[Node]:
+        return [
+            node
+            for node, _ in await self.search_similar_nodes_with_scores(
+                query_embedding=query_embedding,
+                embedding_property_name=embedding_property_name,
+                similarity_metric=similarity_metric,
+                limit=limit,
+                required_labels=required_labels,
+                required_properties=required_properties,
+                include_missing_properties=include_missing_properties,
+                min_score=min_score,
+                include_properties=include_properties,
+                exclude_properties=exclude_properties,
+            )
+        ]
+
+    async def search_similar_nodes_with_scores(
+        self,
+        query_embedding: list[float],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric = SimilarityMetric.COSINE,
+        limit: int | None = 100,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        min_score: float | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[tuple[Node, float]]:
+        if limit is not None and limit <= 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+
+        # Nodes with all required labels are in the column of any one of them.
+        if required_labels:
+            column = self._embedding_columns.get(
+                (min(required_labels), embedding_property_name)
+            )
+            columns = [column] if column is not None else []
+        else:
+            columns = [
+                column
+                for (_, property_name), column in self._embedding_columns.items()
+                if property_name == embedding_property_name
+            ]
+
+        columns = [column for column in columns if len(column.uuids) > 0]
+        if len(columns) == 0:
+            return []
+
+        for column in columns:
+            if column.dimensions != query.shape[0]:
+                raise ValueError(
+                    f"Query embedding has {query.shape[0]} dimensions, "
+                    f"but property {embedding_property_name} "
+                    f"has {column.dimensions} dimensions"
+                )
+
+        scores = np.concatenate(
+            [
+                InMemoryVectorGraphStore._similarities(column, query, similarity_metric)
+                for column in columns
+            ]
+        )
+        uuids = [uuid for column in columns for uuid in column.uuids]
+
+        # Without filters or duplicates, only the top rows can be returned.
+        is_unfiltered = (
+            len(columns) == 1
+            and (required_labels is None or len(required_labels) <= 1)
+            and len(required_properties) == 0
+        )
+        if is_unfiltered and limit is not None and limit < len(scores):
+            top_rows = np.argpartition(-scores, limit - 1)[:limit]
+            ordered_rows = top_rows[np.argsort(-scores[top_rows], kind="stable")]
+        else:
+            ordered_rows = np.argsort(-scores, kind="stable")
+
+        similar_nodes: list[tuple[Node, float]] = []
+        seen_uuids: set[UUID] = set()
+        for row in ordered_rows:
+            score = float(scores[row])
+            if min_score is not None and score < min_score:
+                break
+
+            uuid = uuids[row]
+            if uuid in seen_uuids:
+                continue
+            seen_uuids.add(uuid)
+
+            if not self._node_matches(
+                uuid,
+                required_labels,
+                required_properties,
+                include_missing_properties,
+            ):
+                continue
+
+            similar_nodes.append(
+                (
+                    self._output_node(uuid, include_properties, exclude_properties),
+                    score,
+                )
+            )
+            if limit is not None and len(similar_nodes) >= limit:
+                break
+
+        return similar_nodes
+
+    async def search_related_nodes(
+        self,
+        node_uuid: UUID,
+        allowed_relations: Collection[str] | None = None,
+        find_sources: bool = True,
+        find_targets: bool = True,
+        limit: int | None = None,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        node_labels: Collection[str] | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[Node]:
+        if not (find_sources or find_targets):
+            return []
+
+        node = self._nodes.get(node_uuid)
+        if node is None or not set(node_labels or ()) <= node.labels:
+            return []
+
+        edge_uuids: list[UUID] = []
+        if find_targets:
+            edge_uuids += InMemoryVectorGraphStore._relation_edge_uuids(
+                self._outgoing_edge_uuids.get(node_uuid, {}), allowed_relations
+            )
+        if find_sources:
+            edge_uuids += InMemoryVectorGraphStore._relation_edge_uuids(
+                self._incoming_edge_uuids.get(node_uuid, {}), allowed_relations
+            )
+
+        related_node_uuids: dict[UUID, None] = {}
+        for edge_uuid in edge_uuids:
+            edge = self._edges[edge_uuid]
+            related_node_uuids[
+                edge.target_uuid if edge.source_uuid == node_uuid else edge.source_uuid
+            ] = None
+
+        return self._output_matching_nodes(
+            related_node_uuids,
+            limit,
+            required_labels,
+            required_properties,
+            include_missing_properties,
+            include_properties,
+            exclude_properties,
+        )
+
+    async def search_directional_nodes(
+        self,
+        by_property: str,
+        start_at_value: Any | None = None,
+        include_equal_start_at_value: bool = False,
+        order_ascending: bool = True,
+        limit: int | None = 1,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[Node]:
+        keyed_node_uuids: list[tuple[Any, UUID]] = []
+        for uuid in self._candidate_node_uuids(required_labels):
+            value = self._nodes[uuid].properties.get(by_property)
+            if value is None:
+                continue
+
+            if start_at_value is not None:
+                try:
+                    if order_ascending:
+                        is_in_range = value > start_at_value or (
+                            include_equal_start_at_value and value == start_at_value
+                        )
+                    else:
+                        is_in_range = value < start_at_value or (
+                            include_equal_start_at_value and value == start_at_value
+                        )
+                except TypeError:
+                    # Incomparable values never match, as in Cypher.
+                    is_in_range = False
+
+                if not is_in_range:
+                    continue
+
+            if not self._node_matches(
+                uuid,
+                required_labels,
+                required_properties,
+                include_missing_properties,
+            ):
+                continue
+
+            keyed_node_uuids.append((value, uuid))
+
+        keyed_node_uuids.sort(key=lambda item: item[0], reverse=not order_ascending)
+
+        return [
+            self._output_node(uuid, include_properties, exclude_properties)
+            for _, uuid in keyed_node_uuids[:limit]
+        ]
+
+    async def search_matching_nodes(
+        self,
+        limit: int | None = None,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[Node]:
+        return self._output_matching_nodes(
+            self._candidate_node_uuids(required_labels),
+            limit,
+            required_labels,
+            required_properties,
+            include_missing_properties,
+            include_properties,
+            exclude_properties,
+        )
+
+    async def delete_nodes(
+        self,
+        node_uuids: Collection[UUID],
+        required_labels: Collection[str] | None = None,
+    ):
+        for node_uuid in node_uuids:
+            node = self._nodes.get(node_uuid)
+            if node is None or not set(required_labels or ()) <= node.labels:
+                continue
+
+            for relation_edge_uuids in (
+                self._outgoing_edge_uuids.get(node_uuid, {}),
+                self._incoming_edge_uuids.get(node_uuid, {}),
+            ):
+                for edge_uuids in list(relation_edge_uuids.values()):
+                    for edge_uuid in list(edge_uuids):
+                        self._remove_edge(edge_uuid)
+
+            for label in node.labels:
+                self._label_node_uuids[label].discard(node_uuid)
+                if len(self._label_node_uuids[label]) == 0:
+                    del self._label_node_uuids[label]
+
+            for property_name in self._node_embedding_property_names.pop(node_uuid):
+                for column_key in InMemoryVectorGraphStore._column_keys(
+                    node.labels, property_name
+                ):
+                    self._embedding_columns[column_key].remove(node_uuid)
+
+            del self._nodes[node_uuid]
+
+    async def clear_data(self):
+        self._reset()
+
+    async def snapshot(self):
+        """
+        Save all data to the snapshot path.
+
+        Raises:
+            ValueError:
+                If no snapshot path is configured.
+        """
+        if self._snapshot_path is None:
+            raise ValueError("No snapshot path is configured")
+
+        # Serialize on the event loop for a consistent view of the data,
+        # but write to disk off the event loop.
+        snapshot_bytes = pickle.dumps(
+            self._snapshot_state(), protocol=pickle.HIGHEST_PROTOCOL
+        )
+        await asyncio.to_thread(
+            InMemoryVectorGraphStore._write_snapshot,
+            self._snapshot_path,
+            snapshot_bytes,
+        )
+
+    async def close(self):
+        if self._snapshot_path is not None:
+            await self.snapshot()
+
+    def _validate_nodes(self, nodes: Iterable[Node]):
+        """
+        Validate that nodes can be added to the store.
+
+        Args:
+            nodes (Iterable[Node]):
+                Nodes to validate.
+
+        Raises:
+            ValueError:
+                If a node UUID already exists,
+                or if an embedding does not match
+                the dimensions of its embedding column.
+        """
+        node_uuids: set[UUID] = set()
+        column_dimensions: dict[tuple[str | None, str], int] = {}
+
+        for node in nodes:
+            if node.uuid in self._nodes or node.uuid in node_uuids:
+                raise ValueError(f"Node with UUID {node.uuid} already exists")
+            node_uuids.add(node.uuid)
+
+            for property_name, value in node.properties.items():
+                if not InMemoryVectorGraphStore._is_embedding(value):
+                    continue
+
+                for column_key in InMemoryVectorGraphStore._column_keys(
+                    node.labels, property_name
+                ):
+                    column = self._embedding_columns.get(column_key)
+                    dimensions = column_dimensions.setdefault(
+                        column_key,
+                        column.dimensions if column is not None else len(value),
+                    )
+                    if len(value) != dimensions:
+                        raise ValueError(
+                            f"Embedding property {property_name} "
+                            f"of node {node.uuid} has {len(value)} dimensions, "
+                            f"but expected {dimensions} dimensions"
+                        )
+
+    def _add_node(self, node: Node):
+        properties: dict[str, Property] = {}
+        embedding_property_names: set[str] = set()
+
+        for property_name, value in node.properties.items():
+            if not InMemoryVectorGraphStore._is_embedding(value):
+                properties[property_name] = value
+                continue
+
+            embedding_property_names.add(property_name)
+            embedding = np.asarray(value, dtype=np.float32)
+            for column_key in InMemoryVectorGraphStore._column_keys(
+                node.labels, property_name
+            ):
+                column = self._embedding_columns.get(column_key)
+                if column is None:
+                    column = _EmbeddingColumn(len(embedding))
+                    self._embedding_columns[column_key] = column
+                column.add(node.uuid, embedding)
+
+        self._nodes[node.uuid] = Node(
+            uuid=node.uuid,
+            labels=set(node.labels),
+            properties=properties,
+        )
+        self._node_embedding_property_names[node.uuid] = embedding_property_names
+
+        for label in node.labels:
+            self._label_node_uuids.setdefault(label, set()).add(node.uuid)
+
+    def _add_edge(self, edge: Edge):
+        source_node = self._nodes.get(edge.source_uuid)
+        target_node = self._nodes.get(edge.target_uuid)
+
+        # Edges between missing nodes are ignored, as in Neo4j.
+        if (
+            source_node is None
+            or target_node is None
+            or not edge.source_labels <= source_node.labels
+            or not edge.target_labels <= target_node.labels
+        ):
+            return
+
+        self._edges[edge.uuid] = Edge(
+            uuid=edge.uuid,
+            source_uuid=edge.source_uuid,
+            target_uuid=edge.target_uuid,
+            relation=edge.relation,
+            properties=dict(edge.properties),
+        )
+        self._outgoing_edge_uuids.setdefault(edge.source_uuid, {}).setdefault(
+            edge.relation, set()
+        ).add(edge.uuid)
+        self._incoming_edge_uuids.setdefault(edge.target_uuid, {}).setdefault(
+            edge.relation, set()
+        ).add(edge.uuid)
+
+    def _remove_edge(self, edge_uuid: UUID):
+        edge = self._edges.pop(edge_uuid)
+
+        for adjacency, node_uuid in (
+            (self._outgoing_edge_uuids, edge.source_uuid),
+            (self._incoming_edge_uuids, edge.target_uuid),
+        ):
+            relation_edge_uuids = adjacency[node_uuid]
+            relation_edge_uuids[edge.relation].discard(edge_uuid)
+            if len(relation_edge_uuids[edge.relation]) == 0:
+                del relation_edge_uuids[edge.relation]
+            if len(relation_edge_uuids) == 0:
+                del adjacency[node_uuid]
+
+    def _candidate_node_uuids(
+        self, required_labels: Collection[str] | None
+    ) -> Iterable[UUID]:
+        """
+        Get UUIDs of nodes that may have all required labels.
+        """
+        if not required_labels:
+            return self._nodes.keys()
+
+        return min(
+            (self._label_node_uuids.get(label, set()) for label in required_labels),
+            key=len,
+        )
+
+    def _node_matches(
+        self,
+        node_uuid: UUID,
+        required_labels: Collection[str] | None,
+        required_properties: Mapping[str, Property],
+        include_missing_properties: bool,
+    ) -> bool:
+        node = self._nodes[node_uuid]
+
+        if required_labels is not None and not set(required_labels) <= node.labels:
+            return False
+
+        for property_name, required_value in required_properties.items():
+            if property_name in node.properties:
+                if node.properties[property_name] != required_value:
+                    return False
+            elif not include_missing_properties:
+                return False
+
+        return True
+
+    def _output_matching_nodes(
+        self,
+        node_uuids: Iterable[UUID],
+        limit: int | None,
+        required_labels: Collection[str] | None,
+        required_properties: Mapping[str, Property],
+        include_missing_properties: bool,
+        include_properties: Collection[str] | None,
+        exclude_properties: Collection[str] | None,
+    ) -> list[Node]:
+        matching_nodes: list[Node] = []
+        for node_uuid in node_uuids:
+            if limit is not None and len(matching_nodes) >= limit:
+                break
+
+            if self._node_matches(
+                node_uuid,
+                required_labels,
+                required_properties,
+                include_missing_properties,
+            ):
+                matching_nodes.append(
+                    self._output_node(node_uuid, include_properties, exclude_properties)
+                )
+
+        return matching_nodes
+
+    def _output_node(
+        self,
+        node_uuid: UUID,
+        include_properties: Collection[str] | None,
+        exclude_properties: Collection[str] | None,
+    ) -> Node:
+        """
+        Build a copy of a stored node
+        with its embedding properties restored
+        and its properties projected.
+        """
+        node = self._nodes[node_uuid]
+
+        def is_projected(property_name: str) -> bool:
+            if include_properties is not None:
+                return property_name in include_properties
+            if exclude_properties is not None:
+                return property_name not in exclude_properties
+            return True
+
+        properties: dict[str, Property] = {
+            property_name: value
+            for property_name, value in node.properties.items()
+            if is_projected(property_name)
+        }
+        for property_name in self._node_embedding_property_names[node_uuid]:
+            if is_projected(property_name):
+                column_key = InMemoryVectorGraphStore._column_keys(
+                    node.labels, property_name
+                )[0]
+                properties[property_name] = (
+                    self._embedding_columns[column_key].get(node_uuid).tolist()
+                )
+
+        return Node(uuid=node_uuid, labels=set(node.labels), properties=properties)
+
+    def _snapshot_state(self) -> dict[str, Any]:
+        return {
+            "version": _SNAPSHOT_VERSION,
+            "nodes": list(self._nodes.values()),
+            "node_embedding_property_names": self._node_embedding_property_names,
+            "embedding_columns": {
+                column_key: (list(column.uuids), column.matrix.copy())
+                for column_key, column in self._embedding_columns.items()
+            },
+            "edges": list(self._edges.values()),
+        }
+
+    def _load_snapshot_state(self, state: dict[str, Any]):
+        if state.get("version") != _SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {state.get('version')}")
+
+        for node in state["nodes"]:
+            self._nodes[node.uuid] = node
+            for label in node.labels:
+                self._label_node_uuids.setdefault(label, set()).add(node.uuid)
+
+        self._node_embedding_property_names = state["node_embedding_property_names"]
+
+        for column_key, (uuids, matrix) in state["embedding_columns"].items():
+            column = _EmbeddingColumn(matrix.shape[1])
+            for uuid, embedding in zip(uuids, matrix):
+                column.add(uuid, embedding)
+            self._embedding_columns[column_key] = column
+
+        for edge in state["edges"]:
+            self._add_edge(edge)
+
+    @staticmethod
+    def _write_snapshot(snapshot_path: str, snapshot_bytes: bytes):
+        # Write to a temporary file first
+        # so that a crash never leaves a partial snapshot.
+        temporary_path = f"{snapshot_path}.tmp"
+        with open(temporary_path, "wb") as snapshot_file:
+            snapshot_file.write(snapshot_bytes)
+        os.replace(temporary_path, snapshot_path)
+
+    @staticmethod
+    def _is_embedding(value: Property) -> TypeGuard[list[float]]:
+        return (
+            isinstance(value, list)
+            and len(value) > 0
+            and all(type(element) is float for element in value)
+        )
+
+    @staticmethod
+    def _column_keys(
+        labels: Collection[str], property_name: str
+    ) -> list[tuple[str | None, str]]:
+        """
+        Get the keys of the embedding columns
+        storing an embedding property of a node with the given labels.
+        """
+        if not labels:
+            return [(None, property_name)]
+        return [(label, property_name) for label in sorted(labels)]
+
+    @staticmethod
+    def _relation_edge_uuids(
+        relation_edge_uuids: Mapping[str, set[UUID]],
+        allowed_relations: Collection[str] | None,
+    ) -> list[UUID]:
+        if allowed_relations is None:
+            return [
+                edge_uuid
+                for edge_uuids in relation_edge_uuids.values()
+                for edge_uuid in edge_uuids
+            ]
+
+        return [
+            edge_uuid
+            for relation in allowed_relations
+            for edge_uuid in relation_edge_uuids.get(relation, ())
+        ]
+
+    @staticmethod
+    def _similarities(
+        column: _EmbeddingColumn,
+        query: np.ndarray,
+        similarity_metric: SimilarityMetric,
+    ) -> np.ndarray:
+        """
+        Compute similarity scores of all embeddings in a column
+        to the query embedding.
+        """
+        match similarity_metric:
+            case SimilarityMetric.EUCLIDEAN:
+                squared_distances = np.sum(np.square(column.matrix - query), axis=1)
+                return 1 / (1 + squared_distances)
+            case _:
+                norms = column.norms * np.linalg.norm(query)
+                cosine_similarities = np.divide(
+                    column.matrix @ query,
+                    norms,
+                    out=np.zeros_like(norms),
+                    where=norms > 0,
+                )
+                return (1 + cosine_similarities) / 2
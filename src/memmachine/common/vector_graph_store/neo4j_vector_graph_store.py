@@ -8,11 +8,11 @@ of a vector graph store using Neo4j as the backend database.
 import asyncio
 import logging
 import re
-from collections.abc import Awaitable, Collection, Mapping
+from collections.abc import Awaitable, Collection, Mapping, Sequence
 from typing import Any, cast
 from uuid import UUID
 
-from neo4j import AsyncDriver
+from neo4j import AsyncDriver, AsyncManagedTransaction
 from neo4j.graph import Node as Neo4jNode
 from neo4j.time import DateTime as Neo4jDateTime
 from pydantic import BaseModel, Field, InstanceOf
@@ -20,7 +20,7 @@ from pydantic import BaseModel, Field, InstanceOf
 from memmachine.common.embedder import SimilarityMetric
 from memmachine.common.utils import async_locked, async_with
 
-from .data_types import Edge, Node, Property
+from .data_types import Edge, Node, Property, TraversalStep
 from .vector_graph_store import VectorGraphStore
 
 logger = logging.getLogger(__name__)
@@ -77,80 +77,63 @@ class Neo4jVectorGraphStore(VectorGraphStore):
         self._force_exact_similarity_search = params.force_exact_similarity_search
 
         self._vector_index_name_cache: set[str] = set()
+        self._uuid_constraint_name_cache: set[str] = set()
 
     async def add_nodes(self, nodes: Collection[Node]):
-        labels_nodes_map: dict[tuple[str, ...], list[Node]] = {}
-        for node in nodes:
-            labels_nodes_map.setdefault(tuple(sorted(node.labels)), []).append(node)
+        await self._create_node_uuid_constraint_if_not_exist(
+            labels={label for node in nodes for label in node.labels}
+        )
 
         add_nodes_tasks = [
             async_with(
                 self._semaphore,
-                self._driver.execute_query(
-                    "UNWIND $nodes AS node\n"
-                    f"CREATE (n{
-                        Neo4jVectorGraphStore._format_labels(tuple(labels))
-                    } {{uuid: node.uuid}})\n"
-                    "SET n += node.properties",
-                    nodes=[
-                        {
-                            "uuid": str(node.uuid),
-                            "properties": {
-                                Neo4jVectorGraphStore._sanitize_name(key): value
-                                for key, value in node.properties.items()
-                            },
-                        }
-                        for node in nodes
-                    ],
-                ),
+                self._driver.execute_query(query, parameters_=query_parameters),
+            )
+            for query, query_parameters in (
+                Neo4jVectorGraphStore._add_nodes_queries(nodes)
             )
-            for labels, nodes in labels_nodes_map.items()
         ]
 
         await asyncio.gather(*add_nodes_tasks)
 
     async def add_edges(self, edges: Collection[Edge]):
-        relation_edges_map: dict[str, list[Edge]] = {}
-        for edge in edges:
-            relation_edges_map.setdefault(edge.relation, []).append(edge)
-
         add_edges_tasks = [
             async_with(
                 self._semaphore,
-                self._driver.execute_query(
-                    "UNWIND $edges AS edge\n"
-                    "MATCH"
-                    "    (source {uuid: edge.source_uuid}),"
-                    "    (target {uuid: edge.target_uuid})\n"
-                    "CREATE (source)"
-                    f"    -[r:{sanitized_relation} {{uuid: edge.uuid}}]->"
-                    "    (target)\n"
-                    "SET r += edge.properties",
-                    edges=[
-                        {
-                            "uuid": str(edge.uuid),
-                            "source_uuid": str(edge.source_uuid),
-                            "target_uuid": str(edge.target_uuid),
-                            "properties": {
-                                Neo4jVectorGraphStore._sanitize_name(key): value
-                                for key, value in edge.properties.items()
-                            },
-                        }
-                        for edge in edges
-                    ],
-                ),
+                self._driver.execute_query(query, parameters_=query_parameters),
             )
-            for sanitized_relation, edges in (
-                (
-                    Neo4jVectorGraphStore._sanitize_name(relation),
-                    edges,
-                )
-                for relation, edges in relation_edges_map.items()
+            for query, query_parameters in (
+                Neo4jVectorGraphStore._add_edges_queries(edges)
             )
         ]
 
         await asyncio.gather(*add_edges_tasks)
 
+    async def write_batch(
+        self,
+        nodes: Collection[Node],
+        edges: Collection[Edge],
+    ):
+        await self._create_node_uuid_constraint_if_not_exist(
+            labels={label for node in nodes for label in node.labels}
+        )
+
+        queries = Neo4jVectorGraphStore._add_nodes_queries(
+            nodes
+        ) + Neo4jVectorGraphStore._add_edges_queries(edges)
+
+        if len(queries) == 0:
+            return
+
+        async def write_batch_transaction(transaction: AsyncManagedTransaction):
+            for query, query_parameters in queries:
+                result = await transaction.run(query, query_parameters)
+                await result.consume()
+
+        async with self._semaphore:
+            async with self._driver.session() as session:
+                await session.execute_write(write_batch_transaction)
+
     async def search_similar_nodes(
         self,
         query_embedding: list[float],
@@ -160,107 +143,241 @@ class Neo4jVectorGraphStore(VectorGraphStore):
         required_labels: Collection[str] | None = None,
         required_properties: Mapping[str, Property] = {},
         include_missing_properties: bool = False,
+        min_score: float | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
     ) -> list[Node]:
-        exact_similarity_search = self._force_exact_similarity_search
+        scored_similar_nodes = await self.search_similar_nodes_with_scores(
+            query_embedding=query_embedding,
+            embedding_property_name=embedding_property_name,
+            similarity_metric=similarity_metric,
+            limit=limit,
+            required_labels=required_labels,
+            required_properties=required_properties,
+            include_missing_properties=include_missing_properties,
+            min_score=min_score,
+            include_properties=include_properties,
+            exclude_properties=exclude_properties,
+        )
+        return [similar_node for similar_node, _ in scored_similar_nodes]
 
-        sanitized_embedding_property_name = Neo4jVectorGraphStore._sanitize_name(
-            embedding_property_name
+    async def search_similar_nodes_with_scores(
+        self,
+        query_embedding: list[float],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric = SimilarityMetric.COSINE,
+        limit: int | None = 100,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        min_score: float | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[tuple[Node, float]]:
+        similar_nodes_query, query_parameters = await self._similar_nodes_query(
+            query_embedding=query_embedding,
+            embedding_property_name=embedding_property_name,
+            similarity_metric=similarity_metric,
+            limit=limit,
+            required_labels=required_labels,
+            required_properties=required_properties,
+            include_missing_properties=include_missing_properties,
+            min_score=min_score,
         )
 
-        if not exact_similarity_search:
-            vector_index_name = (
-                Neo4jVectorGraphStore._node_vector_index_name(
-                    Neo4jVectorGraphStore._sanitize_name(next(iter(required_labels))),
-                    sanitized_embedding_property_name,
-                )
-                if required_labels is not None and len(required_labels) > 0
-                else None
+        async with self._semaphore:
+            records, _, _ = await self._driver.execute_query(
+                f"{similar_nodes_query}"
+                f"RETURN {
+                    Neo4jVectorGraphStore._format_node_projection(
+                        'n', include_properties, exclude_properties
+                    )
+                } AS n, similarity\n"
+                "ORDER BY similarity DESC",
+                **query_parameters,
+                **Neo4jVectorGraphStore._node_projection_parameters(
+                    include_properties, exclude_properties
+                ),
             )
 
-            if vector_index_name is None:
-                logger.warning(
-                    "No labels specified for vector index lookup. "
-                    "Falling back to exact similarity search."
-                )
-                exact_similarity_search = True
+        similar_neo4j_nodes = [record["n"] for record in records]
+        return list(
+            zip(
+                Neo4jVectorGraphStore._nodes_from_neo4j_nodes(similar_neo4j_nodes),
+                (float(record["similarity"]) for record in records),
+            )
+        )
 
-        # ANN search requires a finite limit.
-        if limit is None and not exact_similarity_search:
-            limit = 100_000
+    async def search_similar_anchored_contexts(
+        self,
+        query_embedding: list[float],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric = SimilarityMetric.COSINE,
+        limit: int | None = 100,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        min_score: float | None = None,
+        anchor_path: Sequence[TraversalStep] = (),
+        context_step: TraversalStep | None = None,
+        context_limit: int | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[tuple[Node, list[Node]]]:
+        if any(
+            step.allowed_relations is not None and len(step.allowed_relations) == 0
+            for step in anchor_path
+        ) or not all(step.find_sources or step.find_targets for step in anchor_path):
+            return []
 
-        if exact_similarity_search:
-            match similarity_metric:
-                case SimilarityMetric.COSINE:
-                    vector_similarity_function = "vector.similarity.cosine"
-                case SimilarityMetric.EUCLIDEAN:
-                    vector_similarity_function = "vector.similarity.euclidean"
-                case _:
-                    vector_similarity_function = "vector.similarity.cosine"
+        similar_nodes_query, query_parameters = await self._similar_nodes_query(
+            query_embedding=query_embedding,
+            embedding_property_name=embedding_property_name,
+            similarity_metric=similarity_metric,
+            limit=limit,
+            required_labels=required_labels,
+            required_properties=required_properties,
+            include_missing_properties=include_missing_properties,
+            min_score=min_score,
+        )
 
-            query = (
-                f"MATCH (n{Neo4jVectorGraphStore._format_labels(required_labels)})\n"
-                f"WHERE n.{sanitized_embedding_property_name} IS NOT NULL\n"
-                f"AND {
-                    Neo4jVectorGraphStore._format_required_properties(
-                        'n', required_properties, include_missing_properties
+        anchor_path_query, anchor_alias, context_query = (
+            Neo4jVectorGraphStore._anchored_contexts_query_parts(
+                query_parameters=query_parameters,
+                anchor_path=anchor_path,
+                context_step=context_step,
+                context_limit=context_limit,
+                include_properties=include_properties,
+                exclude_properties=exclude_properties,
+            )
+        )
+
+        async with self._semaphore:
+            records, _, _ = await self._driver.execute_query(
+                f"{similar_nodes_query}"
+                f"{anchor_path_query}"
+                f"WITH {anchor_alias} AS a, max(similarity) AS similarity\n"
+                f"RETURN {
+                    Neo4jVectorGraphStore._format_node_projection(
+                        'a', include_properties, exclude_properties
                     )
-                }\n"
-                "WITH n,"
-                f"    {vector_similarity_function}("
-                f"        n.{sanitized_embedding_property_name}, $query_embedding"
-                "    ) AS similarity\n"
-                "RETURN n\n"
-                "ORDER BY similarity DESC\n"
-                f"{'LIMIT $limit' if limit is not None else ''}"
+                } AS anchor, {context_query} AS context\n"
+                "ORDER BY similarity DESC",
+                **query_parameters,
+                **Neo4jVectorGraphStore._node_projection_parameters(
+                    include_properties, exclude_properties
+                ),
             )
 
-            async with self._semaphore:
-                records, _, _ = await self._driver.execute_query(
-                    query,
-                    query_embedding=query_embedding,
-                    limit=limit,
-                    required_properties={
-                        Neo4jVectorGraphStore._sanitize_name(key): value
-                        for key, value in required_properties.items()
-                    },
-                )
+        return [
+            (
+                Neo4jVectorGraphStore._nodes_from_neo4j_nodes([record["anchor"]])[0],
+                Neo4jVectorGraphStore._nodes_from_neo4j_nodes(record["context"]),
+            )
+            for record in records
+        ]
 
-        else:
-            await self._create_node_vector_index_if_not_exist(
-                labels=cast(Collection[str], required_labels),
-                embedding_property_name=embedding_property_name,
-                dimensions=len(query_embedding),
-                similarity_metric=similarity_metric,
+    async def search_similar_anchored_contexts_many(
+        self,
+        query_embeddings: Sequence[list[float]],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric = SimilarityMetric.COSINE,
+        limit: int | None = 100,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        min_score: float | None = None,
+        anchor_path: Sequence[TraversalStep] = (),
+        context_step: TraversalStep | None = None,
+        context_limit: int | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[list[tuple[Node, list[Node]]]]:
+        if len(query_embeddings) == 0:
+            return []
+
+        if any(
+            step.allowed_relations is not None and len(step.allowed_relations) == 0
+            for step in anchor_path
+        ) or not all(step.find_sources or step.find_targets for step in anchor_path):
+            return [[] for _ in query_embeddings]
+
+        # Run the similarity search once per query embedding in a subquery.
+        similar_nodes_query, query_parameters = await self._similar_nodes_query(
+            query_embedding=query_embeddings[0],
+            embedding_property_name=embedding_property_name,
+            similarity_metric=similarity_metric,
+            limit=limit,
+            required_labels=required_labels,
+            required_properties=required_properties,
+            include_missing_properties=include_missing_properties,
+            min_score=min_score,
+            query_embedding_expression="query_embedding",
+        )
+        query_parameters["query_embeddings"] = list(query_embeddings)
+
+        anchor_path_query, anchor_alias, context_query = (
+            Neo4jVectorGraphStore._anchored_contexts_query_parts(
+                query_parameters=query_parameters,
+                anchor_path=anchor_path,
+                context_step=context_step,
+                context_limit=context_limit,
+                include_properties=include_properties,
+                exclude_properties=exclude_properties,
             )
+        )
 
-            query = (
-                "CALL db.index.vector.queryNodes(\n"
-                f"    $vector_index_name, $limit, $query_embedding\n"
-                ")\n"
-                "YIELD node AS n, score AS similarity\n"
-                f"WHERE n{Neo4jVectorGraphStore._format_labels(required_labels)}\n"
-                f"AND {
-                    Neo4jVectorGraphStore._format_required_properties(
-                        'n', required_properties, include_missing_properties
+        # Anchor nodes matched by several query embeddings
+        # are returned and expanded once.
+        async with self._semaphore:
+            records, _, _ = await self._driver.execute_query(
+                "UNWIND range(0, size($query_embeddings) - 1) AS query_index\n"
+                "CALL {\n"
+                "WITH query_index\n"
+                "WITH query_index,"
+                " $query_embeddings[query_index] AS query_embedding\n"
+                f"{similar_nodes_query}"
+                "RETURN n, similarity\n"
+                "}\n"
+                f"{anchor_path_query}"
+                f"WITH query_index, {anchor_alias} AS a,"
+                " max(similarity) AS similarity\n"
+                "WITH a, collect([query_index, similarity]) AS matches\n"
+                f"RETURN {
+                    Neo4jVectorGraphStore._format_node_projection(
+                        'a', include_properties, exclude_properties
                     )
-                }\n"
-                "RETURN n"
+                } AS anchor, {context_query} AS context, matches",
+                **query_parameters,
+                **Neo4jVectorGraphStore._node_projection_parameters(
+                    include_properties, exclude_properties
+                ),
             )
 
-            async with self._semaphore:
-                records, _, _ = await self._driver.execute_query(
-                    query,
-                    query_embedding=query_embedding,
-                    limit=limit,
-                    required_properties={
-                        Neo4jVectorGraphStore._sanitize_name(key): value
-                        for key, value in required_properties.items()
-                    },
-                    vector_index_name=vector_index_name,
+        queries_matches: list[list[tuple[float, Node, list[Node]]]] = [
+            [] for _ in query_embeddings
+        ]
+        for record in records:
+            anchor_node = Neo4jVectorGraphStore._nodes_from_neo4j_nodes(
+                [record["anchor"]]
+            )[0]
+            context_nodes = Neo4jVectorGraphStore._nodes_from_neo4j_nodes(
+                record["context"]
+            )
+            for query_index, similarity in record["matches"]:
+                queries_matches[query_index].append(
+                    (float(similarity), anchor_node, context_nodes)
                 )
 
-        similar_neo4j_nodes = [record["n"] for record in records]
-        return Neo4jVectorGraphStore._nodes_from_neo4j_nodes(similar_neo4j_nodes)
+        return [
+            [
+                (anchor_node, context_nodes)
+                for _, anchor_node, context_nodes in sorted(
+                    matches, key=lambda match: match[0], reverse=True
+                )
+            ]
+            for matches in queries_matches
+        ]
 
     async def search_related_nodes(
         self,
@@ -272,6 +389,9 @@ class Neo4jVectorGraphStore(VectorGraphStore):
         required_labels: Collection[str] | None = None,
         required_properties: Mapping[str, Property] = {},
         include_missing_properties: bool = False,
+        node_labels: Collection[str] | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
     ) -> list[Node]:
         if not (find_sources or find_targets):
             return []
@@ -290,7 +410,9 @@ class Neo4jVectorGraphStore(VectorGraphStore):
                 self._semaphore,
                 self._driver.execute_query(
                     "MATCH\n"
-                    "    (m {uuid: $node_uuid})"
+                    f"    (m{
+                        Neo4jVectorGraphStore._format_labels(node_labels)
+                    } {{uuid: $node_uuid}})"
                     f"    {'-' if find_targets else '<-'}"
                     f"    {query_typed_relation}"
                     f"    {'-' if find_sources else '->'}"
@@ -302,9 +424,16 @@ class Neo4jVectorGraphStore(VectorGraphStore):
                             include_missing_properties,
                         )
                     }\n"
-                    "RETURN n\n"
+                    f"RETURN {
+                        Neo4jVectorGraphStore._format_node_projection(
+                            'n', include_properties, exclude_properties
+                        )
+                    } AS n\n"
                     f"{'LIMIT $limit' if limit is not None else ''}",
                     node_uuid=str(node_uuid),
+                    **Neo4jVectorGraphStore._node_projection_parameters(
+                        include_properties, exclude_properties
+                    ),
                     limit=limit,
                     required_properties={
                         Neo4jVectorGraphStore._sanitize_name(key): value
@@ -336,6 +465,8 @@ class Neo4jVectorGraphStore(VectorGraphStore):
         required_labels: Collection[str] | None = None,
         required_properties: Mapping[str, Property] = {},
         include_missing_properties: bool = False,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
     ) -> list[Node]:
         sanitized_by_property = Neo4jVectorGraphStore._sanitize_name(by_property)
 
@@ -358,20 +489,27 @@ class Neo4jVectorGraphStore(VectorGraphStore):
                         'n', required_properties, include_missing_properties
                     )
                 }\n"
-                "RETURN n\n"
+                f"RETURN {
+                    Neo4jVectorGraphStore._format_node_projection(
+                        'n', include_properties, exclude_properties
+                    )
+                } AS projected_n\n"
                 f"ORDER BY n.{sanitized_by_property} {
                     'ASC' if order_ascending else 'DESC'
                 }\n"
                 f"{'LIMIT $limit' if limit is not None else ''}",
                 start_at_value=start_at_value,
                 limit=limit,
+                **Neo4jVectorGraphStore._node_projection_parameters(
+                    include_properties, exclude_properties
+                ),
                 required_properties={
                     Neo4jVectorGraphStore._sanitize_name(key): value
                     for key, value in required_properties.items()
                 },
             )
 
-        directional_proximal_neo4j_nodes = [record["n"] for record in records]
+        directional_proximal_neo4j_nodes = [record["projected_n"] for record in records]
         return Neo4jVectorGraphStore._nodes_from_neo4j_nodes(
             directional_proximal_neo4j_nodes
         )
@@ -382,6 +520,8 @@ class Neo4jVectorGraphStore(VectorGraphStore):
         required_labels: Collection[str] | None = None,
         required_properties: Mapping[str, Property] = {},
         include_missing_properties: bool = False,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
     ) -> list[Node]:
         async with self._semaphore:
             records, _, _ = await self._driver.execute_query(
@@ -391,9 +531,16 @@ class Neo4jVectorGraphStore(VectorGraphStore):
                         'n', required_properties, include_missing_properties
                     )
                 }\n"
-                "RETURN n\n"
+                f"RETURN {
+                    Neo4jVectorGraphStore._format_node_projection(
+                        'n', include_properties, exclude_properties
+                    )
+                } AS n\n"
                 f"{'LIMIT $limit' if limit is not None else ''}",
                 limit=limit,
+                **Neo4jVectorGraphStore._node_projection_parameters(
+                    include_properties, exclude_properties
+                ),
                 required_properties={
                     Neo4jVectorGraphStore._sanitize_name(key): value
                     for key, value in required_properties.items()
@@ -406,14 +553,15 @@ class Neo4jVectorGraphStore(VectorGraphStore):
     async def delete_nodes(
         self,
         node_uuids: Collection[UUID],
+        required_labels: Collection[str] | None = None,
     ):
         async with self._semaphore:
             await self._driver.execute_query(
-                """
-                UNWIND $node_uuids AS node_uuid
-                MATCH (n {uuid: node_uuid})
-                DETACH DELETE n
-                """,
+                "UNWIND $node_uuids AS node_uuid\n"
+                f"MATCH (n{
+                    Neo4jVectorGraphStore._format_labels(required_labels)
+                } {{uuid: node_uuid}})\n"
+                "DETACH DELETE n",
                 node_uuids=[str(node_uuid) for node_uuid in node_uuids],
             )
 
@@ -424,6 +572,255 @@ class Neo4jVectorGraphStore(VectorGraphStore):
     async def close(self):
         await self._driver.close()
 
+    @staticmethod
+    def _anchored_contexts_query_parts(
+        query_parameters: dict[str, Any],
+        anchor_path: Sequence[TraversalStep],
+        context_step: TraversalStep | None,
+        context_limit: int | None,
+        include_properties: Collection[str] | None,
+        exclude_properties: Collection[str] | None,
+    ) -> tuple[str, str, str]:
+        """
+        Build the parts of a Cypher query
+        that traverse from the similar nodes bound to `n` to anchor nodes
+        and collect the context of an anchor node bound to `a`.
+        Add the query parameters of the parts to query_parameters.
+
+        Args:
+            query_parameters (dict[str, Any]):
+                The query parameters to add to.
+            anchor_path (Sequence[TraversalStep]):
+                The steps from the similar nodes to the anchor nodes.
+            context_step (TraversalStep | None):
+                The step from an anchor node to its context nodes.
+            context_limit (int | None):
+                Maximum number of context nodes per anchor node.
+            include_properties (Collection[str] | None):
+                The properties to include in the context nodes.
+            exclude_properties (Collection[str] | None):
+                The properties to exclude from the context nodes.
+
+        Returns:
+            tuple[str, str, str]:
+                The traversal query part,
+                the alias bound to the anchor nodes by it,
+                and the context expression.
+        """
+        # Traverse from similar nodes to anchor nodes.
+        anchor_path_query = ""
+        previous_alias = "n"
+        for index, step in enumerate(anchor_path):
+            alias = f"m{index}"
+            parameter_name = f"anchor_path_required_properties_{index}"
+
+            anchor_path_query += (
+                f"MATCH ({previous_alias})"
+                f"{
+                    Neo4jVectorGraphStore._format_relation_pattern(
+                        step.allowed_relations, step.find_sources, step.find_targets
+                    )
+                }"
+                f"({alias}{Neo4jVectorGraphStore._format_labels(step.required_labels)})\n"
+                f"WHERE {
+                    Neo4jVectorGraphStore._format_required_properties(
+                        alias,
+                        step.required_properties,
+                        step.include_missing_properties,
+                        parameter_name,
+                    )
+                }\n"
+            )
+            query_parameters[parameter_name] = {
+                Neo4jVectorGraphStore._sanitize_name(key): value
+                for key, value in step.required_properties.items()
+            }
+            previous_alias = alias
+
+        # Collect the context of each anchor node in a subquery.
+        if context_step is None or (
+            not (context_step.find_sources or context_step.find_targets)
+            or (
+                context_step.allowed_relations is not None
+                and len(context_step.allowed_relations) == 0
+            )
+        ):
+            context_query = "[]"
+        else:
+            context_query = (
+                "COLLECT {\n"
+                "    MATCH (a)"
+                f"{
+                    Neo4jVectorGraphStore._format_relation_pattern(
+                        context_step.allowed_relations,
+                        context_step.find_sources,
+                        context_step.find_targets,
+                    )
+                }"
+                f"(c{Neo4jVectorGraphStore._format_labels(context_step.required_labels)})\n"
+                f"    WHERE {
+                    Neo4jVectorGraphStore._format_required_properties(
+                        'c',
+                        context_step.required_properties,
+                        context_step.include_missing_properties,
+                        'context_required_properties',
+                    )
+                }\n"
+                "    WITH DISTINCT c\n"
+                f"    {'LIMIT $context_limit' if context_limit is not None else ''}\n"
+                f"    RETURN {
+                    Neo4jVectorGraphStore._format_node_projection(
+                        'c', include_properties, exclude_properties
+                    )
+                }\n"
+                "}"
+            )
+            query_parameters["context_required_properties"] = {
+                Neo4jVectorGraphStore._sanitize_name(key): value
+                for key, value in context_step.required_properties.items()
+            }
+            query_parameters["context_limit"] = context_limit
+
+        return anchor_path_query, previous_alias, context_query
+
+    async def _similar_nodes_query(
+        self,
+        query_embedding: list[float],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric,
+        limit: int | None,
+        required_labels: Collection[str] | None,
+        required_properties: Mapping[str, Property],
+        include_missing_properties: bool,
+        min_score: float | None = None,
+        query_embedding_expression: str = "$query_embedding",
+    ) -> tuple[str, dict[str, Any]]:
+        """
+        Build the leading part of a Cypher query
+        that binds nodes similar to the query embedding to `n`
+        and their similarity scores to `similarity`.
+        Create the vector index first if ANN search is used.
+
+        Args:
+            query_embedding (list[float]):
+                The embedding vector to compare against.
+            embedding_property_name (str):
+                The name of the property
+                that stores the embedding vector.
+            similarity_metric (SimilarityMetric):
+                The similarity metric to use.
+            limit (int | None):
+                Maximum number of similar nodes to bind.
+            required_labels (Collection[str] | None):
+                Collection of labels that the nodes must have.
+            required_properties (Mapping[str, Property]):
+                Mapping of property names to their required values
+                that the nodes must have.
+            include_missing_properties (bool):
+                Whether to include nodes
+                with missing required properties.
+            min_score (float | None):
+                Minimum similarity score of the nodes to bind.
+                If None, no score cutoff is applied (default: None).
+            query_embedding_expression (str):
+                The Cypher expression of the embedding vector
+                to compare against (default: "$query_embedding").
+                The query_embedding parameter is only set by default.
+
+        Returns:
+            tuple[str, dict[str, Any]]:
+                The query part and its query parameters.
+        """
+        exact_similarity_search = self._force_exact_similarity_search
+
+        sanitized_embedding_property_name = Neo4jVectorGraphStore._sanitize_name(
+            embedding_property_name
+        )
+
+        if not exact_similarity_search:
+            vector_index_name = (
+                Neo4jVectorGraphStore._node_vector_index_name(
+                    Neo4jVectorGraphStore._sanitize_name(next(iter(required_labels))),
+                    sanitized_embedding_property_name,
+                )
+                if required_labels is not None and len(required_labels) > 0
+                else None
+            )
+
+            if vector_index_name is None:
+                logger.warning(
+                    "No labels specified for vector index lookup. "
+                    "Falling back to exact similarity search."
+                )
+                exact_similarity_search = True
+
+        # ANN search requires a finite limit.
+        if limit is None and not exact_similarity_search:
+            limit = 100_000
+
+        query_parameters: dict[str, Any] = {
+            "limit": limit,
+            "min_score": min_score,
+            "required_properties": {
+                Neo4jVectorGraphStore._sanitize_name(key): value
+                for key, value in required_properties.items()
+            },
+        }
+        if query_embedding_expression == "$query_embedding":
+            query_parameters["query_embedding"] = query_embedding
+
+        if exact_similarity_search:
+            match similarity_metric:
+                case SimilarityMetric.COSINE:
+                    vector_similarity_function = "vector.similarity.cosine"
+                case SimilarityMetric.EUCLIDEAN:
+                    vector_similarity_function = "vector.similarity.euclidean"
+                case _:
+                    vector_similarity_function = "vector.similarity.cosine"
+
+            query = (
+                f"MATCH (n{Neo4jVectorGraphStore._format_labels(required_labels)})\n"
+                f"WHERE n.{sanitized_embedding_property_name} IS NOT NULL\n"
+                f"AND {
+                    Neo4jVectorGraphStore._format_required_properties(
+                        'n', required_properties, include_missing_properties
+                    )
+                }\n"
+                "WITH n,"
+                f"    {vector_similarity_function}("
+                f"        n.{sanitized_embedding_property_name}, {query_embedding_expression}"
+                "    ) AS similarity\n"
+                f"{'WHERE similarity >= $min_score' if min_score is not None else ''}\n"
+                "ORDER BY similarity DESC\n"
+                f"{'LIMIT $limit' if limit is not None else ''}\n"
+            )
+
+        else:
+            await self._create_node_vector_index_if_not_exist(
+                labels=cast(Collection[str], required_labels),
+                embedding_property_name=embedding_property_name,
+                dimensions=len(query_embedding),
+                similarity_metric=similarity_metric,
+            )
+
+            query = (
+                "CALL db.index.vector.queryNodes(\n"
+                f"    $vector_index_name, $limit, {query_embedding_expression}\n"
+                ")\n"
+                "YIELD node AS n, score AS similarity\n"
+                f"WHERE n{Neo4jVectorGraphStore._format_labels(required_labels)}\n"
+                f"{'AND similarity >= $min_score' if min_score is not None else ''}\n"
+                f"AND {
+                    Neo4jVectorGraphStore._format_required_properties(
+                        'n', required_properties, include_missing_properties
+                    )
+                }\n"
+                "WITH n, similarity\n"
+            )
+            query_parameters["vector_index_name"] = vector_index_name
+
+        return query, query_parameters
+
     async def _create_node_vector_index_if_not_exist(
         self,
         labels: Collection[str],
@@ -533,6 +930,194 @@ class Neo4jVectorGraphStore(VectorGraphStore):
         async with self._semaphore:
             await self._driver.execute_query("CALL db.awaitIndexes()")
 
+    async def _create_node_uuid_constraint_if_not_exist(
+        self,
+        labels: Collection[str],
+    ):
+        """
+        Create node UUID uniqueness constraint(s) if not exist.
+        Each constraint is backed by a range index on the UUID property,
+        so labeled lookups by UUID do not scan all nodes.
+
+        Args:
+            labels (Collection[str]):
+                Collection of node labels to create constraints for.
+        """
+        if len(labels) == 0:
+            return
+
+        if not self._uuid_constraint_name_cache:
+            async with self._semaphore:
+                records, _, _ = await self._driver.execute_query(
+                    "SHOW CONSTRAINTS YIELD name RETURN name"
+                )
+
+            self._uuid_constraint_name_cache.update(
+                record["name"] for record in records
+            )
+
+        sanitized_labels = [
+            Neo4jVectorGraphStore._sanitize_name(label) for label in labels
+        ]
+
+        requested_constraint_names = [
+            Neo4jVectorGraphStore._node_uuid_constraint_name(sanitized_label)
+            for sanitized_label in sanitized_labels
+        ]
+
+        info_for_constraints_to_create = [
+            (sanitized_label, constraint_name)
+            for sanitized_label, constraint_name in zip(
+                sanitized_labels,
+                requested_constraint_names,
+            )
+            if constraint_name not in self._uuid_constraint_name_cache
+        ]
+
+        if len(info_for_constraints_to_create) == 0:
+            return
+
+        create_constraint_tasks = [
+            async_with(
+                self._semaphore,
+                self._driver.execute_query(
+                    f"CREATE CONSTRAINT {constraint_name}\n"
+                    "IF NOT EXISTS\n"
+                    f"FOR (n:{sanitized_label})\n"
+                    "REQUIRE n.uuid IS UNIQUE"
+                ),
+            )
+            for sanitized_label, constraint_name in info_for_constraints_to_create
+        ]
+
+        await self._execute_create_node_uuid_constraint_if_not_exist(
+            create_constraint_tasks
+        )
+
+        self._uuid_constraint_name_cache.update(requested_constraint_names)
+
+    @async_locked
+    async def _execute_create_node_uuid_constraint_if_not_exist(
+        self, create_constraint_tasks: Collection[Awaitable]
+    ):
+        """
+        Execute the creation of node UUID constraints if not exist.
+        Locked because concurrent schema changes in Neo4j
+        can raise exceptions even with "IF NOT EXISTS".
+
+        Args:
+            create_constraint_tasks (Collection[Awaitable]):
+                Collection of awaitable tasks to create constraints.
+        """
+        await asyncio.gather(*create_constraint_tasks)
+
+    @staticmethod
+    def _add_nodes_queries(
+        nodes: Collection[Node],
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """
+        Build the Cypher queries to add nodes,
+        one per distinct set of labels.
+
+        Args:
+            nodes (Collection[Node]): Collection of Node objects to add.
+
+        Returns:
+            list[tuple[str, dict[str, Any]]]:
+                List of queries and their query parameters.
+        """
+        labels_nodes_map: dict[tuple[str, ...], list[Node]] = {}
+        for node in nodes:
+            labels_nodes_map.setdefault(tuple(sorted(node.labels)), []).append(node)
+
+        return [
+            (
+                "UNWIND $nodes AS node\n"
+                f"CREATE (n{
+                    Neo4jVectorGraphStore._format_labels(labels)
+                } {{uuid: node.uuid}})\n"
+                "SET n += node.properties",
+                {
+                    "nodes": [
+                        {
+                            "uuid": str(node.uuid),
+                            "properties": {
+                                Neo4jVectorGraphStore._sanitize_name(key): value
+                                for key, value in node.properties.items()
+                            },
+                        }
+                        for node in labels_nodes
+                    ],
+                },
+            )
+            for labels, labels_nodes in labels_nodes_map.items()
+        ]
+
+    @staticmethod
+    def _add_edges_queries(
+        edges: Collection[Edge],
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """
+        Build the Cypher queries to add edges,
+        one per distinct relation and source and target labels.
+
+        Args:
+            edges (Collection[Edge]): Collection of Edge objects to add.
+
+        Returns:
+            list[tuple[str, dict[str, Any]]]:
+                List of queries and their query parameters.
+        """
+        relation_labels_edges_map: dict[
+            tuple[str, tuple[str, ...], tuple[str, ...]], list[Edge]
+        ] = {}
+        for edge in edges:
+            relation_labels_edges_map.setdefault(
+                (
+                    edge.relation,
+                    tuple(sorted(edge.source_labels)),
+                    tuple(sorted(edge.target_labels)),
+                ),
+                [],
+            ).append(edge)
+
+        return [
+            (
+                "UNWIND $edges AS edge\n"
+                "MATCH"
+                f"    (source{
+                    Neo4jVectorGraphStore._format_labels(source_labels)
+                } {{uuid: edge.source_uuid}}),"
+                f"    (target{
+                    Neo4jVectorGraphStore._format_labels(target_labels)
+                } {{uuid: edge.target_uuid}})\n"
+                "CREATE (source)"
+                f"    -[r:{Neo4jVectorGraphStore._sanitize_name(relation)}"
+                " {uuid: edge.uuid}]->"
+                "    (target)\n"
+                "SET r += edge.properties",
+                {
+                    "edges": [
+                        {
+                            "uuid": str(edge.uuid),
+                            "source_uuid": str(edge.source_uuid),
+                            "target_uuid": str(edge.target_uuid),
+                            "properties": {
+                                Neo4jVectorGraphStore._sanitize_name(key): value
+                                for key, value in edge.properties.items()
+                            },
+                        }
+                        for edge in relation_labels_edges
+                    ],
+                },
+            )
+            for (
+                relation,
+                source_labels,
+                target_labels,
+            ), relation_labels_edges in relation_labels_edges_map.items()
+        ]
+
     @staticmethod
     def _sanitize_name(name: str) -> str:
         """
@@ -585,11 +1170,53 @@ class Neo4jVectorGraphStore(VectorGraphStore):
             else ""
         )
 
+    @staticmethod
+    def _format_relation_pattern(
+        allowed_relations: Collection[str] | None,
+        find_sources: bool,
+        find_targets: bool,
+    ) -> str:
+        """
+        Format a relationship pattern for use in a Cypher query,
+        relative to the node on its left.
+
+        Args:
+            allowed_relations (Collection[str] | None):
+                Collection of relationship types to match.
+                If None, all relationship types are matched.
+            find_sources (bool):
+                Whether to match nodes on the right
+                that are sources of the relationship.
+            find_targets (bool):
+                Whether to match nodes on the right
+                that are targets of the relationship.
+
+        Returns:
+            str:
+                Formatted relationship pattern for Cypher query.
+        """
+        typed_relation = (
+            "[:"
+            + "|".join(
+                Neo4jVectorGraphStore._sanitize_name(relation)
+                for relation in allowed_relations
+            )
+            + "]"
+            if allowed_relations is not None
+            else "[]"
+        )
+        return (
+            f"{'-' if find_targets else '<-'}"
+            f"{typed_relation}"
+            f"{'-' if find_sources else '->'}"
+        )
+
     @staticmethod
     def _format_required_properties(
         entity_query_alias: str,
         required_properties: Mapping[str, Property],
         include_missing_properties: bool,
+        query_parameter_name: str = "required_properties",
     ) -> str:
         """
         Format required properties for use in a Cypher query.
@@ -603,6 +1230,10 @@ class Neo4jVectorGraphStore(VectorGraphStore):
             include_missing_properties (bool):
                 Whether to include results
                 with missing required properties.
+            query_parameter_name (str):
+                Name of the query parameter
+                holding the sanitized required properties
+                (default: "required_properties").
 
         Returns:
             str:
@@ -612,7 +1243,7 @@ class Neo4jVectorGraphStore(VectorGraphStore):
             " AND ".join(
                 [
                     f"({entity_query_alias}.{sanitized_property_name}"
-                    f"    = $required_properties.{sanitized_property_name}"
+                    f"    = ${query_parameter_name}.{sanitized_property_name}"
                     f"{
                         f' OR {entity_query_alias}.{sanitized_property_name} IS NULL'
                         if include_missing_properties
@@ -627,6 +1258,93 @@ class Neo4jVectorGraphStore(VectorGraphStore):
             or "TRUE"
         )
 
+    @staticmethod
+    def _format_node_projection(
+        entity_query_alias: str,
+        include_properties: Collection[str] | None,
+        exclude_properties: Collection[str] | None,
+    ) -> str:
+        """
+        Format a node projection for use in a Cypher query.
+        Properties are selected by the query parameters
+        from _node_projection_parameters.
+
+        Args:
+            entity_query_alias (str):
+                Alias of the node in the query (e.g., "n").
+            include_properties (Collection[str] | None):
+                Collection of property names to project.
+                If None, all properties are projected.
+            exclude_properties (Collection[str] | None):
+                Collection of property names not to project.
+                If None, no properties are excluded.
+
+        Returns:
+            str:
+                Formatted node projection expression for Cypher query.
+        """
+        if include_properties is None and exclude_properties is None:
+            return entity_query_alias
+
+        if include_properties is not None:
+            selected_keys = (
+                "key IN $include_properties"
+                f" WHERE {entity_query_alias}[key] IS NOT NULL"
+            )
+        else:
+            selected_keys = (
+                f"key IN keys({entity_query_alias})"
+                " WHERE NOT key IN $exclude_properties"
+            )
+
+        return (
+            "{"
+            f"uuid: {entity_query_alias}.uuid, "
+            f"labels: labels({entity_query_alias}), "
+            f"properties: [{selected_keys} | [key, {entity_query_alias}[key]]]"
+            "}"
+        )
+
+    @staticmethod
+    def _node_projection_parameters(
+        include_properties: Collection[str] | None,
+        exclude_properties: Collection[str] | None,
+    ) -> dict[str, Any]:
+        """
+        Get the query parameters for a node projection
+        formatted by _format_node_projection.
+
+        Args:
+            include_properties (Collection[str] | None):
+                Collection of property names to project.
+                If None, all properties are projected.
+            exclude_properties (Collection[str] | None):
+                Collection of property names not to project.
+                If None, no properties are excluded.
+
+        Returns:
+            dict[str, Any]:
+                Query parameters for the node projection.
+        """
+        sanitized_exclude_properties = [
+            Neo4jVectorGraphStore._sanitize_name(key)
+            for key in (exclude_properties or [])
+        ]
+
+        if include_properties is None:
+            return {"exclude_properties": sanitized_exclude_properties}
+
+        return {
+            "include_properties": [
+                sanitized_key
+                for sanitized_key in (
+                    Neo4jVectorGraphStore._sanitize_name(key)
+                    for key in include_properties
+                )
+                if sanitized_key not in sanitized_exclude_properties
+            ]
+        }
+
     @staticmethod
     def _node_vector_index_name(
         sanitized_label: str, sanitized_embedding_property_name: str
@@ -654,15 +1372,33 @@ class Neo4jVectorGraphStore(VectorGraphStore):
             f"{sanitized_embedding_property_name}"
         )
 
+    @staticmethod
+    def _node_uuid_constraint_name(sanitized_label: str) -> str:
+        """
+        Generate a unique name for a node UUID uniqueness constraint
+        based on the label.
+
+        Args:
+            sanitized_label (str):
+                The sanitized node label.
+
+        Returns:
+            str: The generated constraint name.
+        """
+        return f"node_uuid_constraint_for_{len(sanitized_label)}_{sanitized_label}"
+
     @staticmethod
     def _nodes_from_neo4j_nodes(
-        neo4j_nodes: Collection[Neo4jNode],
+        neo4j_nodes: Collection[Neo4jNode | dict[str, Any]],
     ) -> list[Node]:
         """
-        Convert a collection of Neo4jNodes to a list of Nodes.
+        Convert a collection of Neo4jNodes
+        or node projections from _format_node_projection
+        to a list of Nodes.
 
         Args:
-            neo4j_nodes (Collection[Neo4jNode]): Collection of Neo4jNodes.
+            neo4j_nodes (Collection[Neo4jNode | dict[str, Any]]):
+                Collection of Neo4jNodes or node projections.
 
         Returns:
             list[Node]: List of Node objects.
@@ -679,6 +1415,18 @@ class Neo4jVectorGraphStore(VectorGraphStore):
                     if key != "uuid"
                 },
             )
+            if isinstance(neo4j_node, Neo4jNode)
+            else Node(
+                uuid=UUID(neo4j_node["uuid"]),
+                labels=set(neo4j_node["labels"]),
+                properties={
+                    Neo4jVectorGraphStore._desanitize_name(
+                        key
+                    ): Neo4jVectorGraphStore._python_value_from_neo4j_value(value)
+                    for key, value in neo4j_node["properties"]
+                    if key != "uuid"
+                },
+            )
             for neo4j_node in neo4j_nodes
         ]
 
@@ -0,0 +1,1178 @@
+"""
+Segment-based vector graph store implementation.
+
+This module provides an on-disk implementation
+of a vector graph store that keeps embeddings
+in append-only, memory-mapped float32 segment files
+and nodes and edges in a SQLite sidecar database.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, TypeVar, cast
+from uuid import UUID
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from memmachine.common.embedder import SimilarityMetric
+
+from .data_types import Edge, Node, Property
+from .vector_graph_store import VectorGraphStore
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_SIDECAR_FILE_NAME = "sidecar.sqlite3"
+_UUID_SIZE = 16
+
+# Stay well below the SQLite limit on the number of query parameters.
+_MAX_QUERY_PARAMETERS = 500
+
+# Label of the segments storing embeddings of nodes without labels.
+_NO_LABEL = ""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    uuid TEXT PRIMARY KEY,
+    labels TEXT NOT NULL,
+    properties TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS node_labels (
+    label TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    PRIMARY KEY (label, uuid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS node_labels_uuid ON node_labels (uuid);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL,
+    property_name TEXT NOT NULL,
+    dimensions INTEGER NOT NULL,
+    generation INTEGER NOT NULL DEFAULT 0,
+    deleted_rows INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (label, property_name)
+);
+CREATE TABLE IF NOT EXISTS embeddings (
+    uuid TEXT NOT NULL,
+    segment_id INTEGER NOT NULL,
+    row_index INTEGER NOT NULL,
+    PRIMARY KEY (uuid, segment_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS embeddings_segment_row
+    ON embeddings (segment_id, row_index);
+CREATE TABLE IF NOT EXISTS edges (
+    uuid TEXT PRIMARY KEY,
+    source_uuid TEXT NOT NULL,
+    target_uuid TEXT NOT NULL,
+    relation TEXT NOT NULL,
+    properties TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS edges_source ON edges (source_uuid, relation);
+CREATE INDEX IF NOT EXISTS edges_target ON edges (target_uuid, relation);
+"""
+
+
+class SegmentVectorGraphStoreParams(BaseModel):
+    """
+    Parameters for SegmentVectorGraphStore.
+
+    Attributes:
+        directory (str):
+            Directory to store the segment files
+            and the sidecar database in.
+            Created if it does not exist.
+        compaction_threshold (float):
+            Fraction of deleted rows in a segment
+            above which the segment is compacted
+            (default: 0.25).
+    """
+
+    directory: str = Field(
+        ..., description="Directory to store the segment files and sidecar in"
+    )
+    compaction_threshold: float = Field(
+        0.25,
+        description="Fraction of deleted rows in a segment that triggers compaction",
+        gt=0,
+        le=1,
+    )
+
+
+@dataclass(kw_only=True)
+class _Segment:
+    id: int
+    label: str
+    property_name: str
+    dimensions: int
+    generation: int
+    deleted_rows: int
+
+
+class SegmentVectorGraphStore(VectorGraphStore):
+    """
+    On-disk implementation of VectorGraphStore.
+
+    Embedding properties (non-empty lists of floats)
+    are appended to a float32 segment file
+    per label and property name,
+    with a parallel file of node UUIDs per row.
+    Segments are memory-mapped and searched by brute force,
+    so searches read vectors from the page cache without copying
+    and opening a store does not load any vectors.
+    Deleted rows are zeroed in the UUID file
+    and dropped when their segment is compacted.
+
+    Nodes, edges, and the location of each embedding
+    are stored in a SQLite sidecar database.
+    Node and edge properties are stored as JSON,
+    with datetimes tagged to be restored on load.
+
+    Similarity scores follow Neo4j vector similarity functions:
+    cosine similarity is scaled to [0, 1] as (1 + cos) / 2,
+    and euclidean similarity is 1 / (1 + squared distance).
+    Other similarity metrics fall back to cosine similarity.
+    """
+
+    def __init__(self, params: SegmentVectorGraphStoreParams):
+        """
+        Initialize a SegmentVectorGraphStore
+        with the provided parameters.
+
+        Args:
+            params (SegmentVectorGraphStoreParams):
+                Parameters for the SegmentVectorGraphStore.
+        """
+        super().__init__()
+
+        self._directory = params.directory
+        self._compaction_threshold = params.compaction_threshold
+
+        os.makedirs(self._directory, exist_ok=True)
+
+        # The sidecar connection is used from worker threads,
+        # one at a time under the lock.
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            os.path.join(self._directory, _SIDECAR_FILE_NAME),
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+        # Memory maps of the vectors and UUIDs of each segment by segment ID.
+        self._segment_arrays_cache: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+    async def add_nodes(self, nodes: Collection[Node]):
+        await self._run_locked(self._write_batch, nodes, ())
+
+    async def add_edges(self, edges: Collection[Edge]):
+        await self._run_locked(self._write_batch, (), edges)
+
+    async def write_batch(
+        self,
+        nodes: Collection[Node],
+        edges: Collection[Edge],
+    ):
+        await self._run_locked(self._write_batch, nodes, edges)
+
+    async def search_similar_nodes(
+        self,
+        query_embedding: list[float],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric = SimilarityMetric.COSINE,
+        limit: int | None = 100,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        min_score: float | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[Node]:
+        return [
+            node
+            for node, _ in await self.search_similar_nodes_with_scores(
+                query_embedding=query_embedding,
+                embedding_property_name=embedding_property_name,
+                similarity_metric=similarity_metric,
+                limit=limit,
+                required_labels=required_labels,
+                required_properties=required_properties,
+                include_missing_properties=include_missing_properties,
+                min_score=min_score,
+                include_properties=include_properties,
+                exclude_properties=exclude_properties,
+            )
+        ]
+
+    async def search_similar_nodes_with_scores(
+        self,
+        query_embedding: list[float],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric = SimilarityMetric.COSINE,
+        limit: int | None = 100,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        min_score: float | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[tuple[Node, float]]:
+        def search_similar_nodes_with_scores() -> list[tuple[Node, float]]:
+            scored_nodes = self._search_similar_stored_nodes(
+                query_embedding,
+                embedding_property_name,
+                similarity_metric,
+                limit,
+                required_labels,
+                required_properties,
+                include_missing_properties,
+                min_score,
+            )
+            nodes = self._output_nodes(
+                [node for node, _ in scored_nodes],
+                include_properties,
+                exclude_properties,
+            )
+            return [
+                (node, score)
+                for node, (_, score) in zip(nodes, scored_nodes, strict=True)
+            ]
+
+        return await self._run_locked(search_similar_nodes_with_scores)
+
+    async def search_related_nodes(
+        self,
+        node_uuid: UUID,
+        allowed_relations: Collection[str] | None = None,
+        find_sources: bool = True,
+        find_targets: bool = True,
+        limit: int | None = None,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        node_labels: Collection[str] | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[Node]:
+        if not (find_sources or find_targets):
+            return []
+
+        def search_related_nodes() -> list[Node]:
+            node = self._get_stored_nodes([node_uuid]).get(node_uuid)
+            if node is None or not set(node_labels or ()) <= node.labels:
+                return []
+
+            relation_condition = ""
+            relation_parameters: list[str] = []
+            if allowed_relations is not None:
+                relation_condition = (
+                    f"AND relation IN ({', '.join('?' * len(allowed_relations))})"
+                )
+                relation_parameters = list(allowed_relations)
+
+            related_node_uuids: dict[UUID, None] = {}
+            if find_targets:
+                for (related_node_uuid,) in self._connection.execute(
+                    "SELECT target_uuid FROM edges\n"
+                    f"WHERE source_uuid = ? {relation_condition}",
+                    [str(node_uuid), *relation_parameters],
+                ):
+                    related_node_uuids[UUID(related_node_uuid)] = None
+            if find_sources:
+                for (related_node_uuid,) in self._connection.execute(
+                    "SELECT source_uuid FROM edges\n"
+                    f"WHERE target_uuid = ? {relation_condition}",
+                    [str(node_uuid), *relation_parameters],
+                ):
+                    related_node_uuids[UUID(related_node_uuid)] = None
+
+            related_nodes = self._get_stored_nodes(related_node_uuids)
+            matching_nodes = SegmentVectorGraphStore._take_matching_nodes(
+                (
+                    related_nodes[related_node_uuid]
+                    for related_node_uuid in related_node_uuids
+                    if related_node_uuid in related_nodes
+                ),
+                limit,
+                required_labels,
+                required_properties,
+                include_missing_properties,
+            )
+            return self._output_nodes(
+                matching_nodes, include_properties, exclude_properties
+            )
+
+        return await self._run_locked(search_related_nodes)
+
+    async def search_directional_nodes(
+        self,
+        by_property: str,
+        start_at_value: Any | None = None,
+        include_equal_start_at_value: bool = False,
+        order_ascending: bool = True,
+        limit: int | None = 1,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[Node]:
+        def search_directional_nodes() -> list[Node]:
+            keyed_nodes: list[tuple[Any, Node]] = []
+            for node in self._iterate_stored_nodes(required_labels):
+                value = node.properties.get(by_property)
+                if value is None:
+                    continue
+
+                if start_at_value is not None:
+                    try:
+                        if order_ascending:
+                            is_in_range = value > start_at_value or (
+                                include_equal_start_at_value and value == start_at_value
+                            )
+                        else:
+                            is_in_range = value < start_at_value or (
+                                include_equal_start_at_value and value == start_at_value
+                            )
+                    except TypeError:
+                        # Incomparable values never match, as in Cypher.
+                        is_in_range = False
+
+                    if not is_in_range:
+                        continue
+
+                if not SegmentVectorGraphStore._node_matches(
+                    node,
+                    required_labels,
+                    required_properties,
+                    include_missing_properties,
+                ):
+                    continue
+
+                keyed_nodes.append((value, node))
+
+            keyed_nodes.sort(key=lambda item: item[0], reverse=not order_ascending)
+
+            return self._output_nodes(
+                [node for _, node in keyed_nodes[:limit]],
+                include_properties,
+                exclude_properties,
+            )
+
+        return await self._run_locked(search_directional_nodes)
+
+    async def search_matching_nodes(
+        self,
+        limit: int | None = None,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[Node]:
+        def search_matching_nodes() -> list[Node]:
+            matching_nodes = SegmentVectorGraphStore._take_matching_nodes(
+                self._iterate_stored_nodes(required_labels),
+                limit,
+                required_labels,
+                required_properties,
+                include_missing_properties,
+            )
+            return self._output_nodes(
+                matching_nodes, include_properties, exclude_properties
+            )
+
+        return await self._run_locked(search_matching_nodes)
+
+    async def delete_nodes(
+        self,
+        node_uuids: Collection[UUID],
+        required_labels: Collection[str] | None = None,
+    ):
+        await self._run_locked(self._delete_nodes, node_uuids, required_labels)
+
+    async def compact(self):
+        """
+        Compact all segments with deleted rows.
+        """
+
+        def compact():
+            for segment in self._load_segments().values():
+                if segment.deleted_rows > 0:
+                    self._compact_segment(segment)
+
+        await self._run_locked(compact)
+
+    async def clear_data(self):
+        def clear_data():
+            segments = self._load_segments().values()
+
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                for table in (
+                    "nodes",
+                    "node_labels",
+                    "segments",
+                    "embeddings",
+                    "edges",
+                ):
+                    self._connection.execute(f"DELETE FROM {table}")
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+            self._segment_arrays_cache.clear()
+            for segment in segments:
+                self._remove_segment_files(segment)
+
+        await self._run_locked(clear_data)
+
+    async def close(self):
+        def close():
+            self._segment_arrays_cache.clear()
+            self._connection.close()
+
+        await self._run_locked(close)
+
+    async def _run_locked(self, function: Callable[..., T], *args: Any) -> T:
+        """
+        Run a function holding the lock in a worker thread,
+        keeping disk I/O off the event loop.
+        """
+
+        def run_locked() -> T:
+            with self._lock:
+                return function(*args)
+
+        return await asyncio.to_thread(run_locked)
+
+    def _write_batch(self, nodes: Collection[Node], edges: Collection[Edge]):
+        node_uuids = [node.uuid for node in nodes]
+        if len(set(node_uuids)) != len(node_uuids):
+            raise ValueError("Nodes to add have duplicate UUIDs")
+        for node_uuid in self._get_stored_nodes(node_uuids):
+            raise ValueError(f"Node with UUID {node_uuid} already exists")
+
+        node_rows: list[tuple[str, str, str]] = []
+        node_label_rows: list[tuple[str, str]] = []
+        segment_embeddings: dict[tuple[str, str], list[tuple[UUID, list[float]]]] = {}
+        for node in nodes:
+            properties: dict[str, Property] = {}
+            for property_name, value in node.properties.items():
+                if not SegmentVectorGraphStore._is_embedding(value):
+                    properties[property_name] = value
+                    continue
+
+                for label in SegmentVectorGraphStore._segment_labels(node.labels):
+                    segment_embeddings.setdefault((label, property_name), []).append(
+                        (node.uuid, value)  # type: ignore[arg-type]
+                    )
+
+            node_rows.append(
+                (
+                    str(node.uuid),
+                    json.dumps(sorted(node.labels)),
+                    SegmentVectorGraphStore._serialize_properties(properties),
+                )
+            )
+            node_label_rows += [(label, str(node.uuid)) for label in node.labels]
+
+        # Validate before mutating so that a failed batch writes nothing.
+        segments = self._load_segments()
+        for segment_key, embeddings in segment_embeddings.items():
+            segment = segments.get(segment_key)
+            dimensions = (
+                segment.dimensions if segment is not None else len(embeddings[0][1])
+            )
+            for node_uuid, embedding in embeddings:
+                if len(embedding) != dimensions:
+                    raise ValueError(
+                        f"Embedding property {segment_key[1]} "
+                        f"of node {node_uuid} has {len(embedding)} dimensions, "
+                        f"but expected {dimensions} dimensions"
+                    )
+
+        appended_segments: list[tuple[_Segment, int]] = []
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            for (label, property_name), embeddings in segment_embeddings.items():
+                segment = segments.get((label, property_name))
+                if segment is None:
+                    segment = self._create_segment(
+                        label, property_name, len(embeddings[0][1])
+                    )
+
+                start_row = self._segment_row_count(segment)
+                appended_segments.append((segment, start_row))
+                self._append_segment_rows(segment, start_row, embeddings)
+
+                self._connection.executemany(
+                    "INSERT INTO embeddings (uuid, segment_id, row_index)\n"
+                    "VALUES (?, ?, ?)",
+                    [
+                        (str(node_uuid), segment.id, start_row + offset)
+                        for offset, (node_uuid, _) in enumerate(embeddings)
+                    ],
+                )
+
+            self._connection.executemany(
+                "INSERT INTO nodes (uuid, labels, properties) VALUES (?, ?, ?)",
+                node_rows,
+            )
+            self._connection.executemany(
+                "INSERT INTO node_labels (label, uuid) VALUES (?, ?)",
+                node_label_rows,
+            )
+
+            endpoint_nodes = self._get_stored_nodes(
+                {edge.source_uuid for edge in edges}
+                | {edge.target_uuid for edge in edges}
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO edges\n"
+                "(uuid, source_uuid, target_uuid, relation, properties)\n"
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        str(edge.uuid),
+                        str(edge.source_uuid),
+                        str(edge.target_uuid),
+                        edge.relation,
+                        SegmentVectorGraphStore._serialize_properties(edge.properties),
+                    )
+                    for edge in edges
+                    # Edges between missing nodes are ignored, as in Neo4j.
+                    if edge.source_uuid in endpoint_nodes
+                    and edge.target_uuid in endpoint_nodes
+                    and edge.source_labels <= endpoint_nodes[edge.source_uuid].labels
+                    and edge.target_labels <= endpoint_nodes[edge.target_uuid].labels
+                ],
+            )
+
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            for segment, start_row in appended_segments:
+                self._truncate_segment(segment, start_row)
+            raise
+        finally:
+            for segment, _ in appended_segments:
+                self._segment_arrays_cache.pop(segment.id, None)
+
+    def _delete_nodes(
+        self,
+        node_uuids: Collection[UUID],
+        required_labels: Collection[str] | None,
+    ):
+        nodes = self._get_stored_nodes(node_uuids)
+        deleted_node_uuids = [
+            str(node.uuid)
+            for node in nodes.values()
+            if set(required_labels or ()) <= node.labels
+        ]
+        if len(deleted_node_uuids) == 0:
+            return
+
+        deleted_rows: list[tuple[int, int]] = []
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            for chunk in SegmentVectorGraphStore._chunks(deleted_node_uuids):
+                placeholders = ", ".join("?" * len(chunk))
+                deleted_rows += self._connection.execute(
+                    "SELECT segment_id, row_index FROM embeddings\n"
+                    f"WHERE uuid IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                self._connection.execute(
+                    "DELETE FROM edges\n"
+                    f"WHERE source_uuid IN ({placeholders})\n"
+                    f"OR target_uuid IN ({placeholders})",
+                    chunk + chunk,
+                )
+                for table in ("embeddings", "node_labels", "nodes"):
+                    self._connection.execute(
+                        f"DELETE FROM {table} WHERE uuid IN ({placeholders})",
+                        chunk,
+                    )
+
+            deleted_row_counts: dict[int, int] = {}
+            for segment_id, _ in deleted_rows:
+                deleted_row_counts[segment_id] = (
+                    deleted_row_counts.get(segment_id, 0) + 1
+                )
+            self._connection.executemany(
+                "UPDATE segments SET deleted_rows = deleted_rows + ? WHERE id = ?",
+                [
+                    (deleted_row_count, segment_id)
+                    for segment_id, deleted_row_count in deleted_row_counts.items()
+                ],
+            )
+
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+
+        # Rows are zeroed only after commit.
+        # Rows left behind by a crash belong to deleted nodes,
+        # so searches skip them until the segment is compacted.
+        segments = {segment.id: segment for segment in self._load_segments().values()}
+        for segment_id, row_index in deleted_rows:
+            with open(
+                self._segment_uuids_path(segments[segment_id]), "r+b"
+            ) as uuids_file:
+                uuids_file.seek(row_index * _UUID_SIZE)
+                uuids_file.write(bytes(_UUID_SIZE))
+
+        for segment_id in {segment_id for segment_id, _ in deleted_rows}:
+            self._segment_arrays_cache.pop(segment_id, None)
+            segment = segments[segment_id]
+            if (
+                segment.deleted_rows
+                > self._compaction_threshold * self._segment_row_count(segment)
+            ):
+                self._compact_segment(segment)
+
+    def _compact_segment(self, segment: _Segment):
+        """
+        Rewrite a segment without its deleted rows
+        into files of the next generation.
+        """
+        live_rows = self._connection.execute(
+            "SELECT uuid, row_index FROM embeddings\n"
+            "WHERE segment_id = ?\n"
+            "ORDER BY row_index",
+            (segment.id,),
+        ).fetchall()
+
+        vectors, _ = self._segment_arrays(segment)
+        row_indexes = np.array(
+            [row_index for _, row_index in live_rows], dtype=np.int64
+        )
+
+        compacted_segment = _Segment(
+            id=segment.id,
+            label=segment.label,
+            property_name=segment.property_name,
+            dimensions=segment.dimensions,
+            generation=segment.generation + 1,
+            deleted_rows=0,
+        )
+        with open(self._segment_vectors_path(compacted_segment), "wb") as vectors_file:
+            vectors_file.write(vectors[row_indexes].tobytes())
+        with open(self._segment_uuids_path(compacted_segment), "wb") as uuids_file:
+            uuids_file.write(
+                b"".join(UUID(node_uuid).bytes for node_uuid, _ in live_rows)
+            )
+
+        # The new generation takes effect on commit,
+        # so a crash leaves either generation intact.
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._connection.executemany(
+                "UPDATE embeddings SET row_index = ?\n"
+                "WHERE uuid = ? AND segment_id = ?",
+                [
+                    (new_row_index, node_uuid, segment.id)
+                    for new_row_index, (node_uuid, _) in enumerate(live_rows)
+                ],
+            )
+            self._connection.execute(
+                "UPDATE segments SET generation = ?, deleted_rows = 0 WHERE id = ?",
+                (compacted_segment.generation, segment.id),
+            )
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            self._remove_segment_files(compacted_segment)
+            raise
+
+        self._segment_arrays_cache.pop(segment.id, None)
+        self._remove_segment_files(segment)
+
+    def _search_similar_stored_nodes(
+        self,
+        query_embedding: list[float],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric,
+        limit: int | None,
+        required_labels: Collection[str] | None,
+        required_properties: Mapping[str, Property],
+        include_missing_properties: bool,
+        min_score: float | None,
+    ) -> list[tuple[Node, float]]:
+        if limit is not None and limit <= 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+
+        # Nodes with all required labels are in the segment of any one of them.
+        segments = [
+            segment
+            for (label, property_name), segment in self._load_segments().items()
+            if property_name == embedding_property_name
+            and (not required_labels or label == min(required_labels))
+        ]
+
+        segment_scores: list[np.ndarray] = []
+        segment_uuids: list[np.ndarray] = []
+        for segment in segments:
+            vectors, uuids = self._segment_arrays(segment)
+            if len(vectors) == 0:
+                continue
+
+            if segment.dimensions != query.shape[0]:
+                raise ValueError(
+                    f"Query embedding has {query.shape[0]} dimensions, "
+                    f"but property {embedding_property_name} "
+                    f"has {segment.dimensions} dimensions"
+                )
+
+            scores = SegmentVectorGraphStore._similarities(
+                vectors, query, similarity_metric
+            )
+            # Deleted rows have zeroed UUIDs.
+            scores[~uuids.any(axis=1)] = -np.inf
+
+            segment_scores.append(scores)
+            segment_uuids.append(uuids)
+
+        if len(segment_scores) == 0:
+            return []
+
+        scores = np.concatenate(segment_scores)
+        uuids = np.concatenate(segment_uuids)
+
+        # Without filters or duplicates, only the top rows can be returned.
+        is_unfiltered = (
+            len(segment_scores) == 1
+            and (required_labels is None or len(required_labels) <= 1)
+            and len(required_properties) == 0
+        )
+        if is_unfiltered and limit is not None and limit < len(scores):
+            top_rows = np.argpartition(-scores, limit - 1)[:limit]
+            ordered_rows = top_rows[np.argsort(-scores[top_rows], kind="stable")]
+        else:
+            ordered_rows = np.argsort(-scores, kind="stable")
+
+        # Look up candidate nodes in chunks of rows in similarity order.
+        similar_nodes: list[tuple[Node, float]] = []
+        seen_uuids: set[UUID] = set()
+        chunk_size = max(limit or 0, 64)
+        for chunk_start in range(0, len(ordered_rows), chunk_size):
+            is_exhausted = False
+            candidates: list[tuple[UUID, float]] = []
+            for row in ordered_rows[chunk_start : chunk_start + chunk_size]:
+                score = float(scores[row])
+                if score == -np.inf or (min_score is not None and score < min_score):
+                    is_exhausted = True
+                    break
+
+                node_uuid = UUID(bytes=uuids[row].tobytes())
+                if node_uuid not in seen_uuids:
+                    seen_uuids.add(node_uuid)
+                    candidates.append((node_uuid, score))
+
+            candidate_nodes = self._get_stored_nodes(
+                [node_uuid for node_uuid, _ in candidates]
+            )
+            for node_uuid, score in candidates:
+                node = candidate_nodes.get(node_uuid)
+                if node is None or not SegmentVectorGraphStore._node_matches(
+                    node,
+                    required_labels,
+                    required_properties,
+                    include_missing_properties,
+                ):
+                    continue
+
+                similar_nodes.append((node, score))
+                if limit is not None and len(similar_nodes) >= limit:
+                    return similar_nodes
+
+            if is_exhausted:
+                break
+
+        return similar_nodes
+
+    def _get_stored_nodes(self, node_uuids: Iterable[UUID]) -> dict[UUID, Node]:
+        """
+        Get stored nodes, without their embedding properties, by UUID.
+        """
+        stored_nodes: dict[UUID, Node] = {}
+        for chunk in SegmentVectorGraphStore._chunks(
+            [str(node_uuid) for node_uuid in node_uuids]
+        ):
+            for row in self._connection.execute(
+                "SELECT uuid, labels, properties FROM nodes\n"
+                f"WHERE uuid IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ):
+                node = SegmentVectorGraphStore._node_from_row(row)
+                stored_nodes[node.uuid] = node
+
+        return stored_nodes
+
+    def _iterate_stored_nodes(
+        self, required_labels: Collection[str] | None
+    ) -> Iterator[Node]:
+        """
+        Iterate over stored nodes, without their embedding properties,
+        that may have all required labels.
+        """
+        if not required_labels:
+            rows = self._connection.execute(
+                "SELECT uuid, labels, properties FROM nodes"
+            )
+        else:
+            rows = self._connection.execute(
+                "SELECT nodes.uuid, nodes.labels, nodes.properties\n"
+                "FROM node_labels JOIN nodes ON nodes.uuid = node_labels.uuid\n"
+                "WHERE node_labels.label = ?",
+                (min(required_labels),),
+            )
+
+        for row in rows:
+            yield SegmentVectorGraphStore._node_from_row(row)
+
+    def _output_nodes(
+        self,
+        nodes: list[Node],
+        include_properties: Collection[str] | None,
+        exclude_properties: Collection[str] | None,
+    ) -> list[Node]:
+        """
+        Project the properties of stored nodes
+        and restore their embedding properties.
+        """
+
+        def is_projected(property_name: str) -> bool:
+            if include_properties is not None:
+                return property_name in include_properties
+            if exclude_properties is not None:
+                return property_name not in exclude_properties
+            return True
+
+        output_nodes = [
+            Node(
+                uuid=node.uuid,
+                labels=node.labels,
+                properties={
+                    property_name: value
+                    for property_name, value in node.properties.items()
+                    if is_projected(property_name)
+                },
+            )
+            for node in nodes
+        ]
+
+        segments = {
+            segment.id: segment
+            for segment in self._load_segments().values()
+            if is_projected(segment.property_name)
+        }
+        if len(output_nodes) == 0 or len(segments) == 0:
+            return output_nodes
+
+        output_nodes_by_uuid = {node.uuid: node for node in output_nodes}
+        for chunk in SegmentVectorGraphStore._chunks(
+            [str(node.uuid) for node in output_nodes]
+        ):
+            for node_uuid, segment_id, row_index in self._connection.execute(
+                "SELECT uuid, segment_id, row_index FROM embeddings\n"
+                f"WHERE uuid IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ):
+                segment = segments.get(segment_id)
+                if segment is None:
+                    continue
+
+                vectors, _ = self._segment_arrays(segment)
+                output_nodes_by_uuid[UUID(node_uuid)].properties[
+                    segment.property_name
+                ] = vectors[row_index].tolist()
+
+        return output_nodes
+
+    def _load_segments(self) -> dict[tuple[str, str], _Segment]:
+        return {
+            (label, property_name): _Segment(
+                id=segment_id,
+                label=label,
+                property_name=property_name,
+                dimensions=dimensions,
+                generation=generation,
+                deleted_rows=deleted_rows,
+            )
+            for (
+                segment_id,
+                label,
+                property_name,
+                dimensions,
+                generation,
+                deleted_rows,
+            ) in self._connection.execute(
+                "SELECT id, label, property_name, dimensions, generation, deleted_rows\n"
+                "FROM segments"
+            )
+        }
+
+    def _create_segment(
+        self, label: str, property_name: str, dimensions: int
+    ) -> _Segment:
+        cursor = self._connection.execute(
+            "INSERT INTO segments (label, property_name, dimensions)\nVALUES (?, ?, ?)",
+            (label, property_name, dimensions),
+        )
+        segment = _Segment(
+            id=cast(int, cursor.lastrowid),
+            label=label,
+            property_name=property_name,
+            dimensions=dimensions,
+            generation=0,
+            deleted_rows=0,
+        )
+
+        # Files may be left behind by a rolled back segment with the same ID.
+        self._truncate_segment(segment, 0)
+        return segment
+
+    def _segment_arrays(self, segment: _Segment) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get memory maps of the vectors and UUIDs of a segment.
+        """
+        cached_arrays = self._segment_arrays_cache.get(segment.id)
+        if cached_arrays is not None:
+            return cached_arrays
+
+        row_count = self._segment_row_count(segment)
+        if row_count == 0:
+            segment_arrays = (
+                np.empty((0, segment.dimensions), dtype=np.float32),
+                np.empty((0, _UUID_SIZE), dtype=np.uint8),
+            )
+        else:
+            segment_arrays = (
+                np.memmap(
+                    self._segment_vectors_path(segment),
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(row_count, segment.dimensions),
+                ),
+                np.memmap(
+                    self._segment_uuids_path(segment),
+                    dtype=np.uint8,
+                    mode="r",
+                    shape=(row_count, _UUID_SIZE),
+                ),
+            )
+
+        self._segment_arrays_cache[segment.id] = segment_arrays
+        return segment_arrays
+
+    def _segment_row_count(self, segment: _Segment) -> int:
+        """
+        Get the number of complete rows in a segment.
+        A crash during an append may leave a partial row behind.
+        """
+        try:
+            return min(
+                os.path.getsize(self._segment_vectors_path(segment))
+                // (4 * segment.dimensions),
+                os.path.getsize(self._segment_uuids_path(segment)) // _UUID_SIZE,
+            )
+        except FileNotFoundError:
+            return 0
+
+    def _append_segment_rows(
+        self,
+        segment: _Segment,
+        start_row: int,
+        embeddings: list[tuple[UUID, list[float]]],
+    ):
+        self._truncate_segment(segment, start_row)
+
+        with open(self._segment_vectors_path(segment), "ab") as vectors_file:
+            vectors_file.write(
+                np.asarray(
+                    [embedding for _, embedding in embeddings], dtype=np.float32
+                ).tobytes()
+            )
+        with open(self._segment_uuids_path(segment), "ab") as uuids_file:
+            uuids_file.write(b"".join(node_uuid.bytes for node_uuid, _ in embeddings))
+
+    def _truncate_segment(self, segment: _Segment, row_count: int):
+        self._segment_arrays_cache.pop(segment.id, None)
+
+        for path, row_size in (
+            (self._segment_vectors_path(segment), 4 * segment.dimensions),
+            (self._segment_uuids_path(segment), _UUID_SIZE),
+        ):
+            with open(path, "ab") as segment_file:
+                segment_file.truncate(row_count * row_size)
+
+    def _remove_segment_files(self, segment: _Segment):
+        for path in (
+            self._segment_vectors_path(segment),
+            self._segment_uuids_path(segment),
+        ):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _segment_vectors_path(self, segment: _Segment) -> str:
+        return os.path.join(
+            self._directory, f"segment_{segment.id}_{segment.generation}.vectors"
+        )
+
+    def _segment_uuids_path(self, segment: _Segment) -> str:
+        return os.path.join(
+            self._directory, f"segment_{segment.id}_{segment.generation}.uuids"
+        )
+
+    @staticmethod
+    def _node_from_row(row: tuple[str, str, str]) -> Node:
+        node_uuid, labels, properties = row
+        return Node(
+            uuid=UUID(node_uuid),
+            labels=set(json.loads(labels)),
+            properties=SegmentVectorGraphStore._deserialize_properties(properties),
+        )
+
+    @staticmethod
+    def _serialize_properties(properties: Mapping[str, Property]) -> str:
+        """
+        Serialize properties to JSON,
+        with datetimes as objects holding their ISO format.
+        """
+
+        def serialize_value(value: Any) -> Any:
+            if isinstance(value, datetime):
+                return {"datetime": value.isoformat()}
+            if isinstance(value, list):
+                return [serialize_value(element) for element in value]
+            return value
+
+        return json.dumps(
+            {
+                property_name: serialize_value(value)
+                for property_name, value in properties.items()
+            }
+        )
+
+    @staticmethod
+    def _deserialize_properties(properties: str) -> dict[str, Property]:
+        """
+        Deserialize properties serialized by _serialize_properties.
+        """
+
+        def deserialize_value(value: Any) -> Any:
+            if isinstance(value, dict):
+                return datetime.fromisoformat(value["datetime"])
+            if isinstance(value, list):
+                return [deserialize_value(element) for element in value]
+            return value
+
+        return {
+            property_name: deserialize_value(value)
+            for property_name, value in json.loads(properties).items()
+        }
+
+    @staticmethod
+    def _node_matches(
+        node: Node,
+        required_labels: Collection[str] | None,
+        required_properties: Mapping[str, Property],
+        include_missing_properties: bool,
+    ) -> bool:
+        if required_labels is not None and not set(required_labels) <= node.labels:
+            return False
+
+        for property_name, required_value in required_properties.items():
+            if property_name in node.properties:
+                if node.properties[property_name] != required_value:
+                    return False
+            elif not include_missing_properties:
+                return False
+
+        return True
+
+    @staticmethod
+    def _take_matching_nodes(
+        nodes: Iterable[Node],
+        limit: int | None,
+        required_labels: Collection[str] | None,
+        required_properties: Mapping[str, Property],
+        include_missing_properties: bool,
+    ) -> list[Node]:
+        matching_nodes: list[Node] = []
+        for node in nodes:
+            if limit is not None and len(matching_nodes) >= limit:
+                break
+
+            if SegmentVectorGraphStore._node_matches(
+                node,
+                required_labels,
+                required_properties,
+                include_missing_properties,
+            ):
+                matching_nodes.append(node)
+
+        return matching_nodes
+
+    @staticmethod
+    def _is_embedding(value: Property) -> bool:
+        return (
+            isinstance(value, list)
+            and len(value) > 0
+            and all(type(element) is float for element in value)
+        )
+
+    @staticmethod
+    def _segment_labels(labels: Collection[str]) -> list[str]:
+        """
+        Get the labels of the segments
+        storing an embedding property of a node with the given labels.
+        """
+        return sorted(labels) if labels else [_NO_LABEL]
+
+    @staticmethod
+    def _chunks(values: list[T]) -> Iterator[list[T]]:
+        for start in range(0, len(values), _MAX_QUERY_PARAMETERS):
+            yield values[start : start + _MAX_QUERY_PARAMETERS]
+
+    @staticmethod
+    def _similarities(
+        vectors: np.ndarray,
+        query: np.ndarray,
+        similarity_metric: SimilarityMetric,
+    ) -> np.ndarray:
+        """
+        Compute similarity scores of vectors to the query embedding.
+        """
+        match similarity_metric:
+            case SimilarityMetric.EUCLIDEAN:
+                squared_distances = np.sum(np.square(vectors - query), axis=1)
+                return 1 / (1 + squared_distances)
+            case _:
+                norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+                cosine_similarities = np.divide(
+                    vectors @ query,
+                    norms,
+                    out=np.zeros_like(norms),
+                    where=norms > 0,
+                )
+                return (1 + cosine_similarities) / 2
@@ -5,14 +5,15 @@ Defines the interface for adding, searching,
 and deleting nodes and edges.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from collections.abc import Collection, Mapping
+from collections.abc import Collection, Mapping, Sequence
 from typing import Any
 from uuid import UUID
 
 from memmachine.common.embedder import SimilarityMetric
 
-from .data_types import Edge, Node, Property
+from .data_types import Edge, Node, Property, TraversalStep
 
 
 class VectorGraphStore(ABC):
@@ -40,6 +41,27 @@ class VectorGraphStore(ABC):
         """
         raise NotImplementedError
 
+    async def write_batch(
+        self,
+        nodes: Collection[Node],
+        edges: Collection[Edge],
+    ):
+        """
+        Add nodes and edges to the graph store together.
+        Nodes are added before edges,
+        so edges may reference nodes in the same batch.
+
+        Implementations should override this method
+        to write the whole batch atomically in a single transaction.
+        The default implementation calls add_nodes and then add_edges.
+
+        Args:
+            nodes (Collection[Node]): Collection of Node objects to add.
+            edges (Collection[Edge]): Collection of Edge objects to add.
+        """
+        await self.add_nodes(nodes)
+        await self.add_edges(edges)
+
     @abstractmethod
     async def search_similar_nodes(
         self,
@@ -50,6 +72,9 @@ class VectorGraphStore(ABC):
         required_labels: Collection[str] | None = None,
         required_properties: Mapping[str, Property] = {},
         include_missing_properties: bool = False,
+        min_score: float | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
     ) -> list[Node]:
         """
         Search for nodes with embeddings similar to the query embedding.
@@ -77,6 +102,15 @@ class VectorGraphStore(ABC):
             include_missing_properties (bool, optional):
                 If True, nodes missing any of the required properties
                 will also be included in the results.
+            min_score (float | None, optional):
+                Minimum similarity score of the nodes to return.
+                If None, no score cutoff is applied (default: None).
+            include_properties (Collection[str] | None, optional):
+                Collection of property names to return for each node.
+                If None, all properties are returned.
+            exclude_properties (Collection[str] | None, optional):
+                Collection of property names not to return for each node.
+                If None, no properties are excluded.
 
         Returns:
             list[Node]:
@@ -85,6 +119,352 @@ class VectorGraphStore(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def search_similar_nodes_with_scores(
+        self,
+        query_embedding: list[float],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric = SimilarityMetric.COSINE,
+        limit: int | None = 100,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        min_score: float | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[tuple[Node, float]]:
+        """
+        Search for nodes with embeddings similar to the query embedding,
+        returning their similarity scores.
+        Higher scores indicate greater similarity.
+
+        Args:
+            query_embedding (list[float]):
+                The embedding vector to compare against.
+            embedding_property_name (str):
+                The name of the property
+                that stores the embedding vector.
+            similarity_metric (SimilarityMetric, optional):
+                The similarity metric to use
+                (default: SimilarityMetric.COSINE).
+            limit (int | None, optional):
+                Maximum number of similar nodes to return.
+                If None, return as many similar nodes as possible
+                (default: 100).
+            required_labels (Collection[str] | None, optional):
+                Collection of labels that the nodes must have.
+                If None, no label filtering is applied.
+            required_properties (Mapping[str, Property], optional):
+                Mapping of property names to their required values
+                that the nodes must have.
+                If empty, no property filtering is applied.
+            include_missing_properties (bool, optional):
+                If True, nodes missing any of the required properties
+                will also be included in the results.
+            min_score (float | None, optional):
+                Minimum similarity score of the nodes to return.
+                If None, no score cutoff is applied (default: None).
+            include_properties (Collection[str] | None, optional):
+                Collection of property names to return for each node.
+                If None, all properties are returned.
+            exclude_properties (Collection[str] | None, optional):
+                Collection of property names not to return for each node.
+                If None, no properties are excluded.
+
+        Returns:
+            list[tuple[Node, float]]:
+                List of Node objects
+                that are similar to the query embedding
+                paired with their similarity scores,
+                in descending order of similarity.
+        """
+        raise NotImplementedError
+
+    async def search_similar_anchored_contexts(
+        self,
+        query_embedding: list[float],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric = SimilarityMetric.COSINE,
+        limit: int | None = 100,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        min_score: float | None = None,
+        anchor_path: Sequence[TraversalStep] = (),
+        context_step: TraversalStep | None = None,
+        context_limit: int | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[tuple[Node, list[Node]]]:
+        """
+        Search for nodes with embeddings similar to the query embedding,
+        traverse from them to anchor nodes,
+        and retrieve the context (related nodes) of each anchor node.
+
+        Implementations should override this method
+        to perform the whole search in as few round trips as possible.
+        The default implementation composes
+        search_similar_nodes and search_related_nodes.
+
+        Args:
+            query_embedding (list[float]):
+                The embedding vector to compare against.
+            embedding_property_name (str):
+                The name of the property
+                that stores the embedding vector.
+            similarity_metric (SimilarityMetric, optional):
+                The similarity metric to use
+                (default: SimilarityMetric.COSINE).
+            limit (int | None, optional):
+                Maximum number of similar nodes to start traversal from.
+                If None, use as many similar nodes as possible
+                (default: 100).
+            required_labels (Collection[str] | None, optional):
+                Collection of labels that the similar nodes must have.
+                If None, no label filtering is applied.
+            required_properties (Mapping[str, Property], optional):
+                Mapping of property names to their required values
+                that the similar nodes must have.
+                If empty, no property filtering is applied.
+            include_missing_properties (bool, optional):
+                If True, similar nodes missing any of the required properties
+                will also be included.
+            min_score (float | None, optional):
+                Minimum similarity score of the similar nodes
+                to start traversal from.
+                If None, no score cutoff is applied (default: None).
+            anchor_path (Sequence[TraversalStep], optional):
+                Sequence of traversal steps leading
+                from the similar nodes to the anchor nodes.
+                If empty, the similar nodes are the anchor nodes
+                (default: ()).
+            context_step (TraversalStep | None, optional):
+                Traversal step leading from each anchor node
+                to its context nodes.
+                If None, contexts are empty (default: None).
+            context_limit (int | None, optional):
+                Maximum number of context nodes per anchor node.
+                If None, return as many context nodes as possible
+                (default: None).
+            include_properties (Collection[str] | None, optional):
+                Collection of property names to return for each returned node.
+                If None, all properties are returned.
+            exclude_properties (Collection[str] | None, optional):
+                Collection of property names not to return for each returned node.
+                If None, no properties are excluded.
+
+        Returns:
+            list[tuple[Node, list[Node]]]:
+                List of distinct anchor nodes paired with their context nodes,
+                ordered by decreasing similarity of the best similar node
+                from which each anchor node was reached.
+        """
+        # Only anchor and context nodes are returned,
+        # so fetch no properties for intermediate nodes.
+        frontier_nodes = await self.search_similar_nodes(
+            query_embedding=query_embedding,
+            embedding_property_name=embedding_property_name,
+            similarity_metric=similarity_metric,
+            limit=limit,
+            required_labels=required_labels,
+            required_properties=required_properties,
+            include_missing_properties=include_missing_properties,
+            min_score=min_score,
+            include_properties=include_properties if not anchor_path else (),
+            exclude_properties=exclude_properties if not anchor_path else None,
+        )
+
+        frontier_labels = required_labels
+        for index, step in enumerate(anchor_path):
+            is_last_step = index == len(anchor_path) - 1
+            search_related_nodes_tasks = [
+                self.search_related_nodes(
+                    node_uuid=frontier_node.uuid,
+                    allowed_relations=step.allowed_relations,
+                    find_sources=step.find_sources,
+                    find_targets=step.find_targets,
+                    required_labels=step.required_labels,
+                    required_properties=step.required_properties,
+                    include_missing_properties=step.include_missing_properties,
+                    node_labels=frontier_labels,
+                    include_properties=include_properties if is_last_step else (),
+                    exclude_properties=exclude_properties if is_last_step else None,
+                )
+                for frontier_node in frontier_nodes
+            ]
+            frontier_labels = step.required_labels
+
+            frontier_nodes = [
+                related_node
+                for related_nodes in await asyncio.gather(*search_related_nodes_tasks)
+                for related_node in related_nodes
+            ]
+
+        # Deduplicate while preserving similarity order.
+        anchor_nodes = list(dict.fromkeys(frontier_nodes))
+
+        if context_step is None:
+            return [(anchor_node, []) for anchor_node in anchor_nodes]
+
+        search_context_nodes_tasks = [
+            self.search_related_nodes(
+                node_uuid=anchor_node.uuid,
+                allowed_relations=context_step.allowed_relations,
+                find_sources=context_step.find_sources,
+                find_targets=context_step.find_targets,
+                limit=context_limit,
+                required_labels=context_step.required_labels,
+                required_properties=context_step.required_properties,
+                include_missing_properties=context_step.include_missing_properties,
+                node_labels=frontier_labels,
+                include_properties=include_properties,
+                exclude_properties=exclude_properties,
+            )
+            for anchor_node in anchor_nodes
+        ]
+
+        anchor_contexts = await asyncio.gather(*search_context_nodes_tasks)
+        return list(zip(anchor_nodes, anchor_contexts))
+
+    async def search_similar_anchored_contexts_many(
+        self,
+        query_embeddings: Sequence[list[float]],
+        embedding_property_name: str,
+        similarity_metric: SimilarityMetric = SimilarityMetric.COSINE,
+        limit: int | None = 100,
+        required_labels: Collection[str] | None = None,
+        required_properties: Mapping[str, Property] = {},
+        include_missing_properties: bool = False,
+        min_score: float | None = None,
+        anchor_path: Sequence[TraversalStep] = (),
+        context_step: TraversalStep | None = None,
+        context_limit: int | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
+    ) -> list[list[tuple[Node, list[Node]]]]:
+        """
+        Search for the anchored contexts of several query embeddings,
+        like search_similar_anchored_contexts for each query embedding.
+        Nodes matched by several query embeddings are traversed
+        and expanded once.
+
+        Implementations should override this method
+        to perform the whole search in as few round trips as possible.
+        The default implementation composes
+        search_similar_nodes and search_related_nodes.
+
+        Args:
+            query_embeddings (Sequence[list[float]]):
+                The embedding vectors to compare against.
+            See search_similar_anchored_contexts for the other arguments.
+
+        Returns:
+            list[list[tuple[Node, list[Node]]]]:
+                For each query embedding, in order,
+                the result of search_similar_anchored_contexts.
+        """
+        queries_frontier_nodes = await asyncio.gather(
+            *[
+                self.search_similar_nodes(
+                    query_embedding=query_embedding,
+                    embedding_property_name=embedding_property_name,
+                    similarity_metric=similarity_metric,
+                    limit=limit,
+                    required_labels=required_labels,
+                    required_properties=required_properties,
+                    include_missing_properties=include_missing_properties,
+                    min_score=min_score,
+                    include_properties=include_properties if not anchor_path else (),
+                    exclude_properties=(
+                        exclude_properties if not anchor_path else None
+                    ),
+                )
+                for query_embedding in query_embeddings
+            ]
+        )
+
+        async def search_related_nodes_once(
+            nodes: list[Node], **kwargs: Any
+        ) -> dict[UUID, list[Node]]:
+            distinct_nodes = list(dict.fromkeys(nodes))
+            related_nodes = await asyncio.gather(
+                *[
+                    self.search_related_nodes(node_uuid=node.uuid, **kwargs)
+                    for node in distinct_nodes
+                ]
+            )
+            return {
+                node.uuid: node_related_nodes
+                for node, node_related_nodes in zip(distinct_nodes, related_nodes)
+            }
+
+        frontier_labels = required_labels
+        for index, step in enumerate(anchor_path):
+            is_last_step = index == len(anchor_path) - 1
+            related_nodes_by_uuid = await search_related_nodes_once(
+                [
+                    frontier_node
+                    for frontier_nodes in queries_frontier_nodes
+                    for frontier_node in frontier_nodes
+                ],
+                allowed_relations=step.allowed_relations,
+                find_sources=step.find_sources,
+                find_targets=step.find_targets,
+                required_labels=step.required_labels,
+                required_properties=step.required_properties,
+                include_missing_properties=step.include_missing_properties,
+                node_labels=frontier_labels,
+                include_properties=include_properties if is_last_step else (),
+                exclude_properties=exclude_properties if is_last_step else None,
+            )
+            frontier_labels = step.required_labels
+
+            queries_frontier_nodes = [
+                [
+                    related_node
+                    for frontier_node in frontier_nodes
+                    for related_node in related_nodes_by_uuid[frontier_node.uuid]
+                ]
+                for frontier_nodes in queries_frontier_nodes
+            ]
+
+        # Deduplicate while preserving similarity order.
+        queries_anchor_nodes = [
+            list(dict.fromkeys(frontier_nodes))
+            for frontier_nodes in queries_frontier_nodes
+        ]
+
+        if context_step is None:
+            return [
+                [(anchor_node, []) for anchor_node in anchor_nodes]
+                for anchor_nodes in queries_anchor_nodes
+            ]
+
+        context_nodes_by_uuid = await search_related_nodes_once(
+            [
+                anchor_node
+                for anchor_nodes in queries_anchor_nodes
+                for anchor_node in anchor_nodes
+            ],
+            allowed_relations=context_step.allowed_relations,
+            find_sources=context_step.find_sources,
+            find_targets=context_step.find_targets,
+            limit=context_limit,
+            required_labels=context_step.required_labels,
+            required_properties=context_step.required_properties,
+            include_missing_properties=context_step.include_missing_properties,
+            node_labels=frontier_labels,
+            include_properties=include_properties,
+            exclude_properties=exclude_properties,
+        )
+        return [
+            [
+                (anchor_node, context_nodes_by_uuid[anchor_node.uuid])
+                for anchor_node in anchor_nodes
+            ]
+            for anchor_nodes in queries_anchor_nodes
+        ]
+
     @abstractmethod
     async def search_related_nodes(
         self,
@@ -96,6 +476,9 @@ class VectorGraphStore(ABC):
         required_labels: Collection[str] | None = None,
         required_properties: Mapping[str, Property] = {},
         include_missing_properties: bool = False,
+        node_labels: Collection[str] | None = None,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
     ) -> list[Node]:
         """
         Search for nodes related to the specified node via edges.
@@ -128,6 +511,16 @@ class VectorGraphStore(ABC):
             include_missing_properties (bool, optional):
                 If True, nodes missing any of the required properties
                 will also be included in the results.
+            node_labels (Collection[str] | None, optional):
+                Collection of labels that the specified node has,
+                used to look up the specified node efficiently.
+                If None, the specified node is looked up by UUID alone.
+            include_properties (Collection[str] | None, optional):
+                Collection of property names to return for each node.
+                If None, all properties are returned.
+            exclude_properties (Collection[str] | None, optional):
+                Collection of property names not to return for each node.
+                If None, no properties are excluded.
 
         Returns:
             list[Node]:
@@ -147,6 +540,8 @@ class VectorGraphStore(ABC):
         required_labels: Collection[str] | None = None,
         required_properties: Mapping[str, Property] = {},
         include_missing_properties: bool = False,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
     ) -> list[Node]:
         """
         Search for nodes ordered by a specific property.
@@ -178,6 +573,12 @@ class VectorGraphStore(ABC):
             include_missing_properties (bool, optional):
                 If True, nodes missing any of the required properties
                 will also be included in the results.
+            include_properties (Collection[str] | None, optional):
+                Collection of property names to return for each node.
+                If None, all properties are returned.
+            exclude_properties (Collection[str] | None, optional):
+                Collection of property names not to return for each node.
+                If None, no properties are excluded.
 
         Returns:
             list[Node]:
@@ -192,6 +593,8 @@ class VectorGraphStore(ABC):
         required_labels: Collection[str] | None = None,
         required_properties: Mapping[str, Property] = {},
         include_missing_properties: bool = False,
+        include_properties: Collection[str] | None = None,
+        exclude_properties: Collection[str] | None = None,
     ) -> list[Node]:
         """
         Search for nodes matching the specified labels and properties.
@@ -211,6 +614,12 @@ class VectorGraphStore(ABC):
             include_missing_properties (bool, optional):
                 If True, nodes missing any of the required properties
                 will also be included in the results.
+            include_properties (Collection[str] | None, optional):
+                Collection of property names to return for each node.
+                If None, all properties are returned.
+            exclude_properties (Collection[str] | None, optional):
+                Collection of property names not to return for each node.
+                If None, no properties are excluded.
 
         Returns:
             list[Node]:
@@ -222,6 +631,7 @@ class VectorGraphStore(ABC):
     async def delete_nodes(
         self,
         node_uuids: Collection[UUID],
+        required_labels: Collection[str] | None = None,
     ):
         """
         Delete nodes from the graph store.
@@ -229,6 +639,10 @@ class VectorGraphStore(ABC):
         Args:
             node_uuids (Collection[UUID]):
                 Collection of UUIDs of the nodes to delete.
+            required_labels (Collection[str] | None, optional):
+                Collection of labels that the nodes must have
+                to be deleted, used to look up the nodes efficiently.
+                If None, no label filtering is applied.
         """
         raise NotImplementedError
 
@@ -22,7 +22,7 @@ class VectorGraphStoreBuilder(Builder):
         dependency_ids: set[str] = set()
 
         match name:
-            case "neo4j":
+            case "neo4j" | "in-memory" | "segment":
                 pass
 
         return dependency_ids
@@ -67,5 +67,21 @@ class VectorGraphStoreBuilder(Builder):
                         force_exact_similarity_search=factory_params.force_exact_similarity_search,
                     )
                 )
+            case "in-memory":
+                from .in_memory_vector_graph_store import (
+                    InMemoryVectorGraphStore,
+                    InMemoryVectorGraphStoreParams,
+                )
+
+                return InMemoryVectorGraphStore(
+                    InMemoryVectorGraphStoreParams(**config)
+                )
+            case "segment":
+                from .segment_vector_graph_store import (
+                    SegmentVectorGraphStore,
+                    SegmentVectorGraphStoreParams,
+                )
+
+                return SegmentVectorGraphStore(SegmentVectorGraphStoreParams(**config))
             case _:
                 raise ValueError(f"Unknown VectorGraphStore name: {name}")
@@ -18,7 +18,12 @@ from pydantic import BaseModel, Field, InstanceOf
 from memmachine.common.data_types import ExternalServiceAPIError
 from memmachine.common.embedder.embedder import Embedder
 from memmachine.common.reranker.reranker import Reranker
-from memmachine.common.vector_graph_store import Edge, Node, VectorGraphStore
+from memmachine.common.vector_graph_store import (
+    Edge,
+    Node,
+    TraversalStep,
+    VectorGraphStore,
+)
 
 from .data_types import (
     ContentType,
@@ -331,27 +336,15 @@ class DeclarativeMemory:
     ) -> list[Node]:
         """
         Process the result of derivative mutation
-        by embedding and creating nodes for the mutated derivatives.
+        by creating nodes for the mutated derivatives.
+        Embeddings are added to the nodes later in one batch.
         """
-        try:
-            mutated_derivative_embeddings = await self._embedder.ingest_embed(
-                [derivative.content for derivative in mutated_derivatives],
-                max_attempts=3,
-            )
-        except (ExternalServiceAPIError, ValueError, RuntimeError):
-            logger.error("Failed to create embeddings for mutated derivatives")
-            return []
-
         mutated_derivative_nodes = [
             Node(
                 uuid=derivative.uuid,
                 labels={self._derivative_collection},
                 properties={
                     "content": derivative.content,
-                    DeclarativeMemory._embedding_property_name(
-                        self._embedder.model_id,
-                        self._embedder.dimensions,
-                    ): derivative_embedding,
                     "timestamp": derivative.timestamp,
                     "user_metadata": json.dumps(derivative.user_metadata),
                 }
@@ -360,9 +353,7 @@ class DeclarativeMemory:
                     for key, value in derivative.filterable_properties.items()
                 },
             )
-            for derivative, derivative_embedding in zip(
-                mutated_derivatives, mutated_derivative_embeddings
-            )
+            for derivative in mutated_derivatives
         ]
         return mutated_derivative_nodes
 
@@ -420,6 +411,8 @@ class DeclarativeMemory:
                 source_uuid=episode_cluster.uuid,
                 target_uuid=episode.uuid,
                 relation=self._episode_cluster_episode_relation,
+                source_labels={self._episode_cluster_collection},
+                target_labels={self._episode_collection},
             )
             for episode in episode_cluster.episodes
         ]
@@ -440,6 +433,8 @@ class DeclarativeMemory:
                 source_uuid=derivative_node.uuid,
                 target_uuid=episode_cluster_node.uuid,
                 relation=self._derivative_episode_cluster_relation,
+                source_labels={self._derivative_collection},
+                target_labels={self._episode_cluster_collection},
             )
             for derivative_node in derivative_nodes
         ]
@@ -461,30 +456,106 @@ class DeclarativeMemory:
         Args:
             episode (Episode): The episode to add.
         """
-        episode_node = Node(
-            uuid=episode.uuid,
-            labels={self._episode_collection},
-            properties={
-                "episode_type": episode.episode_type,
-                "content_type": episode.content_type.value,
-                "content": episode.content,
-                "timestamp": episode.timestamp,
-                "user_metadata": json.dumps(episode.user_metadata),
-            }
-            | {
-                mangle_filterable_property_key(key): value
-                for key, value in episode.filterable_properties.items()
-            },
-        )
+        await self.add_episodes([episode])
+
+    async def add_episodes(
+        self,
+        episodes: list[Episode],
+    ):
+        """
+        Add episodes to declarative memory.
+        Derivatives of all episodes are embedded together,
+        and all data is written in one batch.
 
-        await self._vector_graph_store.add_nodes([episode_node])
+        Args:
+            episodes (list[Episode]): The episodes to add.
+        """
+        if len(episodes) == 0:
+            return
+
+        episode_nodes = [
+            Node(
+                uuid=episode.uuid,
+                labels={self._episode_collection},
+                properties={
+                    "episode_type": episode.episode_type,
+                    "content_type": episode.content_type.value,
+                    "content": episode.content,
+                    "timestamp": episode.timestamp,
+                    "user_metadata": json.dumps(episode.user_metadata),
+                }
+                | {
+                    mangle_filterable_property_key(key): value
+                    for key, value in episode.filterable_properties.items()
+                },
+            )
+            for episode in episodes
+        ]
 
         # Create nodes and edges for episode clusters and derivatives.
-        derivation_nodes, derivation_edges = await self._derivation_workflow.execute(
-            episode
+        derivation_results = await asyncio.gather(
+            *[self._derivation_workflow.execute(episode) for episode in episodes]
         )
 
-        related_episodes = await self._related_episode_postulator.postulate(episode)
+        derivation_nodes = [
+            derivation_node
+            for episode_derivation_nodes, _ in derivation_results
+            for derivation_node in episode_derivation_nodes
+        ]
+        derivation_edges = [
+            derivation_edge
+            for _, episode_derivation_edges in derivation_results
+            for derivation_edge in episode_derivation_edges
+        ]
+
+        derivative_nodes = [
+            derivation_node
+            for derivation_node in derivation_nodes
+            if self._derivative_collection in derivation_node.labels
+        ]
+
+        # Embed all derivatives in one call.
+        if len(derivative_nodes) > 0:
+            try:
+                derivative_embeddings = await self._embedder.ingest_embed(
+                    [
+                        derivative_node.properties["content"]
+                        for derivative_node in derivative_nodes
+                    ],
+                    max_attempts=3,
+                )
+            except (ExternalServiceAPIError, ValueError, RuntimeError):
+                logger.error("Failed to create embeddings for mutated derivatives")
+
+                # Store episodes and episode clusters without derivatives.
+                derivative_uuids = {
+                    derivative_node.uuid for derivative_node in derivative_nodes
+                }
+                derivation_nodes = [
+                    derivation_node
+                    for derivation_node in derivation_nodes
+                    if derivation_node.uuid not in derivative_uuids
+                ]
+                derivation_edges = [
+                    derivation_edge
+                    for derivation_edge in derivation_edges
+                    if derivation_edge.source_uuid not in derivative_uuids
+                ]
+            else:
+                embedding_property_name = DeclarativeMemory._embedding_property_name(
+                    self._embedder.model_id,
+                    self._embedder.dimensions,
+                )
+                for derivative_node, derivative_embedding in zip(
+                    derivative_nodes, derivative_embeddings
+                ):
+                    derivative_node.properties[embedding_property_name] = (
+                        derivative_embedding
+                    )
+
+        episodes_related_episodes = (
+            await self._related_episode_postulator.postulate_batch(episodes)
+        )
 
         # Create postulated edges between episodes.
         related_episode_edges = [
@@ -493,13 +564,16 @@ class DeclarativeMemory:
                 source_uuid=episode.uuid,
                 target_uuid=related_episode.uuid,
                 relation=self._episode_episode_relation,
+                source_labels={self._episode_collection},
+                target_labels={self._episode_collection},
             )
+            for episode, related_episodes in zip(episodes, episodes_related_episodes)
             for related_episode in related_episodes
         ]
 
-        await self._vector_graph_store.add_nodes(derivation_nodes)
-        await self._vector_graph_store.add_edges(
-            derivation_edges + related_episode_edges
+        await self._vector_graph_store.write_batch(
+            episode_nodes + derivation_nodes,
+            derivation_edges + related_episode_edges,
         )
 
     async def search(
@@ -529,110 +603,147 @@ class DeclarativeMemory:
                 A list of episodes relevant to the query,
                 sorted by timestamp.
         """
+        return (
+            await self.search_many(
+                [query],
+                num_episodes_limit=num_episodes_limit,
+                property_filter=property_filter,
+            )
+        )[0]
+
+    async def search_many(
+        self,
+        queries: list[str],
+        num_episodes_limit: int = 20,
+        property_filter: dict[str, FilterablePropertyValue] = {},
+    ) -> list[list[Episode]]:
+        """
+        Search declarative memory for episodes relevant to each query.
+        The queries are embedded in one call,
+        and the graph store is searched for all of them together,
+        so that episodes matched by several queries are expanded once.
+        Contexts are reranked against each query separately.
+
+        Args:
+            queries (list[str]):
+                The search queries.
+            num_episodes_limit (int, optional):
+                The maximum number
+                of episodes to return per query (default: 20).
+            property_filter (
+                dict[str, FilterablePropertyValue], optional
+            ):
+                Filterable property keys and values to use
+                for filtering episodes.
+                If not provided, no filtering is applied.
+
+        Returns:
+            list[list[Episode]]:
+                For each query, in order,
+                a list of episodes relevant to the query,
+                sorted by timestamp.
+        """
+        if len(queries) == 0:
+            return []
 
-        # Embed query.
+        # Embed queries.
         try:
-            query_embedding = (
-                await self._embedder.search_embed(
-                    [query],
-                    max_attempts=3,
-                )
-            )[0]
+            query_embeddings = await self._embedder.search_embed(
+                queries,
+                max_attempts=3,
+            )
         except (ExternalServiceAPIError, ValueError, RuntimeError):
             logger.error("Failed to create embeddings for query derivatives")
-            return []
-
-        # Search graph store for vector matches.
-        matched_derivative_nodes = await self._vector_graph_store.search_similar_nodes(
-            query_embedding=query_embedding,
-            embedding_property_name=(
-                DeclarativeMemory._embedding_property_name(
-                    self._embedder.model_id,
-                    self._embedder.dimensions,
-                )
-            ),
-            similarity_metric=self._embedder.similarity_metric,
-            required_labels={self._derivative_collection},
-            required_properties={
-                mangle_filterable_property_key(key): value
-                for key, value in property_filter.items()
-            },
-            include_missing_properties=True,
-        )
+            return [[] for _ in queries]
+
+        # Search graph store for vector matches,
+        # traverse from matched derivatives to their source episodes,
+        # and expand the contexts of the source episodes in one round trip.
+        mangled_property_filter = {
+            mangle_filterable_property_key(key): value
+            for key, value in property_filter.items()
+        }
 
-        # Get source episode clusters of matched derivatives.
-        search_derivatives_source_episode_cluster_nodes_tasks = [
-            self._vector_graph_store.search_related_nodes(
-                node_uuid=matched_derivative_node.uuid,
-                allowed_relations={self._derivative_episode_cluster_relation},
-                find_sources=False,
-                find_targets=True,
-                required_labels={self._episode_cluster_collection},
-                required_properties={
-                    mangle_filterable_property_key(key): value
-                    for key, value in property_filter.items()
-                },
+        queries_anchored_episode_node_neighbors = (
+            await self._vector_graph_store.search_similar_anchored_contexts_many(
+                query_embeddings=query_embeddings,
+                embedding_property_name=(
+                    DeclarativeMemory._embedding_property_name(
+                        self._embedder.model_id,
+                        self._embedder.dimensions,
+                    )
+                ),
+                similarity_metric=self._embedder.similarity_metric,
+                required_labels={self._derivative_collection},
+                required_properties=mangled_property_filter,
                 include_missing_properties=True,
+                anchor_path=[
+                    # Get source episode clusters of matched derivatives.
+                    TraversalStep(
+                        allowed_relations={self._derivative_episode_cluster_relation},
+                        find_sources=False,
+                        find_targets=True,
+                        required_labels={self._episode_cluster_collection},
+                        required_properties=mangled_property_filter,
+                        include_missing_properties=True,
+                    ),
+                    # Get source episodes of matched episode clusters.
+                    # Use source episode nodes as nuclei for context expansion.
+                    TraversalStep(
+                        allowed_relations={self._episode_cluster_episode_relation},
+                        find_sources=False,
+                        find_targets=True,
+                        required_labels={self._episode_collection},
+                        required_properties=mangled_property_filter,
+                    ),
+                ],
+                context_step=TraversalStep(
+                    find_sources=True,
+                    find_targets=True,
+                    required_labels={self._episode_collection},
+                    required_properties=mangled_property_filter,
+                ),
+                context_limit=10,
             )
-            for matched_derivative_node in matched_derivative_nodes
-        ]
-
-        derivatives_source_episode_cluster_nodes = await asyncio.gather(
-            *search_derivatives_source_episode_cluster_nodes_tasks
         )
 
-        # Flatten into a single list of episode cluster nodes.
-        matched_episode_cluster_nodes = [
-            episode_cluster_node
-            for derivative_source_episode_cluster_nodes in (
-                derivatives_source_episode_cluster_nodes
-            )
-            for episode_cluster_node in derivative_source_episode_cluster_nodes
-        ]
-
-        # Get source episodes of matched episode clusters.
-        search_episode_clusters_source_episode_nodes_tasks = [
-            self._vector_graph_store.search_related_nodes(
-                node_uuid=matched_episode_cluster_node.uuid,
-                allowed_relations={self._episode_cluster_episode_relation},
-                find_sources=False,
-                find_targets=True,
-                required_labels={self._episode_collection},
-                required_properties={
-                    mangle_filterable_property_key(key): value
-                    for key, value in property_filter.items()
-                },
+        # Rerank contexts against each query.
+        return list(
+            await asyncio.gather(
+                *[
+                    self._rerank_anchored_episode_node_neighbors(
+                        query,
+                        anchored_episode_node_neighbors,
+                        num_episodes_limit=num_episodes_limit,
+                    )
+                    for query, anchored_episode_node_neighbors in zip(
+                        queries, queries_anchored_episode_node_neighbors
+                    )
+                ]
             )
-            for matched_episode_cluster_node in matched_episode_cluster_nodes
-        ]
-
-        episode_clusters_source_episode_nodes = await asyncio.gather(
-            *search_episode_clusters_source_episode_nodes_tasks
         )
 
-        # Flatten into a single list of episode nodes.
-        # Use source episode nodes as nuclei for context expansion.
+    async def _rerank_anchored_episode_node_neighbors(
+        self,
+        query: str,
+        anchored_episode_node_neighbors: list[tuple[Node, list[Node]]],
+        num_episodes_limit: int,
+    ) -> list[Episode]:
+        """
+        Rerank episode node contexts anchored on their nuclear episode nodes
+        against the query, and unify them into episodes sorted by timestamp.
+        """
         nuclear_episode_nodes = [
-            source_episode_node
-            for episode_cluster_source_episode_nodes in (
-                episode_clusters_source_episode_nodes
-            )
-            for source_episode_node in episode_cluster_source_episode_nodes
+            nuclear_episode_node
+            for nuclear_episode_node, _ in anchored_episode_node_neighbors
         ]
-
-        # Get contexts for nuclear episode nodes.
-        expand_episode_node_contexts_tasks = [
-            self._expand_episode_node_context(
-                nuclear_episode_node,
-                property_filter=property_filter,
+        episode_node_contexts = [
+            {nuclear_episode_node, *neighbor_episode_nodes}
+            for nuclear_episode_node, neighbor_episode_nodes in (
+                anchored_episode_node_neighbors
             )
-            for nuclear_episode_node in nuclear_episode_nodes
         ]
 
-        episode_node_contexts = await asyncio.gather(
-            *expand_episode_node_contexts_tasks
-        )
-
         # Rerank contexts.
         episode_node_context_scores = await self._score_episode_node_contexts(
             query, episode_node_contexts
@@ -669,51 +780,6 @@ class DeclarativeMemory:
             key=lambda episode: episode.timestamp,
         )
 
-    async def _expand_episode_node_context(
-        self,
-        nucleus_episode_node: Node,
-        retrieval_depth_limit: int = 1,
-        property_filter: dict[str, FilterablePropertyValue] = {},
-    ) -> set[Node]:
-        """
-        Expand the context of a nucleus episode node
-        by retrieving related episode nodes
-        up to a specified depth limit.
-        """
-        retrieved_context = {nucleus_episode_node}
-        frontier = [nucleus_episode_node]
-
-        for _ in range(1, retrieval_depth_limit + 1):
-            get_new_frontier_tasks = [
-                self._vector_graph_store.search_related_nodes(
-                    node_uuid=frontier_node.uuid,
-                    find_sources=True,
-                    find_targets=True,
-                    limit=10,
-                    required_labels={self._episode_collection},
-                    required_properties={
-                        mangle_filterable_property_key(key): value
-                        for key, value in property_filter.items()
-                    },
-                )
-                for frontier_node in frontier
-            ]
-
-            node_neighborhoods = await asyncio.gather(*get_new_frontier_tasks)
-            frontier = [
-                neighbor_node
-                for node_neighborhood in node_neighborhoods
-                for neighbor_node in node_neighborhood
-                if neighbor_node not in retrieved_context
-            ]
-
-            if not frontier:
-                break
-
-            retrieved_context.update(frontier)
-
-        return retrieved_context
-
     async def _score_episode_node_contexts(
         self, query: str, episode_node_contexts: list[set[Node]]
     ) -> list[float]:
@@ -832,12 +898,14 @@ class DeclarativeMemory:
         Forget all episodes matching the given filterable properties
         and data derived from them.
         """
+        # Only node UUIDs are needed, so fetch no properties.
         matching_episode_nodes = await self._vector_graph_store.search_matching_nodes(
             required_labels={self._episode_collection},
             required_properties={
                 mangle_filterable_property_key(key): value
                 for key, value in property_filter.items()
             },
+            include_properties=(),
         )
 
         search_related_episode_cluster_nodes_tasks = [
@@ -847,6 +915,8 @@ class DeclarativeMemory:
                 required_labels={self._episode_cluster_collection},
                 find_sources=True,
                 find_targets=False,
+                node_labels={self._episode_collection},
+                include_properties=(),
             )
             for episode_node in matching_episode_nodes
         ]
@@ -871,6 +941,8 @@ class DeclarativeMemory:
                 required_labels={self._derivative_collection},
                 find_sources=True,
                 find_targets=False,
+                node_labels={self._episode_cluster_collection},
+                include_properties=(),
             )
             for episode_cluster_node in matching_episode_cluster_nodes
         ]
@@ -892,8 +964,20 @@ class DeclarativeMemory:
         episode_cluster_uuids = [node.uuid for node in matching_episode_cluster_nodes]
         derivative_uuids = [node.uuid for node in matching_derivative_nodes]
 
-        node_uuids_to_delete = episode_uuids + episode_cluster_uuids + derivative_uuids
-        await self._vector_graph_store.delete_nodes(node_uuids_to_delete)
+        await asyncio.gather(
+            self._vector_graph_store.delete_nodes(
+                episode_uuids,
+                required_labels={self._episode_collection},
+            ),
+            self._vector_graph_store.delete_nodes(
+                episode_cluster_uuids,
+                required_labels={self._episode_cluster_collection},
+            ),
+            self._vector_graph_store.delete_nodes(
+                derivative_uuids,
+                required_labels={self._derivative_collection},
+            ),
+        )
 
     @staticmethod
     def _episodes_from_episode_nodes(
@@ -7,6 +7,7 @@ where recent episodes are likely to be relevant to the current episode.
 """
 
 import json
+from bisect import bisect_left
 from datetime import datetime
 from typing import cast
 
@@ -128,3 +129,57 @@ class PreviousRelatedEpisodePostulator(RelatedEpisodePostulator):
         ]
 
         return previous_episodes
+
+    async def postulate_batch(self, episodes: list[Episode]) -> list[list[Episode]]:
+        # Previous episodes may be stored or be earlier in the batch.
+        stored_previous_episodes = await super().postulate_batch(episodes)
+
+        chronological_episodes = sorted(episodes, key=lambda episode: episode.timestamp)
+
+        # Chronological batch episodes matching each distinct property filter.
+        filter_matching_episodes: dict[
+            frozenset[tuple[str, FilterablePropertyValue]], list[Episode]
+        ] = {}
+
+        batch_previous_episodes = []
+        for episode, episode_stored_previous_episodes in zip(
+            episodes, stored_previous_episodes
+        ):
+            property_filter = frozenset(
+                (key, episode.filterable_properties[key])
+                for key in self._filterable_property_keys
+                if key in episode.filterable_properties
+            )
+
+            if property_filter not in filter_matching_episodes:
+                filter_matching_episodes[property_filter] = [
+                    candidate_episode
+                    for candidate_episode in chronological_episodes
+                    if all(
+                        candidate_episode.filterable_properties.get(key) == value
+                        for key, value in property_filter
+                    )
+                ]
+
+            matching_episodes = filter_matching_episodes[property_filter]
+            num_earlier_matching_episodes = bisect_left(
+                matching_episodes,
+                episode.timestamp,
+                key=lambda matching_episode: matching_episode.timestamp,
+            )
+
+            # Keep the latest previous episodes, latest first.
+            batch_previous_episodes.append(
+                sorted(
+                    episode_stored_previous_episodes
+                    + matching_episodes[
+                        max(0, num_earlier_matching_episodes - self._search_limit) : (
+                            num_earlier_matching_episodes
+                        )
+                    ],
+                    key=lambda previous_episode: previous_episode.timestamp,
+                    reverse=True,
+                )[: self._search_limit]
+            )
+
+        return batch_previous_episodes
@@ -4,6 +4,7 @@ Abstract base class for a related episode postulator.
 Defines an interface for postulating related episodes given an episode.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 
 from ..data_types import Episode
@@ -29,3 +30,22 @@ class RelatedEpisodePostulator(ABC):
                 A list of postulated related episodes.
         """
         raise NotImplementedError
+
+    async def postulate_batch(self, episodes: list[Episode]) -> list[list[Episode]]:
+        """
+        Postulate related episodes given a batch of episodes
+        that are added together.
+        Implementations should override this method
+        if episodes in the batch may be related to each other.
+
+        Args:
+            episodes (list[Episode]):
+                The input episodes
+                for which to postulate related episodes.
+
+        Returns:
+            list[list[Episode]]:
+                A list of lists of postulated related episodes,
+                one for each input episode.
+        """
+        return list(await asyncio.gather(*map(self.postulate, episodes)))
@@ -20,20 +20,22 @@ import asyncio
 import copy
 import logging
 import uuid
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any, cast
 
-from memmachine.common.language_model.language_model_builder import (
-    LanguageModelBuilder,
-)
 from memmachine.common.metrics_factory.metrics_factory_builder import (
     MetricsFactoryBuilder,
 )
 from memmachine.common.resource_initializer import ResourceInitializer
+from memmachine.common.utils import AsyncReaderWriterLock
 
 from .data_types import ContentType, Episode, MemoryContext
 from .long_term_memory.long_term_memory import LongTermMemory, LongTermMemoryParams
 from .short_term_memory.session_memory import SessionMemory
+from .short_term_memory.session_memory_store_builder import (
+    SessionMemoryStoreBuilder,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -67,7 +69,10 @@ class EpisodicMemory:
         """
         self._memory_context = memory_context
         self._manager = manager  # The manager that created this instance
-        self._lock = asyncio.Lock()  # Lock for thread-safe operations
+        self._lock = asyncio.Lock()  # Lock for reference counting
+        # Queries share access to the memory stores,
+        # while destructive operations have exclusive access.
+        self._access_lock = AsyncReaderWriterLock()
 
         model_config = config.get("model")
         short_config = config.get("sessionmemory", {})
@@ -86,21 +91,51 @@ class EpisodicMemory:
             if model_config is None or model_config.get(model_name) is None:
                 raise ValueError("Invalid model configuration")
 
-            model_config = copy.deepcopy(model_config.get(model_name))
-            """
-            only support prometheus now.
-            TODO: support different metrics and make it configurable
-            """
-            model_config["metrics_factory_id"] = "prometheus"
-            model_vendor = model_config.pop("model_vendor")
-            metrics_injection = {}
-            metrics_injection["prometheus"] = metrics_manager
-
-            llm_model = LanguageModelBuilder.build(
-                model_vendor,
-                model_config,
-                metrics_injection,
-            )
+            # Language models are built once per configured model
+            # and shared by all instances,
+            # so that their clients and connection pools are reused.
+            if model_name not in EpisodicMemory._shared_resources:
+                model_config = copy.deepcopy(model_config.get(model_name))
+                """
+                only support prometheus now.
+                TODO: support different metrics and make it configurable
+                """
+                model_config["metrics_factory_id"] = "prometheus"
+                model_vendor = model_config.pop("model_vendor")
+
+                resources = ResourceInitializer.initialize(
+                    {
+                        model_name: {
+                            "type": "language_model",
+                            "provider": model_vendor,
+                            "config": model_config,
+                        }
+                    },
+                    EpisodicMemory._shared_resources | {"prometheus": metrics_manager},
+                )
+                EpisodicMemory._shared_resources |= resources
+
+            llm_model = EpisodicMemory._shared_resources[model_name]
+
+            # Session memory stores are shared by all instances.
+            # Without a configured store, the session memory is held in process.
+            session_memory_store = None
+            store_id = short_config.get("store")
+            if store_id is not None:
+                store_declaration = config.get("session_memory_store", {}).get(store_id)
+
+                def build_session_memory_store():
+                    if store_declaration is None:
+                        raise ValueError("Invalid session memory store configuration")
+                    return SessionMemoryStoreBuilder.build(
+                        store_declaration["provider"],
+                        store_declaration.get("config", {}),
+                        {},
+                    )
+
+                session_memory_store = EpisodicMemory.get_shared_resource(
+                    store_id, build_session_memory_store
+                )
 
             # Initialize short-term session memory
             self._session_memory = SessionMemory(
@@ -111,6 +146,7 @@ class EpisodicMemory:
                 short_config.get("max_message_length", 128000),
                 short_config.get("max_token_num", 65536),
                 self._memory_context,
+                session_memory_store,
             )
 
         if len(long_term_config) > 0 and long_term_config.get("enabled") != "false":
@@ -180,6 +216,24 @@ class EpisodicMemory:
             "query_count", "Count of query processing"
         )
 
+    @staticmethod
+    def get_shared_resource(resource_id: str, build: Callable[[], Any]) -> Any:
+        """
+        Retrieves a resource shared by all instances,
+        building and sharing it first if it is not shared yet.
+
+        Args:
+            resource_id (str): The ID of the resource.
+            build (Callable[[], Any]):
+                A function that builds the resource.
+
+        Returns:
+            Any: The shared resource.
+        """
+        if resource_id not in EpisodicMemory._shared_resources:
+            EpisodicMemory._shared_resources[resource_id] = build()
+        return EpisodicMemory._shared_resources[resource_id]
+
     @property
     def short_term_memory(self) -> SessionMemory | None:
         """
@@ -234,6 +288,17 @@ class EpisodicMemory:
         """
         return self._ref_count
 
+    def get_token_num(self) -> int:
+        """
+        Get the estimated number of tokens held in process by the episodic
+        memory instance
+        Returns:
+            The estimated number of tokens in the short-term memory.
+        """
+        if self._session_memory is None:
+            return 0
+        return self._session_memory.get_token_num()
+
     async def reference(self) -> bool:
         """
         Increments the reference count for this instance.
@@ -251,7 +316,7 @@ class EpisodicMemory:
             self._ref_count += 1
             return True
 
-    async def add_memory_episode(
+    def _new_episode(
         self,
         producer: str,
         produced_for: str,
@@ -260,26 +325,15 @@ class EpisodicMemory:
         content_type: ContentType,
         timestamp: datetime | None = None,
         metadata: dict | None = None,
-    ):
+    ) -> Episode:
         # pylint: disable=too-many-arguments
         # pylint: disable=too-many-positional-arguments
         """
-        Adds a new memory episode to both session and declarative memory.
-
-        Validates that the producer and recipient of the episode are part of
-        the current memory context.
-
-        Args:
-            producer: The ID of the user or agent that created the episode.
-            produced_for: The ID of the intended recipient.
-            episode_content: The content of the episode (string or vector).
-            episode_type: The type of the episode (e.g., 'message', 'thought').
-            content_type: The type of the content (e.g., STRING).
-            timestamp: The timestamp of the episode. Defaults to now().
-            metadata: Optional dictionary of user-defined metadata.
+        Creates a new episode in the current memory context.
 
-        Returns:
-            True if the episode was added successfully, False otherwise.
+        Raises:
+            ValueError: If the producer or the recipient of the episode
+                        is not part of the current memory context.
         """
         # Validate that the producer and recipient are part of this memory
         # context
@@ -303,10 +357,7 @@ class EpisodicMemory:
                  the session"""
             )
 
-        start_time = datetime.now()
-
-        # Create a new Episode object
-        episode = Episode(
+        return Episode(
             uuid=uuid.uuid4(),
             episode_type=episode_type,
             content_type=content_type,
@@ -319,6 +370,48 @@ class EpisodicMemory:
             user_metadata=metadata,
         )
 
+    async def add_memory_episode(
+        self,
+        producer: str,
+        produced_for: str,
+        episode_content: str | list[float],
+        episode_type: str,
+        content_type: ContentType,
+        timestamp: datetime | None = None,
+        metadata: dict | None = None,
+    ):
+        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-positional-arguments
+        """
+        Adds a new memory episode to both session and declarative memory.
+
+        Validates that the producer and recipient of the episode are part of
+        the current memory context.
+
+        Args:
+            producer: The ID of the user or agent that created the episode.
+            produced_for: The ID of the intended recipient.
+            episode_content: The content of the episode (string or vector).
+            episode_type: The type of the episode (e.g., 'message', 'thought').
+            content_type: The type of the content (e.g., STRING).
+            timestamp: The timestamp of the episode. Defaults to now().
+            metadata: Optional dictionary of user-defined metadata.
+
+        Returns:
+            True if the episode was added successfully, False otherwise.
+        """
+        episode = self._new_episode(
+            producer,
+            produced_for,
+            episode_content,
+            episode_type,
+            content_type,
+            timestamp,
+            metadata,
+        )
+
+        start_time = datetime.now()
+
         # Add the episode to both memory stores concurrently
         tasks = []
         if self._session_memory:
@@ -336,6 +429,60 @@ class EpisodicMemory:
         self._ingestion_counter.increment()
         return True
 
+    async def add_memory_episodes(
+        self, episodes: list[dict[str, Any]]
+    ) -> list[str | None]:
+        """
+        Adds new memory episodes to both session and declarative memory
+        in one batch.
+
+        Episodes whose producer or recipient is not part of the current
+        memory context are skipped. The other episodes are added to session
+        memory in order, and to declarative memory together, so that their
+        derivatives are embedded and stored in batches.
+
+        Args:
+            episodes: The episodes to add, each a dictionary with the
+                      arguments of `add_memory_episode`.
+
+        Returns:
+            For each episode, None if it was added,
+            or the reason it was skipped otherwise.
+        """
+        errors: list[str | None] = []
+        new_episodes = []
+        for arguments in episodes:
+            try:
+                new_episodes.append(self._new_episode(**arguments))
+                errors.append(None)
+            except ValueError as e:
+                errors.append(str(e))
+
+        if len(new_episodes) == 0:
+            return errors
+
+        start_time = datetime.now()
+
+        async def add_to_session_memory(session_memory: SessionMemory):
+            for episode in new_episodes:
+                await session_memory.add_episode(episode)
+
+        tasks = []
+        if self._session_memory:
+            tasks.append(add_to_session_memory(self._session_memory))
+        if self._long_term_memory:
+            tasks.append(self._long_term_memory.add_episodes(new_episodes))
+        await asyncio.gather(
+            *tasks,
+        )
+        end_time = datetime.now()
+        delta = end_time - start_time
+        self._ingestion_latency_summary.observe(
+            delta.total_seconds() * 1000 + delta.microseconds / 1000
+        )
+        self._ingestion_counter.increment(len(new_episodes))
+        return errors
+
     async def close(self):
         """
         Decrements the reference count and closes the instance if it reaches
@@ -367,7 +514,7 @@ class EpisodicMemory:
         context.
         This is a destructive operation.
         """
-        async with self._lock:
+        async with self._access_lock.write_locked():
             tasks = []
             if self._session_memory:
                 tasks.append(self._session_memory.clear_memory())
@@ -410,7 +557,7 @@ class EpisodicMemory:
         # By default, always allow cross session search
         property_filter["group_id"] = self._memory_context.group_id
 
-        async with self._lock:
+        async with self._access_lock.read_locked():
             if self._session_memory is None:
                 short_episode: list[Episode] = []
                 short_summary = ""
@@ -437,6 +584,86 @@ class EpisodicMemory:
                 )
                 short_episode, short_summary = session_result
 
+        unique_long_episodes = EpisodicMemory._unique_long_episodes(
+            short_episode, long_episode
+        )
+
+        end_time = datetime.now()
+        delta = end_time - start_time
+        self._query_latency_summary.observe(
+            delta.total_seconds() * 1000 + delta.microseconds / 1000
+        )
+        self._query_counter.increment()
+        return short_episode, unique_long_episodes, [short_summary]
+
+    async def query_memory_many(
+        self,
+        queries: list[str],
+        limit: int | None = None,
+        property_filter: dict | None = None,
+    ) -> list[tuple[list[Episode], list[Episode], list[str]]]:
+        """
+        Retrieves relevant context for each of several queries
+        from all memory stores.
+
+        The session memory context does not depend on the query,
+        so it is fetched once for all queries.
+        Long term memory is searched for all queries together.
+
+        Args:
+            queries: The query strings to find context for.
+            limit: The maximum number of episodes to return per query.
+                   The default value is 20.
+            property_filter: A dictionary of properties to filter the search
+                             in declarative memory.
+
+        Returns:
+            For each query, in order, a tuple as returned by query_memory.
+        """
+        start_time = datetime.now()
+        search_limit = limit if limit is not None else 20
+        if property_filter is None:
+            property_filter = {}
+        # By default, always allow cross session search
+        property_filter["group_id"] = self._memory_context.group_id
+
+        short_episode: list[Episode] = []
+        short_summary = ""
+        queries_long_episode: list[list[Episode]] = [[] for _ in queries]
+        async with self._access_lock.read_locked():
+            if self._session_memory is not None and len(queries) > 0:
+                (
+                    short_episode,
+                    short_summary,
+                ) = await self._session_memory.get_session_memory_context(
+                    queries[0], limit=search_limit
+                )
+            if self._long_term_memory is not None:
+                queries_long_episode = await self._long_term_memory.search_many(
+                    queries, search_limit, property_filter
+                )
+
+        results = [
+            (
+                list(short_episode),
+                EpisodicMemory._unique_long_episodes(short_episode, long_episode),
+                [short_summary],
+            )
+            for long_episode in queries_long_episode
+        ]
+
+        end_time = datetime.now()
+        delta = end_time - start_time
+        self._query_latency_summary.observe(
+            delta.total_seconds() * 1000 + delta.microseconds / 1000
+        )
+        self._query_counter.increment(len(queries))
+        return results
+
+    @staticmethod
+    def _unique_long_episodes(
+        short_episode: list[Episode], long_episode: list[Episode]
+    ) -> list[Episode]:
         # Deduplicate episodes from both memory stores, prioritizing
         # short-term memory
         uuid_set = {episode.uuid for episode in short_episode}
@@ -446,14 +673,7 @@ class EpisodicMemory:
             if episode.uuid not in uuid_set:
                 uuid_set.add(episode.uuid)
                 unique_long_episodes.append(episode)
-
-        end_time = datetime.now()
-        delta = end_time - start_time
-        self._query_latency_summary.observe(
-            delta.total_seconds() * 1000 + delta.microseconds / 1000
-        )
-        self._query_counter.increment()
-        return short_episode, unique_long_episodes, [short_summary]
+        return unique_long_episodes
 
     async def formalize_query_with_context(
         self,
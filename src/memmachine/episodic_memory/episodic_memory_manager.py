@@ -10,24 +10,34 @@ is responsible for:
  on group, agent, user, and session IDs.
 - Ensuring that each unique conversational context has a dedicated memory
   instance.
+- Keeping released memory instances in a bounded cache, so that hot
+  sessions are not rebuilt between requests.
+- Building the memory instance of each context once, while instances of
+  other contexts are built or used concurrently.
 - Interacting with a `SessionManager` to persist and retrieve session
   information.
 """
 
 import asyncio
 import logging
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from typing import Any
 
 import yaml
 
+from memmachine.common.metrics_factory.metrics_factory_builder import (
+    MetricsFactoryBuilder,
+)
+
 from .data_types import GroupConfiguration, MemoryContext, SessionInfo
 from .episodic_memory import EpisodicMemory
 from .prompt.summary_prompt import (
     episode_summary_system_prompt,
     episode_summary_user_prompt,
 )
-from .session_manager.session_manager import SessionManager
+from .session_manager.async_session_manager import AsyncSessionManager
 
 logger = logging.getLogger(__name__)
 
@@ -61,15 +71,39 @@ class EpisodicMemoryManager:
         """
         self._memory_config = config
         # A dictionary to hold active memory instances, keyed by their context
-        # hash string.
-        self._context_memory: dict[MemoryContext, EpisodicMemory] = {}
+        # hash string, with the least recently used instances first.
+        self._context_memory: OrderedDict[MemoryContext, EpisodicMemory] = OrderedDict()
+        # The time each memory instance was last used.
+        self._last_used: dict[MemoryContext, float] = {}
+
+        # Instances keep the reference taken when they are created, so that
+        # they stay cached after all clients have released them, until they
+        # have been idle for too long or the cache exceeds its limits.
+        instance_cache = config.get("instance_cache", {})
+        self._max_instances = instance_cache.get("max_instances", 1000)
+        self._idle_ttl_seconds = instance_cache.get("idle_ttl_seconds", 3600)
+        self._max_token_num = instance_cache.get("max_token_num")
         # A lock to ensure thread-safe access to the _context_memory
-        # dictionary.
+        # dictionary. It is only held while the registry is accessed.
         self._lock = asyncio.Lock()
+        # Locks held while the memory instance of a context is built,
+        # so that concurrent requests for the context share one instance,
+        # with the number of tasks holding or waiting on each lock.
+        self._context_locks: dict[MemoryContext, tuple[asyncio.Lock, int]] = {}
+        # The task that evicts idle instances in the background,
+        # started when the first instance is registered.
+        self._sweep_task: asyncio.Task | None = None
+
+        metrics_manager = MetricsFactoryBuilder.build("prometheus", {}, {})
+        self._lock_wait_summary = metrics_manager.get_summary(
+            "memory_manager_lock_wait_latency",
+            "Time spent waiting on memory manager locks in milliseconds",
+            label_names=("lock",),
+        )
         # Initialize the session manager for handling session data persistence.
 
         sessiondb = config.get("sessiondb", {})
-        self._session_manager = SessionManager(sessiondb)
+        self._session_manager = AsyncSessionManager(sessiondb)
 
     @classmethod
     async def reset(cls):
@@ -177,8 +211,73 @@ class EpisodicMemoryManager:
                 result[k] = v
         return result
 
+    @asynccontextmanager
+    async def _timed_lock(self, lock: asyncio.Lock, lock_name: str):
+        """
+        Acquires a lock, recording the time spent waiting for it.
+        """
+        start = time.monotonic()
+        async with lock:
+            self._lock_wait_summary.observe(
+                (time.monotonic() - start) * 1000, {"lock": lock_name}
+            )
+            yield
+
+    @asynccontextmanager
+    async def _context_lock(self, context: MemoryContext):
+        """
+        Acquires the lock for building the memory instance of a context.
+        The lock is discarded when no task holds or waits on it.
+        """
+        lock, user_count = self._context_locks.get(context, (asyncio.Lock(), 0))
+        self._context_locks[context] = (lock, user_count + 1)
+        try:
+            async with self._timed_lock(lock, "context"):
+                yield
+        finally:
+            lock, user_count = self._context_locks[context]
+            if user_count > 1:
+                self._context_locks[context] = (lock, user_count - 1)
+            else:
+                del self._context_locks[context]
+
+    async def _reference_instance(
+        self, context: MemoryContext
+    ) -> EpisodicMemory | None:
+        """
+        Retrieves the registered instance for a context
+        and increments its reference count.
+
+        Returns:
+            The instance, or None if no instance is registered
+            or the registered instance is closing.
+        """
+        async with self._timed_lock(self._lock, "manager"):
+            instance = self._context_memory.get(context)
+            if instance is None:
+                return None
+            if not await instance.reference():
+                # The instance was closed between checking and referencing.
+                # It is replaced by a new instance.
+                logger.info("Context memory %s is closing", context)
+                return None
+            self._register(context, instance)
+            return instance
+
+    async def _register_instance(
+        self, context: MemoryContext, instance: EpisodicMemory
+    ):
+        """
+        References a newly built instance and registers it.
+        """
+        await instance.reference()
+        async with self._timed_lock(self._lock, "manager"):
+            self._register(context, instance)
+        if self._idle_ttl_seconds is not None and self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(self._sweep_idle_instances())
+
     @property
-    def session_manager(self) -> SessionManager:
+    def session_manager(self) -> AsyncSessionManager:
         """Get the manager's session manager."""
         return self._session_manager
 
@@ -214,7 +313,7 @@ class EpisodicMemoryManager:
         context = MemoryContext(
             group_id=group_id, agent_id=set(), user_id=set(), session_id=session_id
         )
-        async with self._lock:
+        async with self._timed_lock(self._lock, "manager"):
             if context in self._context_memory:
                 inst = self._context_memory[context]
         if inst is None:
@@ -238,8 +337,7 @@ class EpisodicMemoryManager:
         user_ids = [] if user_ids is None else user_ids
         if len(agent_ids) < 1 and len(user_ids) < 1:
             raise ValueError("The group must have at least one user ID or agent ID")
-        async with self._lock:
-            self._session_manager.create_new_group(group_id, agent_ids, user_ids)
+        await self._session_manager.create_new_group(group_id, agent_ids, user_ids)
 
     async def create_episodic_memory_instance(
         self, group_id: str, session_id: str, configuration: dict | None = None
@@ -258,13 +356,17 @@ class EpisodicMemoryManager:
         Returns:
             New EpisodicMemory instance.
         """
-        async with self._lock:
-            group = self._session_manager.retrieve_group(group_id)
+        # Contexts are identified by their group and session.
+        context = MemoryContext(
+            group_id=group_id, agent_id=set(), user_id=set(), session_id=session_id
+        )
+        async with self._context_lock(context):
+            group = await self._session_manager.retrieve_group(group_id)
             if group is None:
                 raise ValueError(f"""Failed to get the group {group_id}""")
             configuration = {} if configuration is None else configuration
             configuration = self._merge_configs(self._memory_config, configuration)
-            session = self._session_manager.create_session(
+            session = await self._session_manager.create_session(
                 group_id, session_id, configuration
             )
             context = MemoryContext(
@@ -273,13 +375,11 @@ class EpisodicMemoryManager:
                 user_id=set(group.user_list),
                 session_id=session_id,
             )
-            final_config = self._merge_configs(
-                self._memory_config, session.configuration or {}
-            )
-            memory_instance = EpisodicMemory(self, final_config, context)
-            self._context_memory[context] = memory_instance
-            await memory_instance.reference()
-            return memory_instance
+            # The stored configuration is already merged.
+            memory_instance = EpisodicMemory(self, session.configuration, context)
+            await self._register_instance(context, memory_instance)
+        await self._evict_idle_instances()
+        return memory_instance
 
     async def open_episodic_memory_instance(
         self, group_id: str, session_id: str
@@ -295,17 +395,18 @@ class EpisodicMemoryManager:
         context = MemoryContext(
             group_id=group_id, agent_id=set(), user_id=set(), session_id=session_id
         )
-        async with self._lock:
-            if context in self._context_memory:
-                inst = self._context_memory[context]
-                await inst.reference()
-                return inst
-
-            session_info = self._session_manager.open_session(group_id, session_id)
-            memory_instance = EpisodicMemory(self, session_info.configuration, context)
-            self._context_memory[context] = memory_instance
-            await memory_instance.reference()
-            return memory_instance
+        async with self._context_lock(context):
+            memory_instance = await self._reference_instance(context)
+            if memory_instance is None:
+                session_info = await self._session_manager.open_session(
+                    group_id, session_id
+                )
+                memory_instance = EpisodicMemory(
+                    self, session_info.configuration, context
+                )
+                await self._register_instance(context, memory_instance)
+        await self._evict_idle_instances()
+        return memory_instance
 
     @asynccontextmanager
     async def async_open_episodic_memory_instance(
@@ -396,36 +497,130 @@ class EpisodicMemoryManager:
             session_id=session_id,
         )
 
-        async with self._lock:
-            # If an instance for this context already exists, increment its
-            # reference count and return it.
-            if context in self._context_memory:
-                instance = self._context_memory[context]
-                get_it = await instance.reference()
-                if get_it:
-                    return instance
-                # The instance was closed between checking and referencing.
-                logger.error("Failed get instance reference")
-                return None
-            # If no instance exists, create a new one.
-            try:
-                info = self._session_manager.open_session(group_id, session_id)
-                final_config = info.configuration
-            except ValueError:
-                if configuration is None:
-                    configuration = {}
-                final_config = self._merge_configs(self._memory_config, configuration)
-                info = self._session_manager.create_session_if_not_exist(
-                    group_id, agent_id, user_id, session_id, final_config
-                )
+        async with self._context_lock(context):
+            memory_instance = await self._get_or_create_instance(
+                context, agent_id, user_id, configuration
+            )
+        await self._evict_idle_instances()
+        return memory_instance
+
+    async def _get_or_create_instance(
+        self,
+        context: MemoryContext,
+        agent_id: list[str],
+        user_id: list[str],
+        configuration: dict,
+    ) -> EpisodicMemory | None:
+        """
+        Retrieves or creates the EpisodicMemory instance for a context.
+        The caller must hold the lock of the context.
+        """
+        group_id = context.group_id
+        session_id = context.session_id
 
-            # Create and store the new memory instance.
-            memory_instance = EpisodicMemory(self, final_config, context)
+        # If an instance for this context already exists, increment its
+        # reference count and return it.
+        instance = await self._reference_instance(context)
+        if instance is not None:
+            return instance
+        # If no instance exists, create a new one.
+        try:
+            info = await self._session_manager.open_session(group_id, session_id)
+            final_config = info.configuration
+        except ValueError:
+            info = await self._session_manager.create_session_if_not_exist(
+                group_id,
+                agent_id,
+                user_id,
+                session_id,
+                self._merge_configs(self._memory_config, configuration),
+            )
+            final_config = info.configuration
 
-            self._context_memory[context] = memory_instance
+        # Create and store the new memory instance.
+        memory_instance = EpisodicMemory(self, final_config, context)
+        await self._register_instance(context, memory_instance)
+        return memory_instance
 
-            await memory_instance.reference()
-            return memory_instance
+    def _register(self, context: MemoryContext, instance: EpisodicMemory):
+        """
+        Stores an instance as the most recently used one.
+        The caller must hold the manager lock.
+        """
+        self._context_memory[context] = instance
+        self._context_memory.move_to_end(context)
+        self._last_used[context] = time.monotonic()
+
+    async def _evict_idle_instances(self):
+        """
+        Closes cached instances that no client is using,
+        if they have been idle longer than the idle TTL,
+        or if they are the least recently used ones
+        while the cache exceeds its maximum number of instances or tokens.
+        """
+        evicted_instances = []
+        async with self._timed_lock(self._lock, "manager"):
+            now = time.monotonic()
+            instance_count = len(self._context_memory)
+            token_num = (
+                sum(inst.get_token_num() for inst in self._context_memory.values())
+                if self._max_token_num is not None
+                else 0
+            )
+
+            for context, inst in self._context_memory.items():
+                over_limits = instance_count > self._max_instances or (
+                    self._max_token_num is not None and token_num > self._max_token_num
+                )
+                expired = (
+                    self._idle_ttl_seconds is not None
+                    and now - self._last_used[context] > self._idle_ttl_seconds
+                )
+                if not over_limits and not expired:
+                    # Later instances were used more recently.
+                    break
+
+                # Only the reference taken by the manager remains
+                # if no client is using the instance.
+                if inst.get_reference_count() != 1:
+                    continue
+
+                if self._max_token_num is not None:
+                    token_num -= inst.get_token_num()
+                instance_count -= 1
+                evicted_instances.append((context, inst))
+
+        for context, inst in evicted_instances:
+            # Instances are unregistered and closed under the lock
+            # of their context, so that a new instance for the context
+            # is not built until the state of the evicted one is released.
+            async with self._context_lock(context):
+                async with self._timed_lock(self._lock, "manager"):
+                    # The instance may have been referenced again
+                    # since it was selected for eviction.
+                    if (
+                        self._context_memory.get(context) is not inst
+                        or inst.get_reference_count() != 1
+                    ):
+                        continue
+                    del self._context_memory[context]
+                    del self._last_used[context]
+
+                logger.info("Evicting context memory %s", context)
+                await inst.close()
+
+    async def _sweep_idle_instances(self):
+        """
+        Periodically evicts idle instances,
+        so that the idle TTL is applied without new requests.
+        """
+        assert self._idle_ttl_seconds is not None
+        while True:
+            await asyncio.sleep(self._idle_ttl_seconds)
+            try:
+                await self._evict_idle_instances()
+            except Exception:
+                logger.exception("Failed to evict idle context memories")
 
     async def delete_context_memory(self, context: MemoryContext):
         """
@@ -438,10 +633,14 @@ class EpisodicMemoryManager:
             context: The memory context of the instance to delete.
         """
 
-        async with self._lock:
-            if context in self._context_memory:
+        async with self._timed_lock(self._lock, "manager"):
+            # An evicted instance may have been replaced by a new instance
+            # for the same context before it finished closing.
+            inst = self._context_memory.get(context)
+            if inst is not None and inst.get_reference_count() <= 0:
                 logger.info("Deleting context memory %s\n", context)
                 del self._context_memory[context]
+                del self._last_used[context]
             else:
                 logger.info("Context memory %s does not exist\n", context)
 
@@ -449,23 +648,28 @@ class EpisodicMemoryManager:
         """
         Close all sessions and clean up resources.
         """
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            self._sweep_task = None
         tasks = []
         for inst in self._context_memory.values():
             tasks.append(inst.close())
         await asyncio.gather(*tasks)
+        if self._session_manager is not None:
+            self._session_manager.close()
         del self._session_manager
         self._session_manager = None
 
-    def get_all_sessions(self) -> list[SessionInfo]:
+    async def get_all_sessions(self) -> list[SessionInfo]:
         """
         Retrieves all sessions from the session manager.
 
         Returns:
             A list of SessionInfo objects for all stored sessions.
         """
-        return self._session_manager.get_all_sessions()
+        return await self._session_manager.get_all_sessions()
 
-    def get_user_sessions(self, user_id: str) -> list[SessionInfo]:
+    async def get_user_sessions(self, user_id: str) -> list[SessionInfo]:
         """
         Retrieves all sessions associated with a specific user ID.
 
@@ -475,9 +679,9 @@ class EpisodicMemoryManager:
         Returns:
             A list of SessionInfo objects for the given user.
         """
-        return self._session_manager.get_session_by_user(user_id)
+        return await self._session_manager.get_session_by_user(user_id)
 
-    def get_agent_sessions(self, agent_id: str) -> list[SessionInfo]:
+    async def get_agent_sessions(self, agent_id: str) -> list[SessionInfo]:
         """
         Retrieves all sessions associated with a specific agent ID.
 
@@ -487,9 +691,9 @@ class EpisodicMemoryManager:
         Returns:
             A list of SessionInfo objects for the given agent.
         """
-        return self._session_manager.get_session_by_agent(agent_id)
+        return await self._session_manager.get_session_by_agent(agent_id)
 
-    def get_group_sessions(self, group_id: str) -> list[SessionInfo]:
+    async def get_group_sessions(self, group_id: str) -> list[SessionInfo]:
         """
         Retrieves all sessions associated with a specific group ID.
 
@@ -499,9 +703,9 @@ class EpisodicMemoryManager:
         Returns:
             A list of SessionInfo objects for the given group.
         """
-        return self._session_manager.get_session_by_group(group_id)
+        return await self._session_manager.get_session_by_group(group_id)
 
-    def get_group_configuration(self, group_id: str) -> GroupConfiguration | None:
+    async def get_group_configuration(self, group_id: str) -> GroupConfiguration | None:
         """
         Retrieve one group information
         Args:
@@ -509,4 +713,4 @@ class EpisodicMemoryManager:
         Return:
             The group information
         """
-        return self._session_manager.retrieve_group(group_id)
+        return await self._session_manager.retrieve_group(group_id)
@@ -80,7 +80,19 @@ class LongTermMemory:
         )
 
     async def add_episode(self, episode: Episode):
-        declarative_memory_episode = DeclarativeMemoryEpisode(
+        await self.add_episodes([episode])
+
+    async def add_episodes(self, episodes: list[Episode]):
+        await self._declarative_memory.add_episodes(
+            [
+                LongTermMemory._to_declarative_memory_episode(episode)
+                for episode in episodes
+            ]
+        )
+
+    @staticmethod
+    def _to_declarative_memory_episode(episode: Episode) -> DeclarativeMemoryEpisode:
+        return DeclarativeMemoryEpisode(
             uuid=episode.uuid,
             episode_type="default",
             content_type=content_type_to_declarative_memory_content_type_map[
@@ -99,7 +111,6 @@ class LongTermMemory:
             },
             user_metadata=episode.user_metadata,
         )
-        await self._declarative_memory.add_episode(declarative_memory_episode)
 
     async def search(
         self,
@@ -117,40 +128,66 @@ class LongTermMemory:
             property_filter=dict(id_filter),
         )
         return [
-            Episode(
-                uuid=declarative_memory_episode.uuid,
-                episode_type=declarative_memory_episode.episode_type,
-                content_type=(
-                    declarative_memory_content_type_to_content_type_map[
-                        declarative_memory_episode.content_type
-                    ]
-                ),
-                content=declarative_memory_episode.content,
-                timestamp=declarative_memory_episode.timestamp,
-                group_id=self._group_id,
-                session_id=cast(
-                    str,
-                    declarative_memory_episode.filterable_properties.get(
-                        "session_id", ""
-                    ),
-                ),
-                producer_id=cast(
-                    str,
-                    declarative_memory_episode.filterable_properties.get(
-                        "producer_id", ""
-                    ),
-                ),
-                produced_for_id=cast(
-                    str,
-                    declarative_memory_episode.filterable_properties.get(
-                        "produced_for_id", ""
-                    ),
-                ),
-                user_metadata=declarative_memory_episode.user_metadata,
-            )
+            self._from_declarative_memory_episode(declarative_memory_episode)
             for declarative_memory_episode in declarative_memory_episodes
         ]
 
+    async def search_many(
+        self,
+        queries: list[str],
+        num_episodes_limit: int,
+        id_filter: dict[str, str] = {},
+    ) -> list[list[Episode]]:
+        id_filter = {
+            key: value for key, value in id_filter.items() if key != "group_id"
+        }
+
+        queries_declarative_memory_episodes = (
+            await self._declarative_memory.search_many(
+                queries,
+                num_episodes_limit=num_episodes_limit,
+                property_filter=dict(id_filter),
+            )
+        )
+        return [
+            [
+                self._from_declarative_memory_episode(declarative_memory_episode)
+                for declarative_memory_episode in declarative_memory_episodes
+            ]
+            for declarative_memory_episodes in queries_declarative_memory_episodes
+        ]
+
+    def _from_declarative_memory_episode(
+        self, declarative_memory_episode: DeclarativeMemoryEpisode
+    ) -> Episode:
+        return Episode(
+            uuid=declarative_memory_episode.uuid,
+            episode_type=declarative_memory_episode.episode_type,
+            content_type=(
+                declarative_memory_content_type_to_content_type_map[
+                    declarative_memory_episode.content_type
+                ]
+            ),
+            content=declarative_memory_episode.content,
+            timestamp=declarative_memory_episode.timestamp,
+            group_id=self._group_id,
+            session_id=cast(
+                str,
+                declarative_memory_episode.filterable_properties.get("session_id", ""),
+            ),
+            producer_id=cast(
+                str,
+                declarative_memory_episode.filterable_properties.get("producer_id", ""),
+            ),
+            produced_for_id=cast(
+                str,
+                declarative_memory_episode.filterable_properties.get(
+                    "produced_for_id", ""
+                ),
+            ),
+            user_metadata=declarative_memory_episode.user_metadata,
+        )
+
     async def clear(self):
         self._declarative_memory.forget_all()
 
@@ -0,0 +1,299 @@
+"""
+Asynchronous session manager with an in-process read cache.
+"""
+
+import asyncio
+import copy
+import dataclasses
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from ..data_types import GroupConfiguration, SessionInfo
+from .session_manager import SessionManager
+
+T = TypeVar("T")
+
+
+class _ReadCache[K: Hashable, V]:
+    """
+    LRU cache of the results of database reads.
+
+    Each key has a generation, incremented when the key is invalidated
+    while reads of it are in flight, so that a read that started
+    before a write cannot fill the cache with its stale result.
+    Generations are only kept while reads of their key are in flight.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._generations: dict[K, int] = {}
+        self._read_counts: dict[K, int] = {}
+
+    def get(self, key: K) -> V | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def begin_read(self, key: K) -> int:
+        """
+        Begin a read of a key, returning the generation to fill the cache with.
+        end_read must be called when the read ends.
+        """
+        self._read_counts[key] = self._read_counts.get(key, 0) + 1
+        return self._generations.setdefault(key, 0)
+
+    def end_read(self, key: K):
+        self._read_counts[key] -= 1
+        if self._read_counts[key] == 0:
+            del self._read_counts[key]
+            del self._generations[key]
+
+    def fill(self, key: K, value: V, generation: int):
+        """
+        Cache the result of a read that began at the generation,
+        unless the key was invalidated since.
+        """
+        if self._generations.get(key) == generation:
+            self.put(key, value)
+
+    def put(self, key: K, value: V):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K):
+        self._entries.pop(key, None)
+        if key in self._generations:
+            self._generations[key] += 1
+
+
+class AsyncSessionManager:
+    """
+    Asynchronous interface to a SessionManager.
+
+    Database operations run on a dedicated worker thread, so that they do not
+    block the event loop. The results of `open_session` and `retrieve_group`
+    are cached in process, and invalidated when sessions or groups are
+    created or deleted through this manager.
+    Session configurations are shared with the SessionManager,
+    and must not be modified.
+    """
+
+    def __init__(self, config: dict):
+        """
+        Initializes the AsyncSessionManager.
+
+        Args:
+            config (dict): A configuration dictionary for the SessionManager,
+                           optionally with the maximum number of cached
+                           sessions and groups ("cache_size", default 10000).
+        """
+        # SQLite connections, in particular to in-memory databases,
+        # cannot be shared between threads,
+        # so the session manager is created and used on a single thread.
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="session-manager"
+        )
+        try:
+            self._session_manager = self._executor.submit(
+                SessionManager, config
+            ).result()
+        except BaseException:
+            self._executor.shutdown()
+            raise
+
+        cache_size = config.get("cache_size", 10000)
+        self._session_cache: _ReadCache[tuple[str, str], SessionInfo] = _ReadCache(
+            cache_size
+        )
+        self._group_cache: _ReadCache[str, GroupConfiguration] = _ReadCache(cache_size)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    @staticmethod
+    def _copy_session(session: SessionInfo) -> SessionInfo:
+        # Configurations are immutable, so they are not copied.
+        return dataclasses.replace(
+            session,
+            agent_ids=list(session.agent_ids),
+            user_ids=list(session.user_ids),
+        )
+
+    async def create_new_group(
+        self,
+        group_id: str,
+        agent_ids: list[str],
+        user_ids: list[str],
+        configuration: dict | None = None,
+    ):
+        """
+        Creates a new group.
+        See SessionManager.create_new_group.
+        """
+        try:
+            await self._run(
+                self._session_manager.create_new_group,
+                group_id,
+                agent_ids,
+                user_ids,
+                configuration,
+            )
+        finally:
+            self._group_cache.invalidate(group_id)
+
+    async def retrieve_group(self, group_id: str) -> GroupConfiguration | None:
+        """
+        Retrieves a group by its ID, from the cache if possible.
+        See SessionManager.retrieve_group.
+        """
+        group = self._group_cache.get(group_id)
+        if group is None:
+            generation = self._group_cache.begin_read(group_id)
+            try:
+                group = await self._run(self._session_manager.retrieve_group, group_id)
+                if group is None:
+                    return None
+                self._group_cache.fill(group_id, group, generation)
+            finally:
+                self._group_cache.end_read(group_id)
+        return copy.deepcopy(group)
+
+    async def delete_group(self, group_id: str):
+        """
+        Deletes a group by its ID.
+        See SessionManager.delete_group.
+        """
+        try:
+            await self._run(self._session_manager.delete_group, group_id)
+        finally:
+            self._group_cache.invalidate(group_id)
+
+    async def retrieve_all_groups(self) -> list[GroupConfiguration]:
+        """
+        Retrieves all groups.
+        See SessionManager.retrieve_all_groups.
+        """
+        return await self._run(self._session_manager.retrieve_all_groups)
+
+    async def open_session(self, group_id: str, session_id: str) -> SessionInfo:
+        """
+        Opens a session, from the cache if possible.
+        See SessionManager.open_session.
+        """
+        key = (group_id, session_id)
+        session = self._session_cache.get(key)
+        if session is None:
+            generation = self._session_cache.begin_read(key)
+            try:
+                session = await self._run(
+                    self._session_manager.open_session, group_id, session_id
+                )
+                self._session_cache.fill(key, session, generation)
+            finally:
+                self._session_cache.end_read(key)
+        return AsyncSessionManager._copy_session(session)
+
+    async def create_session(
+        self,
+        group_id: str,
+        session_id: str,
+        configuration: dict | None = None,
+    ) -> SessionInfo:
+        """
+        Creates a new session.
+        See SessionManager.create_session.
+        """
+        try:
+            return await self._run(
+                self._session_manager.create_session,
+                group_id,
+                session_id,
+                configuration,
+            )
+        finally:
+            self._session_cache.invalidate((group_id, session_id))
+
+    async def create_session_if_not_exist(
+        self,
+        group_id: str,
+        agent_ids: list[str],
+        user_ids: list[str],
+        session_id: str,
+        configuration: dict | None = None,
+    ) -> SessionInfo:
+        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-positional-arguments
+        """
+        Creates a new session if one does not already exist.
+        See SessionManager.create_session_if_not_exist.
+        """
+        key = (group_id, session_id)
+        try:
+            session = await self._run(
+                self._session_manager.create_session_if_not_exist,
+                group_id,
+                agent_ids,
+                user_ids,
+                session_id,
+                configuration,
+            )
+        finally:
+            # The group may have been created with the session.
+            self._group_cache.invalidate(group_id)
+            self._session_cache.invalidate(key)
+        self._session_cache.put(key, session)
+        return AsyncSessionManager._copy_session(session)
+
+    async def delete_session(self, group_id: str, session_id: str):
+        """
+        Deletes a session.
+        See SessionManager.delete_session.
+        """
+        try:
+            await self._run(self._session_manager.delete_session, group_id, session_id)
+        finally:
+            self._session_cache.invalidate((group_id, session_id))
+
+    async def get_all_sessions(self) -> list[SessionInfo]:
+        """
+        Retrieves all sessions.
+        See SessionManager.get_all_sessions.
+        """
+        return await self._run(self._session_manager.get_all_sessions)
+
+    async def get_session_by_user(self, usr_id: str) -> list[SessionInfo]:
+        """
+        Retrieves all sessions associated with a specific user ID.
+        See SessionManager.get_session_by_user.
+        """
+        return await self._run(self._session_manager.get_session_by_user, usr_id)
+
+    async def get_session_by_group(self, group_id: str) -> list[SessionInfo]:
+        """
+        Retrieves all sessions associated with a specific group ID.
+        See SessionManager.get_session_by_group.
+        """
+        return await self._run(self._session_manager.get_session_by_group, group_id)
+
+    async def get_session_by_agent(self, agent_id: str) -> list[SessionInfo]:
+        """
+        Retrieves all sessions associated with a specific agent ID.
+        See SessionManager.get_session_by_agent.
+        """
+        return await self._run(self._session_manager.get_session_by_agent, agent_id)
+
+    def close(self):
+        """
+        Closes the database connections and stops the database worker thread.
+        """
+        # Connections must be closed on the thread that opened them.
+        self._executor.submit(self._session_manager.close).result()
+        self._executor.shutdown(wait=True)
@@ -1,5 +1,6 @@
 """Manages database sessions for multi-agent and multi-user conversations."""
 
+import hashlib
 import json
 import os
 from typing import Annotated
@@ -42,7 +43,8 @@ class SessionManager:
 
     class MemSession(Base):  # pylint: disable=too-few-public-methods
         """ORM model for a session.
-        group_id and session_id form the composite primary key
+        group_id and session_id form the composite primary key.
+        configuration holds the hash of a row in the configurations table.
         """
 
         __tablename__ = "sessions"
@@ -109,6 +111,16 @@ class SessionManager:
         agent_list: Mapped[StringColumn]
         configuration: Mapped[StringColumn]
 
+    class Configuration(Base):  # pylint: disable=too-few-public-methods
+        """ORM model for a session configuration,
+        keyed by the SHA-256 hash of its canonical JSON.
+        Sessions with the same configuration share one row.
+        """
+
+        __tablename__ = "configurations"
+        config_hash: Mapped[StringKeyColumn]
+        configuration: Mapped[StringColumn]
+
     def __init__(self, config: dict):
         """
         Initializes the SessionManager.
@@ -148,12 +160,71 @@ class SessionManager:
         # Create all tables defined in the Base metadata if they don't exist
         Base.metadata.create_all(self._engine)
 
+        # Parsed configurations by hash.
+        # Configurations are immutable once stored,
+        # so they are shared by the sessions that reference them.
+        self._configurations: dict[str, dict] = {}
+
     def __del__(self):
         """Destructor to clean up database engine resources."""
+        self.close()
+
+    def close(self):
+        """Disposes of the connection pool of the database engine."""
         if hasattr(self, "_engine"):
-            # Disposes of the connection pool
             self._engine.dispose()
 
+    def _store_configuration(self, dbsession, configuration: dict | None) -> str:
+        """
+        Stores a configuration in the configurations table
+        if it is not stored yet.
+
+        Args:
+            dbsession: The database session to store the configuration in.
+            configuration (dict | None): The configuration to store.
+
+        Returns:
+            str: The hash that references the configuration.
+        """
+        serialized = json.dumps(
+            configuration if configuration is not None else {},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        config_hash = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        if dbsession.get(self.Configuration, config_hash) is None:
+            dbsession.add(
+                self.Configuration(config_hash=config_hash, configuration=serialized)
+            )
+        if config_hash not in self._configurations:
+            self._configurations[config_hash] = json.loads(serialized)
+        return config_hash
+
+    def _load_configuration(self, dbsession, reference: str) -> dict:
+        """
+        Loads the configuration referenced by a session.
+
+        Args:
+            dbsession: The database session to load the configuration from.
+            reference (str): The configuration column of the session.
+
+        Returns:
+            dict: The parsed configuration, which must not be modified.
+        """
+        if reference.startswith("{"):
+            # Sessions created before configurations were stored by hash
+            # hold the configuration inline.
+            return json.loads(reference)
+
+        configuration = self._configurations.get(reference)
+        if configuration is None:
+            row = dbsession.get(self.Configuration, reference)
+            if row is None:
+                raise ValueError(f"Configuration {reference} does not exist")
+            configuration = json.loads(row.configuration)
+            self._configurations[reference] = configuration
+        return configuration
+
     def create_new_group(
         self,
         group_id: str,
@@ -295,7 +366,9 @@ class SessionManager:
                 agent_ids=json.loads(sessions[0].agent_ids),
                 user_ids=json.loads(sessions[0].user_ids),
                 session_id=sessions[0].session_id,
-                configuration=json.loads(sessions[0].configuration),
+                configuration=self._load_configuration(
+                    dbsession, sessions[0].configuration
+                ),
             )
 
     def create_session(
@@ -338,7 +411,7 @@ class SessionManager:
             )
             if len(sessions) > 0:
                 raise ValueError(f"""Session {group_id}: {session_id} already exists""")
-            config = json.dumps(configuration if configuration is not None else {})
+            config = self._store_configuration(dbsession, configuration)
             agent_ids = json.loads(groups[0].agent_list)
             user_ids = json.loads(groups[0].user_list)
             # Create the new session
@@ -368,7 +441,7 @@ class SessionManager:
                 agent_ids=agent_ids,
                 user_ids=user_ids,
                 session_id=session_id,
-                configuration=configuration or {},
+                configuration=self._configurations[config],
             )
 
     def create_session_if_not_exist(
@@ -404,7 +477,6 @@ class SessionManager:
         """
         agents = json.dumps(agent_ids)
         users = json.dumps(user_ids)
-        config = json.dumps(configuration if configuration is not None else {})
         with self._session() as dbsession:
             # Query for an existing session with the same group id
             sess = (
@@ -434,6 +506,7 @@ class SessionManager:
                     users = group.user_list
 
                 # Create a new session if it doesn't exist
+                config = self._store_configuration(dbsession, configuration)
                 new_sess = self.MemSession(
                     timestamp=int(os.times()[4]),
                     group_id=group_id,
@@ -466,7 +539,9 @@ class SessionManager:
                 agent_ids=json.loads(sess_data.agent_ids),
                 user_ids=json.loads(sess_data.user_ids),
                 session_id=sess_data.session_id,
-                configuration=json.loads(sess_data.configuration),
+                configuration=self._load_configuration(
+                    dbsession, sess_data.configuration
+                ),
             )
 
     def get_all_sessions(self) -> list[SessionInfo]:
@@ -488,7 +563,9 @@ class SessionManager:
                         agent_ids=json.loads(session.agent_ids),
                         user_ids=json.loads(session.user_ids),
                         session_id=session.session_id,
-                        configuration=json.loads(session.configuration),
+                        configuration=self._load_configuration(
+                            dbsession, session.configuration
+                        ),
                     )
                 )
         return result
@@ -524,7 +601,9 @@ class SessionManager:
                         agent_ids=json.loads(sess.agent_ids),
                         user_ids=json.loads(sess.user_ids),
                         session_id=sess.session_id,
-                        configuration=json.loads(sess.configuration),
+                        configuration=self._load_configuration(
+                            dbsession, sess.configuration
+                        ),
                     )
                 )
         return result
@@ -557,7 +636,9 @@ class SessionManager:
                         agent_ids=json.loads(sess.agent_ids),
                         user_ids=json.loads(sess.user_ids),
                         session_id=sess.session_id,
-                        configuration=json.loads(sess.configuration),
+                        configuration=self._load_configuration(
+                            dbsession, sess.configuration
+                        ),
                     )
                 )
             return result
@@ -594,7 +675,9 @@ class SessionManager:
                         agent_ids=json.loads(sess.agent_ids),
                         user_ids=json.loads(sess.user_ids),
                         session_id=sess.session_id,
-                        configuration=json.loads(sess.configuration),
+                        configuration=self._load_configuration(
+                            dbsession, sess.configuration
+                        ),
                     )
                 )
         return result
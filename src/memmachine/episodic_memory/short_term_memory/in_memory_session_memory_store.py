@@ -0,0 +1,62 @@
+"""
+Session memory store that holds the state of sessions in process.
+"""
+
+from collections import deque
+
+from ..data_types import Episode, MemoryContext
+from .session_memory_store import (
+    SessionMemoryLimits,
+    SessionMemoryState,
+    SessionMemoryStore,
+    add_episode_to_state,
+)
+
+
+class InMemorySessionMemoryStore(SessionMemoryStore):
+    """
+    Session memory store that holds the state of sessions in process.
+    The state of a session is lost when it is released.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty InMemorySessionMemoryStore.
+        """
+        self._states: dict[tuple[str, str], SessionMemoryState] = {}
+
+    async def load_state(
+        self, memory_context: MemoryContext, capacity: int
+    ) -> SessionMemoryState:
+        key = InMemorySessionMemoryStore._key(memory_context)
+        state = self._states.get(key)
+        if state is None:
+            state = SessionMemoryState(episodes=deque(maxlen=capacity))
+            self._states[key] = state
+        return state
+
+    async def append_episode(
+        self,
+        memory_context: MemoryContext,
+        episode: Episode,
+        token_num: int,
+        limits: SessionMemoryLimits,
+    ) -> tuple[SessionMemoryState, list[Episode] | None]:
+        # The loaded state is the stored state.
+        state = await self.load_state(memory_context, limits.capacity)
+        return state, add_episode_to_state(state, episode, token_num, limits)
+
+    async def save_summary(self, memory_context: MemoryContext, summary: str):
+        state = self._states.get(InMemorySessionMemoryStore._key(memory_context))
+        if state is not None:
+            state.summary = summary
+
+    async def delete_state(self, memory_context: MemoryContext):
+        self._states.pop(InMemorySessionMemoryStore._key(memory_context), None)
+
+    async def release_state(self, memory_context: MemoryContext):
+        await self.delete_state(memory_context)
+
+    @staticmethod
+    def _key(memory_context: MemoryContext) -> tuple[str, str]:
+        return (memory_context.group_id, memory_context.session_id)
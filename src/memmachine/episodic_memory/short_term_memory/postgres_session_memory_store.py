@@ -0,0 +1,249 @@
+"""
+Session memory store that persists the state of sessions in PostgreSQL.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any
+
+import asyncpg
+
+from ..data_types import Episode, MemoryContext
+from .session_memory_store import (
+    SessionMemoryLimits,
+    SessionMemoryState,
+    SessionMemoryStore,
+    add_episode_to_state,
+    deserialize_episode,
+    serialize_episode,
+)
+
+
+class PostgresSessionMemoryStore(SessionMemoryStore):
+    """
+    Session memory store that persists the state of sessions
+    in a PostgreSQL database, which can be shared by server workers
+    on any number of hosts.
+    Episodes are append-only rows,
+    with one state row per session for its summary and counters.
+    """
+
+    def __init__(self, config: dict[str, Any]):
+        """
+        Initialize a PostgresSessionMemoryStore.
+        The connection pool is created on first access.
+
+        Args:
+            config (dict[str, Any]):
+                A configuration dictionary containing the host, port, user,
+                password, database, and optionally schema of the database.
+
+        Raises:
+            ValueError: If a connection parameter is not provided in the config.
+        """
+        for key in ("host", "port", "user", "password", "database"):
+            if config.get(key) is None:
+                raise ValueError(f"DB {key} is not in config")
+        self._config = config
+
+        self._episodes_table = "session_memory_episodes"
+        self._states_table = "session_memory_states"
+        schema = config.get("schema")
+        if schema is not None and schema.strip() != "":
+            schema = schema.strip()
+            self._episodes_table = f"{schema}.{self._episodes_table}"
+            self._states_table = f"{schema}.{self._states_table}"
+
+        self._pool: asyncpg.Pool | None = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        if self._pool is not None:
+            return self._pool
+
+        async with self._pool_lock:
+            if self._pool is None:
+                pool = await asyncpg.create_pool(
+                    host=self._config["host"],
+                    port=self._config["port"],
+                    user=self._config["user"],
+                    password=self._config["password"],
+                    database=self._config["database"],
+                    min_size=self._config.get("min_pool_size", 1),
+                    max_size=self._config.get("max_pool_size", 10),
+                )
+                async with pool.acquire() as conn:
+                    await conn.execute(
+                        f"""
+                        CREATE TABLE IF NOT EXISTS {self._episodes_table} (
+                            id BIGSERIAL PRIMARY KEY,
+                            group_id TEXT NOT NULL,
+                            session_id TEXT NOT NULL,
+                            episode JSONB NOT NULL
+                        );
+                        CREATE INDEX IF NOT EXISTS session_memory_episodes_session
+                        ON {self._episodes_table} (group_id, session_id, id);
+                        CREATE TABLE IF NOT EXISTS {self._states_table} (
+                            group_id TEXT NOT NULL,
+                            session_id TEXT NOT NULL,
+                            summary TEXT NOT NULL DEFAULT '',
+                            episode_count INTEGER NOT NULL DEFAULT 0,
+                            message_len INTEGER NOT NULL DEFAULT 0,
+                            token_num INTEGER NOT NULL DEFAULT 0,
+                            episode_num INTEGER NOT NULL DEFAULT 0,
+                            PRIMARY KEY (group_id, session_id)
+                        );
+                        """
+                    )
+                self._pool = pool
+
+        return self._pool
+
+    async def load_state(
+        self, memory_context: MemoryContext, capacity: int
+    ) -> SessionMemoryState:
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            return await self._read_state(conn, memory_context, capacity)
+
+    async def _read_state(
+        self,
+        conn: asyncpg.Connection,
+        memory_context: MemoryContext,
+        capacity: int,
+        for_update: bool = False,
+    ) -> SessionMemoryState:
+        row = await conn.fetchrow(
+            f"""
+            SELECT summary, episode_count, message_len, token_num, episode_num
+            FROM {self._states_table}
+            WHERE group_id = $1 AND session_id = $2
+            {"FOR UPDATE" if for_update else ""}
+            """,
+            memory_context.group_id,
+            memory_context.session_id,
+        )
+        if row is None:
+            return SessionMemoryState(episodes=deque(maxlen=capacity))
+
+        episode_rows = await conn.fetch(
+            f"""
+            SELECT episode FROM {self._episodes_table}
+            WHERE group_id = $1 AND session_id = $2
+            ORDER BY id DESC LIMIT $3
+            """,
+            memory_context.group_id,
+            memory_context.session_id,
+            min(row["episode_num"], capacity),
+        )
+
+        return SessionMemoryState(
+            episodes=deque(
+                (
+                    deserialize_episode(episode_row["episode"])
+                    for episode_row in reversed(episode_rows)
+                ),
+                maxlen=capacity,
+            ),
+            episode_count=row["episode_count"],
+            message_len=row["message_len"],
+            token_num=row["token_num"],
+            summary=row["summary"],
+        )
+
+    async def append_episode(
+        self,
+        memory_context: MemoryContext,
+        episode: Episode,
+        token_num: int,
+        limits: SessionMemoryLimits,
+    ) -> tuple[SessionMemoryState, list[Episode] | None]:
+        pool = await self._get_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            # Lock the state row of the session,
+            # so that concurrent appends from other workers are serialized.
+            await conn.execute(
+                f"""
+                INSERT INTO {self._states_table} (group_id, session_id)
+                VALUES ($1, $2)
+                ON CONFLICT (group_id, session_id) DO NOTHING
+                """,
+                memory_context.group_id,
+                memory_context.session_id,
+            )
+            state = await self._read_state(
+                conn, memory_context, limits.capacity, for_update=True
+            )
+            evicted_episodes = add_episode_to_state(state, episode, token_num, limits)
+
+            await conn.execute(
+                f"""
+                INSERT INTO {self._episodes_table} (group_id, session_id, episode)
+                VALUES ($1, $2, $3::jsonb)
+                """,
+                memory_context.group_id,
+                memory_context.session_id,
+                serialize_episode(episode),
+            )
+            await conn.execute(
+                f"""
+                UPDATE {self._states_table} SET
+                episode_count = $3,
+                message_len = $4,
+                token_num = $5,
+                episode_num = $6
+                WHERE group_id = $1 AND session_id = $2
+                """,
+                memory_context.group_id,
+                memory_context.session_id,
+                state.episode_count,
+                state.message_len,
+                state.token_num,
+                len(state.episodes),
+            )
+            # Only the newest episode_num episodes are ever read.
+            await conn.execute(
+                f"""
+                DELETE FROM {self._episodes_table}
+                WHERE group_id = $1 AND session_id = $2 AND id < (
+                    SELECT id FROM {self._episodes_table}
+                    WHERE group_id = $1 AND session_id = $2
+                    ORDER BY id DESC LIMIT 1 OFFSET $3
+                )
+                """,
+                memory_context.group_id,
+                memory_context.session_id,
+                len(state.episodes) - 1,
+            )
+
+        return state, evicted_episodes
+
+    async def save_summary(self, memory_context: MemoryContext, summary: str):
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                f"""
+                INSERT INTO {self._states_table} (group_id, session_id, summary)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (group_id, session_id) DO UPDATE SET
+                summary = EXCLUDED.summary
+                """,
+                memory_context.group_id,
+                memory_context.session_id,
+                summary,
+            )
+
+    async def delete_state(self, memory_context: MemoryContext):
+        pool = await self._get_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            for table in (self._episodes_table, self._states_table):
+                await conn.execute(
+                    f"DELETE FROM {table} WHERE group_id = $1 AND session_id = $2",
+                    memory_context.group_id,
+                    memory_context.session_id,
+                )
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
@@ -6,7 +6,8 @@ storing and managing a sequence of conversational turns (episodes) within a
 single session. It uses a deque with a fixed capacity and evicts older
 episodes when memory limits (number of episodes, message length, or token
 count) are reached. Evicted episodes are summarized asynchronously to maintain
-context over a longer conversation.
+context over a longer conversation. The episodes, counters, and summary are
+held by a `SessionMemoryStore`, which may persist them outside of the process.
 """
 
 import asyncio
@@ -16,6 +17,12 @@ from collections import deque
 from memmachine.common.data_types import ExternalServiceAPIError
 
 from ..data_types import Episode, MemoryContext
+from .in_memory_session_memory_store import InMemorySessionMemoryStore
+from .session_memory_store import (
+    SessionMemoryLimits,
+    SessionMemoryState,
+    SessionMemoryStore,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +47,7 @@ class SessionMemory:
         max_message_len: int,
         max_token_num: int,
         memory_context: MemoryContext,
+        store: SessionMemoryStore | None = None,
     ):
         # pylint: disable=too-many-arguments
         # pylint: disable=too-many-positional-arguments
@@ -60,38 +68,30 @@ class SessionMemory:
                            messages.
             memory_context: The context (group, agent, user, session) for the
                             memory.
+            store: The store holding the state of the memory. The state is
+                   loaded from the store on each access, so that it can be
+                   shared with other processes. Defaults to a store that holds
+                   the state in process.
         """
         self._model = model
         self._summary_user_prompt = summary_user_prompt
         self._summary_system_prompt = summary_system_prompt
-        self._memory: deque[Episode] = deque(maxlen=capacity)
-        self._capacity = capacity
-        self._current_episode_count = 0
-        self._max_message_len = max_message_len
-        self._max_token_num = max_token_num
-        self._current_message_len = 0
-        self._current_token_num = 0
-        self._summary = ""
+        self._limits = SessionMemoryLimits(capacity, max_message_len, max_token_num)
         self._memory_context = memory_context
-        self._summary_task = None
+        self._store = store if store is not None else InMemorySessionMemoryStore()
+        # The state last loaded from the store.
+        self._state: SessionMemoryState | None = None
+        self._summary_task: asyncio.Task | None = None
         self._lock = asyncio.Lock()
 
-    def _is_full(self) -> bool:
+    async def _load_state(self) -> SessionMemoryState:
         """
-        Checks if the short-term memory has reached its capacity.
-
-        Memory is considered full if the number of events, total message
-        length, or total token count exceeds their respective maximums.
-
-        Returns:
-            True if the memory is full, False otherwise.
+        Loads the state of the memory from the store.
         """
-        result = (
-            self._current_episode_count >= self._capacity
-            or self._current_message_len >= self._max_message_len
-            or self._current_token_num >= self._max_token_num
+        self._state = await self._store.load_state(
+            self._memory_context, self._limits.capacity
         )
-        return result
+        return self._state
 
     async def add_episode(self, episode: Episode) -> bool:
         """
@@ -105,38 +105,32 @@ class SessionMemory:
             otherwise.
         """
         async with self._lock:
-            self._memory.append(episode)
+            # The store decides eviction atomically,
+            # so that workers sharing the session do not lose updates.
+            state, evicted_episodes = await self._store.append_episode(
+                self._memory_context,
+                episode,
+                self._compute_token_num(episode),
+                self._limits,
+            )
+            self._state = state
+            if evicted_episodes is None:
+                return False
 
-            self._current_episode_count += 1
-            self._current_message_len += len(episode.content)
-            self._current_token_num += self._compute_token_num(self._memory[-1])
-            full = self._is_full()
-            if full:
-                await self._do_evict()
-            return full
+            await self._summarize(evicted_episodes, state.summary)
+            return True
 
-    async def _do_evict(self):
+    async def _summarize(self, episodes: list[Episode], summary: str):
         """
-        The eviction make a copy of the episode to create summary
-        asynchronously. It clears the stats. It keeps as many episode
-        as possible for current capacity.
+        Creates a summary of evicted episodes asynchronously.
         """
-        result = []
-        # do not clear the episode memory here so rolling episode can be
-        #  used as context
-        # just remove the episode that left over from previous evition.
-        while len(self._memory) > self._current_episode_count:
-            self._memory.popleft()
-
-        for e in self._memory:
-            result.append(e)
-        self._current_episode_count = 0
-        self._current_message_len = 0
-        self._current_token_num = 0
         # if previous summary task is still running, wait for it
         if self._summary_task is not None:
             await self._summary_task
-        self._summary_task = asyncio.create_task(self._create_summary(result))
+            summary = (await self._load_state()).summary
+        self._summary_task = asyncio.create_task(
+            self._create_summary(episodes, summary)
+        )
 
     async def clear_memory(self):
         """
@@ -147,17 +141,34 @@ class SessionMemory:
         async with self._lock:
             if self._summary_task is not None:
                 self._summary_task.cancel()
-            self._memory.clear()
-            self._current_episode_count = 0
-            self._current_message_len = 0
-            self._current_token_num = 0
-            self._summary = ""
+                self._summary_task = None
+            await self._store.delete_state(self._memory_context)
+            self._state = None
 
     async def close(self):
-        """Closes the memory, which currently just involves clearing it."""
-        await self.clear_memory()
+        """
+        Closes the memory, releasing the state held in process.
+        State held only in process is cleared.
+        """
+        async with self._lock:
+            if self._summary_task is not None:
+                await self._summary_task
+                self._summary_task = None
+            await self._store.release_state(self._memory_context)
+            self._state = None
+
+    def get_token_num(self) -> int:
+        """
+        Estimates the number of tokens held by the short-term memory,
+        including the summary, as of its last access.
+        """
+        if self._state is None:
+            return 0
+        return self._compute_token_num(self._state.summary) + sum(
+            self._compute_token_num(e) for e in self._state.episodes
+        )
 
-    async def _create_summary(self, episodes: list[Episode]):
+    async def _create_summary(self, episodes: list[Episode], summary: str):
         """
         Generates a new summary of the events currently in memory.
 
@@ -181,13 +192,13 @@ class SessionMemory:
                     meta = repr(entry.user_metadata)
                 episode_content += f"[{str(entry.uuid)} : {meta} : {entry.content}]"
             msg = self._summary_user_prompt.format(
-                episodes=episode_content, summary=self._summary
+                episodes=episode_content, summary=summary
             )
             result = await self._model.generate_response(
                 system_prompt=self._summary_system_prompt, user_prompt=msg
             )
-            self._summary = result[0]
-            logger.debug("Summary: %s\n", self._summary)
+            await self._store.save_summary(self._memory_context, result[0])
+            logger.debug("Summary: %s\n", result[0])
         except ExternalServiceAPIError:
             logger.info("External API error when creating summary")
         except ValueError:
@@ -214,13 +225,14 @@ class SessionMemory:
             if self._summary_task is not None:
                 await self._summary_task
                 self._summary_task = None
+            state = await self._load_state()
             length = (
-                self._compute_token_num(self._summary)
-                if self._summary is not None
+                self._compute_token_num(state.summary)
+                if state.summary is not None
                 else 0
             )
             episodes: deque[Episode] = deque()
-            for e in reversed(self._memory):
+            for e in reversed(state.episodes):
                 if length >= max_token_num > 0:
                     break
                 if len(episodes) >= limit > 0:
@@ -230,7 +242,7 @@ class SessionMemory:
                     break
                 episodes.appendleft(e)
                 length += token_num
-            return list(episodes), self._summary
+            return list(episodes), state.summary
 
     def _compute_token_num(self, episode: Episode | str) -> int:
         """
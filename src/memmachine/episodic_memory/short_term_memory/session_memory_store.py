@@ -0,0 +1,242 @@
+"""
+Abstract base class for a store that holds the state of session memories.
+
+A store keeps, for each session, the episodes appended to its short-term
+memory and one state row with its rolling summary and counters. Stores that
+persist the state outside of the process let several server workers share
+sessions and keep short-term memory across restarts.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from uuid import UUID
+
+from ..data_types import ContentType, Episode, MemoryContext
+
+
+@dataclass
+class SessionMemoryState:
+    """
+    The state of the short-term memory of a session.
+    """
+
+    episodes: deque[Episode] = field(default_factory=deque)
+    """The episodes retained in memory, oldest first."""
+    episode_count: int = 0
+    """The number of episodes added since the last eviction."""
+    message_len: int = 0
+    """The total message length of episodes added since the last eviction."""
+    token_num: int = 0
+    """The number of tokens of episodes added since the last eviction."""
+    summary: str = ""
+    """The rolling summary of evicted episodes."""
+
+
+@dataclass(frozen=True)
+class SessionMemoryLimits:
+    """
+    The limits of the short-term memory of a session.
+    The memory is full when any of the limits is reached.
+    """
+
+    capacity: int
+    """The maximum number of episodes."""
+    max_message_len: int
+    """The maximum total message length of episodes in characters."""
+    max_token_num: int
+    """The maximum number of tokens of episodes."""
+
+    def is_full(self, state: SessionMemoryState) -> bool:
+        """
+        Check whether the episodes added since the last eviction
+        have reached any of the limits.
+        """
+        return (
+            state.episode_count >= self.capacity
+            or state.message_len >= self.max_message_len
+            or state.token_num >= self.max_token_num
+        )
+
+
+def add_episode_to_state(
+    state: SessionMemoryState,
+    episode: Episode,
+    token_num: int,
+    limits: SessionMemoryLimits,
+) -> list[Episode] | None:
+    """
+    Add an episode to the state of a session in place,
+    and evict the episodes added since the last eviction
+    if the memory is full.
+
+    Evicted episodes stay in memory as context,
+    but the counters are reset and episodes left over
+    from previous evictions are removed.
+
+    Args:
+        state (SessionMemoryState):
+            The state to add the episode to.
+        episode (Episode):
+            The episode to add.
+        token_num (int):
+            The number of tokens of the episode.
+        limits (SessionMemoryLimits):
+            The limits of the memory.
+
+    Returns:
+        list[Episode] | None:
+            The evicted episodes, or None if the memory is not full.
+    """
+    state.episodes.append(episode)
+    state.episode_count += 1
+    state.message_len += len(episode.content)
+    state.token_num += token_num
+    if not limits.is_full(state):
+        return None
+
+    while len(state.episodes) > state.episode_count:
+        state.episodes.popleft()
+    state.episode_count = 0
+    state.message_len = 0
+    state.token_num = 0
+    return list(state.episodes)
+
+
+class SessionMemoryStore(ABC):
+    """
+    Abstract base class for a store
+    that holds the state of session memories.
+    """
+
+    @abstractmethod
+    async def load_state(
+        self, memory_context: MemoryContext, capacity: int
+    ) -> SessionMemoryState:
+        """
+        Load the state of the short-term memory of a session.
+        The state of a session that was never stored is empty.
+
+        Args:
+            memory_context (MemoryContext):
+                The context of the session.
+            capacity (int):
+                The maximum number of episodes retained in memory.
+
+        Returns:
+            SessionMemoryState:
+                The state of the short-term memory of the session.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def append_episode(
+        self,
+        memory_context: MemoryContext,
+        episode: Episode,
+        token_num: int,
+        limits: SessionMemoryLimits,
+    ) -> tuple[SessionMemoryState, list[Episode] | None]:
+        """
+        Append an episode to the short-term memory of a session,
+        evicting episodes if the memory is full (see add_episode_to_state).
+        The state is read, updated, and written atomically,
+        so that episodes can be appended to a session concurrently.
+
+        Args:
+            memory_context (MemoryContext):
+                The context of the session.
+            episode (Episode):
+                The episode to append.
+            token_num (int):
+                The number of tokens of the episode.
+            limits (SessionMemoryLimits):
+                The limits of the memory.
+
+        Returns:
+            tuple[SessionMemoryState, list[Episode] | None]:
+                The state after appending the episode,
+                and the evicted episodes, or None if the memory is not full.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save_summary(self, memory_context: MemoryContext, summary: str):
+        """
+        Store the rolling summary of a session.
+
+        Args:
+            memory_context (MemoryContext):
+                The context of the session.
+            summary (str):
+                The new rolling summary.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_state(self, memory_context: MemoryContext):
+        """
+        Delete all episodes and the summary of a session.
+
+        Args:
+            memory_context (MemoryContext):
+                The context of the session.
+        """
+        raise NotImplementedError
+
+    async def release_state(self, memory_context: MemoryContext):
+        """
+        Release the resources held in process for a session
+        that is no longer in use.
+        Stores that only hold state in process discard it.
+
+        Args:
+            memory_context (MemoryContext):
+                The context of the session.
+        """
+
+    async def close(self):
+        """
+        Close the store and release its connections.
+        """
+
+
+def serialize_episode(episode: Episode) -> str:
+    """
+    Serialize an episode to JSON for a store.
+    """
+    return json.dumps(
+        {
+            "uuid": str(episode.uuid),
+            "episode_type": episode.episode_type,
+            "content_type": episode.content_type.value,
+            "content": episode.content,
+            "timestamp": episode.timestamp.isoformat(),
+            "group_id": episode.group_id,
+            "session_id": episode.session_id,
+            "producer_id": episode.producer_id,
+            "produced_for_id": episode.produced_for_id,
+            "user_metadata": episode.user_metadata,
+        }
+    )
+
+
+def deserialize_episode(serialized_episode: str) -> Episode:
+    """
+    Deserialize an episode serialized by serialize_episode.
+    """
+    fields = json.loads(serialized_episode)
+    return Episode(
+        uuid=UUID(fields["uuid"]),
+        episode_type=fields["episode_type"],
+        content_type=ContentType(fields["content_type"]),
+        content=fields["content"],
+        timestamp=datetime.fromisoformat(fields["timestamp"]),
+        group_id=fields["group_id"],
+        session_id=fields["session_id"],
+        producer_id=fields["producer_id"],
+        produced_for_id=fields["produced_for_id"],
+        user_metadata=fields["user_metadata"],
+    )
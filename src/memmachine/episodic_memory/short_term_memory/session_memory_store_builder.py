@@ -0,0 +1,43 @@
+"""
+Builder for SessionMemoryStore instances.
+"""
+
+from typing import Any
+
+from memmachine.common.builder import Builder
+
+from .session_memory_store import SessionMemoryStore
+
+
+class SessionMemoryStoreBuilder(Builder):
+    """
+    Builder for SessionMemoryStore instances.
+    """
+
+    @staticmethod
+    def get_dependency_ids(name: str, config: dict[str, Any]) -> set[str]:
+        return set()
+
+    @staticmethod
+    def build(
+        name: str, config: dict[str, Any], injections: dict[str, Any]
+    ) -> SessionMemoryStore:
+        match name:
+            case "in-memory":
+                from .in_memory_session_memory_store import (
+                    InMemorySessionMemoryStore,
+                )
+
+                return InMemorySessionMemoryStore()
+            case "sqlite":
+                from .sqlite_session_memory_store import SQLiteSessionMemoryStore
+
+                return SQLiteSessionMemoryStore(config)
+            case "postgres":
+                from .postgres_session_memory_store import (
+                    PostgresSessionMemoryStore,
+                )
+
+                return PostgresSessionMemoryStore(config)
+            case _:
+                raise ValueError(f"Unknown SessionMemoryStore name: {name}")
@@ -0,0 +1,235 @@
+"""
+Session memory store that persists the state of sessions in SQLite.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+from collections import deque
+from typing import Any
+
+from ..data_types import Episode, MemoryContext
+from .session_memory_store import (
+    SessionMemoryLimits,
+    SessionMemoryState,
+    SessionMemoryStore,
+    add_episode_to_state,
+    deserialize_episode,
+    serialize_episode,
+)
+
+
+class SQLiteSessionMemoryStore(SessionMemoryStore):
+    """
+    Session memory store that persists the state of sessions
+    in a SQLite database, which can be shared by server workers on one host.
+    Episodes are append-only rows,
+    with one state row per session for its summary and counters.
+    """
+
+    def __init__(self, config: dict[str, Any]):
+        """
+        Initialize a SQLiteSessionMemoryStore.
+
+        Args:
+            config (dict[str, Any]):
+                A configuration dictionary containing the path
+                of the SQLite database.
+                Example: {"path": "session_memory.db"}
+
+        Raises:
+            ValueError: If the "path" is not provided in the config.
+        """
+        path = config.get("path")
+        if path is None or len(path) < 1:
+            raise ValueError(f"Invalid SQLite path: {str(config)}")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS session_memory_episodes (\n"
+            "    id INTEGER PRIMARY KEY AUTOINCREMENT,\n"
+            "    group_id TEXT NOT NULL,\n"
+            "    session_id TEXT NOT NULL,\n"
+            "    episode TEXT NOT NULL\n"
+            ")"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS session_memory_episodes_session\n"
+            "ON session_memory_episodes (group_id, session_id, id)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS session_memory_states (\n"
+            "    group_id TEXT NOT NULL,\n"
+            "    session_id TEXT NOT NULL,\n"
+            "    summary TEXT NOT NULL DEFAULT '',\n"
+            "    episode_count INTEGER NOT NULL DEFAULT 0,\n"
+            "    message_len INTEGER NOT NULL DEFAULT 0,\n"
+            "    token_num INTEGER NOT NULL DEFAULT 0,\n"
+            "    episode_num INTEGER NOT NULL DEFAULT 0,\n"
+            "    PRIMARY KEY (group_id, session_id)\n"
+            ")"
+        )
+
+    async def load_state(
+        self, memory_context: MemoryContext, capacity: int
+    ) -> SessionMemoryState:
+        return await asyncio.to_thread(self._load_state, memory_context, capacity)
+
+    def _load_state(
+        self, memory_context: MemoryContext, capacity: int
+    ) -> SessionMemoryState:
+        with self._lock:
+            return self._read_state(memory_context, capacity)
+
+    def _read_state(
+        self, memory_context: MemoryContext, capacity: int
+    ) -> SessionMemoryState:
+        key = (memory_context.group_id, memory_context.session_id)
+        row = self._connection.execute(
+            "SELECT summary, episode_count, message_len, token_num, episode_num\n"
+            "FROM session_memory_states\n"
+            "WHERE group_id = ? AND session_id = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return SessionMemoryState(episodes=deque(maxlen=capacity))
+
+        summary, episode_count, message_len, token_num, episode_num = row
+        episode_rows = self._connection.execute(
+            "SELECT episode FROM session_memory_episodes\n"
+            "WHERE group_id = ? AND session_id = ?\n"
+            "ORDER BY id DESC LIMIT ?",
+            (*key, min(episode_num, capacity)),
+        ).fetchall()
+
+        return SessionMemoryState(
+            episodes=deque(
+                (deserialize_episode(episode) for (episode,) in reversed(episode_rows)),
+                maxlen=capacity,
+            ),
+            episode_count=episode_count,
+            message_len=message_len,
+            token_num=token_num,
+            summary=summary,
+        )
+
+    async def append_episode(
+        self,
+        memory_context: MemoryContext,
+        episode: Episode,
+        token_num: int,
+        limits: SessionMemoryLimits,
+    ) -> tuple[SessionMemoryState, list[Episode] | None]:
+        return await asyncio.to_thread(
+            self._append_episode, memory_context, episode, token_num, limits
+        )
+
+    def _append_episode(
+        self,
+        memory_context: MemoryContext,
+        episode: Episode,
+        token_num: int,
+        limits: SessionMemoryLimits,
+    ) -> tuple[SessionMemoryState, list[Episode] | None]:
+        key = (memory_context.group_id, memory_context.session_id)
+        with self._lock:
+            # The state is read inside the write transaction,
+            # so that concurrent appends from other processes are serialized.
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                state = self._read_state(memory_context, limits.capacity)
+                evicted_episodes = add_episode_to_state(
+                    state, episode, token_num, limits
+                )
+                self._connection.execute(
+                    "INSERT INTO session_memory_episodes (group_id, session_id, episode)\n"
+                    "VALUES (?, ?, ?)",
+                    (*key, serialize_episode(episode)),
+                )
+                self._connection.execute(
+                    "INSERT INTO session_memory_states\n"
+                    "(group_id, session_id, episode_count, message_len, token_num, episode_num)\n"
+                    "VALUES (?, ?, ?, ?, ?, ?)\n"
+                    "ON CONFLICT (group_id, session_id) DO UPDATE SET\n"
+                    "episode_count = excluded.episode_count,\n"
+                    "message_len = excluded.message_len,\n"
+                    "token_num = excluded.token_num,\n"
+                    "episode_num = excluded.episode_num",
+                    (
+                        *key,
+                        state.episode_count,
+                        state.message_len,
+                        state.token_num,
+                        len(state.episodes),
+                    ),
+                )
+                # Only the newest episode_num episodes are ever read.
+                self._connection.execute(
+                    "DELETE FROM session_memory_episodes\n"
+                    "WHERE group_id = ? AND session_id = ? AND id < (\n"
+                    "    SELECT id FROM session_memory_episodes\n"
+                    "    WHERE group_id = ? AND session_id = ?\n"
+                    "    ORDER BY id DESC LIMIT 1 OFFSET ?\n"
+                    ")",
+                    (*key, *key, len(state.episodes) - 1),
+                )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+        return state, evicted_episodes
+
+    async def save_summary(self, memory_context: MemoryContext, summary: str):
+        await asyncio.to_thread(self._save_summary, memory_context, summary)
+
+    def _save_summary(self, memory_context: MemoryContext, summary: str):
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO session_memory_states (group_id, session_id, summary)\n"
+                "VALUES (?, ?, ?)\n"
+                "ON CONFLICT (group_id, session_id) DO UPDATE SET\n"
+                "summary = excluded.summary",
+                (memory_context.group_id, memory_context.session_id, summary),
+            )
+
+    async def delete_state(self, memory_context: MemoryContext):
+        await asyncio.to_thread(self._delete_state, memory_context)
+
+    def _delete_state(self, memory_context: MemoryContext):
+        key = (memory_context.group_id, memory_context.session_id)
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute(
+                    "DELETE FROM session_memory_episodes\n"
+                    "WHERE group_id = ? AND session_id = ?",
+                    key,
+                )
+                self._connection.execute(
+                    "DELETE FROM session_memory_states\n"
+                    "WHERE group_id = ? AND session_id = ?",
+                    key,
+                )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    async def close(self):
+        await asyncio.to_thread(self._close)
+
+    def _close(self):
+        with self._lock:
+            self._connection.close()
@@ -11,6 +11,7 @@ import datetime
 import json
 import logging
 import re
+from collections.abc import Mapping
 from itertools import accumulate, groupby, tee
 from typing import Any
 
@@ -151,6 +152,10 @@ class ProfileMemory:
         prompt (ProfilePrompt): The system prompts to be used.
         max_cache_size (int, optional): Max size for the profile LRU cache.
             Defaults to 1000.
+        update_batch_token_limit (int, optional): Estimated number of tokens
+            of pending history messages to pack into one profile update
+            prompt. If 0, each message is sent in its own prompt.
+            Defaults to 0.
     """
 
     PROFILE_UPDATE_INTERVAL_SEC = 2
@@ -178,6 +183,7 @@ class ProfileMemory:
         prompt: ProfilePrompt,
         max_cache_size=1000,
         profile_storage: ProfileStorageBase,
+        update_batch_token_limit: int = 0,
     ):
         if model is None:
             raise ValueError("model must be provided")
@@ -187,12 +193,15 @@ class ProfileMemory:
             raise ValueError("prompt must be provided")
         if profile_storage is None:
             raise ValueError("profile_storage must be provided")
+        if update_batch_token_limit < 0:
+            raise ValueError("update_batch_token_limit must be non-negative")
 
         self._model = model
         self._embeddings = embeddings
         self._profile_storage = profile_storage
 
         self._max_cache_size = max_cache_size
+        self._update_batch_token_limit = update_batch_token_limit
 
         self._update_prompt = prompt.update_prompt
         self._consolidation_prompt = prompt.consolidation_prompt
@@ -306,6 +315,45 @@ class ProfileMemory:
             citations=citations,
         )
 
+    async def add_new_profiles(self, features: list[dict[str, Any]]):
+        """Adds new features to users' profiles.
+
+        The values of all features are embedded in one call,
+        and the features are stored in one transaction.
+        This invalidates the cache for the users' profiles.
+
+        Args:
+            features: The features to add. Each feature is a dictionary
+                with the user_id, feature, value and tag, and optionally the
+                metadata, isolations and citations arguments of
+                add_new_profile.
+        """
+        if len(features) == 0:
+            return
+
+        for feature in features:
+            self._profile_cache.erase(
+                (feature["user_id"], json.dumps(feature.get("isolations") or {}))
+            )
+        embs = await self._embeddings.ingest_embed(
+            [feature["value"] for feature in features]
+        )
+        await self._profile_storage.add_profile_features(
+            [
+                {
+                    "user_id": feature["user_id"],
+                    "feature": feature["feature"],
+                    "value": feature["value"],
+                    "tag": feature["tag"],
+                    "embedding": np.array(emb),
+                    "metadata": feature.get("metadata") or {},
+                    "isolations": feature.get("isolations") or {},
+                    "citations": feature.get("citations") or [],
+                }
+                for feature, emb in zip(features, embs)
+            ]
+        )
+
     async def delete_user_profile_feature(
         self,
         user_id: str,
@@ -333,8 +381,9 @@ class ProfileMemory:
             user_id, feature, tag, value, isolations
         )
 
+    @staticmethod
     def range_filter(
-        self, arr: list[tuple[float, Any]], max_range: float, max_std: float
+        arr: list[tuple[float, Any]], max_range: float, max_std: float
     ) -> list[Any]:
         """
         Filters a list of semantically searched entries based on similarity.
@@ -373,7 +422,7 @@ class ProfileMemory:
     async def semantic_search(
         self,
         query: str,
-        k: int = 1_000_000,
+        k: int = 100,
         min_cos: float = -1.0,
         max_range: float = 2.0,
         max_std: float = 1.0,
@@ -385,7 +434,8 @@ class ProfileMemory:
         Args:
             user_id: The ID of the user.
             query: The search query string.
-            k: The maximum number of results to retrieve from the database.
+            k: The maximum number of candidates to retrieve from the database,
+                before the `range_filter` is applied.
             min_cos: The minimum cosine similarity for results.
             max_range: The maximum range for the `range_filter`.
             max_std: The maximum standard deviation for the `range_filter`.
@@ -395,14 +445,66 @@ class ProfileMemory:
             A list of matching profile entries, filtered by similarity scores.
         """
         # TODO: cache this # pylint: disable=fixme
+        return (
+            await self.semantic_search_many(
+                [query],
+                k=k,
+                min_cos=min_cos,
+                max_range=max_range,
+                max_std=max_std,
+                isolations=isolations,
+                user_id=user_id,
+            )
+        )[0]
+
+    async def semantic_search_many(
+        self,
+        queries: list[str],
+        k: int = 100,
+        min_cos: float = -1.0,
+        max_range: float = 2.0,
+        max_std: float = 1.0,
+        isolations: dict[str, bool | int | float | str] | None = None,
+        user_id: str = "",
+    ) -> list[list[Any]]:
+        """Performs a semantic search on a user's profile for several queries.
+
+        The queries are embedded in one call.
+
+        Args:
+            queries: The search query strings.
+            k: The maximum number of candidates to retrieve from the database
+                for each query, before the `range_filter` is applied.
+            min_cos: The minimum cosine similarity for results.
+            max_range: The maximum range for the `range_filter`.
+            max_std: The maximum standard deviation for the `range_filter`.
+            isolations: A dictionary for data isolation.
+            user_id: The ID of the user.
+
+        Returns:
+            A list of matching profile entries for each query,
+            filtered by similarity scores.
+        """
         if isolations is None:
             isolations = {}
-        qemb = (await self._embeddings.search_embed([query]))[0]
-        candidates = await self._profile_storage.semantic_search(
-            user_id, np.array(qemb), k, min_cos, isolations
+        if len(queries) == 0:
+            return []
+        qembs = await self._embeddings.search_embed(queries)
+        # The storage applies the range filter to the candidates.
+        return await asyncio.gather(
+            *(
+                self._profile_storage.semantic_search(
+                    user_id,
+                    np.array(qemb),
+                    k,
+                    min_cos,
+                    isolations,
+                    max_range=max_range,
+                    max_std=max_std,
+                )
+                for qemb in qembs
+            )
         )
-        formatted = [(i["metadata"]["similarity_score"], i) for i in candidates]
-        return self.range_filter(formatted, max_range, max_std)
 
     async def get_large_profile_sections(
         self,
@@ -470,6 +572,35 @@ class ProfileMemory:
 
         await self._dirty_users.mark_update(user_id)
 
+    async def add_persona_messages(self, messages: list[dict[str, Any]]):
+        """Adds messages to the history in one batch
+        and may trigger profile updates.
+
+        Args:
+            messages: The messages to add, each a dictionary with the
+                     content, metadata, isolations and user_id arguments
+                     of `add_persona_message`.
+        """
+        history_messages: list[Mapping[str, Any]] = []
+        for message in messages:
+            content = message["content"]
+            metadata = message.get("metadata") or {}
+            if "speaker" in metadata:
+                content = f"{metadata['speaker']} sends '{content}'"
+            history_messages.append(
+                {
+                    "user_id": message.get("user_id", ""),
+                    "content": content,
+                    "metadata": metadata,
+                    "isolations": message.get("isolations") or {},
+                }
+            )
+
+        await self._profile_storage.add_history_messages(history_messages)
+
+        for history_message in history_messages:
+            await self._dirty_users.mark_update(history_message["user_id"])
+
     async def uningested_message_count(self):
         return await self._profile_storage.get_uningested_history_messages_count()
 
@@ -525,20 +656,27 @@ class ProfileMemory:
             if len(messages) == 0:
                 return
 
-            logger.debug("ProfileMemory - Processing %d messages", len(messages))
+            # Messages are fetched newest first;
+            # process them in the order they were sent.
+            messages = sorted(messages, key=lambda message: message["id"])
+            windows = self._pack_message_windows(messages)
+            logger.debug(
+                "ProfileMemory - Processing %d messages in %d windows",
+                len(messages),
+                len(windows),
+            )
             mark_tasks = []
 
-            for i in range(0, len(messages) - 1):
-                message = messages[i]
-                await self._update_user_profile_think(message)
+            for i, window in enumerate(windows):
+                await self._update_user_profile_think(
+                    window, wait_consolidate=i == len(windows) - 1
+                )
                 mark_tasks.append(
-                    self._profile_storage.mark_messages_ingested([message["id"]])
+                    self._profile_storage.mark_messages_ingested(
+                        [message["id"] for message in window]
+                    )
                 )
 
-            await self._update_user_profile_think(messages[-1], wait_consolidate=True)
-            mark_tasks.append(
-                self._profile_storage.mark_messages_ingested([messages[-1]["id"]])
-            )
             await asyncio.gather(*mark_tasks)
 
         tasks = []
@@ -547,6 +685,30 @@ class ProfileMemory:
 
         await asyncio.gather(*tasks)
 
+    def _pack_message_windows(self, messages: list[Any]) -> list[list[Any]]:
+        """
+        Pack consecutive history messages into windows
+        whose estimated number of tokens is within the batch token limit.
+        A message that exceeds the limit by itself gets its own window.
+        """
+        if self._update_batch_token_limit == 0:
+            return [[message] for message in messages]
+
+        windows: list[list[Any]] = []
+        window_token_num = 0
+        for message in messages:
+            token_num = int(len(message["content"]) / 4)  # 4 character per token
+            if (
+                len(windows) > 0
+                and window_token_num + token_num <= self._update_batch_token_limit
+            ):
+                windows[-1].append(message)
+                window_token_num += token_num
+            else:
+                windows.append([message])
+                window_token_num = token_num
+        return windows
+
     def _parse_llm_json_response(
         self, response_text: str, response_type: str = "update"
     ) -> tuple[str, str]:
@@ -681,21 +843,23 @@ class ProfileMemory:
 
     async def _update_user_profile_think(
         self,
-        record: Any,
+        records: list[Any],
         wait_consolidate: bool = False,
     ):
         """
         update user profile based on json output, after doing a chain
         of thought.
+        The records must share the user and isolations,
+        and are sent to the language model in one prompt.
         """
         # TODO: These really should not be raw data structures.
-        citation_id = record["id"]  # Think this is an int
-        user_id = record["user_id"]
-        isolations = json.loads(record["isolations"])
+        citation_ids = [record["id"] for record in records]  # Think this is an int
+        user_id = records[0]["user_id"]
+        isolations = json.loads(records[0]["isolations"])
         # metadata = json.loads(record["metadata"])
 
         profile = await self.get_user_profile(user_id, isolations)
-        memory_content = record["content"]
+        memory_content = "\n".join(record["content"] for record in records)
 
         user_prompt = (
             "The old profile is provided below:\n"
@@ -829,6 +993,8 @@ class ProfileMemory:
             len(valid_commands),
             user_id,
         )
+        # Consecutive add commands are added in one batch.
+        pending_features: list[dict[str, Any]] = []
         for command in valid_commands:
             if command["command"] == "add":
                 logger.debug(
@@ -836,16 +1002,20 @@ class ProfileMemory:
                     user_id,
                     command,
                 )
-                await self.add_new_profile(
-                    user_id,
-                    command["feature"],
-                    command["value"],
-                    command["tag"],
-                    citations=[citation_id],
-                    isolations=isolations,
-                    # metadata=metadata
+                pending_features.append(
+                    {
+                        "user_id": user_id,
+                        "feature": command["feature"],
+                        "value": command["value"],
+                        "tag": command["tag"],
+                        "citations": citation_ids,
+                        "isolations": isolations,
+                        # "metadata": metadata,
+                    }
                 )
             elif command["command"] == "delete":
+                await self.add_new_profiles(pending_features)
+                pending_features = []
                 value = command["value"] if "value" in command else None
                 logger.debug(
                     "ProfileMemory - Deleting profile feature for user %s: %s",
@@ -864,6 +1034,7 @@ class ProfileMemory:
                 raise ValueError(
                     "Command with unknown action: " + str(command["command"])
                 )
+        await self.add_new_profiles(pending_features)
 
         if wait_consolidate:
             s = await self.get_large_profile_sections(
@@ -1004,6 +1175,7 @@ class ProfileMemory:
             value: str
             metadata: ConsolidateMemoryMetadata
 
+        new_features: list[dict[str, Any]] = []
         for memory in consolidate_memories:
             try:
                 consolidate_memory = ConsolidateMemory(**memory)
@@ -1042,11 +1214,14 @@ class ProfileMemory:
                     "think": thinking,
                 },
             )
-            await self.add_new_profile(
-                user_id,
-                consolidate_memory.feature,
-                consolidate_memory.value,
-                consolidate_memory.tag,
-                citations=new_citations,
-                isolations=new_isolations,
+            new_features.append(
+                {
+                    "user_id": user_id,
+                    "feature": consolidate_memory.feature,
+                    "value": consolidate_memory.value,
+                    "tag": consolidate_memory.tag,
+                    "citations": new_citations,
+                    "isolations": new_isolations,
+                }
             )
+        await self.add_new_profiles(new_features)
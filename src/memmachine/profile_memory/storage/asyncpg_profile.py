@@ -12,6 +12,32 @@ from memmachine.profile_memory.storage.storage_base import ProfileStorageBase
 
 logger = logging.getLogger(__name__)
 
+VECTOR_DISTANCE_OPERATORS: dict[str, tuple[str, str]] = {
+    "cosine": ("<=>", "vector_cosine_ops"),
+    "dot": ("<#>", "vector_ip_ops"),
+    "euclidean": ("<->", "vector_l2_ops"),
+    "manhattan": ("<+>", "vector_l1_ops"),
+}
+"""
+pgvector distance operator and index operator class
+for each embedding similarity metric.
+"""
+
+VECTOR_SIMILARITY_EXPRESSIONS: dict[str, str] = {
+    "cosine": "(1 - {distance})",
+    "dot": "(-{distance})",
+    "euclidean": "(1 / (1 + {distance} ^ 2))",
+    "manhattan": "(1 / (1 + {distance}))",
+}
+"""
+SQL similarity score of a pgvector distance
+for each embedding similarity metric.
+
+Euclidean and Manhattan similarities are bounded in (0, 1]
+like cosine similarities, so that min_cos and the range filter
+apply to them on the same scale.
+"""
+
 
 class RecordMapping(Mapping):
     def __init__(self, inner: asyncpg.Record):
@@ -63,6 +89,29 @@ class AsyncPgProfileStorage(ProfileStorageBase):
             raise ValueError("DB database is not in config")
         self._config = config
 
+        # The distance operator must match the operator class
+        # of the embedding index for the index to be used.
+        self._similarity_metric = config.get("similarity_metric") or "dot"
+        if self._similarity_metric not in VECTOR_DISTANCE_OPERATORS:
+            raise ValueError(
+                f"Unsupported similarity metric: {self._similarity_metric}"
+            )
+        self._hnsw_ef_search = config.get("hnsw_ef_search")
+        if self._hnsw_ef_search is not None and (
+            not isinstance(self._hnsw_ef_search, int) or self._hnsw_ef_search < 1
+        ):
+            raise ValueError("hnsw_ef_search must be a positive integer")
+        self._hnsw_iterative_scan = config.get("hnsw_iterative_scan")
+        if self._hnsw_iterative_scan not in (
+            None,
+            "off",
+            "strict_order",
+            "relaxed_order",
+        ):
+            raise ValueError(
+                f"Unsupported hnsw_iterative_scan: {self._hnsw_iterative_scan}"
+            )
+
         self.main_table = "prof"
         self.junction_table = "citations"
         self.history_table = "history"
@@ -228,6 +277,59 @@ class AsyncPgProfileStorage(ProfileStorageBase):
                     [(pid, c) for c in citations],
                 )
 
+    async def add_profile_features(
+        self,
+        features: list[Mapping[str, Any]],
+    ):
+        if len(features) == 0:
+            return
+
+        assert self._pool is not None
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                pids = await conn.fetch(
+                    f"""
+                    INSERT INTO {self.main_table}
+                    (user_id, tag, feature, value, embedding, metadata, isolations)
+                    SELECT user_id, tag, feature, value, embedding, metadata, isolations
+                    FROM unnest(
+                        $1::text[], $2::text[], $3::text[], $4::text[],
+                        $5::vector[], $6::jsonb[], $7::jsonb[]
+                    ) WITH ORDINALITY AS f(
+                        user_id, tag, feature, value,
+                        embedding, metadata, isolations, position
+                    )
+                    ORDER BY position
+                    RETURNING id
+                """,
+                    [feature["user_id"] for feature in features],
+                    [feature["tag"] for feature in features],
+                    [feature["feature"] for feature in features],
+                    [str(feature["value"]) for feature in features],
+                    [feature["embedding"] for feature in features],
+                    [json.dumps(feature.get("metadata") or {}) for feature in features],
+                    [
+                        json.dumps(feature.get("isolations") or {})
+                        for feature in features
+                    ],
+                )
+
+                citation_rows = [
+                    (row["id"], c)
+                    for row, feature in zip(pids, features)
+                    for c in feature.get("citations") or []
+                ]
+                if len(citation_rows) == 0:
+                    return
+                await conn.executemany(
+                    f"""
+                    INSERT INTO {self.junction_table}
+                    (profile_id, content_id)
+                    VALUES ($1, $2)
+                """,
+                    citation_rows,
+                )
+
     async def delete_profile_feature(
         self,
         user_id: str,
@@ -358,56 +460,110 @@ class AsyncPgProfileStorage(ProfileStorageBase):
         min_cos: float,
         isolations: dict[str, bool | int | float | str] | None = None,
         include_citations: bool = False,
+        max_range: float | None = None,
+        max_std: float | None = None,
     ) -> list[dict[str, Any]]:
         if isolations is None:
             isolations = {}
 
+        operator, _ = VECTOR_DISTANCE_OPERATORS[self._similarity_metric]
+        distance = f"(p.embedding {operator} $1::vector)"
+        similarity = VECTOR_SIMILARITY_EXPRESSIONS[self._similarity_metric].format(
+            distance=distance
+        )
+
         assert self._pool is not None
-        async with self._pool.acquire() as conn:
-            agg = await conn.fetch(
-                """
-                SELECT JSON_BUILD_OBJECT(
-                    'tag', p.tag,
-                    'feature', p.feature,
-                    'value', p.value,
-                    'metadata', JSON_BUILD_OBJECT(
-                        'id', p.id,
-                        'similarity_score', (-(p.embedding <#> $1::vector))
+        async with self._pool.acquire() as conn, conn.transaction():
+            # Search parameters of an HNSW index on the embeddings.
+            if self._hnsw_ef_search is not None:
+                await conn.execute(
+                    f"SET LOCAL hnsw.ef_search = {int(self._hnsw_ef_search)}"
+                )
+            if self._hnsw_iterative_scan is not None:
+                await conn.execute(
+                    f"SET LOCAL hnsw.iterative_scan = {self._hnsw_iterative_scan}"
+                )
+
+            # Order the candidates by the bare distance
+            # so that the index can be used.
+            # Then keep the longest prefix of candidates
+            # whose similarity scores deviate by less than max_std,
+            # and of those the ones within max_range of the top score,
+            # as ProfileMemory.range_filter does.
+            rows = await conn.fetch(
+                f"""
+                WITH candidates AS (
+                    SELECT p.id, p.tag, p.feature, p.value,
+                    {similarity} AS similarity_score
+                    FROM {self.main_table} p
+                    WHERE p.user_id = $2
+                    AND {similarity} > $3
+                    AND p.isolations @> $4
+                    ORDER BY {distance}
+                    LIMIT $5
+                ), ranked AS (
+                    SELECT *,
+                    ROW_NUMBER() OVER w AS position,
+                    FIRST_VALUE(similarity_score) OVER w AS top_score,
+                    STDDEV_POP(similarity_score) OVER w AS prefix_std
+                    FROM candidates
+                    WINDOW w AS (
+                        ORDER BY similarity_score DESC, id
+                        ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                    )
+                )
+                SELECT r.id, r.tag, r.feature, r.value, r.similarity_score
                 """
                 + (
                     f"""
-                        , 'citations', COALESCE(
-                            (
-                                SELECT JSON_AGG(h.content)
-                                FROM {self.junction_table} j
-                                JOIN {self.history_table} h ON j.content_id = h.id
-                                WHERE p.id = j.profile_id
-                            ),
-                            '[]'::json
-                        )
+                    , COALESCE(
+                        (
+                            SELECT JSON_AGG(h.content)
+                            FROM {self.junction_table} j
+                            JOIN {self.history_table} h ON j.content_id = h.id
+                            WHERE r.id = j.profile_id
+                        ),
+                        '[]'::json
+                    ) AS citations
                     """
                     if include_citations
                     else ""
                 )
-                + f"""
-                    )
-                )
-                FROM {self.main_table} p
-                WHERE p.user_id = $2
-                AND -(p.embedding <#> $1::vector) > $3
-                AND p.isolations @> $4
-                GROUP BY p.tag, p.feature, p.value, p.id, p.embedding
-                ORDER BY -(p.embedding <#> $1::vector) DESC
-                LIMIT $5
+                + """
+                FROM ranked r
+                WHERE ($6::float8 IS NULL OR r.similarity_score > r.top_score - $6)
+                AND ($7::float8 IS NULL OR r.position <= (
+                    SELECT COALESCE(MAX(position), 0) FROM ranked
+                    WHERE prefix_std < $7
+                ))
+                ORDER BY r.position
                 """,
                 qemb,
                 user_id,
                 min_cos,
                 json.dumps(isolations),
                 k,
+                max_range,
+                max_std,
+            )
+
+        res = []
+        for row in rows:
+            metadata: dict[str, Any] = {
+                "id": row["id"],
+                "similarity_score": row["similarity_score"],
+            }
+            if include_citations:
+                metadata["citations"] = json.loads(row["citations"])
+            res.append(
+                {
+                    "tag": row["tag"],
+                    "feature": row["feature"],
+                    "value": row["value"],
+                    "metadata": metadata,
+                }
             )
-            res = [json.loads(a[0]) for a in agg]
-            return res
+        return res
 
     async def add_history(
         self,
@@ -437,6 +593,32 @@ class AsyncPgProfileStorage(ProfileStorageBase):
             )
         return RecordMapping(row)
 
+    async def add_history_messages(
+        self,
+        messages: list[Mapping[str, Any]],
+    ) -> list[Mapping[str, Any]]:
+        if len(messages) == 0:
+            return []
+
+        stm = f"""
+            INSERT INTO {self.history_table} (user_id, content, metadata, isolations)
+            SELECT user_id, content, metadata, isolations
+            FROM unnest($1::text[], $2::text[], $3::jsonb[], $4::jsonb[])
+            WITH ORDINALITY AS m(user_id, content, metadata, isolations, position)
+            ORDER BY position
+            RETURNING id, user_id, content, metadata, isolations
+        """
+        assert self._pool is not None
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                stm,
+                [message["user_id"] for message in messages],
+                [message["content"] for message in messages],
+                [json.dumps(message.get("metadata") or {}) for message in messages],
+                [json.dumps(message.get("isolations") or {}) for message in messages],
+            )
+        return [RecordMapping(row) for row in rows]
+
     async def delete_history(
         self,
         user_id: str,
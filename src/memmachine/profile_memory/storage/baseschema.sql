@@ -1,4 +1,5 @@
 CREATE EXTENSION IF NOT EXISTS vector;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
 CREATE SCHEMA IF NOT EXISTS metadata;
 
 --TODO: find a better way to model metadata and isolations than jsonb
@@ -16,6 +17,9 @@ CREATE TABLE IF NOT EXISTS prof (
 );
 
 CREATE INDEX IF NOT EXISTS prof_user_idx ON prof (user_id);
+-- Serves both the user_id and the isolations containment filters.
+CREATE INDEX IF NOT EXISTS prof_user_isolations_idx ON
+    prof USING gin (user_id, isolations jsonb_path_ops);
 
 CREATE TABLE IF NOT EXISTS history (
     id SERIAL PRIMARY KEY,
@@ -33,6 +37,8 @@ CREATE INDEX IF NOT EXISTS history_user_ingested_idx ON
     history (user_id, ingested);
 CREATE INDEX IF NOT EXISTS history_user_ingested_ts_desc ON
     history (user_id, ingested, create_at DESC);
+CREATE INDEX IF NOT EXISTS history_user_isolations_idx ON
+    history USING gin (user_id, isolations jsonb_path_ops);
 
 
 CREATE TABLE IF NOT EXISTS citations (
@@ -75,6 +75,18 @@ class ProfileStorageBase(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def add_profile_features(
+        self,
+        features: list[Mapping[str, Any]],
+    ):
+        """
+        add features to profiles in one transaction.
+        each feature has the user_id, feature, value, tag, embedding,
+        metadata, isolations and citations arguments of add_profile_feature.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def semantic_search(
         self,
@@ -84,7 +96,15 @@ class ProfileStorageBase(ABC):
         min_cos: float,
         isolations: dict[str, bool | int | float | str] | None = None,
         include_citations: bool = False,
+        max_range: float | None = None,
+        max_std: float | None = None,
     ) -> list[dict[str, Any]]:
+        """
+        get the k features most similar to qemb with similarity above min_cos,
+        most similar first.
+        if max_range or max_std is set, only the features that pass
+        ProfileMemory.range_filter with them are returned.
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -133,6 +153,19 @@ class ProfileStorageBase(ABC):
     ) -> Mapping[str, Any]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def add_history_messages(
+        self,
+        messages: list[Mapping[str, Any]],
+    ) -> list[Mapping[str, Any]]:
+        """
+        add history messages in one batch.
+        each message has the user_id, content, metadata and isolations
+        arguments of add_history.
+        returns the added rows in the order of the messages
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def delete_history(
         self,
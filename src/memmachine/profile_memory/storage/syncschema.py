@@ -7,6 +7,10 @@ import asyncpg
 from dotenv import load_dotenv
 from pgvector.asyncpg import register_vector
 
+from memmachine.profile_memory.storage.asyncpg_profile import (
+    VECTOR_DISTANCE_OPERATORS,
+)
+
 script_dir = str(Path(__file__).parent)
 
 
@@ -14,6 +18,19 @@ def get_base() -> str:
     return open(f"{script_dir}/baseschema.sql", "r").read()
 
 
+def get_embedding_index(dimensions: int, similarity_metric: str) -> str:
+    """
+    SQL that types the profile embedding column with its dimensions
+    and creates an HNSW index on it for the similarity metric.
+    """
+    _, operator_class = VECTOR_DISTANCE_OPERATORS[similarity_metric]
+    return f"""
+        ALTER TABLE prof ALTER COLUMN embedding TYPE vector({int(dimensions)});
+        CREATE INDEX IF NOT EXISTS prof_embedding_{similarity_metric}_idx
+        ON prof USING hnsw (embedding {operator_class});
+    """
+
+
 async def delete_data(database: str, host: str, port: str, user: str, password: str):
     d: dict[str, str] = {
         "host": host,
@@ -47,7 +64,15 @@ async def delete_data(database: str, host: str, port: str, user: str, password:
         await pool.execute(f'DROP TABLE IF EXISTS "{table}" CASCADE;')
 
 
-async def sync_to(database: str, host: str, port: str, user: str, password: str):
+async def sync_to(
+    database: str,
+    host: str,
+    port: str,
+    user: str,
+    password: str,
+    embedding_dimensions: int | None = None,
+    similarity_metric: str = "dot",
+):
     d: dict[str, str] = {
         "host": host,
         "port": port,
@@ -67,6 +92,14 @@ async def sync_to(database: str, host: str, port: str, user: str, password: str)
     )
     connection = await asyncpg.connect(**d)
     await connection.execute(get_base())
+    if embedding_dimensions is not None:
+        print(
+            f"Indexing {embedding_dimensions}-dimensional embeddings "
+            f"for {similarity_metric} similarity ..."
+        )
+        await connection.execute(
+            get_embedding_index(embedding_dimensions, similarity_metric)
+        )
     print("Re-initializing ...")
 
 
@@ -102,6 +135,22 @@ def main():
         default=os.getenv("POSTGRES_PASSWORD"),
         help="the default password is read from the environement variable POSTGRES_PASSWORD",
     )
+    parser.add_argument(
+        "--embedding-dimensions",
+        type=int,
+        default=os.getenv("PROFILE_EMBEDDING_DIMENSIONS"),
+        help="the dimensions of the profile embeddings. if set, the embeddings "
+        "are indexed for approximate nearest neighbor search. the default is "
+        "read from the environment variable PROFILE_EMBEDDING_DIMENSIONS",
+    )
+    parser.add_argument(
+        "--similarity-metric",
+        choices=sorted(VECTOR_DISTANCE_OPERATORS),
+        default=os.getenv("PROFILE_SIMILARITY_METRIC", "dot"),
+        help="the similarity metric of the profile embedder, which the "
+        "embedding index is built for. the default is read from the "
+        "environment variable PROFILE_SIMILARITY_METRIC",
+    )
     parser.add_argument(
         "--delete",
         action="store_true",
@@ -115,7 +164,15 @@ def main():
 async def main_async(args):
     if args.delete:
         await delete_data(args.database, args.host, args.port, args.user, args.password)
-    await sync_to(args.database, args.host, args.port, args.user, args.password)
+    await sync_to(
+        args.database,
+        args.host,
+        args.port,
+        args.user,
+        args.password,
+        embedding_dimensions=args.embedding_dimensions,
+        similarity_metric=args.similarity_metric,
+    )
 
 
 if __name__ == "__main__":
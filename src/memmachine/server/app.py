@@ -14,8 +14,10 @@ import argparse
 import asyncio
 import contextvars
 import copy
+import json
 import logging
 import os
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from importlib import import_module
 from typing import Any, Self, cast
@@ -26,15 +28,15 @@ from dotenv import load_dotenv
 from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.params import Depends
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from fastmcp import FastMCP
 from fastmcp.server.http import StarletteWithLifespan
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, ValidationError, model_validator
 from starlette.applications import Starlette
 from starlette.types import Lifespan, Receive, Scope, Send
 
-from memmachine.common.embedder import EmbedderBuilder
+from memmachine.common.embedder import Embedder, EmbedderBuilder
 from memmachine.common.language_model import LanguageModelBuilder
 from memmachine.common.metrics_factory import MetricsFactoryBuilder
 from memmachine.episodic_memory.data_types import ContentType
@@ -70,6 +72,12 @@ class AppConst:
     DEFAULT_EPISODE_TYPE = "message"
     """Default value for episode type when not provided."""
 
+    STREAM_MAX_IN_FLIGHT = 32
+    """Maximum number of streamed episodes being added at the same time."""
+
+    STREAM_MAX_LINE_BYTES = 1024 * 1024
+    """Maximum size of a line of a streamed request body."""
+
     GROUP_ID_KEY = "group-id"
     """Header key for group ID."""
 
@@ -384,6 +392,16 @@ class NewEpisode(RequestWithSession):
         return self
 
 
+class NewEpisodeBatch(BaseModel):
+    """Request model for adding memory episodes in one batch."""
+
+    episodes: list[NewEpisode] = Field(
+        ...,
+        description="The episodes to add. The session of each episode is "
+        "merged with the session from the headers.",
+    )
+
+
 class SearchQuery(RequestWithSession):
     """Request model for searching memories."""
 
@@ -392,6 +410,14 @@ class SearchQuery(RequestWithSession):
     limit: int | None = None
 
 
+class BatchSearchQuery(RequestWithSession):
+    """Request model for searching memories for several queries."""
+
+    queries: list[str]
+    filter: dict[str, Any] | None = None
+    limit: int | None = None
+
+
 def _split_str_to_list(s: str) -> list[str]:
     return [x.strip() for x in s.split(",") if x.strip() != ""]
 
@@ -457,6 +483,26 @@ class SearchResult(BaseModel):
     content: dict[str, Any]
 
 
+class BatchSearchResult(BaseModel):
+    """Response model for memory search results of several queries."""
+
+    status: int = 0
+    content: list[dict[str, Any]]
+
+
+class BatchItemResult(BaseModel):
+    """Result of adding one episode of a batch."""
+
+    status: int = 200
+    message: str = ""
+
+
+class BatchResult(BaseModel):
+    """Response model for adding memory episodes in one batch."""
+
+    results: list[BatchItemResult]
+
+
 class MemorySession(BaseModel):
     """Response model for session information."""
 
@@ -554,17 +600,35 @@ async def initialize_resource(
             "Embedding model not configured in config file for profile memory"
         )
 
-    embedder_def = embedders.get(embedder_id)
-    if embedder_def is None:
-        raise ValueError(f"Can not find definition of embedder {embedder_id}")
+    # Embedders are shared with episodic memory,
+    # so that cached embedders serve both memories.
+    def get_embedder(embedder_id: str) -> Embedder:
+        return EpisodicMemory.get_shared_resource(
+            embedder_id, lambda: build_embedder(embedder_id)
+        )
 
-    embedder_config = copy.deepcopy(embedder_def["config"])
-    if embedder_def["provider"] == "openai":
-        embedder_config["metrics_factory_id"] = "prometheus"
+    def build_embedder(embedder_id: str) -> Embedder:
+        embedder_def = embedders.get(embedder_id)
+        if embedder_def is None:
+            raise ValueError(f"Can not find definition of embedder {embedder_id}")
+
+        embedder_config = copy.deepcopy(embedder_def["config"])
+        if embedder_def["provider"] in ("openai", "cached"):
+            embedder_config.setdefault("metrics_factory_id", "prometheus")
+
+        # Build embedders wrapped by this embedder first.
+        embedder_injections: dict[str, Any] = dict(metrics_injection)
+        for dependency_id in EmbedderBuilder.get_dependency_ids(
+            embedder_def["provider"], embedder_config
+        ):
+            if dependency_id not in embedder_injections:
+                embedder_injections[dependency_id] = get_embedder(dependency_id)
+
+        return EmbedderBuilder.build(
+            embedder_def["provider"], embedder_config, embedder_injections
+        )
 
-    embeddings = EmbedderBuilder.build(
-        embedder_def["provider"], embedder_config, metrics_injection
-    )
+    embeddings = get_embedder(embedder_id)
 
     # Get the database configuration
     # get DB config from configuration file is available
@@ -587,6 +651,9 @@ async def initialize_resource(
             "user": db_config.get("user", ""),
             "password": db_config.get("password", ""),
             "database": db_config.get("database", ""),
+            "similarity_metric": embeddings.similarity_metric.value,
+            "hnsw_ef_search": profile_config.get("hnsw_ef_search"),
+            "hnsw_iterative_scan": profile_config.get("hnsw_iterative_scan"),
         }
     )
 
@@ -595,6 +662,7 @@ async def initialize_resource(
         embeddings=embeddings,
         profile_storage=profile_storage,
         prompt=profile_prompt,
+        update_batch_token_limit=profile_config.get("update_batch_token_limit", 0),
     )
     episodic_memory = EpisodicMemoryManager.create_episodic_memory_manager(config_file)
     return episodic_memory, profile_memory
@@ -1026,6 +1094,294 @@ async def _add_memory(episode: NewEpisode):
         )
 
 
+@app.post("/v1/memories/batch")
+async def add_memory_batch(
+    batch: NewEpisodeBatch,
+    session: SessionData = Depends(_get_session_from_header),  # type: ignore
+) -> BatchResult:
+    """Adds memory episodes to both episodic and profile memory in one batch.
+
+    Episodes are grouped by session. The episodic memory instance of each
+    session is retrieved once, and its episodes are added together, so that
+    their derivatives are embedded in batches. The episodes added to
+    episodic memory are then added to the profile memory history together.
+
+    Args:
+        batch: The NewEpisodeBatch object containing the episodes.
+        session: The session data from headers to merge with each episode.
+
+    Returns:
+        BatchResult: The status of each episode, in order. The status is
+            200 if the episode was added, 422 if its session is invalid,
+            404 if no matching episodic memory instance is found, 400 if
+            its session does not match its group or its producer or
+            produced_for IDs are invalid for the session, and 500 if adding
+            it to episodic or profile memory failed.
+    """
+    return await _add_memory_batch(batch, session)
+
+
+async def _add_memory_batch(batch: NewEpisodeBatch, session: SessionData):
+    """Adds memory episodes to both episodic and profile memory in one batch.
+    Internal function.
+
+    See the docstring for add_memory_batch() for details."""
+    results = [BatchItemResult() for _ in batch.episodes]
+
+    session_episode_indices: dict[tuple, list[int]] = {}
+    for index, episode in enumerate(batch.episodes):
+        try:
+            episode.merge_and_validate_session(session.model_copy(deep=True))
+        except RequestValidationError as e:
+            results[index] = BatchItemResult(status=422, message=str(e))
+            continue
+        episode_session = episode.get_session()
+        key = (
+            episode_session.group_id,
+            episode_session.session_id,
+            tuple(episode_session.agent_id),
+            tuple(episode_session.user_id),
+        )
+        session_episode_indices.setdefault(key, []).append(index)
+
+    async def add_session_episodes(
+        indices: list[int],
+    ) -> list[tuple[int, dict[str, Any]]]:
+        """Adds the episodes of a session to episodic memory, returning the
+        indices and persona messages of the added episodes."""
+        episodes = [batch.episodes[index] for index in indices]
+        episode_session = episodes[0].get_session()
+        inst: EpisodicMemory | None = await cast(
+            EpisodicMemoryManager, episodic_memory
+        ).get_episodic_memory_instance(
+            group_id=episode_session.group_id,
+            agent_id=episode_session.agent_id,
+            user_id=episode_session.user_id,
+            session_id=episode_session.session_id,
+        )
+        if inst is None:
+            for index in indices:
+                results[index] = BatchItemResult(
+                    status=404, message="unable to find episodic memory"
+                )
+            return []
+
+        async with AsyncEpisodicMemory(inst) as inst:
+            try:
+                errors = await inst.add_memory_episodes(
+                    [
+                        {
+                            "producer": episode.producer,
+                            "produced_for": episode.produced_for,
+                            "episode_content": episode.episode_content,
+                            "episode_type": episode.episode_type,
+                            "content_type": ContentType.STRING,
+                            "metadata": episode.metadata,
+                        }
+                        for episode in episodes
+                    ]
+                )
+            except Exception as e:
+                logger.exception("Failed to add episodes to episodic memory")
+                for index in indices:
+                    results[index] = BatchItemResult(status=500, message=str(e))
+                return []
+            ctx = inst.get_memory_context()
+
+        persona_messages = []
+        for index, episode, error in zip(indices, episodes, errors):
+            if error is not None:
+                results[index] = BatchItemResult(status=400, message=error)
+                continue
+            persona_messages.append(
+                (
+                    index,
+                    {
+                        "content": str(episode.episode_content),
+                        "metadata": episode.metadata,
+                        "isolations": {
+                            "group_id": ctx.group_id,
+                            "session_id": ctx.session_id,
+                            "producer": episode.producer,
+                            "produced_for": episode.produced_for,
+                        },
+                        "user_id": episode.producer,
+                    },
+                )
+            )
+        return persona_messages
+
+    # Failures are recorded for the episodes of their session,
+    # so that the statuses of other sessions are still returned.
+    session_persona_messages = await asyncio.gather(
+        *[
+            add_session_episodes(indices)
+            for indices in session_episode_indices.values()
+        ],
+        return_exceptions=True,
+    )
+    persona_messages = []
+    for indices, session_result in zip(
+        session_episode_indices.values(), session_persona_messages
+    ):
+        if isinstance(session_result, BaseException):
+            if not isinstance(session_result, Exception):
+                raise session_result
+            if isinstance(session_result, HTTPException):
+                status, message = session_result.status_code, str(session_result.detail)
+            elif isinstance(session_result, ValueError):
+                status, message = 400, str(session_result)
+            else:
+                logger.error(
+                    "Failed to add episodes to episodic memory",
+                    exc_info=session_result,
+                )
+                status, message = 500, str(session_result)
+            for index in indices:
+                results[index] = BatchItemResult(status=status, message=message)
+            continue
+        persona_messages.extend(session_result)
+
+    try:
+        await cast(ProfileMemory, profile_memory).add_persona_messages(
+            [persona_message for _, persona_message in persona_messages]
+        )
+    except Exception as e:
+        logger.exception("Failed to add episodes to profile memory")
+        for index, _ in persona_messages:
+            results[index] = BatchItemResult(status=500, message=str(e))
+    return BatchResult(results=results)
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """Streaming response that is sent while the request body is read.
+
+    StreamingResponse listens for the client disconnecting by receiving
+    messages, which would take chunks of the request body away from the
+    handler. The handler reading the body receives the disconnect instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+
+
+@app.post("/v1/memories/stream")
+async def add_memory_stream(
+    request: Request,
+    session: SessionData = Depends(_get_session_from_header),  # type: ignore
+) -> _DuplexStreamingResponse:
+    """Adds memory episodes streamed as newline-delimited JSON.
+
+    Each line of the `application/x-ndjson` request body is a NewEpisode
+    object, which is added to both episodic and profile memory like in
+    add_memory(). Episodes without a session use the session from the
+    headers. At most `AppConst.STREAM_MAX_IN_FLIGHT` episodes are added at
+    the same time, and more of the body is only read as they complete.
+
+    For each episode, a line with its line number, status and message is
+    streamed back as newline-delimited JSON, in order of completion.
+    The status is 200 if the episode was added, 422 if it is invalid,
+    and the status of the error raised by add_memory() otherwise.
+
+    Args:
+        request: The HTTP request with the streamed body.
+        session: The session data from headers to merge with each episode.
+    """
+    return _DuplexStreamingResponse(
+        _stream_memory_acknowledgements(request, session),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _stream_memory_acknowledgements(
+    request: Request, session: SessionData
+) -> AsyncIterator[str]:
+    """Adds the episodes streamed in a request body
+    and yields their acknowledgements.
+
+    See the docstring for add_memory_stream() for details."""
+    # Both limits bound the memory used by a stream: episodes are only read
+    # when one is released, which happens after its acknowledgement is queued.
+    in_flight = asyncio.Semaphore(AppConst.STREAM_MAX_IN_FLIGHT)
+    acknowledgements: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(
+        maxsize=AppConst.STREAM_MAX_IN_FLIGHT
+    )
+
+    async def add_line(line_number: int, line: bytes):
+        try:
+            episode = NewEpisode.model_validate_json(line)
+            episode.merge_and_validate_session(session.model_copy(deep=True))
+            await _add_memory(episode)
+            acknowledgement = {"line": line_number, "status": 200, "message": ""}
+        except (ValidationError, RequestValidationError) as e:
+            acknowledgement = {"line": line_number, "status": 422, "message": str(e)}
+        except HTTPException as e:
+            acknowledgement = {
+                "line": line_number,
+                "status": e.status_code,
+                "message": str(e.detail),
+            }
+        except Exception as e:
+            logger.exception("Failed to add streamed episode")
+            acknowledgement = {"line": line_number, "status": 500, "message": str(e)}
+        try:
+            await acknowledgements.put(acknowledgement)
+        finally:
+            in_flight.release()
+
+    async def read_lines():
+        tasks: set[asyncio.Task] = set()
+
+        async def start(line_number: int, line: bytes):
+            if line.strip() == b"":
+                return
+            await in_flight.acquire()
+            task = asyncio.create_task(add_line(line_number, line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        line_number = 0
+        buffer = b""
+        try:
+            async for chunk in request.stream():
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    line_number += 1
+                    await start(line_number, line)
+                if len(buffer) > AppConst.STREAM_MAX_LINE_BYTES:
+                    await acknowledgements.put(
+                        {
+                            "line": line_number + 1,
+                            "status": 413,
+                            "message": "line is too long",
+                        }
+                    )
+                    buffer = b""
+                    break
+            else:
+                line_number += 1
+                await start(line_number, buffer)
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        except Exception:
+            logger.exception("Failed to read streamed episodes")
+            for task in tasks:
+                task.cancel()
+        await acknowledgements.put(None)
+
+    reader = asyncio.create_task(read_lines())
+    try:
+        while (acknowledgement := await acknowledgements.get()) is not None:
+            yield json.dumps(acknowledgement) + "\n"
+        await reader
+    finally:
+        reader.cancel()
+
+
 @app.post("/v1/memories/episodic")
 async def add_episodic_memory(
     episode: NewEpisode,
@@ -1207,6 +1563,84 @@ async def _search_memory(q: SearchQuery) -> SearchResult:
         )
 
 
+@app.post("/v1/memories/search/batch")
+async def search_memory_batch(
+    q: BatchSearchQuery,
+    response: Response,
+    session: SessionData = Depends(_get_session_from_header),  # type: ignore
+) -> BatchSearchResult:
+    """Searches for memories across both episodic and profile memory
+    for several queries at once.
+
+    The episodic memory instance is resolved once, and the queries are
+    embedded together and searched in both memories.
+    Each query is reranked separately.
+
+    Args:
+        q: The BatchSearchQuery object containing the queries and context.
+        response: The HTTP response object to update headers.
+        session: The session data from headers to merge with the request.
+
+    Returns:
+        A BatchSearchResult object whose content holds the results
+        from both memory types for each query, in the order of the queries.
+
+    Raises:
+        HTTPException: 404 if no matching episodic memory instance is found.
+    """
+    q.merge_and_validate_session(session)
+    q.update_response_session_header(response)
+    return await _search_memory_batch(q)
+
+
+async def _search_memory_batch(q: BatchSearchQuery) -> BatchSearchResult:
+    """Searches for memories across both episodic and profile memory
+    for several queries at once.
+    Internal function.
+    See the docstring for search_memory_batch() for details."""
+    session = q.get_session()
+    inst: EpisodicMemory | None = await cast(
+        EpisodicMemoryManager, episodic_memory
+    ).get_episodic_memory_instance(
+        group_id=session.group_id,
+        agent_id=session.agent_id,
+        user_id=session.user_id,
+        session_id=session.session_id,
+    )
+    if inst is None:
+        raise q.new_404_not_found_error("unable to find episodic memory")
+    async with AsyncEpisodicMemory(inst) as inst:
+        ctx = inst.get_memory_context()
+        user_id = (
+            session.user_id[0]
+            if session.user_id is not None and len(session.user_id) > 0
+            else ""
+        )
+        episodic_results, profile_results = await asyncio.gather(
+            inst.query_memory_many(q.queries, q.limit, q.filter),
+            cast(ProfileMemory, profile_memory).semantic_search_many(
+                q.queries,
+                q.limit if q.limit is not None else 5,
+                isolations={
+                    "group_id": ctx.group_id,
+                    "session_id": ctx.session_id,
+                },
+                user_id=user_id,
+            ),
+        )
+        return BatchSearchResult(
+            content=[
+                {
+                    "episodic_memory": episodic_result,
+                    "profile_memory": profile_result,
+                }
+                for episodic_result, profile_result in zip(
+                    episodic_results, profile_results
+                )
+            ]
+        )
+
+
 @app.post("/v1/memories/episodic/search")
 async def search_episodic_memory(
     q: SearchQuery,
@@ -1346,7 +1780,7 @@ async def get_all_sessions() -> AllSessionsResponse:
     """
     Get all sessions
     """
-    sessions = cast(EpisodicMemoryManager, episodic_memory).get_all_sessions()
+    sessions = await cast(EpisodicMemoryManager, episodic_memory).get_all_sessions()
     return AllSessionsResponse(
         sessions=[
             MemorySession(
@@ -1365,7 +1799,9 @@ async def get_sessions_for_user(user_id: str) -> AllSessionsResponse:
     """
     Get all sessions for a particular user
     """
-    sessions = cast(EpisodicMemoryManager, episodic_memory).get_user_sessions(user_id)
+    sessions = await cast(EpisodicMemoryManager, episodic_memory).get_user_sessions(
+        user_id
+    )
     return AllSessionsResponse(
         sessions=[
             MemorySession(
@@ -1384,7 +1820,9 @@ async def get_sessions_for_group(group_id: str) -> AllSessionsResponse:
     """
     Get all sessions for a particular group
     """
-    sessions = cast(EpisodicMemoryManager, episodic_memory).get_group_sessions(group_id)
+    sessions = await cast(EpisodicMemoryManager, episodic_memory).get_group_sessions(
+        group_id
+    )
     return AllSessionsResponse(
         sessions=[
             MemorySession(
@@ -1403,7 +1841,9 @@ async def get_sessions_for_agent(agent_id: str) -> AllSessionsResponse:
     """
     Get all sessions for a particular agent
     """
-    sessions = cast(EpisodicMemoryManager, episodic_memory).get_agent_sessions(agent_id)
+    sessions = await cast(EpisodicMemoryManager, episodic_memory).get_agent_sessions(
+        agent_id
+    )
     return AllSessionsResponse(
         sessions=[
             MemorySession(
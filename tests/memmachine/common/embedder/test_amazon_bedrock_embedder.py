@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_aws import BedrockEmbeddings
+from pydantic import Field
+
+from memmachine.common.embedder.amazon_bedrock_embedder import (
+    AmazonBedrockEmbedder,
+    AmazonBedrockEmbedderParams,
+)
+
+
+class FakeBedrockEmbeddings(BedrockEmbeddings):
+    requests: list[list[str]] = Field(default_factory=list)
+    active_requests: int = 0
+    max_active_requests: int = 0
+    lock: Any = Field(default_factory=threading.Lock)
+
+    def __init__(self, **kwargs):
+        super().__init__(client=MagicMock(), region_name="us-east-1", **kwargs)
+
+    def _request(self, texts: list[str]) -> list[list[float]]:
+        with self.lock:
+            self.requests.append(texts)
+            self.active_requests += 1
+            self.max_active_requests = max(
+                self.max_active_requests, self.active_requests
+            )
+        time.sleep(0.01)
+        with self.lock:
+            self.active_requests -= 1
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._request([text])[0]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if self._inferred_provider == "cohere":
+            return self._request(texts)
+        return [self.embed_query(text) for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_cohere_inputs_are_chunked():
+    client = FakeBedrockEmbeddings(model_id="cohere.embed-english-v3")
+    embedder = AmazonBedrockEmbedder(
+        AmazonBedrockEmbedderParams(
+            client=client,
+            model_id="cohere.embed-english-v3",
+            max_inputs_per_request=2,
+        )
+    )
+    assert embedder.dimensions == 2
+
+    client.requests.clear()
+    embeddings = await embedder.ingest_embed(["a", "bb", "ccc", "dddd", "eeeee"])
+    assert embeddings == [[float(length), 1.0] for length in range(1, 6)]
+    assert sorted(client.requests) == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_bounded():
+    client = FakeBedrockEmbeddings(model_id="amazon.titan-embed-text-v2:0")
+    embedder = AmazonBedrockEmbedder(
+        AmazonBedrockEmbedderParams(
+            client=client,
+            model_id="amazon.titan-embed-text-v2:0",
+            max_inputs_per_request=4,
+            max_concurrent_requests=2,
+        )
+    )
+
+    client.requests.clear()
+    inputs = ["x" * length for length in range(1, 11)]
+    embeddings = await embedder.ingest_embed(inputs)
+    assert embeddings == [[float(length), 1.0] for length in range(1, 11)]
+    assert sorted(client.requests) == sorted([input] for input in inputs)
+    assert client.max_active_requests <= 2
+
+    embeddings = await embedder.search_embed(inputs)
+    assert embeddings == [[float(length), 1.0] for length in range(1, 11)]
+    assert client.max_active_requests <= 2
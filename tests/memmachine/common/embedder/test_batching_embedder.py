@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from memmachine.common.data_types import ExternalServiceAPIError
+from memmachine.common.embedder import Embedder, SimilarityMetric
+from memmachine.common.embedder.batching_embedder import (
+    BatchingEmbedder,
+    BatchingEmbedderParams,
+)
+
+
+class FakeEmbedder(Embedder):
+    def __init__(self, delay=0.0):
+        super().__init__()
+
+        self._delay = delay
+        self.calls: list[tuple[str, list[str], int]] = []
+
+    async def ingest_embed(
+        self, inputs: list[str], max_attempts: int = 1
+    ) -> list[list[float]]:
+        self.calls.append(("ingest", inputs, max_attempts))
+        await asyncio.sleep(self._delay)
+        if "error" in inputs:
+            raise ValueError("Embedding failed")
+        if "short" in inputs:
+            return [[1.0, 1.0]]
+        return [[float(len(input)), 1.0] for input in inputs]
+
+    async def search_embed(
+        self, queries: list[str], max_attempts: int = 1
+    ) -> list[list[float]]:
+        self.calls.append(("search", queries, max_attempts))
+        return [[float(len(query)), -1.0] for query in queries]
+
+    @property
+    def model_id(self) -> str:
+        return "fake-model"
+
+    @property
+    def dimensions(self) -> int:
+        return 2
+
+    @property
+    def similarity_metric(self) -> SimilarityMetric:
+        return SimilarityMetric.COSINE
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_batched():
+    embedder = FakeEmbedder()
+    batching_embedder = BatchingEmbedder(
+        BatchingEmbedderParams(embedder=embedder, max_wait_seconds=0.01)
+    )
+
+    results = await asyncio.gather(
+        batching_embedder.ingest_embed(["a"]),
+        batching_embedder.ingest_embed(["bb", "ccc"]),
+        batching_embedder.search_embed(["dddd"]),
+        batching_embedder.ingest_embed(["e"], max_attempts=3),
+    )
+    assert results == [
+        [[1.0, 1.0]],
+        [[2.0, 1.0], [3.0, 1.0]],
+        [[4.0, -1.0]],
+        [[1.0, 1.0]],
+    ]
+    assert sorted(embedder.calls) == [
+        ("ingest", ["a", "bb", "ccc"], 1),
+        ("ingest", ["e"], 3),
+        ("search", ["dddd"], 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_embedded_without_waiting():
+    embedder = FakeEmbedder()
+    batching_embedder = BatchingEmbedder(
+        BatchingEmbedderParams(embedder=embedder, max_batch_size=2, max_wait_seconds=60)
+    )
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            batching_embedder.ingest_embed(["a"]),
+            batching_embedder.ingest_embed(["bb"]),
+        ),
+        timeout=1,
+    )
+    assert results == [[[1.0, 1.0]], [[2.0, 1.0]]]
+    assert embedder.calls == [("ingest", ["a", "bb"], 1)]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_fanned_out():
+    embedder = FakeEmbedder()
+    batching_embedder = BatchingEmbedder(BatchingEmbedderParams(embedder=embedder))
+
+    results = await asyncio.gather(
+        batching_embedder.ingest_embed(["a"]),
+        batching_embedder.ingest_embed(["error"]),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+    assert await batching_embedder.ingest_embed([]) == []
+    assert len(embedder.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_short_responses_are_errors():
+    embedder = FakeEmbedder()
+    batching_embedder = BatchingEmbedder(BatchingEmbedderParams(embedder=embedder))
+
+    results = await asyncio.gather(
+        batching_embedder.ingest_embed(["a"]),
+        batching_embedder.ingest_embed(["short", "bb"]),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, ExternalServiceAPIError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batches_cancel_calls():
+    embedder = FakeEmbedder(delay=60)
+    batching_embedder = BatchingEmbedder(
+        BatchingEmbedderParams(embedder=embedder, max_wait_seconds=0)
+    )
+
+    call = asyncio.ensure_future(batching_embedder.ingest_embed(["a"]))
+    while not embedder.calls:
+        await asyncio.sleep(0)
+    for batch_task in batching_embedder._batch_tasks:
+        batch_task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(call, timeout=1)
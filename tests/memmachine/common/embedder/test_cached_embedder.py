@@ -0,0 +1,178 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from memmachine.common.embedder import Embedder, SimilarityMetric
+from memmachine.common.embedder.cached_embedder import (
+    CachedEmbedder,
+    CachedEmbedderParams,
+)
+from memmachine.common.metrics_factory.metrics_factory import MetricsFactory
+
+
+class FakeEmbedder(Embedder):
+    def __init__(self, model_id="fake-model", delay=0.0):
+        super().__init__()
+
+        self._model_id = model_id
+        self._delay = delay
+        self.calls: list[tuple[str, list[str]]] = []
+
+    async def ingest_embed(
+        self, inputs: list[str], max_attempts: int = 1
+    ) -> list[list[float]]:
+        self.calls.append(("ingest", inputs))
+        await asyncio.sleep(self._delay)
+        if "fail" in inputs:
+            raise RuntimeError("Failed to embed")
+        return [[float(len(input)), 1.0] for input in inputs]
+
+    async def search_embed(
+        self, queries: list[str], max_attempts: int = 1
+    ) -> list[list[float]]:
+        self.calls.append(("search", queries))
+        return [[float(len(query)), -1.0] for query in queries]
+
+    @property
+    def model_id(self) -> str:
+        return self._model_id
+
+    @property
+    def dimensions(self) -> int:
+        return 2
+
+    @property
+    def similarity_metric(self) -> SimilarityMetric:
+        return SimilarityMetric.COSINE
+
+
+@pytest.mark.asyncio
+async def test_cached_embed():
+    embedder = FakeEmbedder()
+    metrics_factory = MagicMock(spec=MetricsFactory)
+    hits_counter = MagicMock()
+    misses_counter = MagicMock()
+    metrics_factory.get_counter.side_effect = [hits_counter, misses_counter]
+
+    cached_embedder = CachedEmbedder(
+        CachedEmbedderParams(embedder=embedder, metrics_factory=metrics_factory)
+    )
+    assert cached_embedder.model_id == "fake-model"
+    assert cached_embedder.dimensions == 2
+
+    embeddings = await cached_embedder.ingest_embed(["a", "bb", "a"])
+    assert embeddings == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert embedder.calls == [("ingest", ["a", "bb"])]
+    hits_counter.increment.assert_called_with(value=0, labels={})
+    misses_counter.increment.assert_called_with(value=3, labels={})
+
+    embeddings = await cached_embedder.ingest_embed(["bb", "ccc"])
+    assert embeddings == [[2.0, 1.0], [3.0, 1.0]]
+    assert embedder.calls[-1] == ("ingest", ["ccc"])
+    hits_counter.increment.assert_called_with(value=1, labels={})
+    misses_counter.increment.assert_called_with(value=1, labels={})
+
+    # Search embeddings are cached separately from ingest embeddings.
+    embeddings = await cached_embedder.search_embed(["a"])
+    assert embeddings == [[1.0, -1.0]]
+    assert embedder.calls[-1] == ("search", ["a"])
+
+    # Returned embeddings are copies.
+    embeddings[0].append(0.0)
+    assert await cached_embedder.search_embed(["a"]) == [[1.0, -1.0]]
+    assert len(embedder.calls) == 3
+
+    assert await cached_embedder.ingest_embed([]) == []
+    with pytest.raises(ValueError):
+        await cached_embedder.ingest_embed(["a"], max_attempts=0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses():
+    embedder = FakeEmbedder(delay=0.01)
+    cached_embedder = CachedEmbedder(CachedEmbedderParams(embedder=embedder))
+
+    # Concurrent misses of the same input wait for a single embedder call.
+    results = await asyncio.gather(
+        cached_embedder.ingest_embed(["a", "bb"]),
+        cached_embedder.ingest_embed(["bb"]),
+        cached_embedder.ingest_embed(["a", "ccc"]),
+    )
+    assert results == [
+        [[1.0, 1.0], [2.0, 1.0]],
+        [[2.0, 1.0]],
+        [[1.0, 1.0], [3.0, 1.0]],
+    ]
+    assert embedder.calls == [("ingest", ["a", "bb"]), ("ingest", ["ccc"])]
+
+    # Failures are raised to every waiting call, and are not cached.
+    results = await asyncio.gather(
+        cached_embedder.ingest_embed(["fail"]),
+        cached_embedder.ingest_embed(["fail"]),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(embedder.calls) == 3
+    with pytest.raises(RuntimeError):
+        await cached_embedder.ingest_embed(["fail"])
+    assert len(embedder.calls) == 4
+
+    # Calls waiting for a cancelled call embed the input themselves.
+    task = asyncio.create_task(cached_embedder.ingest_embed(["dddd"]))
+    await asyncio.sleep(0)
+    waiting_task = asyncio.create_task(cached_embedder.ingest_embed(["dddd"]))
+    await asyncio.sleep(0)
+    task.cancel()
+    assert await waiting_task == [[4.0, 1.0]]
+    assert embedder.calls[-2:] == [("ingest", ["dddd"]), ("ingest", ["dddd"])]
+
+
+@pytest.mark.asyncio
+async def test_cached_embed_eviction_and_expiry(monkeypatch):
+    embedder = FakeEmbedder()
+    cached_embedder = CachedEmbedder(
+        CachedEmbedderParams(embedder=embedder, max_size=2, ttl_seconds=10)
+    )
+
+    await cached_embedder.ingest_embed(["a", "bb"])
+    await cached_embedder.ingest_embed(["a"])
+    await cached_embedder.ingest_embed(["ccc"])
+    assert len(embedder.calls) == 2
+
+    # "bb" was least recently used.
+    await cached_embedder.ingest_embed(["a", "bb"])
+    assert embedder.calls[-1] == ("ingest", ["bb"])
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    await cached_embedder.ingest_embed(["bb"])
+    assert embedder.calls[-1] == ("ingest", ["bb"])
+
+
+@pytest.mark.asyncio
+async def test_shared_cache(tmp_path):
+    sqlite_path = str(tmp_path / "embeddings.sqlite3")
+
+    embedder = FakeEmbedder()
+    cached_embedder = CachedEmbedder(
+        CachedEmbedderParams(embedder=embedder, sqlite_path=sqlite_path)
+    )
+    await cached_embedder.ingest_embed(["a", "bb"])
+
+    other_embedder = FakeEmbedder()
+    other_cached_embedder = CachedEmbedder(
+        CachedEmbedderParams(embedder=other_embedder, sqlite_path=sqlite_path)
+    )
+    embeddings = await other_cached_embedder.ingest_embed(["bb", "ccc"])
+    assert embeddings == [[2.0, 1.0], [3.0, 1.0]]
+    assert other_embedder.calls == [("ingest", ["ccc"])]
+
+    # Embeddings of different models do not collide.
+    different_embedder = FakeEmbedder(model_id="different-model")
+    different_cached_embedder = CachedEmbedder(
+        CachedEmbedderParams(embedder=different_embedder, sqlite_path=sqlite_path)
+    )
+    await different_cached_embedder.ingest_embed(["a"])
+    assert different_embedder.calls == [("ingest", ["a"])]
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from memmachine.common.embedder.openai_embedder import (
+    OpenAIEmbedder,
+    OpenAIEmbedderParams,
+)
+
+
+@pytest.fixture
+def client():
+    client = openai.AsyncOpenAI(api_key="test-api-key")
+
+    client.requests = []
+
+    async def create(input, model, dimensions=None):
+        client.requests.append(input)
+        return SimpleNamespace(
+            data=[SimpleNamespace(embedding=[float(len(text)), 1.0]) for text in input],
+            usage=SimpleNamespace(prompt_tokens=0, total_tokens=0),
+        )
+
+    client.embeddings.create = create
+    return client
+
+
+@pytest.mark.asyncio
+async def test_inputs_are_chunked_by_count(client):
+    embedder = OpenAIEmbedder(
+        OpenAIEmbedderParams(
+            client=client,
+            model="text-embedding-3-small",
+            dimensions=2,
+            max_inputs_per_request=2,
+        )
+    )
+
+    embeddings = await embedder.ingest_embed(["a", "bb", "ccc", "dddd", "eeeee"])
+    assert embeddings == [[float(length), 1.0] for length in range(1, 6)]
+    assert client.requests == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+
+
+@pytest.mark.asyncio
+async def test_inputs_are_chunked_by_estimated_tokens(client):
+    embedder = OpenAIEmbedder(
+        OpenAIEmbedderParams(
+            client=client,
+            model="text-embedding-3-small",
+            dimensions=2,
+            max_tokens_per_request=10,
+            max_concurrent_requests=1,
+        )
+    )
+
+    long_input = "x" * 40
+    embeddings = await embedder.search_embed(["a", long_input, "b", "c"])
+    assert embeddings == [[1.0, 1.0], [40.0, 1.0], [1.0, 1.0], [1.0, 1.0]]
+    assert client.requests == [["a"], [long_input], ["b", "c"]]
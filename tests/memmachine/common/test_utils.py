@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from memmachine.common.utils import AsyncReaderWriterLock, get_openai_http_client
+
+
+@pytest.mark.asyncio
+async def test_reader_writer_lock():
+    lock = AsyncReaderWriterLock()
+    events = []
+
+    async def read(name):
+        async with lock.read_locked():
+            events.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name} end")
+
+    async def write(name):
+        async with lock.write_locked():
+            events.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name} end")
+
+    async def delayed(coroutine):
+        await asyncio.sleep(0.001)
+        await coroutine
+
+    await asyncio.gather(
+        read("read1"),
+        read("read2"),
+        write("write"),
+        # Readers arriving after a waiting writer wait for it.
+        delayed(read("read3")),
+    )
+    assert events[:2] == ["read1 start", "read2 start"]
+    assert events[4:] == ["write start", "write end", "read3 start", "read3 end"]
+
+
+@pytest.mark.asyncio
+async def test_reader_writer_lock_cancelled_writer():
+    lock = AsyncReaderWriterLock()
+
+    async with lock.read_locked():
+        writer = asyncio.create_task(lock.write_locked().__aenter__())
+        await asyncio.sleep(0)
+        writer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await writer
+
+        # New readers are no longer blocked.
+        async with asyncio.timeout(1), lock.read_locked():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_get_openai_http_client():
+    assert get_openai_http_client({"api_key": "test-api-key"}) is None
+
+    http_client = get_openai_http_client({"max_connections": 5})
+    assert http_client is not None
+    await http_client.aclose()
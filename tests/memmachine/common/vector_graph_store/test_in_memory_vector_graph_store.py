@@ -0,0 +1,341 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from memmachine.common.embedder import SimilarityMetric
+from memmachine.common.vector_graph_store import Edge, Node, TraversalStep
+from memmachine.common.vector_graph_store.in_memory_vector_graph_store import (
+    InMemoryVectorGraphStore,
+    InMemoryVectorGraphStoreParams,
+)
+from memmachine.common.vector_graph_store.vector_graph_store_builder import (
+    VectorGraphStoreBuilder,
+)
+
+
+@pytest.fixture
+def vector_graph_store():
+    return InMemoryVectorGraphStore(InMemoryVectorGraphStoreParams())
+
+
+def test_builder():
+    vector_graph_store = VectorGraphStoreBuilder.build("in-memory", {}, {})
+    assert isinstance(vector_graph_store, InMemoryVectorGraphStore)
+
+
+@pytest.mark.asyncio
+async def test_add_nodes(vector_graph_store):
+    nodes = [
+        Node(uuid=uuid4(), labels={"Entity"}, properties={"name": "Node1"}),
+        Node(uuid=uuid4(), labels={"Entity", "Person"}, properties={"age": 30}),
+        Node(uuid=uuid4(), properties={"embedding": [0.1, 0.2, 0.3]}),
+    ]
+
+    await vector_graph_store.add_nodes(nodes)
+
+    results = await vector_graph_store.search_matching_nodes()
+    assert {node.uuid for node in results} == {node.uuid for node in nodes}
+
+    with pytest.raises(ValueError):
+        await vector_graph_store.add_nodes([Node(uuid=nodes[0].uuid)])
+
+    with pytest.raises(ValueError):
+        await vector_graph_store.add_nodes(
+            [Node(uuid=uuid4(), properties={"embedding": [0.1, 0.2]})]
+        )
+
+    assert len(await vector_graph_store.search_matching_nodes()) == 3
+
+
+@pytest.mark.asyncio
+async def test_add_edges(vector_graph_store):
+    node1 = Node(uuid=uuid4(), labels={"Entity"})
+    node2 = Node(uuid=uuid4(), labels={"Entity"})
+    await vector_graph_store.add_nodes([node1, node2])
+
+    await vector_graph_store.add_edges(
+        [
+            Edge(
+                uuid=uuid4(),
+                source_uuid=node1.uuid,
+                target_uuid=node2.uuid,
+                relation="RELATED_TO",
+                source_labels={"Entity"},
+                target_labels={"Entity"},
+            ),
+            # Ignored because the target node does not exist.
+            Edge(uuid=uuid4(), source_uuid=node1.uuid, target_uuid=uuid4()),
+            # Ignored because the source node does not have the label.
+            Edge(
+                uuid=uuid4(),
+                source_uuid=node2.uuid,
+                target_uuid=node1.uuid,
+                source_labels={"Person"},
+            ),
+        ]
+    )
+
+    results = await vector_graph_store.search_related_nodes(node1.uuid)
+    assert results == [node2]
+
+    results = await vector_graph_store.search_related_nodes(
+        node1.uuid, find_targets=False
+    )
+    assert results == []
+
+
+@pytest.mark.asyncio
+async def test_search_similar_nodes(vector_graph_store):
+    nodes = [
+        Node(
+            uuid=uuid4(),
+            labels={"Entity"},
+            properties={"name": "Node1", "embedding": [1000000.0, 0.0]},
+        ),
+        Node(
+            uuid=uuid4(),
+            labels={"Entity"},
+            properties={"name": "Node2", "embedding": [10.0, 10.0]},
+        ),
+        Node(
+            uuid=uuid4(),
+            labels={"Entity"},
+            properties={"name": "Node3", "embedding": [-100.0, 0.0]},
+        ),
+        Node(
+            uuid=uuid4(),
+            labels={"Other"},
+            properties={"name": "Node4", "embedding": [1.0, 0.0]},
+        ),
+    ]
+    await vector_graph_store.add_nodes(nodes)
+
+    results = await vector_graph_store.search_similar_nodes(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding",
+        similarity_metric=SimilarityMetric.COSINE,
+        required_labels=["Entity"],
+    )
+    assert [node.properties["name"] for node in results] == [
+        "Node1",
+        "Node2",
+        "Node3",
+    ]
+    assert results[0].properties["embedding"] == [1000000.0, 0.0]
+
+    results = await vector_graph_store.search_similar_nodes_with_scores(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding",
+        similarity_metric=SimilarityMetric.EUCLIDEAN,
+        limit=2,
+    )
+    assert [node.properties["name"] for node, _ in results] == ["Node4", "Node2"]
+    assert results[0][1] == pytest.approx(1.0)
+
+    results = await vector_graph_store.search_similar_nodes_with_scores(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding",
+        min_score=0.9,
+        required_properties={"name": "Node1"},
+        include_properties=["name"],
+    )
+    assert len(results) == 1
+    assert results[0][0].properties == {"name": "Node1"}
+    assert results[0][1] == pytest.approx(1.0)
+
+    with pytest.raises(ValueError):
+        await vector_graph_store.search_similar_nodes(
+            query_embedding=[1.0, 0.0, 0.0],
+            embedding_property_name="embedding",
+        )
+
+
+@pytest.mark.asyncio
+async def test_search_similar_anchored_contexts(vector_graph_store):
+    episodes = [
+        Node(
+            uuid=uuid4(),
+            labels={"Episode"},
+            properties={"content": f"Episode{index}"},
+        )
+        for index in range(3)
+    ]
+    derivatives = [
+        Node(
+            uuid=uuid4(),
+            labels={"Derivative"},
+            properties={"embedding": [1.0, float(index)]},
+        )
+        for index in range(3)
+    ]
+    edges = [
+        Edge(
+            uuid=uuid4(),
+            source_uuid=derivative.uuid,
+            target_uuid=episode.uuid,
+            relation="DERIVED_FROM",
+        )
+        for derivative, episode in zip(derivatives, episodes)
+    ] + [
+        Edge(
+            uuid=uuid4(),
+            source_uuid=episodes[0].uuid,
+            target_uuid=episodes[1].uuid,
+            relation="PRECEDES",
+        )
+    ]
+    await vector_graph_store.write_batch(episodes + derivatives, edges)
+
+    results = await vector_graph_store.search_similar_anchored_contexts(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding",
+        limit=2,
+        required_labels=["Derivative"],
+        anchor_path=[
+            TraversalStep(
+                allowed_relations=["DERIVED_FROM"],
+                find_sources=False,
+                required_labels=["Episode"],
+            )
+        ],
+        context_step=TraversalStep(
+            allowed_relations=["PRECEDES"],
+            required_labels=["Episode"],
+        ),
+    )
+    assert [(anchor, context) for anchor, context in results] == [
+        (episodes[0], [episodes[1]]),
+        (episodes[1], [episodes[0]]),
+    ]
+
+    results = await vector_graph_store.search_similar_anchored_contexts_many(
+        query_embeddings=[[1.0, 0.0], [0.0, 1.0]],
+        embedding_property_name="embedding",
+        limit=2,
+        required_labels=["Derivative"],
+        anchor_path=[
+            TraversalStep(
+                allowed_relations=["DERIVED_FROM"],
+                find_sources=False,
+                required_labels=["Episode"],
+            )
+        ],
+        context_step=TraversalStep(
+            allowed_relations=["PRECEDES"],
+            required_labels=["Episode"],
+        ),
+    )
+    assert results == [
+        [(episodes[0], [episodes[1]]), (episodes[1], [episodes[0]])],
+        [(episodes[2], []), (episodes[1], [episodes[0]])],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_directional_nodes(vector_graph_store):
+    time = datetime.now()
+    nodes = [
+        Node(
+            uuid=uuid4(),
+            labels={"Event"},
+            properties={"timestamp": time + timedelta(minutes=index)},
+        )
+        for index in range(5)
+    ]
+    await vector_graph_store.add_nodes(nodes)
+
+    results = await vector_graph_store.search_directional_nodes(
+        by_property="timestamp",
+        start_at_value=time + timedelta(minutes=2),
+        include_equal_start_at_value=True,
+        order_ascending=False,
+        limit=2,
+        required_labels=["Event"],
+    )
+    assert results == [nodes[2], nodes[1]]
+
+    results = await vector_graph_store.search_directional_nodes(
+        by_property="timestamp",
+        start_at_value=time + timedelta(minutes=2),
+        limit=None,
+    )
+    assert results == [nodes[3], nodes[4]]
+
+
+@pytest.mark.asyncio
+async def test_search_matching_nodes(vector_graph_store):
+    nodes = [
+        Node(uuid=uuid4(), labels={"Entity"}, properties={"group": "a"}),
+        Node(uuid=uuid4(), labels={"Entity"}, properties={"group": "b"}),
+        Node(uuid=uuid4(), labels={"Entity"}),
+    ]
+    await vector_graph_store.add_nodes(nodes)
+
+    results = await vector_graph_store.search_matching_nodes(
+        required_labels=["Entity"], required_properties={"group": "a"}
+    )
+    assert results == [nodes[0]]
+
+    results = await vector_graph_store.search_matching_nodes(
+        required_properties={"group": "a"}, include_missing_properties=True
+    )
+    assert set(results) == {nodes[0], nodes[2]}
+
+
+@pytest.mark.asyncio
+async def test_delete_nodes(vector_graph_store):
+    nodes = [
+        Node(uuid=uuid4(), labels={"Entity"}, properties={"embedding": [1.0, 0.0]}),
+        Node(uuid=uuid4(), labels={"Entity"}, properties={"embedding": [0.0, 1.0]}),
+        Node(uuid=uuid4(), labels={"Other"}, properties={"embedding": [1.0, 1.0]}),
+    ]
+    await vector_graph_store.add_nodes(nodes)
+    await vector_graph_store.add_edges(
+        [Edge(uuid=uuid4(), source_uuid=nodes[0].uuid, target_uuid=nodes[1].uuid)]
+    )
+
+    await vector_graph_store.delete_nodes(
+        [nodes[0].uuid, nodes[2].uuid], required_labels=["Entity"]
+    )
+
+    results = await vector_graph_store.search_matching_nodes()
+    assert set(results) == {nodes[1], nodes[2]}
+    assert await vector_graph_store.search_related_nodes(nodes[1].uuid) == []
+
+    results = await vector_graph_store.search_similar_nodes(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding",
+        required_labels=["Entity"],
+    )
+    assert results == [nodes[1]]
+    assert results[0].properties["embedding"] == [0.0, 1.0]
+
+    await vector_graph_store.clear_data()
+    assert await vector_graph_store.search_matching_nodes() == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot(tmp_path):
+    snapshot_path = str(tmp_path / "snapshot.pkl")
+    params = InMemoryVectorGraphStoreParams(snapshot_path=snapshot_path)
+
+    vector_graph_store = InMemoryVectorGraphStore(params)
+    node1 = Node(uuid=uuid4(), labels={"Entity"}, properties={"embedding": [1.0]})
+    node2 = Node(uuid=uuid4(), labels={"Entity"}, properties={"name": "Node2"})
+    await vector_graph_store.add_nodes([node1, node2])
+    await vector_graph_store.add_edges(
+        [Edge(uuid=uuid4(), source_uuid=node1.uuid, target_uuid=node2.uuid)]
+    )
+    await vector_graph_store.close()
+
+    vector_graph_store = InMemoryVectorGraphStore(params)
+    results = await vector_graph_store.search_similar_nodes(
+        query_embedding=[1.0], embedding_property_name="embedding"
+    )
+    assert results == [node1]
+    assert results[0].properties == {"embedding": [1.0]}
+
+    results = await vector_graph_store.search_related_nodes(node1.uuid)
+    assert results == [node2]
+    assert results[0].properties == {"name": "Node2"}
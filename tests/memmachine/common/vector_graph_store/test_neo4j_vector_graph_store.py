@@ -8,7 +8,7 @@ from neo4j import AsyncGraphDatabase
 from testcontainers.neo4j import Neo4jContainer
 
 from memmachine.common.embedder import SimilarityMetric
-from memmachine.common.vector_graph_store import Edge, Node
+from memmachine.common.vector_graph_store import Edge, Node, TraversalStep
 from memmachine.common.vector_graph_store.neo4j_vector_graph_store import (
     Neo4jVectorGraphStore,
     Neo4jVectorGraphStoreParams,
@@ -179,6 +179,59 @@ async def test_add_edges(neo4j_driver, vector_graph_store):
     assert len(records) == 4
 
 
+@pytest.mark.asyncio
+async def test_write_batch(neo4j_driver, vector_graph_store):
+    node1_uuid = uuid4()
+    node2_uuid = uuid4()
+
+    await vector_graph_store.write_batch([], [])
+
+    records, _, _ = await neo4j_driver.execute_query("MATCH (n) RETURN n")
+    assert len(records) == 0
+
+    await vector_graph_store.write_batch(
+        [
+            Node(uuid=node1_uuid, labels={"Entity"}, properties={"name": "Node1"}),
+            Node(uuid=node2_uuid, labels={"Other"}, properties={"name": "Node2"}),
+        ],
+        [
+            Edge(
+                uuid=uuid4(),
+                source_uuid=node1_uuid,
+                target_uuid=node2_uuid,
+                relation="RELATED_TO",
+                source_labels={"Entity"},
+                target_labels={"Other"},
+            ),
+            Edge(
+                uuid=uuid4(),
+                source_uuid=node2_uuid,
+                target_uuid=node1_uuid,
+                relation="IS",
+            ),
+        ],
+    )
+
+    records, _, _ = await neo4j_driver.execute_query("MATCH (n) RETURN n")
+    assert len(records) == 2
+
+    records, _, _ = await neo4j_driver.execute_query("MATCH ()-[r]->() RETURN r")
+    assert len(records) == 2
+
+    # The batch is written atomically.
+    with pytest.raises(Exception):
+        await vector_graph_store.write_batch(
+            [
+                Node(uuid=uuid4(), labels={"Entity"}),
+                Node(uuid=node1_uuid, labels={"Entity"}),
+            ],
+            [],
+        )
+
+    records, _, _ = await neo4j_driver.execute_query("MATCH (n) RETURN n")
+    assert len(records) == 2
+
+
 @pytest.mark.asyncio
 async def test_search_similar_nodes(vector_graph_store, vector_graph_store_ann):
     nodes = [
@@ -327,6 +380,188 @@ async def test_search_similar_nodes(vector_graph_store, vector_graph_store_ann):
     )
     assert 0 < len(results) <= 5
 
+    scored_results = await vector_graph_store.search_similar_nodes_with_scores(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding1",
+        similarity_metric=SimilarityMetric.COSINE,
+        limit=5,
+        required_labels=["Entity"],
+    )
+    assert len(scored_results) == 5
+    assert scored_results[0][0].properties["name"] == "Node1"
+    scores = [score for _, score in scored_results]
+    assert scores == sorted(scores, reverse=True)
+
+    min_score = scores[1]
+    for store in [vector_graph_store, vector_graph_store_ann]:
+        scored_results = await store.search_similar_nodes_with_scores(
+            query_embedding=[1.0, 0.0],
+            embedding_property_name="embedding1",
+            similarity_metric=SimilarityMetric.COSINE,
+            limit=5,
+            required_labels=["Entity"],
+            min_score=min_score,
+        )
+        assert [node.properties["name"] for node, _ in scored_results] == [
+            "Node1",
+            "Node2",
+        ]
+        assert all(score >= min_score for _, score in scored_results)
+
+    results = await vector_graph_store.search_similar_nodes(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding1",
+        similarity_metric=SimilarityMetric.COSINE,
+        limit=5,
+        required_labels=["Entity"],
+        min_score=min_score,
+    )
+    assert [node.properties["name"] for node in results] == ["Node1", "Node2"]
+
+
+@pytest.mark.asyncio
+async def test_search_similar_anchored_contexts(
+    vector_graph_store, vector_graph_store_ann
+):
+    derivative1_uuid = uuid4()
+    derivative2_uuid = uuid4()
+    episode1_uuid = uuid4()
+    episode2_uuid = uuid4()
+    episode3_uuid = uuid4()
+    episode4_uuid = uuid4()
+
+    nodes = [
+        Node(
+            uuid=derivative1_uuid,
+            labels=["Derivative"],
+            properties={"name": "Derivative1", "embedding": [1.0, 0.0]},
+        ),
+        Node(
+            uuid=derivative2_uuid,
+            labels=["Derivative"],
+            properties={"name": "Derivative2", "embedding": [0.0, 1.0]},
+        ),
+        Node(
+            uuid=episode1_uuid,
+            labels=["Episode"],
+            properties={"name": "Episode1", "session": "A"},
+        ),
+        Node(
+            uuid=episode2_uuid,
+            labels=["Episode"],
+            properties={"name": "Episode2", "session": "A"},
+        ),
+        Node(
+            uuid=episode3_uuid,
+            labels=["Episode"],
+            properties={"name": "Episode3", "session": "A"},
+        ),
+        Node(
+            uuid=episode4_uuid,
+            labels=["Episode"],
+            properties={"name": "Episode4", "session": "B"},
+        ),
+    ]
+
+    edges = [
+        Edge(
+            uuid=uuid4(),
+            source_uuid=derivative1_uuid,
+            target_uuid=episode1_uuid,
+            relation="DERIVED_FROM",
+        ),
+        Edge(
+            uuid=uuid4(),
+            source_uuid=derivative2_uuid,
+            target_uuid=episode2_uuid,
+            relation="DERIVED_FROM",
+        ),
+        Edge(
+            uuid=uuid4(),
+            source_uuid=episode1_uuid,
+            target_uuid=episode2_uuid,
+            relation="RELATED_TO",
+        ),
+        Edge(
+            uuid=uuid4(),
+            source_uuid=episode3_uuid,
+            target_uuid=episode1_uuid,
+            relation="RELATED_TO",
+        ),
+        Edge(
+            uuid=uuid4(),
+            source_uuid=episode4_uuid,
+            target_uuid=episode1_uuid,
+            relation="RELATED_TO",
+        ),
+    ]
+
+    await vector_graph_store.add_nodes(nodes)
+    await vector_graph_store.add_edges(edges)
+
+    anchor_path = [
+        TraversalStep(
+            allowed_relations={"DERIVED_FROM"},
+            find_sources=False,
+            find_targets=True,
+            required_labels={"Episode"},
+        ),
+    ]
+
+    results = await vector_graph_store.search_similar_anchored_contexts(
+        query_embedding=[1.0, 0.1],
+        embedding_property_name="embedding",
+        required_labels=["Derivative"],
+        anchor_path=anchor_path,
+    )
+    assert [anchor.uuid for anchor, _ in results] == [episode1_uuid, episode2_uuid]
+    assert all(context == [] for _, context in results)
+
+    results = await vector_graph_store.search_similar_anchored_contexts(
+        query_embedding=[1.0, 0.1],
+        embedding_property_name="embedding",
+        limit=1,
+        required_labels=["Derivative"],
+        anchor_path=anchor_path,
+        context_step=TraversalStep(
+            required_labels={"Episode"},
+            required_properties={"session": "A"},
+        ),
+    )
+    assert len(results) == 1
+    anchor, context = results[0]
+    assert anchor.uuid == episode1_uuid
+    assert {node.uuid for node in context} == {episode2_uuid, episode3_uuid}
+
+    results = await vector_graph_store_ann.search_similar_anchored_contexts(
+        query_embedding=[1.0, 0.1],
+        embedding_property_name="embedding",
+        limit=2,
+        required_labels=["Derivative"],
+        anchor_path=anchor_path,
+        context_step=TraversalStep(required_labels={"Episode"}),
+        context_limit=1,
+    )
+    assert 0 < len(results) <= 2
+    assert all(len(context) == 1 for _, context in results)
+
+    results = await vector_graph_store.search_similar_anchored_contexts_many(
+        query_embeddings=[[1.0, 0.1], [0.1, 1.0]],
+        embedding_property_name="embedding",
+        required_labels=["Derivative"],
+        anchor_path=anchor_path,
+        context_step=TraversalStep(
+            required_labels={"Episode"},
+            required_properties={"session": "A"},
+        ),
+    )
+    assert [[anchor.uuid for anchor, _ in result] for result in results] == [
+        [episode1_uuid, episode2_uuid],
+        [episode2_uuid, episode1_uuid],
+    ]
+    assert {node.uuid for node in results[0][0][1]} == {episode2_uuid, episode3_uuid}
+    assert results[1][1][1] == results[0][0][1]
+
 
 @pytest.mark.asyncio
 async def test_search_related_nodes(vector_graph_store):
@@ -576,6 +811,75 @@ async def test_search_directional_nodes(vector_graph_store):
     assert results[1].properties["name"] == "Event3"
 
 
+@pytest.mark.asyncio
+async def test_property_projection(vector_graph_store):
+    node1_uuid = uuid4()
+    node2_uuid = uuid4()
+
+    await vector_graph_store.add_nodes(
+        [
+            Node(
+                uuid=node1_uuid,
+                labels=["Entity"],
+                properties={
+                    "name": "Node1",
+                    "embedding": [1.0, 0.0],
+                    "time?": datetime.now(),
+                },
+            ),
+            Node(
+                uuid=node2_uuid,
+                labels=["Entity"],
+                properties={"name": "Node2", "embedding": [0.0, 1.0]},
+            ),
+        ]
+    )
+    await vector_graph_store.add_edges(
+        [
+            Edge(
+                uuid=uuid4(),
+                source_uuid=node1_uuid,
+                target_uuid=node2_uuid,
+            )
+        ]
+    )
+
+    results = await vector_graph_store.search_similar_nodes(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding",
+        required_labels=["Entity"],
+        exclude_properties=["embedding"],
+    )
+    assert len(results) == 2
+    assert results[0].uuid == node1_uuid
+    assert results[0].labels == {"Entity"}
+    assert set(results[0].properties.keys()) == {"name", "time?"}
+    assert isinstance(results[0].properties["time?"], datetime)
+
+    results = await vector_graph_store.search_related_nodes(
+        node_uuid=node1_uuid,
+        include_properties=["name", "missing"],
+    )
+    assert len(results) == 1
+    assert results[0].properties == {"name": "Node2"}
+
+    results = await vector_graph_store.search_directional_nodes(
+        by_property="name",
+        limit=2,
+        include_properties=[],
+    )
+    assert [node.uuid for node in results] == [node1_uuid, node2_uuid]
+    assert all(node.properties == {} for node in results)
+
+    results = await vector_graph_store.search_matching_nodes(
+        required_properties={"name": "Node1"},
+        include_properties=["name", "embedding"],
+        exclude_properties=["embedding"],
+    )
+    assert len(results) == 1
+    assert results[0].properties == {"name": "Node1"}
+
+
 @pytest.mark.asyncio
 async def test_search_matching_nodes(vector_graph_store):
     nodes = [
@@ -722,3 +1026,84 @@ async def test_delete_nodes(neo4j_driver, vector_graph_store):
     await vector_graph_store.delete_nodes([node.uuid for node in nodes[:-3]])
     records, _, _ = await neo4j_driver.execute_query("MATCH (n) RETURN n")
     assert len(records) == 3
+
+    labeled_nodes = [
+        Node(
+            uuid=uuid4(),
+            labels=["Entity"],
+        ),
+        Node(
+            uuid=uuid4(),
+            labels=["Other"],
+        ),
+    ]
+
+    await vector_graph_store.add_nodes(labeled_nodes)
+    records, _, _ = await neo4j_driver.execute_query("MATCH (n) RETURN n")
+    assert len(records) == 5
+
+    await vector_graph_store.delete_nodes(
+        [node.uuid for node in labeled_nodes], required_labels=["Entity"]
+    )
+    records, _, _ = await neo4j_driver.execute_query("MATCH (n) RETURN n")
+    assert len(records) == 4
+
+
+@pytest.mark.asyncio
+async def test_uuid_constraints(neo4j_driver, vector_graph_store):
+    node1_uuid = uuid4()
+    node2_uuid = uuid4()
+
+    await vector_graph_store.add_nodes(
+        [
+            Node(uuid=node1_uuid, labels=["Source"]),
+            Node(uuid=node2_uuid, labels=["Target"]),
+        ]
+    )
+
+    records, _, _ = await neo4j_driver.execute_query(
+        "SHOW CONSTRAINTS YIELD labelsOrTypes, properties, type "
+        "RETURN labelsOrTypes, properties, type"
+    )
+    constrained_labels = {
+        record["labelsOrTypes"][0]
+        for record in records
+        if record["properties"] == ["uuid"] and record["type"] == "UNIQUENESS"
+    }
+    assert {"Source", "Target"} <= constrained_labels
+
+    await vector_graph_store.add_edges(
+        [
+            Edge(
+                uuid=uuid4(),
+                source_uuid=node1_uuid,
+                target_uuid=node2_uuid,
+                relation="RELATED_TO",
+                source_labels={"Source"},
+                target_labels={"Target"},
+            ),
+            Edge(
+                uuid=uuid4(),
+                source_uuid=node1_uuid,
+                target_uuid=node2_uuid,
+                relation="RELATED_TO",
+                source_labels={"Target"},
+                target_labels={"Target"},
+            ),
+        ]
+    )
+
+    records, _, _ = await neo4j_driver.execute_query("MATCH ()-[r]->() RETURN r")
+    assert len(records) == 1
+
+    results = await vector_graph_store.search_related_nodes(
+        node_uuid=node1_uuid,
+        node_labels={"Source"},
+    )
+    assert [node.uuid for node in results] == [node2_uuid]
+
+    results = await vector_graph_store.search_related_nodes(
+        node_uuid=node1_uuid,
+        node_labels={"Target"},
+    )
+    assert len(results) == 0
@@ -0,0 +1,306 @@
+import os
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+from memmachine.common.embedder import SimilarityMetric
+from memmachine.common.vector_graph_store import Edge, Node, TraversalStep
+from memmachine.common.vector_graph_store.segment_vector_graph_store import (
+    SegmentVectorGraphStore,
+    SegmentVectorGraphStoreParams,
+)
+from memmachine.common.vector_graph_store.vector_graph_store_builder import (
+    VectorGraphStoreBuilder,
+)
+
+
+@pytest_asyncio.fixture
+async def vector_graph_store(tmp_path):
+    vector_graph_store = SegmentVectorGraphStore(
+        SegmentVectorGraphStoreParams(directory=str(tmp_path))
+    )
+    yield vector_graph_store
+    await vector_graph_store.close()
+
+
+@pytest.mark.asyncio
+async def test_builder(tmp_path):
+    vector_graph_store = VectorGraphStoreBuilder.build(
+        "segment", {"directory": str(tmp_path)}, {}
+    )
+    assert isinstance(vector_graph_store, SegmentVectorGraphStore)
+    await vector_graph_store.close()
+
+
+@pytest.mark.asyncio
+async def test_add_nodes_and_edges(vector_graph_store):
+    node1 = Node(uuid=uuid4(), labels={"Entity"}, properties={"name": "Node1"})
+    node2 = Node(
+        uuid=uuid4(),
+        labels={"Entity", "Person"},
+        properties={"age": 30, "embedding": [0.1, 0.2]},
+    )
+    await vector_graph_store.add_nodes([node1, node2])
+
+    with pytest.raises(ValueError):
+        await vector_graph_store.add_nodes([Node(uuid=node1.uuid)])
+
+    with pytest.raises(ValueError):
+        await vector_graph_store.add_nodes(
+            [Node(uuid=uuid4(), labels={"Entity"}, properties={"embedding": [0.1]})]
+        )
+
+    await vector_graph_store.add_edges(
+        [
+            Edge(
+                uuid=uuid4(),
+                source_uuid=node1.uuid,
+                target_uuid=node2.uuid,
+                relation="RELATED_TO",
+                source_labels={"Entity"},
+                target_labels={"Person"},
+            ),
+            # Ignored because the target node does not exist.
+            Edge(uuid=uuid4(), source_uuid=node1.uuid, target_uuid=uuid4()),
+        ]
+    )
+
+    results = await vector_graph_store.search_matching_nodes()
+    assert set(results) == {node1, node2}
+
+    results = await vector_graph_store.search_related_nodes(
+        node1.uuid, allowed_relations=["RELATED_TO"], node_labels=["Entity"]
+    )
+    assert results == [node2]
+    assert results[0].labels == {"Entity", "Person"}
+    assert results[0].properties["age"] == 30
+    assert results[0].properties["embedding"] == pytest.approx([0.1, 0.2])
+
+    assert await vector_graph_store.search_related_nodes(node2.uuid) == [node1]
+    assert (
+        await vector_graph_store.search_related_nodes(node2.uuid, find_sources=False)
+        == []
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_similar_nodes(vector_graph_store):
+    nodes = [
+        Node(
+            uuid=uuid4(),
+            labels={"Entity"},
+            properties={"name": "Node1", "embedding": [1000000.0, 0.0]},
+        ),
+        Node(
+            uuid=uuid4(),
+            labels={"Entity"},
+            properties={"name": "Node2", "embedding": [10.0, 10.0]},
+        ),
+        Node(
+            uuid=uuid4(),
+            labels={"Entity"},
+            properties={"name": "Node3", "embedding": [-100.0, 0.0]},
+        ),
+        Node(
+            uuid=uuid4(),
+            labels={"Other"},
+            properties={"name": "Node4", "embedding": [1.0, 0.0]},
+        ),
+    ]
+    await vector_graph_store.add_nodes(nodes)
+
+    results = await vector_graph_store.search_similar_nodes(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding",
+        required_labels=["Entity"],
+    )
+    assert [node.properties["name"] for node in results] == [
+        "Node1",
+        "Node2",
+        "Node3",
+    ]
+
+    results = await vector_graph_store.search_similar_nodes_with_scores(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding",
+        similarity_metric=SimilarityMetric.EUCLIDEAN,
+        limit=2,
+    )
+    assert [node.properties["name"] for node, _ in results] == ["Node4", "Node2"]
+    assert results[0][1] == pytest.approx(1.0)
+
+    results = await vector_graph_store.search_similar_nodes_with_scores(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding",
+        min_score=0.9,
+        required_properties={"name": "Node1"},
+        include_properties=["name"],
+    )
+    assert len(results) == 1
+    assert results[0][0].properties == {"name": "Node1"}
+    assert results[0][1] == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_search_similar_anchored_contexts(vector_graph_store):
+    episodes = [
+        Node(uuid=uuid4(), labels={"Episode"}, properties={"index": index})
+        for index in range(3)
+    ]
+    derivatives = [
+        Node(
+            uuid=uuid4(),
+            labels={"Derivative"},
+            properties={"embedding": [1.0, float(index)]},
+        )
+        for index in range(3)
+    ]
+    edges = [
+        Edge(
+            uuid=uuid4(),
+            source_uuid=derivative.uuid,
+            target_uuid=episode.uuid,
+            relation="DERIVED_FROM",
+        )
+        for derivative, episode in zip(derivatives, episodes)
+    ] + [
+        Edge(
+            uuid=uuid4(),
+            source_uuid=episodes[0].uuid,
+            target_uuid=episodes[1].uuid,
+            relation="PRECEDES",
+        )
+    ]
+    await vector_graph_store.write_batch(episodes + derivatives, edges)
+
+    results = await vector_graph_store.search_similar_anchored_contexts(
+        query_embedding=[1.0, 0.0],
+        embedding_property_name="embedding",
+        limit=2,
+        required_labels=["Derivative"],
+        anchor_path=[
+            TraversalStep(
+                allowed_relations=["DERIVED_FROM"],
+                find_sources=False,
+                required_labels=["Episode"],
+            )
+        ],
+        context_step=TraversalStep(
+            allowed_relations=["PRECEDES"],
+            required_labels=["Episode"],
+        ),
+    )
+    assert results == [
+        (episodes[0], [episodes[1]]),
+        (episodes[1], [episodes[0]]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_directional_nodes(vector_graph_store):
+    time = datetime.now()
+    nodes = [
+        Node(
+            uuid=uuid4(),
+            labels={"Event"},
+            properties={"timestamp": time + timedelta(minutes=index)},
+        )
+        for index in range(5)
+    ]
+    await vector_graph_store.add_nodes(nodes)
+
+    results = await vector_graph_store.search_directional_nodes(
+        by_property="timestamp",
+        start_at_value=time + timedelta(minutes=2),
+        include_equal_start_at_value=True,
+        order_ascending=False,
+        limit=2,
+        required_labels=["Event"],
+    )
+    assert results == [nodes[2], nodes[1]]
+    assert results[0].properties["timestamp"] == time + timedelta(minutes=2)
+
+
+@pytest.mark.asyncio
+async def test_property_types(vector_graph_store):
+    time = datetime.now()
+    properties = {
+        "flag": True,
+        "count": 3,
+        "score": 0.5,
+        "name": "Node",
+        "timestamp": time,
+        "flags": [True, False],
+        "counts": [1, 2],
+        "names": ["a", "b"],
+        "timestamps": [time, time + timedelta(days=1)],
+        "missing": None,
+    }
+    node = Node(uuid=uuid4(), labels={"Entity"}, properties=properties)
+    await vector_graph_store.add_nodes([node])
+
+    results = await vector_graph_store.search_matching_nodes()
+    assert results == [node]
+    assert results[0].properties == properties
+
+
+@pytest.mark.asyncio
+async def test_delete_and_compact(tmp_path):
+    params = SegmentVectorGraphStoreParams(
+        directory=str(tmp_path), compaction_threshold=0.4
+    )
+    vector_graph_store = SegmentVectorGraphStore(params)
+
+    nodes = [
+        Node(
+            uuid=uuid4(),
+            labels={"Entity"},
+            properties={"index": index, "embedding": [1.0, float(index)]},
+        )
+        for index in range(4)
+    ]
+    await vector_graph_store.add_nodes(nodes)
+    await vector_graph_store.add_edges(
+        [Edge(uuid=uuid4(), source_uuid=nodes[0].uuid, target_uuid=nodes[1].uuid)]
+    )
+
+    # Deleting one row of four does not trigger compaction.
+    await vector_graph_store.delete_nodes([nodes[0].uuid], required_labels=["Entity"])
+    assert os.path.exists(tmp_path / "segment_1_0.vectors")
+    assert await vector_graph_store.search_related_nodes(nodes[1].uuid) == []
+
+    # Nodes without the required labels are not deleted.
+    await vector_graph_store.delete_nodes([nodes[1].uuid], required_labels=["Other"])
+
+    results = await vector_graph_store.search_similar_nodes(
+        query_embedding=[1.0, 0.0], embedding_property_name="embedding"
+    )
+    assert results == [nodes[1], nodes[2], nodes[3]]
+
+    # Deleting a second row of four triggers compaction.
+    await vector_graph_store.delete_nodes([nodes[2].uuid])
+    assert not os.path.exists(tmp_path / "segment_1_0.vectors")
+    assert os.path.getsize(tmp_path / "segment_1_1.vectors") == 2 * 2 * 4
+
+    results = await vector_graph_store.search_similar_nodes(
+        query_embedding=[1.0, 0.0], embedding_property_name="embedding"
+    )
+    assert results == [nodes[1], nodes[3]]
+    assert results[1].properties["embedding"] == [1.0, 3.0]
+
+    await vector_graph_store.close()
+
+    # Reopening maps the segments without loading them.
+    vector_graph_store = SegmentVectorGraphStore(params)
+    results = await vector_graph_store.search_similar_nodes(
+        query_embedding=[1.0, 0.0], embedding_property_name="embedding"
+    )
+    assert results == [nodes[1], nodes[3]]
+    assert results[0].properties == {"index": 1, "embedding": [1.0, 1.0]}
+
+    await vector_graph_store.clear_data()
+    assert await vector_graph_store.search_matching_nodes() == []
+    assert not os.path.exists(tmp_path / "segment_1_1.vectors")
+    await vector_graph_store.close()
@@ -160,3 +160,72 @@ async def test_previous_related_episode_postulator():
     related_episodes = await postulator.postulate(episode)
     assert len(related_episodes) == 1
     assert related_episodes[0].content == "second"
+
+
+@pytest.mark.asyncio
+async def test_previous_related_episode_postulator_batch():
+    vector_graph_store = MagicMock(spec=VectorGraphStore)
+    timestamp = datetime.now()
+
+    stored_node = Node(
+        uuid=uuid4(),
+        labels={"Episode"},
+        properties={
+            "episode_type": "test",
+            "content_type": ContentType.STRING,
+            "content": "stored",
+            "timestamp": timestamp,
+            mangle_filterable_property_key("user_id"): "user1",
+            "user_metadata": "null",
+        },
+    )
+
+    def side_effect(*args, **kwargs):
+        return [
+            node
+            for node in [stored_node]
+            if node.properties["timestamp"] < kwargs["start_at_value"]
+            and all(
+                node.properties.get(key) == value
+                for key, value in kwargs.get("required_properties", {}).items()
+            )
+        ][: kwargs.get("limit", -1)]
+
+    vector_graph_store.search_directional_nodes = AsyncMock(side_effect=side_effect)
+
+    def make_episode(content, seconds, user_id):
+        return Episode(
+            uuid=uuid4(),
+            episode_type="test",
+            content_type=ContentType.STRING,
+            content=content,
+            timestamp=timestamp + timedelta(seconds=seconds),
+            filterable_properties={"user_id": user_id},
+        )
+
+    episodes = [
+        make_episode("third", 3, "user1"),
+        make_episode("first", 1, "user1"),
+        make_episode("other", 2, "user2"),
+        make_episode("second", 2, "user1"),
+    ]
+
+    postulator = PreviousRelatedEpisodePostulator(
+        PreviousRelatedEpisodePostulatorParams(
+            episode_collection="Episode",
+            vector_graph_store=vector_graph_store,
+            search_limit=2,
+            filterable_property_keys={"user_id"},
+        )
+    )
+
+    related_episodes = await postulator.postulate_batch(episodes)
+    assert [
+        [related_episode.content for related_episode in episode_related_episodes]
+        for episode_related_episodes in related_episodes
+    ] == [
+        ["second", "first"],
+        ["stored"],
+        [],
+        ["first", "stored"],
+    ]
@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from memmachine.episodic_memory.session_manager.async_session_manager import (
+    AsyncSessionManager,
+    _ReadCache,
+)
+from memmachine.episodic_memory.session_manager.session_manager import (
+    SessionManager,
+)
+
+
+@pytest.fixture
+def session_manager():
+    manager = AsyncSessionManager({"uri": "sqlite:///:memory:"})
+    yield manager
+    manager.close()
+
+
+@pytest.mark.asyncio
+async def test_open_session_is_cached(session_manager):
+    await session_manager.create_new_group("group1", ["agent1"], ["user1"])
+    session = await session_manager.create_session(
+        "group1", "session1", {"key": "value"}
+    )
+
+    with patch.object(
+        SessionManager,
+        "open_session",
+        wraps=session_manager._session_manager.open_session,
+    ) as open_session:
+        assert await session_manager.open_session("group1", "session1") == session
+        opened_session = await session_manager.open_session("group1", "session1")
+        assert opened_session == session
+        assert open_session.call_count == 1
+
+        # Cached results are copies, sharing the immutable configuration.
+        opened_session.agent_ids.append("agent2")
+        assert (await session_manager.open_session("group1", "session1")).agent_ids == [
+            "agent1"
+        ]
+
+        # Deleting a session invalidates it.
+        await session_manager.delete_session("group1", "session1")
+        with pytest.raises(ValueError):
+            await session_manager.open_session("group1", "session1")
+
+
+@pytest.mark.asyncio
+async def test_retrieve_group_is_cached(session_manager):
+    assert await session_manager.retrieve_group("group1") is None
+    await session_manager.create_session_if_not_exist(
+        "group1", ["agent1"], ["user1"], "session1"
+    )
+
+    with patch.object(
+        SessionManager,
+        "retrieve_group",
+        wraps=session_manager._session_manager.retrieve_group,
+    ) as retrieve_group:
+        group = await session_manager.retrieve_group("group1")
+        assert group is not None
+        assert group.agent_list == ["agent1"]
+        assert await session_manager.retrieve_group("group1") == group
+        assert retrieve_group.call_count == 1
+
+        await session_manager.delete_session("group1", "session1")
+        await session_manager.delete_group("group1")
+        assert await session_manager.retrieve_group("group1") is None
+
+
+@pytest.mark.asyncio
+async def test_reads_in_flight_do_not_fill_invalidated_cache(session_manager):
+    await session_manager.create_new_group("group1", ["agent1"], ["user1"])
+    await session_manager.create_session("group1", "session1")
+
+    # The session is deleted while it is being opened.
+    await asyncio.gather(
+        session_manager.open_session("group1", "session1"),
+        session_manager.delete_session("group1", "session1"),
+    )
+    with pytest.raises(ValueError):
+        await session_manager.open_session("group1", "session1")
+
+
+def test_read_cache_generations():
+    cache: _ReadCache[str, str] = _ReadCache(max_size=2)
+
+    generation = cache.begin_read("a")
+    cache.invalidate("a")
+    cache.fill("a", "stale", generation)
+    cache.end_read("a")
+    assert cache.get("a") is None
+
+    generation = cache.begin_read("a")
+    cache.fill("a", "fresh", generation)
+    cache.end_read("a")
+    assert cache.get("a") == "fresh"
+
+    # Generations are not kept without reads in flight.
+    assert cache._generations == {}
+
+    cache.put("b", "b")
+    cache.put("c", "c")
+    assert cache.get("a") is None
@@ -320,3 +320,47 @@ def test_create_session_with_null_config(session_manager: SessionManager):
         configuration=None,
     )
     assert session_info.configuration == {}
+
+
+def test_configurations_are_stored_once(session_manager: SessionManager):
+    """Test that sessions with the same configuration share one row."""
+    session_manager.create_new_group("g1", ["a1"], ["u1"])
+    session_manager.create_session("g1", "s1", {"a": 1, "b": {"c": 2}})
+    session_manager.create_session("g1", "s2", {"b": {"c": 2}, "a": 1})
+    session_manager.create_session("g1", "s3", {"a": 2})
+
+    with session_manager._session() as dbsession:
+        assert dbsession.query(SessionManager.Configuration).count() == 2
+        references = {
+            sess.configuration for sess in dbsession.query(SessionManager.MemSession)
+        }
+    assert len(references) == 2
+
+    # Configurations are loaded from the database when not memoized.
+    session_manager._configurations.clear()
+    assert session_manager.open_session("g1", "s2").configuration == {
+        "a": 1,
+        "b": {"c": 2},
+    }
+    assert (
+        session_manager.open_session("g1", "s1").configuration
+        is session_manager.open_session("g1", "s2").configuration
+    )
+
+
+def test_open_session_with_inline_configuration(session_manager: SessionManager):
+    """Test opening a session stored before configurations were hashed."""
+    with session_manager._session() as dbsession:
+        dbsession.add(
+            SessionManager.MemSession(
+                timestamp=0,
+                group_id="g1",
+                agent_ids='["a1"]',
+                user_ids='["u1"]',
+                session_id="s1",
+                configuration='{"key": "value"}',
+            )
+        )
+        dbsession.commit()
+
+    assert session_manager.open_session("g1", "s1").configuration == {"key": "value"}
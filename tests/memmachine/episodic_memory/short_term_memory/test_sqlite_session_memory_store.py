@@ -0,0 +1,132 @@
+import asyncio
+import json
+import sqlite3
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from memmachine.episodic_memory.data_types import (
+    ContentType,
+    Episode,
+    MemoryContext,
+)
+from memmachine.episodic_memory.short_term_memory.session_memory import (
+    SessionMemory,
+)
+from memmachine.episodic_memory.short_term_memory.sqlite_session_memory_store import (
+    SQLiteSessionMemoryStore,
+)
+
+
+def create_test_episode(content):
+    return Episode(
+        uuid=uuid.uuid4(),
+        episode_type="message",
+        content_type=ContentType.STRING,
+        content=content,
+        timestamp=datetime.now(),
+        group_id="group1",
+        session_id="session1",
+        producer_id="user1",
+        user_metadata={"key": "value"},
+    )
+
+
+@pytest.fixture
+def memory_context():
+    return MemoryContext(
+        group_id="group1",
+        agent_id={"agent1"},
+        user_id={"user1"},
+        session_id="session1",
+    )
+
+
+def create_session_memory(path, memory_context, capacity=3):
+    model = MagicMock()
+    model.generate_response = AsyncMock(return_value=["summary"])
+    return SessionMemory(
+        model=model,
+        summary_system_prompt="System prompt",
+        summary_user_prompt="User prompt: {episodes} {summary}",
+        capacity=capacity,
+        max_message_len=100,
+        max_token_num=50,
+        memory_context=memory_context,
+        store=SQLiteSessionMemoryStore({"path": path}),
+    )
+
+
+@pytest.mark.asyncio
+async def test_state_is_shared_and_persisted(tmp_path, memory_context):
+    path = str(tmp_path / "session_memory.db")
+
+    memory = create_session_memory(path, memory_context)
+    episodes = [create_test_episode(content) for content in ["a", "b", "c", "d"]]
+    for episode in episodes:
+        await memory.add_episode(episode)
+
+    # Another worker sees the same state.
+    other_memory = create_session_memory(path, memory_context)
+    assert await other_memory.get_session_memory_context(query="test") == (
+        episodes[1:],
+        "summary",
+    )
+
+    # Closing does not delete persisted state.
+    await memory.close()
+    await other_memory.add_episode(create_test_episode("e"))
+    restarted_memory = create_session_memory(path, memory_context)
+    retrieved_episodes, summary = await restarted_memory.get_session_memory_context(
+        query="test"
+    )
+    assert [episode.content for episode in retrieved_episodes] == ["c", "d", "e"]
+    assert retrieved_episodes[0] == episodes[2]
+    assert summary == "summary"
+
+    await restarted_memory.clear_memory()
+    assert await other_memory.get_session_memory_context(query="test") == ([], "")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_are_not_lost(tmp_path, memory_context):
+    path = str(tmp_path / "session_memory.db")
+    memories = [
+        create_session_memory(path, memory_context, capacity=10) for _ in range(2)
+    ]
+
+    # Each worker appends 5 of the 10 episodes concurrently.
+    episodes = [create_test_episode(str(index)) for index in range(10)]
+    fulls = await asyncio.gather(
+        *(
+            memories[index % 2].add_episode(episode)
+            for index, episode in enumerate(episodes)
+        )
+    )
+
+    # The memory became full exactly once, on the last append.
+    assert fulls.count(True) == 1
+    retrieved_episodes, _ = await memories[0].get_session_memory_context(query="test")
+    assert sorted(episode.content for episode in retrieved_episodes) == sorted(
+        episode.content for episode in episodes
+    )
+
+
+@pytest.mark.asyncio
+async def test_old_episodes_are_deleted(tmp_path, memory_context):
+    path = str(tmp_path / "session_memory.db")
+    memory = create_session_memory(path, memory_context)
+
+    for content in ["a", "b", "c", "d", "e"]:
+        await memory.add_episode(create_test_episode(content))
+    await memory.close()
+
+    # Only the episodes in memory are kept.
+    connection = sqlite3.connect(path)
+    rows = connection.execute(
+        "SELECT episode FROM session_memory_episodes ORDER BY id"
+    ).fetchall()
+    connection.close()
+    assert [json.loads(episode)["content"] for (episode,) in rows] == ["c", "d", "e"]
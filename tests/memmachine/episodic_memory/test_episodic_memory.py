@@ -1,11 +1,13 @@
 """Unit tests for the EpisodicMemory class."""
 
+import asyncio
 import uuid
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from memmachine.common.resource_initializer import resource_builder_map
 from memmachine.episodic_memory.data_types import ContentType, Episode, MemoryContext
 from memmachine.episodic_memory.episodic_memory import (
     AsyncEpisodicMemory,
@@ -17,6 +19,14 @@ from memmachine.episodic_memory.episodic_memory import (
 pytestmark = pytest.mark.asyncio
 
 
+@pytest.fixture(autouse=True)
+def clear_shared_resources():
+    """Isolates the resources shared between EpisodicMemory instances."""
+    EpisodicMemory._shared_resources.clear()
+    yield
+    EpisodicMemory._shared_resources.clear()
+
+
 @pytest.fixture
 def memory_context():
     """Provides a sample MemoryContext for tests."""
@@ -69,9 +79,7 @@ def mock_config_without_longterm_memory():
 def episodic_memory_instance(mock_manager, mock_config, memory_context):
     """Provides an EpisodicMemory instance with mocked dependencies."""
     with (
-        patch(
-            "memmachine.episodic_memory.episodic_memory.LanguageModelBuilder"
-        ) as MockLMB,
+        patch.dict(resource_builder_map, {"language_model": MagicMock()}),
         patch(
             "memmachine.episodic_memory.episodic_memory.MetricsFactoryBuilder"
         ) as MockMFB,
@@ -84,6 +92,8 @@ def episodic_memory_instance(mock_manager, mock_config, memory_context):
     ):
         # Mock the builders and their build methods
         mock_model = MagicMock()
+        MockLMB = resource_builder_map["language_model"]
+        MockLMB.get_dependency_ids.return_value = set()
         MockLMB.build.return_value = mock_model
 
         mock_metrics_manager = MagicMock()
@@ -101,9 +111,11 @@ def episodic_memory_instance(mock_manager, mock_config, memory_context):
 
         mock_ltm_instance = MagicMock()
         mock_ltm_instance.add_episode = AsyncMock()
+        mock_ltm_instance.add_episodes = AsyncMock()
         mock_ltm_instance.forget_session = AsyncMock()
         mock_ltm_instance.close = AsyncMock()
         mock_ltm_instance.search = AsyncMock()
+        mock_ltm_instance.search_many = AsyncMock()
         MockLongTermMemory.return_value = mock_ltm_instance
 
         instance = EpisodicMemory(mock_manager, mock_config, memory_context)
@@ -119,9 +131,7 @@ def episodic_memory_instance_without_longterm(
 ):
     """Provides an EpisodicMemory instance with mocked dependencies."""
     with (
-        patch(
-            "memmachine.episodic_memory.episodic_memory.LanguageModelBuilder"
-        ) as MockLMB,
+        patch.dict(resource_builder_map, {"language_model": MagicMock()}),
         patch(
             "memmachine.episodic_memory.episodic_memory.MetricsFactoryBuilder"
         ) as MockMFB,
@@ -131,6 +141,8 @@ def episodic_memory_instance_without_longterm(
     ):
         # Mock the builders and their build methods
         mock_model = MagicMock()
+        MockLMB = resource_builder_map["language_model"]
+        MockLMB.get_dependency_ids.return_value = set()
         MockLMB.build.return_value = mock_model
 
         mock_metrics_manager = MagicMock()
@@ -172,6 +184,31 @@ async def test_initialization_fails_with_invalid_config(mock_manager, memory_con
         )
 
 
+async def test_language_model_is_shared(mock_manager, mock_config, memory_context):
+    """Tests that instances share the language model of the same configured model."""
+    with (
+        patch.dict(resource_builder_map, {"language_model": MagicMock()}),
+        patch("memmachine.episodic_memory.episodic_memory.MetricsFactoryBuilder"),
+        patch(
+            "memmachine.episodic_memory.episodic_memory.SessionMemory"
+        ) as MockSessionMemory,
+    ):
+        MockLMB = resource_builder_map["language_model"]
+        MockLMB.get_dependency_ids.return_value = {"prometheus"}
+        mock_model = MagicMock()
+        MockLMB.build.return_value = mock_model
+
+        EpisodicMemory(mock_manager, mock_config, memory_context)
+        EpisodicMemory(mock_manager, mock_config, memory_context)
+
+        MockLMB.build.assert_called_once()
+        name, config = MockLMB.build.call_args.args[:2]
+        assert name == "mock_vendor"
+        assert config == {"metrics_factory_id": "prometheus"}
+        assert MockSessionMemory.call_args_list[0].args[0] is mock_model
+        assert MockSessionMemory.call_args_list[1].args[0] is mock_model
+
+
 async def test_reference_and_close(episodic_memory_instance, mock_manager):
     """Tests the reference counting and closing mechanism."""
     # Initial ref count is 1
@@ -237,6 +274,50 @@ async def test_add_memory_episode_invalid_produced_for(
     )
 
 
+async def test_add_memory_episodes(episodic_memory_instance):
+    """Tests adding a batch of episodes with an invalid producer."""
+    episode_arguments = {
+        "produced_for": "test_agent",
+        "episode_type": "message",
+        "content_type": ContentType.STRING,
+    }
+    errors = await episodic_memory_instance.add_memory_episodes(
+        [
+            {"producer": "test_user", "episode_content": "first", **episode_arguments},
+            {
+                "producer": "invalid_user",
+                "episode_content": "invalid",
+                **episode_arguments,
+            },
+            {"producer": "test_user", "episode_content": "second", **episode_arguments},
+        ]
+    )
+
+    assert errors[0] is None
+    assert "invalid_user" in errors[1]
+    assert errors[2] is None
+
+    # Valid episodes are added to session memory in order,
+    # and to long-term memory together.
+    session_memory = episodic_memory_instance._session_memory
+    assert [
+        call.args[0].content for call in session_memory.add_episode.await_args_list
+    ] == ["first", "second"]
+    long_term_memory = episodic_memory_instance._long_term_memory
+    long_term_memory.add_episodes.assert_awaited_once()
+    assert [
+        episode.content for episode in long_term_memory.add_episodes.await_args.args[0]
+    ] == ["first", "second"]
+
+
+async def test_add_memory_episodes_with_missing_arguments(episodic_memory_instance):
+    """Tests that malformed episode arguments are errors, not skipped episodes."""
+    with pytest.raises(TypeError):
+        await episodic_memory_instance.add_memory_episodes(
+            [{"producer": "test_user", "episode_content": "first"}]
+        )
+
+
 async def test_memory_without_ltm_memory(
     episodic_memory_instance_without_longterm, memory_context
 ):
@@ -343,6 +424,48 @@ async def test_query_memory(episodic_memory_instance, memory_context):
     assert summary_res == ["summary"]
 
 
+async def test_query_memory_many(episodic_memory_instance, memory_context):
+    """Tests querying memory for several queries at once."""
+    episodes = [
+        Episode(
+            uuid=uuid.uuid4(),
+            content=f"episode {index}",
+            episode_type="message",
+            content_type=ContentType.STRING,
+            timestamp=datetime.now(),
+            group_id=memory_context.group_id,
+            session_id=memory_context.session_id,
+            producer_id="test_user",
+        )
+        for index in range(3)
+    ]
+
+    episodic_memory_instance.short_term_memory.get_session_memory_context.return_value = (
+        [episodes[0]],
+        "summary",
+    )
+    episodic_memory_instance.long_term_memory.search_many.return_value = [
+        [episodes[0], episodes[1]],
+        [episodes[2]],
+    ]
+
+    results = await episodic_memory_instance.query_memory_many(
+        ["first query", "second query"], limit=10
+    )
+
+    # The session memory context is fetched once for all queries.
+    episodic_memory_instance.short_term_memory.get_session_memory_context.assert_awaited_once()
+    episodic_memory_instance.long_term_memory.search_many.assert_awaited_once_with(
+        ["first query", "second query"],
+        10,
+        {"group_id": memory_context.group_id},
+    )
+    assert results == [
+        ([episodes[0]], [episodes[1]], ["summary"]),
+        ([episodes[0]], [episodes[2]], ["summary"]),
+    ]
+
+
 async def test_formalize_query_with_context(episodic_memory_instance):
     """Tests the formatting of a query with context from memory."""
     mock_episode = Episode(
@@ -470,3 +593,37 @@ async def test_delete_data(episodic_memory_instance):
     await episodic_memory_instance.delete_data()
     episodic_memory_instance.short_term_memory.clear_memory.assert_awaited_once()
     episodic_memory_instance.long_term_memory.forget_session.assert_awaited_once()
+
+
+async def test_queries_run_concurrently(episodic_memory_instance):
+    """Tests that queries run in parallel, but not alongside data deletion."""
+    active_searches = 0
+    max_active_searches = 0
+
+    async def search(query, limit, property_filter):
+        nonlocal active_searches, max_active_searches
+        active_searches += 1
+        max_active_searches = max(max_active_searches, active_searches)
+        await asyncio.sleep(0.01)
+        active_searches -= 1
+        return []
+
+    async def forget_session():
+        assert active_searches == 0
+
+    episodic_memory_instance.short_term_memory.get_session_memory_context.return_value = (
+        [],
+        "",
+    )
+    episodic_memory_instance.long_term_memory.search.side_effect = search
+    episodic_memory_instance.long_term_memory.forget_session.side_effect = (
+        forget_session
+    )
+
+    await asyncio.gather(
+        *[episodic_memory_instance.query_memory("test query") for _ in range(4)],
+        episodic_memory_instance.delete_data(),
+        *[episodic_memory_instance.query_memory("test query") for _ in range(4)],
+    )
+    assert max_active_searches == 4
+    episodic_memory_instance.long_term_memory.forget_session.assert_awaited_once()
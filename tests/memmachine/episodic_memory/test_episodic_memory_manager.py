@@ -1,5 +1,7 @@
 """Unit tests for the EpisodicMemoryManager class."""
 
+import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock, mock_open, patch
 
 import pytest
@@ -132,7 +134,7 @@ async def test_create_group(manager):
     # Create group with same ID
     with pytest.raises(ValueError):
         await manager.create_group("g1", ["u2"], ["A2"])
-    group = manager.get_group_configuration("g1")
+    group = await manager.get_group_configuration("g1")
     assert group is not None
     assert group.group_id == "g1"
 
@@ -277,6 +279,220 @@ async def test_shut_down(manager):
         mock_instance2.close.assert_called_once()
 
 
+class FakeEpisodicMemory:
+    """Reference counted stand-in for EpisodicMemory."""
+
+    def __init__(self, manager, config, memory_context):
+        self._manager = manager
+        self._memory_context = memory_context
+        self._ref_count = 1
+        self.token_num = 0
+        self.closed = False
+
+    def get_memory_context(self):
+        return self._memory_context
+
+    def get_reference_count(self):
+        return self._ref_count
+
+    def get_token_num(self):
+        return self.token_num
+
+    async def reference(self):
+        if self._ref_count <= 0:
+            return False
+        self._ref_count += 1
+        return True
+
+    async def close(self):
+        self._ref_count -= 1
+        if self._ref_count <= 0:
+            self.closed = True
+            await self._manager.delete_context_memory(self._memory_context)
+
+
+def create_cached_manager(instance_cache):
+    return EpisodicMemoryManager(
+        {
+            "sessiondb": {"uri": "sqlite:///:memory:"},
+            "instance_cache": instance_cache,
+        }
+    )
+
+
+@patch(
+    "memmachine.episodic_memory.episodic_memory_manager.EpisodicMemory",
+    FakeEpisodicMemory,
+)
+async def test_released_instances_are_cached():
+    """Test that released instances are reused until evicted as least recently used."""
+    manager = create_cached_manager({"max_instances": 2})
+
+    inst1 = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s1")
+    await inst1.close()
+    assert not inst1.closed
+    assert await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s1") is (
+        inst1
+    )
+    await inst1.close()
+
+    inst2 = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s2")
+    await inst2.close()
+
+    # The instance in use is not evicted, even if the cache is full.
+    inst3 = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s3")
+    assert inst1.closed
+    assert not inst2.closed
+    assert not inst3.closed
+
+    inst4 = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s4")
+    assert inst2.closed
+    assert not inst3.closed
+
+    # An evicted instance is replaced by a new one.
+    inst = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s1")
+    assert inst is not inst1
+    await inst.close()
+    await inst3.close()
+    await inst4.close()
+
+
+@patch(
+    "memmachine.episodic_memory.episodic_memory_manager.EpisodicMemory",
+    FakeEpisodicMemory,
+)
+async def test_idle_and_oversized_instances_are_evicted(monkeypatch):
+    """Test that instances idle past the TTL or over the token budget are evicted."""
+    manager = create_cached_manager({"idle_ttl_seconds": 60, "max_token_num": 100})
+
+    inst1 = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s1")
+    inst1.token_num = 80
+    await inst1.close()
+    inst2 = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s2")
+    inst2.token_num = 30
+    await inst2.close()
+
+    inst3 = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s3")
+    assert inst1.closed
+    assert not inst2.closed
+    await inst3.close()
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    inst4 = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s4")
+    assert inst2.closed
+    assert inst3.closed
+    assert not inst4.closed
+    await inst4.close()
+
+
+async def test_evicted_instances_close_before_replacement():
+    """
+    Test that a new instance for a context is not built
+    until the evicted instance of the context is closed.
+    """
+    manager = create_cached_manager({"max_instances": 1})
+    close_started = asyncio.Event()
+    close_finished = asyncio.Event()
+
+    class SlowClosingEpisodicMemory(FakeEpisodicMemory):
+        async def close(self):
+            if self._ref_count == 1:
+                close_started.set()
+                await close_finished.wait()
+            await super().close()
+
+    with patch(
+        "memmachine.episodic_memory.episodic_memory_manager.EpisodicMemory",
+        SlowClosingEpisodicMemory,
+    ):
+        inst1 = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s1")
+        await inst1.close()
+
+        # Building s2 evicts s1.
+        evicting = asyncio.create_task(
+            manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s2")
+        )
+        await close_started.wait()
+        replacing = asyncio.create_task(
+            manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s1")
+        )
+        await asyncio.sleep(0.01)
+        assert not replacing.done()
+
+        close_finished.set()
+        inst2 = await evicting
+        inst = await replacing
+        assert inst1.closed
+        assert inst is not inst1
+        assert not inst.closed
+        await inst.close()
+        await inst2.close()
+
+
+@patch(
+    "memmachine.episodic_memory.episodic_memory_manager.EpisodicMemory",
+    FakeEpisodicMemory,
+)
+async def test_idle_instances_are_swept():
+    """Test that idle instances are evicted without new requests."""
+    manager = create_cached_manager({"idle_ttl_seconds": 0.01})
+
+    inst = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s1")
+    await inst.close()
+    await asyncio.sleep(0.1)
+    assert inst.closed
+    await manager.shut_down()
+
+
+async def test_instances_are_built_once_per_context():
+    """
+    Test that concurrent requests for a context share one instance,
+    while instances of other contexts are used during its construction.
+    """
+    manager = create_cached_manager({})
+    with patch(
+        "memmachine.episodic_memory.episodic_memory_manager.EpisodicMemory",
+        side_effect=FakeEpisodicMemory,
+    ) as MockEpisodicMemory:
+        cached = await manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s1")
+
+        session_manager = manager.session_manager
+        open_session = session_manager.open_session
+        session_opened = asyncio.Event()
+
+        async def slow_open_session(group_id, session_id):
+            await session_opened.wait()
+            return await open_session(group_id, session_id)
+
+        with patch.object(session_manager, "open_session", slow_open_session):
+            tasks = [
+                asyncio.create_task(
+                    manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s2")
+                )
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+
+            # The construction for s2 does not block other contexts.
+            assert (
+                await asyncio.wait_for(
+                    manager.get_episodic_memory_instance("g1", ["a1"], ["u1"], "s1"),
+                    timeout=1,
+                )
+                is cached
+            )
+            assert not any(task.done() for task in tasks)
+
+            session_opened.set()
+            instances = await asyncio.gather(*tasks)
+
+        assert all(inst is instances[0] for inst in instances)
+        assert instances[0].get_reference_count() == 4
+        assert MockEpisodicMemory.call_count == 2
+        assert manager._context_locks == {}
+
+
 # --- Test Session Proxy Methods ---
 
 
@@ -284,10 +500,10 @@ async def test_get_all_sessions(manager):
     """Test the get_all_sessions proxy method."""
     # Create some sessions directly via the session manager for this test
     sm = manager.session_manager
-    sm.create_session_if_not_exist("g1", ["a1"], ["u1"], "s1")
-    sm.create_session_if_not_exist("g2", ["a2"], ["u2"], "s2")
+    await sm.create_session_if_not_exist("g1", ["a1"], ["u1"], "s1")
+    await sm.create_session_if_not_exist("g2", ["a2"], ["u2"], "s2")
 
-    sessions = manager.get_all_sessions()
+    sessions = await manager.get_all_sessions()
     assert len(sessions) == 2
     assert {s.session_id for s in sessions} == {"s1", "s2"}
 
@@ -295,30 +511,30 @@ async def test_get_all_sessions(manager):
 async def test_get_user_sessions(manager):
     """Test the get_user_sessions proxy method."""
     sm = manager.session_manager
-    sm.create_session_if_not_exist("g1", ["a1"], ["u1", "u2"], "s1")
-    sm.create_session_if_not_exist("g2", ["a2"], ["u2"], "s2")
+    await sm.create_session_if_not_exist("g1", ["a1"], ["u1", "u2"], "s1")
+    await sm.create_session_if_not_exist("g2", ["a2"], ["u2"], "s2")
 
     # User in one session
-    user1_sessions = manager.get_user_sessions("u1")
+    user1_sessions = await manager.get_user_sessions("u1")
     assert len(user1_sessions) == 1
     assert user1_sessions[0].session_id == "s1"
 
     # User in two sessions
-    user2_sessions = manager.get_user_sessions("u2")
+    user2_sessions = await manager.get_user_sessions("u2")
     assert len(user2_sessions) == 2
     assert {s.session_id for s in user2_sessions} == {"s1", "s2"}
 
     # User in no sessions
-    assert manager.get_user_sessions("u3") == []
+    assert await manager.get_user_sessions("u3") == []
 
 
 async def test_get_agent_sessions(manager):
     """Test the get_agent_sessions proxy method."""
     sm = manager.session_manager
-    sm.create_session_if_not_exist("g1", ["a1", "a2"], ["u1"], "s1")
-    sm.create_session_if_not_exist("g2", ["a2"], ["u2"], "s2")
+    await sm.create_session_if_not_exist("g1", ["a1", "a2"], ["u1"], "s1")
+    await sm.create_session_if_not_exist("g2", ["a2"], ["u2"], "s2")
 
-    agent2_sessions = manager.get_agent_sessions("a2")
+    agent2_sessions = await manager.get_agent_sessions("a2")
     assert len(agent2_sessions) == 2
     assert {s.session_id for s in agent2_sessions} == {"s1", "s2"}
 
@@ -326,11 +542,11 @@ async def test_get_agent_sessions(manager):
 async def test_get_group_sessions(manager):
     """Test the get_group_sessions proxy method."""
     sm = manager.session_manager
-    sm.create_session_if_not_exist("g1", ["a1"], ["u1"], "s1")
-    sm.create_session_if_not_exist("g1", ["a2"], ["u2"], "s2")
+    await sm.create_session_if_not_exist("g1", ["a1"], ["u1"], "s1")
+    await sm.create_session_if_not_exist("g1", ["a2"], ["u2"], "s2")
 
-    group1_sessions = manager.get_group_sessions("g1")
+    group1_sessions = await manager.get_group_sessions("g1")
     assert len(group1_sessions) == 2
     assert {s.session_id for s in group1_sessions} == {"s1", "s2"}
 
-    assert manager.get_group_sessions("g2") == []
+    assert await manager.get_group_sessions("g2") == []
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import asyncio
 import json
+import math
 import time
 from dataclasses import dataclass, field
 from typing import Any
 
 import numpy as np
 
+from memmachine.profile_memory.profile_memory import ProfileMemory
 from memmachine.profile_memory.storage.storage_base import ProfileStorageBase
 
 
@@ -153,6 +155,22 @@ class InMemoryProfileStorage(ProfileStorageBase):
             self._profiles_by_user.setdefault(user_id, []).append(entry)
             self._profiles_by_id[entry.id] = entry
 
+    async def add_profile_features(
+        self,
+        features: list[dict[str, Any]],
+    ):
+        for feature in features:
+            await self.add_profile_feature(
+                feature["user_id"],
+                feature["feature"],
+                feature["value"],
+                feature["tag"],
+                feature["embedding"],
+                feature.get("metadata"),
+                feature.get("isolations"),
+                feature.get("citations"),
+            )
+
     async def semantic_search(
         self,
         user_id: str,
@@ -161,6 +179,8 @@ class InMemoryProfileStorage(ProfileStorageBase):
         min_cos: float,
         isolations: dict[str, bool | int | float | str] | None = None,
         include_citations: bool = False,
+        max_range: float | None = None,
+        max_std: float | None = None,
     ) -> list[dict[str, Any]]:
         isolations = isolations or {}
         async with self._lock:
@@ -182,6 +202,12 @@ class InMemoryProfileStorage(ProfileStorageBase):
             hits.sort(key=lambda item: item[0], reverse=True)
             if k > 0:
                 hits = hits[:k]
+            if max_range is not None or max_std is not None:
+                hits = ProfileMemory.range_filter(
+                    [(score, (score, entry)) for score, entry in hits],
+                    max_range if max_range is not None else math.inf,
+                    max_std if max_std is not None else math.inf,
+                )
 
             results: list[dict[str, Any]] = []
             for score, entry in hits:
@@ -314,6 +340,20 @@ class InMemoryProfileStorage(ProfileStorageBase):
             self._history_by_id[entry.id] = entry
             return self._history_entry_to_mapping(entry)
 
+    async def add_history_messages(
+        self,
+        messages: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        return [
+            await self.add_history(
+                message["user_id"],
+                message["content"],
+                message.get("metadata"),
+                message.get("isolations"),
+            )
+            for message in messages
+        ]
+
     async def delete_history(
         self,
         user_id: str,
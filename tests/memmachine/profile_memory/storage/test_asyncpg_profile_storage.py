@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import pytest_asyncio
+from testcontainers.postgres import PostgresContainer
+
+from memmachine.profile_memory.storage.asyncpg_profile import AsyncPgProfileStorage
+from memmachine.profile_memory.storage.syncschema import sync_to as setup_pg_schema
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(scope="module")
+def pg_container():
+    with PostgresContainer("pgvector/pgvector:pg16") as container:
+        yield container
+
+
+@pytest_asyncio.fixture
+async def euclidean_storage(pg_container):
+    config = {
+        "host": pg_container.get_container_host_ip(),
+        "port": int(pg_container.get_exposed_port(5432)),
+        "user": pg_container.username,
+        "password": pg_container.password,
+        "database": pg_container.dbname,
+        "similarity_metric": "euclidean",
+    }
+    await setup_pg_schema(
+        database=config["database"],
+        host=config["host"],
+        port=f"{config['port']}",
+        user=config["user"],
+        password=config["password"],
+        embedding_dimensions=2,
+        similarity_metric="euclidean",
+    )
+
+    storage = AsyncPgProfileStorage(config)
+    await storage.startup()
+    yield storage
+    await storage.delete_all()
+    await storage.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_euclidean_semantic_search(euclidean_storage):
+    # Every feature is at least a unit distance from the query.
+    for value, embedding in [
+        ("near", [1.0, 0.0]),
+        ("middle", [2.0, 0.0]),
+        ("far", [0.0, 3.0]),
+    ]:
+        await euclidean_storage.add_profile_feature(
+            user_id="user",
+            feature="feature",
+            value=value,
+            tag="tag",
+            embedding=np.array(embedding),
+        )
+
+    results = await euclidean_storage.semantic_search(
+        user_id="user",
+        qemb=np.array([0.0, 0.0]),
+        k=10,
+        min_cos=-1.0,
+        max_range=2.0,
+        max_std=1.0,
+    )
+
+    assert [result["value"] for result in results] == ["near", "middle", "far"]
+    scores = [result["metadata"]["similarity_score"] for result in results]
+    assert scores == pytest.approx([1 / 2, 1 / 5, 1 / 10])
@@ -165,6 +165,16 @@ async def test_semantic_search_sorting_and_citations(storage: InMemoryProfileSto
     assert len(filtered) == 1
     assert filtered[0]["value"] == "ai"
 
+    filtered = await storage.semantic_search(
+        user_id="user",
+        qemb=np.array([1.0, 0.1]),
+        k=10,
+        min_cos=-1.0,
+        isolations={},
+        max_range=0.5,
+    )
+    assert [entry["value"] for entry in filtered] == ["ai"]
+
 
 @pytest.mark.asyncio
 async def test_history_management(storage: InMemoryProfileStorage):
@@ -2,7 +2,7 @@
 
 import asyncio
 import time
-from unittest.mock import create_autospec
+from unittest.mock import AsyncMock, create_autospec
 
 import pytest
 import pytest_asyncio
@@ -389,3 +389,84 @@ async def test_persona_think_updates_profile(
     )
 
     assert profile == mock_persona_think_response
+
+
+async def test_batched_profile_extraction(
+    mock_embedder, mock_llm, mock_prompt, mock_storage
+):
+    pm = ProfileMemory(
+        model=mock_llm,
+        embeddings=mock_embedder,
+        prompt=mock_prompt,
+        profile_storage=mock_storage,
+        update_batch_token_limit=5,
+    )
+    await pm.startup()
+    mock_llm.generate_response.return_value = (
+        '{"1": {"command": "add", "feature": "pet", "value": "dog", "tag": "home"}}',
+        [],
+    )
+    # Each message is estimated at 2 tokens, so two fit in a window.
+    await mock_storage.add_history_messages(
+        [{"user_id": "test_user", "content": f"message{index}"} for index in range(5)]
+    )
+
+    await pm._process_uningested_memories("test_user")
+
+    assert mock_llm.generate_response.await_count == 3
+    user_prompts = [
+        call.kwargs["user_prompt"]
+        for call in mock_llm.generate_response.await_args_list
+    ]
+    assert "message0\nmessage1" in user_prompts[0]
+    assert "message4" in user_prompts[2]
+    assert await pm.uningested_message_count() == 0
+    profile = await pm.get_user_profile("test_user")
+    assert "pet" in profile["home"]
+
+    await pm.delete_all()
+    await pm.cleanup()
+
+
+async def test_add_new_profiles(profile_memory: ProfileMemory, mock_embedder):
+    mock_embedder.ingest_embed = AsyncMock(wraps=mock_embedder.ingest_embed)
+
+    await profile_memory.add_new_profiles(
+        [
+            {
+                "user_id": "test_user",
+                "feature": f"test_feature_{index}",
+                "value": f"test_value_{index}",
+                "tag": "test_tag",
+                "citations": [index],
+            }
+            for index in range(3)
+        ]
+    )
+
+    mock_embedder.ingest_embed.assert_awaited_once()
+    profile = await profile_memory.get_user_profile("test_user")
+    assert profile == {
+        "test_tag": {
+            f"test_feature_{index}": {"value": f"test_value_{index}"}
+            for index in range(3)
+        }
+    }
+
+
+async def test_semantic_search_many(profile_memory: ProfileMemory, mock_embedder):
+    await profile_memory.add_new_profile(
+        user_id="test_user",
+        feature="test_feature",
+        value="test_value",
+        tag="test_tag",
+    )
+    mock_embedder.search_embed = AsyncMock(wraps=mock_embedder.search_embed)
+
+    results = await profile_memory.semantic_search_many(
+        ["first", "second"], user_id="test_user"
+    )
+
+    mock_embedder.search_embed.assert_awaited_once_with(["first", "second"])
+    assert len(results) == 2
+    assert all(result[0]["value"] == "test_value" for result in results)
@@ -3,10 +3,13 @@ Test profile memory initialization
 """
 
 from unittest.mock import MagicMock
+from uuid import uuid4
 
 import pytest
 import yaml
 
+from memmachine.common.embedder import SimilarityMetric
+from memmachine.episodic_memory.episodic_memory import EpisodicMemory
 from memmachine.episodic_memory.episodic_memory_manager import (
     EpisodicMemoryManager,
 )
@@ -35,6 +38,8 @@ def mock_dependencies(monkeypatch):
     )
     monkeypatch.setattr("memmachine.server.app.import_module", mock_import_module)
 
+    mock_embedder_builder.build.return_value.similarity_metric = SimilarityMetric.COSINE
+
     # Mock the create_episodic_memory_manager class method
     mock_episodic_manager.create_episodic_memory_manager.return_value = (
         mock_episodic_manager
@@ -51,12 +56,18 @@ def mock_dependencies(monkeypatch):
 
 
 @pytest.fixture
-def mock_config_file(tmp_path):
+def embedder_id():
+    """An embedder ID that is not shared by an earlier test."""
+    return f"test_embedder_{uuid4()}"
+
+
+@pytest.fixture
+def mock_config_file(tmp_path, embedder_id):
     """Creates a temporary YAML config file for testing."""
     config_content = {
         "profile_memory": {
             "llm_model": "test_llm",
-            "embedding_model": "test_embedder",
+            "embedding_model": embedder_id,
             "database": "test_db",
             "prompt": "test_prompt",
         },
@@ -68,7 +79,7 @@ def mock_config_file(tmp_path):
             }
         },
         "embedder": {
-            "test_embedder": {
+            embedder_id: {
                 "provider": "openai",
                 "config": {
                     "model_name": "text-embedding-ada-002",
@@ -95,7 +106,7 @@ def mock_config_file(tmp_path):
 
 @pytest.mark.asyncio
 async def test_initialize_resource_success(
-    mock_dependencies, mock_config_file, monkeypatch
+    mock_dependencies, mock_config_file, embedder_id, monkeypatch
 ):
     """
     Tests that initialize_resource successfully creates and returns
@@ -113,6 +124,13 @@ async def test_initialize_resource_success(
     mock_dependencies[
         "episodic_manager"
     ].create_episodic_memory_manager.assert_called_once_with(mock_config_file)
+
+    # The embedder is shared with episodic memory.
+    embedder = mock_dependencies["embedder_builder"].build.return_value
+    assert (
+        EpisodicMemory.get_shared_resource(embedder_id, MagicMock(side_effect=KeyError))
+        is embedder
+    )
     mock_dependencies["profile_memory"].assert_called_once()
 
     # Verify prompt module was imported
@@ -141,6 +159,27 @@ async def test_initialize_resource_success(
     assert db_config["user"] == "postgres"
     assert db_config["password"] == "TEST_DB_PASS_VAR"
     assert db_config["database"] == "test_db"
+    assert db_config["similarity_metric"] == "cosine"
 
     # You could add more specific assertions here to check the arguments
     # passed to the builders and ProfileMemory constructor if needed.
+
+
+@pytest.mark.asyncio
+async def test_initialize_resource_keeps_embedder_metrics_factory(
+    mock_dependencies, mock_config_file, embedder_id
+):
+    """
+    Tests that initialize_resource keeps the metrics factory
+    configured for the profile memory embedder.
+    """
+    with open(mock_config_file, encoding="utf-8") as f:
+        config_content = yaml.safe_load(f)
+    config_content["embedder"][embedder_id]["config"]["metrics_factory_id"] = "custom"
+    with open(mock_config_file, "w", encoding="utf-8") as f:
+        yaml.dump(config_content, f)
+
+    await initialize_resource(mock_config_file)
+
+    embedder_builder_args = mock_dependencies["embedder_builder"].build.call_args[0]
+    assert embedder_builder_args[1]["metrics_factory_id"] == "custom"
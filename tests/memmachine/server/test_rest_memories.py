@@ -1,3 +1,5 @@
+import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -40,9 +42,20 @@ def mock_memory_managers(monkeypatch):
     #    the `async with` block.
     mock_inst = MagicMock()
     mock_inst.add_memory_episode = AsyncMock(return_value=True)
+    mock_inst.add_memory_episodes = AsyncMock(
+        side_effect=lambda episodes: [
+            None if episode["producer"] != "intruder" else "invalid producer"
+            for episode in episodes
+        ]
+    )
     mock_inst.delete_data = AsyncMock()
     mock_inst.get_memory_context.return_value = MagicMock(group_id="g", session_id="s")
     mock_inst.query_memory = AsyncMock(return_value=([], [], ["EpisodicMemory"]))
+    mock_inst.query_memory_many = AsyncMock(
+        side_effect=lambda queries, limit, property_filter: [
+            ([], [], [query]) for query in queries
+        ]
+    )
 
     # 2. Create a mock async context manager that yields the mock instance.
     mock_context_manager = AsyncMock()
@@ -62,9 +75,15 @@ def mock_memory_managers(monkeypatch):
         async def add_persona_message(self, *args, **kwargs):
             pass
 
+        async def add_persona_messages(self, messages):
+            self.persona_messages = messages
+
         async def semantic_search(self, *args, **kwargs):
             return []
 
+        async def semantic_search_many(self, queries, *args, **kwargs):
+            return [[query] for query in queries]
+
     # 5. Apply all patches to the app module.
     monkeypatch.setattr(app_module, "episodic_memory", DummyEpisodicMemoryManager())
     monkeypatch.setattr(app_module, "profile_memory", DummyProfileMemory())
@@ -360,6 +379,19 @@ def test_memory_search_without_session(query_payload_without_session):
     assert response.headers["group-id"] == "default"
 
 
+def test_memory_search_batch(valid_query_payload):
+    payload = dict(valid_query_payload)
+    del payload["query"]
+    payload["queries"] = ["first", "second", "first"]
+    response = client.post("/v1/memories/search/batch", json=payload)
+    assert response.status_code == 200
+    rsp = response.json()["content"]
+    assert rsp == [
+        {"episodic_memory": [[], [], [query]], "profile_memory": [query]}
+        for query in ["first", "second", "first"]
+    ]
+
+
 # --- Test episodic memory query /v1/memories/episodic/search ---
 def test_episodic_memory_search_valid(valid_query_payload):
     """
@@ -485,3 +517,117 @@ def test_delete_memories_extra_field(valid_delete_payload):
     valid_delete_payload["unexpected_field"] = "should-be-accepted"
     response = client.request("DELETE", "/v1/memories", json=valid_delete_payload)
     assert response.status_code in (200, 201, 204)
+
+
+# --- Tests for POST /v1/memories/batch ---
+
+
+def test_post_memories_batch(valid_post_payload, valid_session_headers):
+    import memmachine.server.app as app_module
+
+    invalid_episode = dict(valid_post_payload, producer="intruder")
+    header_episode = {
+        key: value for key, value in valid_post_payload.items() if key != "session"
+    }
+    header_episode["producer"] = "user3"
+    response = client.post(
+        "/v1/memories/batch",
+        json={"episodes": [valid_post_payload, invalid_episode, header_episode]},
+        headers=valid_session_headers,
+    )
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["results"]] == [
+        200,
+        400,
+        200,
+    ]
+    persona_messages = app_module.profile_memory.persona_messages
+    assert [message["user_id"] for message in persona_messages] == [
+        "user1",
+        "user3",
+    ]
+
+
+def test_post_memories_batch_failures(monkeypatch, valid_post_payload):
+    import memmachine.server.app as app_module
+
+    class FailingEpisodicMemoryManager:
+        async def get_episodic_memory_instance(self, *args, session_id, **kwargs):
+            if session_id == "invalid":
+                raise ValueError("Invalid session id")
+            if session_id == "broken":
+                raise RuntimeError("Session database is unavailable")
+            return MagicMock()
+
+    monkeypatch.setattr(app_module, "episodic_memory", FailingEpisodicMemoryManager())
+
+    def episode_in_session(session_id):
+        return dict(
+            valid_post_payload,
+            session=dict(valid_post_payload["session"], session_id=session_id),
+        )
+
+    episodes = [
+        valid_post_payload,
+        episode_in_session("invalid"),
+        episode_in_session("broken"),
+    ]
+    response = client.post("/v1/memories/batch", json={"episodes": episodes})
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["results"]] == [
+        200,
+        400,
+        500,
+    ]
+
+    # Episodes added to episodic memory fail if profile memory fails.
+    app_module.profile_memory.add_persona_messages = AsyncMock(
+        side_effect=RuntimeError("Profile database is unavailable")
+    )
+    response = client.post("/v1/memories/batch", json={"episodes": episodes})
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["results"]] == [
+        500,
+        400,
+        500,
+    ]
+
+
+# --- Tests for POST /v1/memories/stream ---
+
+
+def test_post_memories_stream(
+    monkeypatch, valid_post_payload_without_session, valid_session_headers
+):
+    import memmachine.server.app as app_module
+
+    monkeypatch.setattr(app_module.AppConst, "STREAM_MAX_IN_FLIGHT", 2)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def add_memory(episode):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    monkeypatch.setattr(app_module, "_add_memory", add_memory)
+
+    lines = [json.dumps(valid_post_payload_without_session)] * 5
+    lines.insert(2, "not json")
+    response = client.post(
+        "/v1/memories/stream",
+        content="\n".join(lines) + "\n\n",
+        headers=valid_session_headers | {"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    acknowledgements = {
+        acknowledgement["line"]: acknowledgement["status"]
+        for acknowledgement in map(json.loads, response.text.splitlines())
+    }
+    assert acknowledgements == {1: 200, 2: 200, 3: 422, 4: 200, 5: 200, 6: 200}
+    assert max_in_flight == 2